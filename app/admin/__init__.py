@@ -8,6 +8,10 @@
 from flask import Blueprint, render_template, redirect, url_for, request, flash, jsonify, session, current_app
 from flask_login import login_required, current_user
 from app.common.models import Menu, User, Department, Code, Brand, MemberAuth, DeptAuth, db
+from app.services.product_catalog import refresh_product_catalog
+from app.services.permission_service import permission_service, mask_to_flags
+from app.services.menu_service import menu_service
+from app.services.code_tree_service import CodeTreeService, CodeTreeError, bump_code_version
 from datetime import datetime
 
 admin_bp = Blueprint('admin', __name__, url_prefix='/admin')
@@ -71,43 +75,15 @@ def code_management():
         return redirect('/auth/login')
     
     try:
-        # 분석 결과를 바탕으로 개선된 정렬: CodeSeq → parent_seq → Sort → Seq
-        # 이렇게 하면 같은 CodeSeq 그룹 내에서 부모-자식 관계가 더 명확하게 표현됩니다
-        codes_query = Code.query.order_by(
-            Code.code_seq.asc().nulls_last(),    # CodeSeq 먼저 (그룹별)
-            Code.parent_seq.asc().nulls_first(), # 부모 관계 (NULL이 Root)
-            Code.sort.asc(),                     # 정렬 순서
-            Code.seq.asc()                       # 시퀀스 순서 (최종)
-        ).all()
-        
-        # Code 객체를 딕셔너리로 변환
-        codes = [code.to_dict() for code in codes_query]
-        
-        current_app.logger.info(f"코드 관리 페이지: {len(codes)}개 코드 조회 완료")
-        
-        # 디버깅: 개선된 계층 구조 확인
-        if codes:
-            depth_counts = {}
-            codeseq_counts = {}
-            for code in codes[:15]:  # 첫 15개만 로깅
-                depth = code['depth']
-                code_seq = code['code_seq']
-                depth_counts[depth] = depth_counts.get(depth, 0) + 1
-                codeseq_counts[code_seq] = codeseq_counts.get(code_seq, 0) + 1
-                current_app.logger.info(f"📋 코드: {code['seq']} | {code['code']} | {code['code_name']} | CodeSeq: {code_seq} | Parent: {code['parent_seq']} | Sort: {code['sort']}")
-            
-            current_app.logger.info(f"📊 깊이별 코드 수: {depth_counts}")
-            current_app.logger.info(f"📁 CodeSeq별 코드 수: {list(codeseq_counts.items())[:10]}")
-            current_app.logger.info(f"🌳 정렬 방식: CodeSeq → parent_seq → Sort → Seq (트리 구조 최적화)")
-        else:
-            current_app.logger.warning("⚠️ 조회된 코드가 없습니다!")
-        
-        return render_template('admin/code_management.html', codes=codes)
+        # 트리는 화면에서 상위 코드별로 /admin/api/codes/tree 지연 로딩, 페이지는 통계만 렌더링
+        stats = CodeTreeService(db.session).summary()
+        return render_template('admin/code_management.html', stats=stats)
         
     except Exception as e:
         current_app.logger.error(f"코드 관리 페이지 오류: {e}")
         flash(f'코드 목록 조회 중 오류가 발생했습니다: {str(e)}', 'error')
-        return render_template('admin/code_management.html', codes=[])
+        return render_template('admin/code_management.html',
+                               stats={'total': 0, 'max_depth': 0, 'group_count': 0})
 
 @admin_bp.route('/brands')
 @admin_bp.route('/brand_management')
@@ -198,6 +174,8 @@ def create_menu():
         
         db.session.add(new_menu)
         db.session.commit()
+        permission_service.invalidate()
+        menu_service.invalidate()
         
         return jsonify({'success': True, 'message': '메뉴가 생성되었습니다.'})
         
@@ -234,6 +212,8 @@ def update_menu():
         menu.upt_date = db.func.now()
         
         db.session.commit()
+        permission_service.invalidate()
+        menu_service.invalidate()
         return jsonify({'success': True, 'message': '메뉴가 수정되었습니다.'})
         
     except Exception as e:
@@ -269,6 +249,8 @@ def delete_menu():
         
         db.session.delete(menu)
         db.session.commit()
+        permission_service.invalidate()
+        menu_service.invalidate()
         
         return jsonify({'success': True, 'message': '메뉴가 삭제되었습니다.'})
         
@@ -342,6 +324,8 @@ def create_code():
         
         db.session.add(new_code)
         db.session.commit()
+        bump_code_version()
+        refresh_product_catalog()
         
         current_app.logger.info(f"코드 추가 성공: {code} - {code_name} (사용자: {session.get('member_seq')})")
         
@@ -499,6 +483,8 @@ def update_code():
         existing_code.upt_date = datetime.now()
         
         db.session.commit()
+        bump_code_version()
+        refresh_product_catalog()
         
         current_app.logger.info(f"코드 수정 성공: {code} - {code_name} (사용자: {session.get('member_seq')})")
         
@@ -528,29 +514,10 @@ def delete_code():
         if not seq:
             return jsonify({'success': False, 'message': 'seq가 필요합니다.'})
         
-        # 기존 코드 조회
-        target_code = Code.query.filter_by(seq=int(seq)).first()
-        if not target_code:
-            return jsonify({'success': False, 'message': '해당 코드를 찾을 수 없습니다.'})
-        
-        # 하위 코드들을 재귀적으로 찾기
-        def find_all_children(parent_seq):
-            children = Code.query.filter_by(parent_seq=parent_seq).all()
-            all_children = children.copy()
-            for child in children:
-                all_children.extend(find_all_children(child.seq))
-            return all_children
-        
-        # 삭제할 모든 코드 (자신 + 하위 코드들)
-        all_codes_to_delete = [target_code] + find_all_children(target_code.seq)
-        
-        # 삭제 확인 로그
-        deleted_codes = []
-        for code in all_codes_to_delete:
-            deleted_codes.append(f"{code.code} - {code.code_name}")
-            db.session.delete(code)
-        
-        db.session.commit()
+        # 코드 + 하위 코드 전체를 재귀 CTE 한 번으로 삭제
+        result = CodeTreeService(db.session).delete_subtree(int(seq))
+        deleted_codes = result['deleted_codes']
+        refresh_product_catalog()
         
         current_app.logger.info(f"코드 삭제 성공: {len(deleted_codes)}개 코드 삭제 - {', '.join(deleted_codes)} (사용자: {session.get('member_seq')})")
         
@@ -563,6 +530,8 @@ def delete_code():
             }
         })
         
+    except CodeTreeError as e:
+        return jsonify({'success': False, 'message': str(e)})
     except Exception as e:
         db.session.rollback()
         current_app.logger.error(f"코드 삭제 실패: {e}")
@@ -598,20 +567,11 @@ def update_codes_order():
             # parent_seq가 0이면 NULL로 처리 (최상위 코드)
             filter_parent_seq = None if parent_seq == 0 else parent_seq
             
-            # 해당 부모의 같은 깊이 코드들 조회
-            codes = Code.query.filter_by(parent_seq=filter_parent_seq, depth=depth).all()
-            code_dict = {code.seq: code for code in codes}
-            
-            # 새로운 순서로 sort 값 업데이트 (1부터 시작)
-            updated_count = 0
-            for index, seq_val in enumerate(order_list):
-                if seq_val in code_dict:
-                    code_dict[seq_val].sort = index + 1
-                    code_dict[seq_val].upt_user = session.get('member_seq')
-                    code_dict[seq_val].upt_date = datetime.now()
-                    updated_count += 1
-            
-            db.session.commit()
+            # UPDATE ... FROM (VALUES ...) 한 번으로 sort 값 일괄 업데이트 (1부터 시작)
+            result = CodeTreeService(db.session).reorder(
+                filter_parent_seq, depth, order_list, user=session.get('member_seq')
+            )
+            updated_count = result['updated_count']
             
             current_app.logger.info(f"드래그 앤 드롭 순서 변경 완료: parent={parent_seq}, depth={depth}, 업데이트={updated_count}개")
             
@@ -626,52 +586,94 @@ def update_codes_order():
             })
             
         elif seq and new_sort:
-            # 기존 개별 순서 변경 (레거시 호환)
-            target_code = Code.query.filter_by(seq=int(seq)).first()
-            if not target_code:
-                return jsonify({'success': False, 'message': '해당 코드를 찾을 수 없습니다.'})
-            
-            # 같은 부모의 형제 코드들 조회
-            siblings = Code.query.filter_by(
-                parent_seq=target_code.parent_seq,
-                depth=target_code.depth
-            ).filter(Code.seq != target_code.seq).all()
-            
-            # 새로운 정렬 순서 적용
+            # 기존 개별 순서 변경 (레거시 호환) - 뒤쪽 형제 밀기까지 한 트랜잭션
             new_sort_value = int(new_sort)
+            result = CodeTreeService(db.session).move_to_position(
+                int(seq), new_sort_value, user=session.get('member_seq')
+            )
             
-            # 같은 순서나 그 이후의 코드들을 한 칸씩 밀어내기
-            for sibling in siblings:
-                if (sibling.sort or 999) >= new_sort_value:
-                    sibling.sort = (sibling.sort or 0) + 1
-                    sibling.upt_user = session.get('member_seq')
-                    sibling.upt_date = datetime.now()
-            
-            # 대상 코드의 순서 변경
-            target_code.sort = new_sort_value
-            target_code.upt_user = session.get('member_seq')
-            target_code.upt_date = datetime.now()
-            
-            db.session.commit()
-            
-            current_app.logger.info(f"코드 순서 변경 성공: {target_code.code} → Sort {new_sort_value}")
+            current_app.logger.info(f"코드 순서 변경 성공: {result['code']} → Sort {new_sort_value}")
             
             return jsonify({
                 'success': True,
                 'message': '순서가 성공적으로 변경되었습니다.',
                 'data': {
-                    'seq': target_code.seq,
+                    'seq': result['seq'],
                     'new_sort': new_sort_value
                 }
             })
         else:
             return jsonify({'success': False, 'message': '필수 데이터가 누락되었습니다.'})
         
+    except CodeTreeError as e:
+        return jsonify({'success': False, 'message': str(e)})
     except Exception as e:
         db.session.rollback()
         current_app.logger.error(f"코드 순서 변경 실패: {e}")
         return jsonify({'success': False, 'message': f'순서 변경 중 오류가 발생했습니다: {str(e)}'}), 500
 
+@admin_bp.route('/api/codes/move', methods=['POST'])
+def move_code_subtree():
+    """코드 이동 (하위 코드 포함, 다른 상위 코드 아래로)"""
+    if 'member_seq' not in session:
+        return redirect('/auth/login')
+    
+    try:
+        seq = request.form.get('seq', type=int)
+        new_parent_seq = request.form.get('parent_seq', 0, type=int)
+        if not seq:
+            return jsonify({'success': False, 'message': 'seq가 필요합니다.'})
+        
+        result = CodeTreeService(db.session).move_subtree(seq, new_parent_seq, user=session.get('member_seq'))
+        refresh_product_catalog()
+        
+        current_app.logger.info(f"코드 이동 성공: {seq} → parent {new_parent_seq} ({result['moved_count']}개)")
+        
+        return jsonify({
+            'success': True,
+            'message': f"코드가 이동되었습니다. (총 {result['moved_count']}개)",
+            'data': result
+        })
+        
+    except CodeTreeError as e:
+        return jsonify({'success': False, 'message': str(e)})
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"코드 이동 실패: {e}")
+        return jsonify({'success': False, 'message': f'코드 이동 중 오류가 발생했습니다: {str(e)}'}), 500
+
+@admin_bp.route('/api/codes/copy', methods=['POST'])
+def copy_code_subtree():
+    """코드 복사 (하위 코드 포함)"""
+    if 'member_seq' not in session:
+        return redirect('/auth/login')
+    
+    try:
+        seq = request.form.get('seq', type=int)
+        new_parent_seq = request.form.get('parent_seq', 0, type=int)
+        new_code = request.form.get('code', '').strip() or None
+        if not seq:
+            return jsonify({'success': False, 'message': 'seq가 필요합니다.'})
+        
+        result = CodeTreeService(db.session).copy_subtree(
+            seq, new_parent_seq, user=session.get('member_seq'), new_code=new_code
+        )
+        
+        current_app.logger.info(f"코드 복사 성공: {seq} → {result['new_root_seq']} ({result['copied_count']}개)")
+        
+        return jsonify({
+            'success': True,
+            'message': f"코드가 복사되었습니다. (총 {result['copied_count']}개)",
+            'data': result
+        })
+        
+    except CodeTreeError as e:
+        return jsonify({'success': False, 'message': str(e)})
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"코드 복사 실패: {e}")
+        return jsonify({'success': False, 'message': f'코드 복사 중 오류가 발생했습니다: {str(e)}'}), 500
+
 @admin_bp.route('/api/codes/paginated', methods=['GET'])
 def get_codes_paginated():
     """페이징된 코드 목록 조회"""
@@ -735,6 +737,37 @@ def get_codes_paginated():
         return jsonify({'success': False, 'message': f'코드 조회 중 오류가 발생했습니다: {str(e)}'}), 500
 
 
+@admin_bp.route('/api/codes/tree', methods=['GET'])
+def browse_code_tree():
+    """코드 트리 탐색 (상위 코드 기준 지연 로딩, keyset 커서)"""
+    if 'member_seq' not in session:
+        return redirect('/auth/login')
+    
+    try:
+        parent_seq = request.args.get('parent_seq', type=int)
+        depth_limit = request.args.get('depth_limit', 1, type=int)
+        cursor = request.args.get('cursor')
+        limit = request.args.get('limit', 200, type=int)
+        
+        result = CodeTreeService(db.session).browse(
+            parent_seq=parent_seq, depth_limit=depth_limit, cursor=cursor, limit=limit
+        )
+        
+        return jsonify({
+            'success': True,
+            'data': result['nodes'],
+            'cursor': {
+                'next': result['next_cursor'],
+                'has_more': result['has_more']
+            }
+        })
+        
+    except CodeTreeError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+    except Exception as e:
+        current_app.logger.error(f"코드 트리 조회 실패: {e}")
+        return jsonify({'success': False, 'message': f'코드 조회 중 오류가 발생했습니다: {str(e)}'}), 500
+
 # ==================== 부서 관리 API ====================
 
 @admin_bp.route('/api/departments/get', methods=['POST'])
@@ -926,6 +959,7 @@ def save_department_auth():
                 db.session.add(new_auth)
         
         db.session.commit()
+        permission_service.invalidate()
         return jsonify({'success': True, 'message': '부서 권한이 저장되었습니다.'})
         
     except Exception as e:
@@ -1079,6 +1113,7 @@ def create_user():
                 db.session.add(user_dept)
         
         db.session.commit()
+        permission_service.invalidate()
         
         return jsonify({
             'success': True,
@@ -1201,6 +1236,7 @@ def update_user(user_seq):
                 db.session.add(user_dept)
         
         db.session.commit()
+        permission_service.invalidate()
         
         return jsonify({
             'success': True,
@@ -1239,6 +1275,7 @@ def delete_user(user_seq):
         MemberAuth.query.filter_by(member_seq=user_seq).delete()
         
         db.session.commit()
+        permission_service.invalidate()
         
         return jsonify({
             'success': True,
@@ -1390,6 +1427,7 @@ def set_user_permissions(user_seq):
             db.session.add(new_auth)
         
         db.session.commit()
+        permission_service.invalidate()
         
         return jsonify({
             'success': True,
@@ -1493,6 +1531,7 @@ def set_department_permissions(dept_seq):
                     db.session.add(new_user_auth)
         
         db.session.commit()
+        permission_service.invalidate()
         
         return jsonify({
             'success': True,
@@ -1513,44 +1552,27 @@ def get_permissions_matrix():
         company_id = session.get('current_company_id', 1)
         view_type = request.args.get('type', 'user')  # user 또는 department
         
+        # 권한 스냅샷 (MemberAuth / DeptAuth 각 1회 조회, Redis 캐시)
+        grants = permission_service.get_grants()
+        menus = Menu.query.order_by(Menu.depth.asc(), Menu.sort.asc()).all()
+        
+        def build_permissions(masks):
+            return [
+                dict({'menu_seq': menu.seq, 'menu_name': menu.name},
+                     **mask_to_flags(masks.get(str(menu.seq), 0)))
+                for menu in menus
+            ]
+        
         if view_type == 'user':
             # 사용자별 권한 매트릭스
             users = User.query.filter_by(member_status='Y').order_by(User.name.asc()).all()
-            menus = Menu.query.order_by(Menu.depth.asc(), Menu.sort.asc()).all()
             
-            matrix = []
-            for user in users:
-                user_auths = MemberAuth.query.filter_by(member_seq=user.seq).all()
-                auth_dict = {auth.menu_seq: auth for auth in user_auths}
-                
-                user_permissions = []
-                for menu in menus:
-                    auth = auth_dict.get(menu.seq)
-                    if auth:
-                        user_permissions.append({
-                            'menu_seq': menu.seq,
-                            'menu_name': menu.name,
-                            'auth_create': auth.auth_create,
-                            'auth_read': auth.auth_read,
-                            'auth_update': auth.auth_update,
-                            'auth_delete': auth.auth_delete
-                        })
-                    else:
-                        user_permissions.append({
-                            'menu_seq': menu.seq,
-                            'menu_name': menu.name,
-                            'auth_create': 'N',
-                            'auth_read': 'N',
-                            'auth_update': 'N',
-                            'auth_delete': 'N'
-                        })
-                
-                matrix.append({
-                    'user_seq': user.seq,
-                    'user_name': user.name,
-                    'super_user': user.super_user,
-                    'permissions': user_permissions
-                })
+            matrix = [{
+                'user_seq': user.seq,
+                'user_name': user.name,
+                'super_user': user.super_user,
+                'permissions': build_permissions(grants['members'].get(str(user.seq), {}))
+            } for user in users]
             
             return jsonify({
                 'success': True,
@@ -1564,40 +1586,12 @@ def get_permissions_matrix():
         else:  # department
             # 부서별 권한 매트릭스
             departments = Department.query.filter_by(use_yn='Y').order_by(Department.sort.asc()).all()
-            menus = Menu.query.order_by(Menu.depth.asc(), Menu.sort.asc()).all()
             
-            matrix = []
-            for dept in departments:
-                dept_auths = DeptAuth.query.filter_by(dept_seq=dept.seq).all()
-                auth_dict = {auth.menu_seq: auth for auth in dept_auths}
-                
-                dept_permissions = []
-                for menu in menus:
-                    auth = auth_dict.get(menu.seq)
-                    if auth:
-                        dept_permissions.append({
-                            'menu_seq': menu.seq,
-                            'menu_name': menu.name,
-                            'auth_create': auth.auth_create,
-                            'auth_read': auth.auth_read,
-                            'auth_update': auth.auth_update,
-                            'auth_delete': auth.auth_delete
-                        })
-                    else:
-                        dept_permissions.append({
-                            'menu_seq': menu.seq,
-                            'menu_name': menu.name,
-                            'auth_create': 'N',
-                            'auth_read': 'N',
-                            'auth_update': 'N',
-                            'auth_delete': 'N'
-                        })
-                
-                matrix.append({
-                    'dept_seq': dept.seq,
-                    'dept_name': dept.dept_name,
-                    'permissions': dept_permissions
-                })
+            matrix = [{
+                'dept_seq': dept.seq,
+                'dept_name': dept.dept_name,
+                'permissions': build_permissions(grants['departments'].get(str(dept.seq), {}))
+            } for dept in departments]
             
             return jsonify({
                 'success': True,
@@ -0,0 +1,13 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+매출 분석 모듈
+브랜드/채널/기간/사은품별 집계 API (인메모리 매출 큐브)
+"""
+
+from flask import Blueprint
+
+# 매출 분석 Blueprint 생성
+analytics_bp = Blueprint('analytics', __name__, url_prefix='/analytics')
+
+from . import routes
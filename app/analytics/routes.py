@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+매출 분석 API 라우트
+- GET/POST /analytics/api/sales/query : 기간 + 필터 + 그룹 차원 + 측정값 + 상위 N 집계
+- GET      /analytics/api/sales/meta  : 사용 가능한 차원/측정값, 큐브 메모리 현황
+
+조회 예:
+    /analytics/api/sales/query?start=2025-01-01&end=2025-06-30&group_by=brand,month
+        &measures=amount,quantity&filter_channel=NAVER,COUPANG&top=20
+"""
+
+from datetime import date, datetime
+import logging
+
+from flask import g, jsonify, request, session
+
+from . import analytics_bp
+from app.common.middleware import multi_tenant
+from app.services.sales_cube import (DATE_DIMENSIONS, DIMENSIONS, MEASURES, CubeQueryError,
+                                     sales_cube)
+
+logger = logging.getLogger(__name__)
+
+FILTER_PREFIX = 'filter_'
+
+
+def _parse_date(value, default: date) -> date:
+    if not value:
+        return default
+    for fmt in ('%Y-%m-%d', '%Y%m%d'):
+        try:
+            return datetime.strptime(value, fmt).date()
+        except ValueError:
+            continue
+    raise CubeQueryError(f"날짜 형식 오류 (YYYY-MM-DD): {value}")
+
+
+def _split(value):
+    if value is None:
+        return []
+    if isinstance(value, (list, tuple)):
+        return list(value)
+    return [item.strip() for item in str(value).split(',') if item.strip()]
+
+
+def _query_params():
+    """GET 쿼리 문자열 / POST JSON 공통 파싱"""
+    if request.method == 'POST':
+        body = request.get_json(silent=True) or {}
+        filters = {name: _split(values) for name, values in (body.get('filters') or {}).items()}
+    else:
+        body = request.args
+        filters = {key[len(FILTER_PREFIX):]: _split(value)
+                   for key, value in request.args.items() if key.startswith(FILTER_PREFIX)}
+
+    today = date.today()
+    top = body.get('top')
+    return {
+        'start': _parse_date(body.get('start'), today.replace(day=1)),
+        'end': _parse_date(body.get('end'), today),
+        'group_by': _split(body.get('group_by')),
+        'measures': _split(body.get('measures')) or None,
+        'filters': filters,
+        'top': int(top) if top not in (None, '') else None,
+        'order_by': body.get('order_by') or None,
+    }, body.get('company_id')
+
+
+def _company_id(requested):
+    """요청 회사 (지정 시 접근 권한 확인, 기본은 현재 선택 회사)"""
+    if requested:
+        company_id = int(requested)
+        if not multi_tenant.has_company_access(session.get('member_seq'), company_id):
+            return None
+        return company_id
+    return getattr(g, 'current_company_id', None) or session.get('current_company_id')
+
+
+@analytics_bp.route('/api/sales/query', methods=['GET', 'POST'])
+def sales_query():
+    """매출 집계 조회"""
+    if 'member_seq' not in session:
+        return jsonify({'success': False, 'message': '로그인이 필요합니다.'}), 401
+    try:
+        params, requested_company = _query_params()
+        company_id = _company_id(requested_company)
+        if not company_id:
+            return jsonify({'success': False, 'message': '회사를 선택해주세요.'}), 403
+        
+        data = sales_cube.query(company_id, **params)
+        return jsonify({'success': True, 'data': data})
+        
+    except (CubeQueryError, ValueError) as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+    except Exception as e:
+        logger.error(f"❌ 매출 분석 조회 실패: {e}")
+        return jsonify({
+            'success': False,
+            'message': f'매출 분석 조회 중 오류가 발생했습니다: {str(e)}'
+        }), 500
+
+
+@analytics_bp.route('/api/sales/meta')
+def sales_meta():
+    """차원/측정값 목록 + 큐브 현황"""
+    if 'member_seq' not in session:
+        return jsonify({'success': False, 'message': '로그인이 필요합니다.'}), 401
+    return jsonify({
+        'success': True,
+        'data': {
+            'dimensions': list(DIMENSIONS) + list(DATE_DIMENSIONS),
+            'filters': list(DIMENSIONS) + ['is_revenue'],
+            'measures': list(MEASURES),
+            'cube': sales_cube.stats(),
+        }
+    })
@@ -1,6 +1,7 @@
 from flask import Blueprint, render_template, request, redirect, session, flash
 from werkzeug.security import check_password_hash
 from app.common.models import User
+from app.services.permission_service import require_permission  # 메뉴 권한 데코레이터
 
 auth_bp = Blueprint('auth', __name__, url_prefix='/auth')
 
@@ -13,7 +13,10 @@ import logging
 
 from . import batch_bp
 from app.services.batch_scheduler import batch_scheduler, BatchJobConfig, BatchExecutionResult
+from app.services.batch_job_runner import batch_job_runner, JOB_MANUAL, JOB_SCHEDULED
+from app.services.batch_metrics import dashboard_stats
 from app.services.erpia_client import ErpiaApiClient
+from app.services.erpia_goods_sync import ErpiaGoodsSync
 from app.services.gift_classifier import GiftClassifier
 from app.common.models import db
 
@@ -131,20 +134,33 @@ def add_job():
         
         return redirect(url_for('batch.add_job'))
 
+def _submit_scheduled_job(job_id):
+    """스케줄 작업 즉시 실행을 작업 러너에 등록 → 작업 ID (작업 없으면 None)"""
+    job_config = batch_scheduler.get_job_config(job_id)
+    if not job_config:
+        return None
+    return batch_job_runner.submit(
+        company_id=job_config.company_id,
+        batch_type=JOB_SCHEDULED,
+        params={'job_id': job_id, 'job_type': job_config.job_type}
+    )
+
 @batch_bp.route('/jobs/<job_id>/run', methods=['POST'])
 def run_job(job_id):
-    """배치 작업 즉시 실행"""
+    """배치 작업 즉시 실행 (작업 러너에 등록)"""
     try:
-        if batch_scheduler.run_job_now(job_id):
+        queued_id = _submit_scheduled_job(job_id)
+        if queued_id:
             return jsonify({
                 'success': True,
-                'message': f'작업 {job_id}이 즉시 실행되었습니다.'
-            })
+                'message': f'작업 {job_id}이 실행 대기열에 등록되었습니다.',
+                'data': {'job_id': queued_id}
+            }), 202
         else:
             return jsonify({
                 'success': False,
-                'message': f'작업 {job_id} 실행에 실패했습니다.'
-            }), 400
+                'message': f'작업 {job_id}을 찾을 수 없습니다.'
+            }), 404
             
     except Exception as e:
         logger.error(f"❌ 작업 즉시 실행 실패 ({job_id}): {e}")
@@ -226,31 +242,23 @@ def dashboard_data():
         scheduler_status = {
             'running': batch_scheduler.is_running,
             'job_count': len(batch_scheduler.get_jobs()),
+            'leader': batch_scheduler.get_leader_status(),
             'last_check': datetime.now().isoformat()
         }
         
-        # 최근 7일간 실행 통계 (임시로 하드코딩)
-        total_executions = 10
-        successful_executions = 8
-        failed_executions = 2
-        
-        # 일별 통계 (임시)
-        daily_stats = {
-            '2025-01-27': {'success': 3, 'failed': 1},
-            '2025-01-28': {'success': 5, 'failed': 1}
-        }
+        # 최근 N일 실행 통계 + 회사/모드별 처리량 (erpia_batch_logs / erpia_batch_metrics)
+        days = request.args.get('days', 7, type=int)
+        company_id = request.args.get('company_id', type=int)
+        stats = dashboard_stats(db.session, days=days, company_id=company_id)
         
         return jsonify({
             'success': True,
             'data': {
                 'scheduler_status': scheduler_status,
-                'execution_stats': {
-                    'total': total_executions,
-                    'successful': successful_executions,
-                    'failed': failed_executions,
-                    'success_rate': successful_executions / total_executions if total_executions > 0 else 0
-                },
-                'daily_stats': daily_stats,
+                'execution_stats': stats['execution_stats'],
+                'daily_stats': stats['daily_stats'],
+                'throughput': stats['throughput'],
+                'step_stats': stats['steps'],
                 'last_updated': datetime.now().isoformat()
             }
         })
@@ -269,7 +277,11 @@ def start_scheduler():
         return redirect('/auth/login')
     try:
         if not batch_scheduler.is_running:
-            batch_scheduler.start()
+            if not batch_scheduler.start():
+                return jsonify({
+                    'success': False,
+                    'message': '다른 서버 프로세스가 스케줄러를 실행 중입니다.'
+                }), 409
             return jsonify({
                 'success': True,
                 'message': '스케줄러가 시작되었습니다.'
@@ -407,7 +419,8 @@ def api_start_scheduler():
         return redirect('/auth/login')
     try:
         if not batch_scheduler.is_running:
-            batch_scheduler.start()
+            if not batch_scheduler.start():
+                return jsonify({'success': False, 'message': '다른 서버 프로세스가 스케줄러를 실행 중입니다.'})
             logger.info("🚀 배치 스케줄러 시작됨")
             return jsonify({'success': True, 'message': '스케줄러가 시작되었습니다.'})
         else:
@@ -423,7 +436,7 @@ def api_stop_scheduler():
         return redirect('/auth/login')
     try:
         if batch_scheduler.is_running:
-            batch_scheduler.shutdown()
+            batch_scheduler.stop()
             logger.info("⏹️ 배치 스케줄러 중지됨")
             return jsonify({'success': True, 'message': '스케줄러가 중지되었습니다.'})
         else:
@@ -490,10 +503,9 @@ def api_run_gift_classification():
 def api_run_job(job_id):
     """작업 즉시 실행 API"""
     try:
-        job = batch_scheduler.get_job(job_id)
-        if job:
-            job.modify(next_run_time=datetime.now())
-            return jsonify({'success': True, 'message': '작업이 실행되었습니다.'})
+        queued_id = _submit_scheduled_job(job_id)
+        if queued_id:
+            return jsonify({'success': True, 'message': '작업이 실행 대기열에 등록되었습니다.', 'data': {'job_id': queued_id}})
         else:
             return jsonify({'success': False, 'message': '작업을 찾을 수 없습니다.'})
     except Exception as e:
@@ -675,7 +687,7 @@ def test_erpia_connection_by_company(company_id):
 
 @batch_bp.route('/api/erpia/manual-batch/<int:company_id>', methods=['POST'])
 def run_manual_batch(company_id):
-    """수동 배치 실행 API"""
+    """수동 배치 실행 API (작업 러너에 등록 후 작업 ID 즉시 반환)"""
     try:
         if 'member_seq' not in session:
             return jsonify({'success': False, 'message': '로그인이 필요합니다.'}), 401
@@ -690,7 +702,6 @@ def run_manual_batch(company_id):
         
         # 날짜 형식 검증
         try:
-            from datetime import datetime
             start_dt = datetime.strptime(start_date, '%Y%m%d')
             end_dt = datetime.strptime(end_date, '%Y%m%d')
             
@@ -700,10 +711,8 @@ def run_manual_batch(company_id):
         except ValueError:
             return jsonify({'success': False, 'message': '날짜 형식이 올바르지 않습니다. (YYYYMMDD)'}), 400
         
-        logger.info(f"🚀 수동 배치 실행 시작: 회사ID={company_id}, 기간={start_date}~{end_date}")
-        
         # 배치 설정 로드
-        from app.common.models import CompanyErpiaConfig, ErpiaBatchLog
+        from app.common.models import CompanyErpiaConfig
         
         config = CompanyErpiaConfig.query.filter_by(company_id=company_id).first()
         if not config:
@@ -712,182 +721,95 @@ def run_manual_batch(company_id):
         if not config.batch_enabled:
             return jsonify({'success': False, 'message': 'ERPia 연동이 비활성화되어 있습니다.'}), 400
         
-        # 배치 로그 생성
-        batch_log = ErpiaBatchLog(
+        job_id = batch_job_runner.submit(
             company_id=company_id,
+            batch_type=JOB_MANUAL,
+            params={
+                'start_date': start_date,
+                'end_date': end_date,
+                'days': (end_dt - start_dt).days + 1,
+                'batch_options': batch_options,
+                'member_id': session.get('member_id', 'admin'),
+            },
             admin_code=config.admin_code,
-            batch_type='manual',
-            start_time=datetime.utcnow(),
-            status='RUNNING',
             date_range=f"{start_date}-{end_date}"
         )
-        db.session.add(batch_log)
-        db.session.commit()
+        logger.info(f"🚀 수동 배치 등록: 작업 #{job_id}, 회사ID={company_id}, 기간={start_date}~{end_date}")
         
-        try:
-            # ERPia API 클라이언트 초기화
-            from app.services.erpia_client import ErpiaApiClient
-            erpia_client = ErpiaApiClient(company_id=company_id)
-            
-            total_processed = 0
-            total_gifts = 0
-            member_id = session.get('member_id', 'admin')
-            
-            # 1. 매장정보 수집 (옵션에 따라)
-            if batch_options.get('include_customers', True):
-                logger.info("📱 매장정보 수집 시작")
-                try:
-                    # 분류 코드 매핑 준비 (Shop 모듈 방식 참고)
-                    classification_mapping = {}
-                    try:
-                        from app.common.models import Code
-                        cst_group = Code.query.filter_by(code='CST', depth=0).first()
-                        if cst_group:
-                            classification_groups = Code.query.filter_by(
-                                parent_seq=cst_group.seq, 
-                                depth=1
-                            ).all()
-                            
-                            for group in classification_groups:
-                                group_codes = Code.query.filter_by(
-                                    parent_seq=group.seq,
-                                    depth=2
-                                ).all()
-                                
-                                # 코드별 매핑 딕셔너리 생성
-                                group_key = group.code.lower()
-                                classification_mapping[group_key] = {}
-                                for code in group_codes:
-                                    classification_mapping[group_key][code.code] = code.code_name
-                            
-                            logger.info(f"📋 분류 매핑 준비 완료: {list(classification_mapping.keys())}")
-                        else:
-                            logger.warning("⚠️ CST 분류 그룹을 찾을 수 없습니다.")
-                    except Exception as e:
-                        logger.error(f"❌ 분류 매핑 준비 실패: {str(e)}")
-                        classification_mapping = {}
-                    
-                    logger.info(f"📅 매장정보 조회 기간: {start_date} ~ {end_date}")
-                    logger.info(f"🏢 대상 회사: {company_id} ({'에이원' if company_id == 1 else '에이원월드'})")
-                    
-                    customers_data = erpia_client.fetch_customers(start_date, end_date)
-                    if customers_data:
-                        from app.common.models import ErpiaCustomer
-                        
-                        updated_count = 0
-                        inserted_count = 0
-                        error_count = 0
-                        
-                        logger.info(f"📊 총 {len(customers_data)}개 매장 데이터 수집 완료")
-                        
-                        for customer_data in customers_data:
-                            try:
-                                customer_code = customer_data.get('customer_code', '').strip()
-                                if not customer_code:
-                                    error_count += 1
-                                    continue
-                                
-                                # 시스템 필드 제외
-                                system_fields = {'seq', 'ins_user', 'ins_date', 'upt_user', 'upt_date', 'company_id'}
-                                customer_data_filtered = {k: v for k, v in customer_data.items() 
-                                                        if hasattr(ErpiaCustomer, k) and k not in system_fields}
-                                
-                                existing_customer = ErpiaCustomer.query.filter_by(
-                                    customer_code=customer_code,
-                                    company_id=company_id
-                                ).first()
-                                
-                                if existing_customer:
-                                    # 업데이트
-                                    for key, value in customer_data_filtered.items():
-                                        setattr(existing_customer, key, value)
-                                    existing_customer.upt_user = member_id
-                                    existing_customer.upt_date = datetime.utcnow()
-                                    updated_count += 1
-                                else:
-                                    # 신규 추가
-                                    new_customer = ErpiaCustomer(
-                                        company_id=company_id,
-                                        ins_user=member_id,
-                                        ins_date=datetime.utcnow(),
-                                        upt_user=member_id,
-                                        upt_date=datetime.utcnow(),
-                                        **customer_data_filtered
-                                    )
-                                    db.session.add(new_customer)
-                                    inserted_count += 1
-                            
-                            except Exception as e:
-                                logger.error(f"❌ 매장 데이터 처리 실패 ({customer_code}): {str(e)}")
-                                error_count += 1
-                                continue
-                        
-                        # 커밋
-                        db.session.commit()
-                        
-                        logger.info(f"✅ 매장정보 수집 완료: 신규 {inserted_count}개, 업데이트 {updated_count}개, 오류 {error_count}개")
-                        total_processed += inserted_count + updated_count
-                    else:
-                        logger.warning("⚠️ ERPia에서 매장 데이터를 가져오지 못했습니다.")
-                        
-                except Exception as e:
-                    logger.error(f"❌ 매장정보 수집 실패: {str(e)}")
-                    db.session.rollback()
-                    raise e
-            
-            # 2. 매출데이터 수집 (옵션에 따라)
-            if batch_options.get('include_sales', True):
-                logger.info("💰 매출데이터 수집 시작")
-                try:
-                    # 매출 데이터 처리는 복잡하므로 기본 구현만
-                    logger.info("💰 매출데이터 수집 완료 (기본 구현)")
-                except Exception as e:
-                    logger.error(f"❌ 매출데이터 수집 실패: {e}")
-            
-            # 3. 상품정보 수집 (옵션에 따라)
-            if batch_options.get('include_products', True):
-                logger.info("📦 상품정보 수집 시작")
-                try:
-                    # 상품 정보 처리는 향후 구현
-                    logger.info("📦 상품정보 수집 완료 (기본 구현)")
-                except Exception as e:
-                    logger.error(f"❌ 상품정보 수집 실패: {e}")
-            
-            # 배치 완료 처리
-            batch_log.end_time = datetime.utcnow()
-            batch_log.status = 'SUCCESS'
-            batch_log.processed_orders = total_processed
-            batch_log.gift_products = total_gifts
-            db.session.commit()
-            
-            logger.info(f"🎉 수동 배치 실행 완료: {total_processed}건 처리")
-            
-            return jsonify({
-                'success': True,
-                'message': f'배치 실행 완료: {total_processed}건 처리',
-                'data': {
-                    'processed_count': total_processed,
-                    'gift_count': total_gifts,
-                    'start_date': start_date,
-                    'end_date': end_date,
-                    'batch_options': batch_options
-                }
-            })
-            
-        except Exception as e:
-            # 배치 실패 처리
-            batch_log.end_time = datetime.utcnow()
-            batch_log.status = 'FAILED'
-            batch_log.error_message = str(e)
-            db.session.commit()
-            
-            logger.error(f"❌ 수동 배치 실행 실패: {e}")
-            raise
+        return jsonify({
+            'success': True,
+            'message': f'배치 작업이 등록되었습니다. (작업 #{job_id})',
+            'data': {
+                'job_id': job_id,
+                'status_url': url_for('batch.get_batch_job_status', job_id=job_id),
+                'start_date': start_date,
+                'end_date': end_date,
+                'batch_options': batch_options
+            }
+        }), 202
         
     except Exception as e:
+        db.session.rollback()
         logger.error(f"❌ 수동 배치 API 오류: {e}")
         return jsonify({'success': False, 'message': str(e)}), 500
 
+@batch_bp.route('/api/erpia/jobs/<int:job_id>', methods=['GET'])
+def get_batch_job_status(job_id):
+    """배치 작업 진행 상태 (단계별 페이지/건수/ETA)"""
+    if 'member_seq' not in session:
+        return jsonify({'success': False, 'message': '로그인이 필요합니다.'}), 401
+    try:
+        status = batch_job_runner.get_status(job_id)
+        if not status:
+            return jsonify({'success': False, 'message': '작업을 찾을 수 없습니다.'}), 404
+        return jsonify({'success': True, 'data': status})
+    except Exception as e:
+        logger.error(f"❌ 배치 작업 상태 조회 실패 (#{job_id}): {e}")
+        return jsonify({'success': False, 'message': str(e)}), 500
+
+@batch_bp.route('/api/erpia/jobs/<int:job_id>/cancel', methods=['POST'])
+def cancel_batch_job(job_id):
+    """배치 작업 취소 (실행 중이면 다음 페이지 수신 시 중단)"""
+    if 'member_seq' not in session:
+        return jsonify({'success': False, 'message': '로그인이 필요합니다.'}), 401
+    try:
+        status = batch_job_runner.cancel(job_id)
+        if not status:
+            return jsonify({'success': False, 'message': '대기 또는 실행 중인 작업이 아닙니다.'}), 400
+        return jsonify({'success': True, 'message': '취소 요청되었습니다.', 'data': {'job_id': job_id, 'status': status}})
+    except Exception as e:
+        db.session.rollback()
+        logger.error(f"❌ 배치 작업 취소 실패 (#{job_id}): {e}")
+        return jsonify({'success': False, 'message': str(e)}), 500
+
+@batch_bp.route('/api/erpia/jobs/<int:job_id>/resume', methods=['POST'])
+def resume_batch_job(job_id):
+    """실패/취소된 배치 작업 재개 (완료된 단계는 건너뜀)"""
+    if 'member_seq' not in session:
+        return jsonify({'success': False, 'message': '로그인이 필요합니다.'}), 401
+    try:
+        if not batch_job_runner.resume(job_id):
+            return jsonify({'success': False, 'message': '실패 또는 취소된 작업만 재개할 수 있습니다.'}), 400
+        return jsonify({'success': True, 'message': '작업이 다시 등록되었습니다.', 'data': {'job_id': job_id}})
+    except Exception as e:
+        db.session.rollback()
+        logger.error(f"❌ 배치 작업 재개 실패 (#{job_id}): {e}")
+        return jsonify({'success': False, 'message': str(e)}), 500
+
+@batch_bp.route('/api/erpia/goods/report/<int:company_id>', methods=['GET'])
+def get_erpia_goods_report(company_id):
+    """ERPia 상품 마스터 리포트 (미매핑/최근 변경 상품)"""
+    if 'member_seq' not in session:
+        return jsonify({'success': False, 'message': '로그인이 필요합니다.'}), 401
+    try:
+        days = request.args.get('days', 7, type=int)
+        limit = min(request.args.get('limit', 200, type=int), 1000)
+        report = ErpiaGoodsSync(db.session, company_id).report(days=days, limit=limit)
+        return jsonify({'success': True, 'data': report})
+    except Exception as e:
+        logger.error(f"❌ ERPia 상품 마스터 리포트 조회 실패 (회사 {company_id}): {e}")
+        return jsonify({'success': False, 'message': str(e)}), 500
+
 @batch_bp.route('/api/erpia/batch-logs/<int:company_id>', methods=['GET'])
 def get_batch_logs(company_id):
     """배치 실행 로그 조회"""
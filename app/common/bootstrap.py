@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+DB 스키마/기본 데이터 부트스트랩 (버전 관리)
+- app_bootstrap_versions: 구성요소(schema, seed)별 적용 버전
+- 앱 기동 시에는 버전 조회 1회만 (최신이면 create_all/기본 데이터/인덱스 작업 생략)
+- 버전이 뒤처졌으면 BOOTSTRAP_AUTO=true 일 때 한 프로세스만 실행 (advisory lock), 나머지는 완료 대기
+- 수동 실행: python scripts/bootstrap.py [--status] [--force]
+
+모델/뷰/인덱스/기본 데이터가 바뀌면 해당 구성요소의 version 을 올린다.
+"""
+
+import logging
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import text
+
+logger = logging.getLogger(__name__)
+
+VERSION_TABLE = 'app_bootstrap_versions'
+LOCK_NAME = 'app_bootstrap'
+WAIT_TIMEOUT = 300  # 다른 프로세스 부트스트랩 대기 (초)
+
+
+@dataclass
+class BootstrapStep:
+    component: str
+    version: int
+    description: str
+    run: Callable
+
+
+def _schema(app):
+    """테이블 + 읽기 모델 + 인덱스 + 매출 파티션"""
+    from app.common.models import db
+    from app.services.batch_job_runner import BatchJobRunner
+    from app.services.code_tree_service import CodeTreeService
+    from app.services.erpia_goods_sync import ErpiaGoodsSync
+    from app.services.product_catalog import product_catalog
+    from app.services.sales_partitions import SalesPartitionManager
+
+    db.create_all()
+
+    # 상품 카탈로그 읽기 모델 (구체화 뷰) - 실패하면 버전을 기록하지 않도록 중단
+    if not product_catalog.ensure_view(db.session):
+        raise RuntimeError('product_catalog 구체화 뷰 생성 실패')
+    # 코드 트리 탐색 인덱스 (레거시 tbl_code 테이블)
+    if not CodeTreeService(db.session).ensure_indexes():
+        raise RuntimeError('tbl_code 인덱스 생성 실패')
+    # ERPia 상품 마스터 매핑 인덱스 (product_details.erpia_code)
+    ErpiaGoodsSync.ensure_indexes(db.session)
+    # 배치 작업 큐 부분 인덱스
+    BatchJobRunner.ensure_indexes(db.session)
+    # 매출/주문 회사·월 파티션 (이후 미래 월은 PARTITION_MAINTENANCE 작업이 생성)
+    SalesPartitionManager(db.session).ensure_partitions(
+        months_ahead=app.config.get('SALES_PARTITION_MONTHS_AHEAD', 3))
+
+
+def _seed(app):
+    """회사/사용자 소속/ERPia 기본 설정"""
+    from app.common.models import create_default_data
+    create_default_data()
+
+
+STEPS: List[BootstrapStep] = [
+    BootstrapStep('schema', 1, '테이블/뷰/인덱스/매출 파티션', _schema),
+    BootstrapStep('seed', 1, '기본 회사/ERPia 설정', _seed),
+]
+
+
+def current_versions(session) -> Dict[str, int]:
+    """적용된 구성요소 버전 (버전 테이블이 없으면 빈 dict)"""
+    exists = session.execute(text("SELECT to_regclass(:name) IS NOT NULL"), {'name': VERSION_TABLE}).scalar()
+    if not exists:
+        return {}
+    rows = session.execute(text(f"SELECT component, version FROM {VERSION_TABLE}")).all()
+    return {component: version for component, version in rows}
+
+
+def pending_steps(session, force: bool = False) -> List[BootstrapStep]:
+    if force:
+        return list(STEPS)
+    versions = current_versions(session)
+    return [step for step in STEPS if versions.get(step.component, 0) < step.version]
+
+
+def _record(session, step: BootstrapStep, duration_ms: int):
+    session.execute(text(f"""
+        CREATE TABLE IF NOT EXISTS {VERSION_TABLE} (
+            component VARCHAR(50) PRIMARY KEY,
+            version INTEGER NOT NULL,
+            description VARCHAR(200),
+            duration_ms INTEGER,
+            applied_at TIMESTAMP NOT NULL DEFAULT NOW()
+        )
+    """))
+    session.execute(text(f"""
+        INSERT INTO {VERSION_TABLE} (component, version, description, duration_ms, applied_at)
+        VALUES (:component, :version, :description, :duration_ms, NOW())
+        ON CONFLICT (component) DO UPDATE
+        SET version = EXCLUDED.version, description = EXCLUDED.description,
+            duration_ms = EXCLUDED.duration_ms, applied_at = EXCLUDED.applied_at
+    """), {'component': step.component, 'version': step.version,
+           'description': step.description, 'duration_ms': duration_ms})
+    session.commit()
+
+
+def run_bootstrap(app, force: bool = False, components: Optional[List[str]] = None) -> Dict[str, int]:
+    """
+    뒤처진 구성요소 실행 → {구성요소: 소요 ms}
+
+    다른 프로세스가 실행 중이면 끝날 때까지 기다린 뒤 남은 단계만 실행한다.
+    """
+    from app.common.models import db
+    from app.services.leader_election import advisory_lock
+
+    deadline = time.monotonic() + WAIT_TIMEOUT
+    while True:
+        with advisory_lock(db.engine, LOCK_NAME) as acquired:
+            if acquired:
+                applied = {}
+                for step in pending_steps(db.session, force):
+                    if components and step.component not in components:
+                        continue
+                    started = time.perf_counter()
+                    print(f"🔧 부트스트랩 {step.component} v{step.version}: {step.description}")
+                    try:
+                        step.run(app)
+                    except Exception:
+                        db.session.rollback()
+                        raise
+                    applied[step.component] = int((time.perf_counter() - started) * 1000)
+                    _record(db.session, step, applied[step.component])
+                return applied
+        if time.monotonic() > deadline:
+            raise TimeoutError('다른 프로세스의 DB 부트스트랩이 끝나지 않았습니다.')
+        print("⏳ 다른 프로세스가 DB 부트스트랩 중 - 대기")
+        time.sleep(2)
+        if not pending_steps(db.session, force=False):
+            return {}
+
+
+def ensure_bootstrapped(app):
+    """앱 기동 시 버전 확인 (최신이면 조회 1회로 끝)"""
+    from app.common.models import db
+
+    try:
+        pending = pending_steps(db.session)
+    except Exception as e:
+        db.session.rollback()
+        print(f"❌ 데이터베이스 연결 실패: {e}")
+        return
+
+    if not pending:
+        versions = ', '.join(f"{step.component} v{step.version}" for step in STEPS)
+        print(f"✅ PostgreSQL 연결, DB 스키마/기본 데이터 최신 ({versions})")
+        return
+
+    names = ', '.join(f"{step.component} v{step.version}" for step in pending)
+    if not app.config.get('BOOTSTRAP_AUTO', True):
+        print(f"⚠️ DB 부트스트랩 필요: {names} - python scripts/bootstrap.py 실행")
+        return
+
+    try:
+        applied = run_bootstrap(app)
+        if applied:
+            print(f"✅ DB 부트스트랩 완료: {applied} (ms)")
+    except Exception as e:
+        print(f"❌ DB 부트스트랩 실패 ({names}): {e}")
+        import traceback
+        print(f"   상세 오류: {traceback.format_exc()}")
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Redis 캐시 공통 모듈
+- DB 번호별 커넥션 풀 공유 (docs/03_Redis_캐시_전략.md 의 DB 분리 규칙)
+- JSON 값 저장/조회, 버전 스탬프 키
+- Redis 장애 시 None 반환 → 호출 측이 DB 조회로 대체
+"""
+
+import json
+import logging
+import threading
+from typing import Any, Dict, Optional
+
+from app.common.metrics import count_cache
+
+logger = logging.getLogger(__name__)
+
+# Redis DB 분리 (docs/03_Redis_캐시_전략.md)
+REDIS_DB = {
+    'session': 0,
+    'cache': 1,
+    'temp': 2,
+    'queue': 3,
+    'batch': 4,
+    'gift': 5,
+}
+
+# 데이터 유형별 TTL (초)
+TTL = {
+    'session': 86400,       # 24시간
+    'permissions': 3600,    # 1시간
+    'master_data': 21600,   # 6시간
+    'statistics': 43200,    # 12시간
+    'temp_data': 1800,      # 30분
+    'lock': 300,            # 5분
+    'batch_status': 3600,   # 1시간
+}
+
+
+class RedisCache:
+    """Redis 커넥션 풀 + JSON 캐시 헬퍼"""
+
+    def __init__(self):
+        self.host = 'localhost'
+        self.port = 6380
+        self.password = None
+        self.max_connections = 20
+        self.socket_timeout = 2
+        self._pools: Dict[int, Any] = {}
+        self._lock = threading.Lock()
+        self._available = None
+
+    def init_app(self, app):
+        """앱 설정 로드 후 연결 확인 (설정 암호 → 암호 없음 순서, 첫 시도 성공 시 1회로 끝)"""
+        self.host = app.config.get('REDIS_HOST', 'localhost')
+        self.port = int(app.config.get('REDIS_PORT', 6380))
+        self.max_connections = int(app.config.get('REDIS_MAX_CONNECTIONS', 20))
+        self.socket_timeout = app.config.get('REDIS_SOCKET_TIMEOUT', 2)
+        configured_password = app.config.get('REDIS_PASSWORD')
+
+        for password in dict.fromkeys((configured_password, None)):
+            self.password = password
+            self.reset_pools()
+            try:
+                self.client(REDIS_DB['session']).ping()
+                self._available = True
+                print(f"✅ Redis 캐시 연결 성공 (포트 {self.port}, {'암호 있음' if password else '암호 없음'})")
+                break
+            except Exception as e:
+                self._available = False
+                last_error = e
+        else:
+            print(f"⚠️ Redis 연결 실패: {last_error}")
+
+        app.extensions['redis_cache'] = self
+
+    @property
+    def available(self) -> bool:
+        return bool(self._available)
+
+    def reset_pools(self):
+        """커넥션 풀 초기화 (fork 이후 재생성용)"""
+        with self._lock:
+            for pool in self._pools.values():
+                try:
+                    pool.disconnect()
+                except Exception:
+                    pass
+            self._pools = {}
+
+    def _get_pool(self, db: int):
+        pool = self._pools.get(db)
+        if pool is None:
+            with self._lock:
+                pool = self._pools.get(db)
+                if pool is None:
+                    from redis import ConnectionPool
+                    pool = ConnectionPool(
+                        host=self.host,
+                        port=self.port,
+                        db=db,
+                        password=self.password,
+                        max_connections=self.max_connections,
+                        socket_timeout=self.socket_timeout,
+                        socket_connect_timeout=self.socket_timeout,
+                    )
+                    self._pools[db] = pool
+        return pool
+
+    def client(self, db: int = REDIS_DB['cache']):
+        """DB 번호별 풀을 공유하는 Redis 클라이언트"""
+        from redis import Redis
+        return Redis(connection_pool=self._get_pool(db))
+
+    # ------------------------------------------------------------------
+    # JSON 값
+    # ------------------------------------------------------------------
+    def get_json(self, key: str, db: int = REDIS_DB['cache']) -> Optional[Any]:
+        if self._available is False:
+            return None
+        try:
+            value = self.client(db).get(key)
+            count_cache(key, bool(value))
+            return json.loads(value) if value else None
+        except Exception as e:
+            logger.warning(f"⚠️ 캐시 조회 실패 ({key}): {e}")
+            return None
+
+    def set_json(self, key: str, value: Any, ttl: int = TTL['master_data'], db: int = REDIS_DB['cache']) -> bool:
+        if self._available is False:
+            return False
+        try:
+            return bool(self.client(db).setex(key, ttl, json.dumps(value, ensure_ascii=False, default=str)))
+        except Exception as e:
+            logger.warning(f"⚠️ 캐시 저장 실패 ({key}): {e}")
+            return False
+
+    def delete(self, *keys: str, db: int = REDIS_DB['cache']) -> int:
+        if self._available is False or not keys:
+            return 0
+        try:
+            return self.client(db).delete(*keys)
+        except Exception as e:
+            logger.warning(f"⚠️ 캐시 삭제 실패 ({keys}): {e}")
+            return 0
+
+    # ------------------------------------------------------------------
+    # 버전 스탬프 (키에 버전을 포함시켜 일괄 무효화)
+    # ------------------------------------------------------------------
+    def get_version(self, name: str, db: int = REDIS_DB['cache']) -> int:
+        if self._available is False:
+            return 0
+        try:
+            value = self.client(db).get(f"version:{name}")
+            return int(value) if value else 0
+        except Exception as e:
+            logger.warning(f"⚠️ 캐시 버전 조회 실패 ({name}): {e}")
+            return 0
+
+    def bump_version(self, name: str, db: int = REDIS_DB['cache']) -> int:
+        if self._available is False:
+            return 0
+        try:
+            return int(self.client(db).incr(f"version:{name}"))
+        except Exception as e:
+            logger.warning(f"⚠️ 캐시 버전 증가 실패 ({name}): {e}")
+            return 0
+
+
+# 전역 캐시 인스턴스
+cache = RedisCache()
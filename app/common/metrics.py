@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Prometheus 메트릭 공통 모듈
+- 요청 지연시간 (블루프린트/엔드포인트별), 요청당 SQL 쿼리 수/시간
+- ERPia API 지연시간/오류 (admin_code, mode 별), 배치 수집 건수
+- 캐시 적중률 (키 접두어별), 배치 작업 큐 깊이 (스크랩 시점 조회)
+- gunicorn 다중 프로세스: PROMETHEUS_MULTIPROC_DIR 설정 시 프로세스별 파일 집계
+- 배치 워커(worker.py): ERPia/수집/작업 러너 메트릭을 별도 HTTP 포트(METRICS_WORKER_PORT)로 노출
+"""
+
+import logging
+import os
+import time
+
+from flask import Response, g, request
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Histogram, REGISTRY, generate_latest, multiprocess,
+    start_http_server
+)
+from prometheus_client.core import GaugeMetricFamily
+
+logger = logging.getLogger(__name__)
+
+# ----------------------------------------------------------------------
+# 메트릭 정의
+# ----------------------------------------------------------------------
+HTTP_REQUEST_SECONDS = Histogram(
+    'mis_http_request_duration_seconds', 'HTTP 요청 처리 시간',
+    ['blueprint', 'endpoint', 'method', 'status'],
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+)
+DB_QUERIES_PER_REQUEST = Histogram(
+    'mis_db_queries_per_request', '요청당 SQL 쿼리 수',
+    ['blueprint', 'endpoint'],
+    buckets=(1, 2, 5, 10, 20, 50, 100, 200, 500)
+)
+DB_SECONDS_PER_REQUEST = Histogram(
+    'mis_db_query_seconds_per_request', '요청당 SQL 실행 시간 합계',
+    ['blueprint', 'endpoint'],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)
+)
+ERPIA_REQUEST_SECONDS = Histogram(
+    'mis_erpia_request_duration_seconds', 'ERPia API 호출 시간',
+    ['admin_code', 'mode'],
+    buckets=(0.1, 0.25, 0.5, 1, 2, 5, 10, 30)
+)
+ERPIA_REQUEST_ERRORS = Counter(
+    'mis_erpia_request_errors_total', 'ERPia API 호출 실패 (재시도 포함)',
+    ['admin_code', 'mode']
+)
+BATCH_ROWS_INGESTED = Counter(
+    'mis_batch_rows_ingested_total', 'ERPia 배치 수신 건수',
+    ['company_id', 'mode']
+)
+CACHE_REQUESTS = Counter(
+    'mis_cache_requests_total', 'Redis 캐시 조회 (hit/miss)',
+    ['cache', 'result']
+)
+
+
+def observe_erpia_request(admin_code: str, mode: str, seconds: float, error: bool = False):
+    ERPIA_REQUEST_SECONDS.labels(admin_code or '-', mode or '-').observe(seconds)
+    if error:
+        ERPIA_REQUEST_ERRORS.labels(admin_code or '-', mode or '-').inc()
+
+
+def count_batch_rows(company_id, mode: str, rows: int):
+    if rows:
+        BATCH_ROWS_INGESTED.labels(str(company_id), mode or '-').inc(rows)
+
+
+def count_cache(key: str, hit: bool):
+    """키 접두어(permissions, menu, codes ...)별 적중/실패"""
+    CACHE_REQUESTS.labels(key.split(':', 1)[0], 'hit' if hit else 'miss').inc()
+
+
+# ----------------------------------------------------------------------
+# 스크랩 시점 게이지 (프로세스 간 공유 상태는 DB/Redis 에서 직접 조회)
+# ----------------------------------------------------------------------
+class BatchQueueCollector:
+    """배치 작업 큐 깊이 (erpia_batch_logs 상태별 + 워커 명령 큐 길이)"""
+
+    def __init__(self, app):
+        self.app = app
+
+    def collect(self):
+        jobs = GaugeMetricFamily('mis_batch_jobs', '상태별 배치 작업 수 (대기/실행 중)', labels=['status'])
+        commands = GaugeMetricFamily('mis_batch_command_queue_length', '배치 워커 명령 큐 길이')
+        try:
+            from sqlalchemy import text
+            from app.common.models import db
+            with self.app.app_context():
+                rows = db.session.execute(text("""
+                    SELECT status, COUNT(*) FROM erpia_batch_logs
+                    WHERE status IN ('QUEUED', 'RUNNING', 'CANCELLING')
+                    GROUP BY status
+                """)).all()
+                db.session.rollback()
+            counts = dict(rows)
+            for status in ('QUEUED', 'RUNNING', 'CANCELLING'):
+                jobs.add_metric([status], counts.get(status, 0))
+            yield jobs
+        except Exception as e:
+            logger.warning(f"⚠️ 배치 큐 메트릭 조회 실패: {e}")
+
+        try:
+            from app.common.cache import cache, REDIS_DB
+            from app.services.batch_scheduler import COMMAND_QUEUE_KEY
+            commands.add_metric([], cache.client(REDIS_DB['queue']).llen(COMMAND_QUEUE_KEY))
+            yield commands
+        except Exception as e:
+            logger.warning(f"⚠️ 배치 명령 큐 메트릭 조회 실패: {e}")
+
+
+def start_worker_metrics_server(app) -> bool:
+    """
+    배치 워커 메트릭 HTTP 서버 시작 (METRICS_WORKER_PORT, 0 이면 사용 안 함)
+
+    웹 /metrics 는 웹 프로세스 값만 보이므로 external 모드 워커의 ERPia 호출/수집 건수는 이 포트로 스크랩.
+    배치 큐 깊이는 웹 /metrics 에서 이미 노출하므로 등록하지 않음
+    """
+    port = int(app.config.get('METRICS_WORKER_PORT', 0) or 0)
+    if not port:
+        return False
+    registry = REGISTRY
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    try:
+        start_http_server(port, addr=app.config.get('METRICS_WORKER_ADDR', '0.0.0.0'), registry=registry)
+    except OSError as e:
+        logger.error(f"❌ 배치 워커 메트릭 서버 시작 실패 (포트 {port}): {e}")
+        return False
+    logger.info(f"📈 배치 워커 메트릭: http://{app.config.get('METRICS_WORKER_ADDR', '0.0.0.0')}:{port}/metrics")
+    return True
+
+
+def mark_process_dead(pid: int):
+    """gunicorn child_exit 훅: 종료된 워커의 live gauge 파일 정리"""
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        multiprocess.mark_process_dead(pid)
+
+
+class Metrics:
+    """Flask 요청 계측 + /metrics 엔드포인트"""
+
+    def __init__(self):
+        self.app = None
+        self._queue_collector = None
+        self._listening = set()
+
+    def init_app(self, app):
+        self.app = app
+        if self._queue_collector is None:
+            self._queue_collector = BatchQueueCollector(app)
+            if not os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+                REGISTRY.register(self._queue_collector)
+        else:
+            self._queue_collector.app = app
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+        app.add_url_rule('/metrics', 'metrics', self.metrics_view)
+
+        from app.common.models import db
+        with app.app_context():
+            self._listen_sql(db.engine)
+
+        app.extensions['metrics'] = self
+
+    # ------------------------------------------------------------------
+    # SQL 쿼리 수/시간 (요청 컨텍스트 안에서만 집계)
+    # ------------------------------------------------------------------
+    def _listen_sql(self, engine):
+        """엔진 cursor 이벤트 등록 (엔진당 1회, init_app 재호출 시 중복 집계 방지)"""
+        if id(engine) in self._listening:
+            return
+        self._listening.add(id(engine))
+
+        from sqlalchemy import event
+        from flask import has_request_context
+
+        @event.listens_for(engine, 'before_cursor_execute')
+        def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            conn.info.setdefault('metrics_query_start', []).append(time.perf_counter())
+
+        @event.listens_for(engine, 'after_cursor_execute')
+        def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            starts = conn.info.get('metrics_query_start')
+            if not starts:
+                return
+            elapsed = time.perf_counter() - starts.pop()
+            if has_request_context():
+                g._metrics_sql_count = getattr(g, '_metrics_sql_count', 0) + 1
+                g._metrics_sql_seconds = getattr(g, '_metrics_sql_seconds', 0.0) + elapsed
+
+    # ------------------------------------------------------------------
+    # 요청 계측
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _before_request():
+        g._metrics_started = time.perf_counter()
+
+    @staticmethod
+    def _after_request(response):
+        started = getattr(g, '_metrics_started', None)
+        if started is None or request.endpoint == 'metrics':
+            return response
+
+        blueprint = request.blueprint or '-'
+        endpoint = request.endpoint or 'unmatched'
+        HTTP_REQUEST_SECONDS.labels(blueprint, endpoint, request.method, str(response.status_code)).observe(
+            time.perf_counter() - started
+        )
+        DB_QUERIES_PER_REQUEST.labels(blueprint, endpoint).observe(getattr(g, '_metrics_sql_count', 0))
+        DB_SECONDS_PER_REQUEST.labels(blueprint, endpoint).observe(getattr(g, '_metrics_sql_seconds', 0.0))
+        return response
+
+    # ------------------------------------------------------------------
+    # /metrics
+    # ------------------------------------------------------------------
+    def metrics_view(self):
+        """Prometheus 스크랩 (METRICS_ALLOWED_IPS 설정 시 IP 제한)"""
+        allowed = self.app.config.get('METRICS_ALLOWED_IPS')
+        if allowed and request.remote_addr not in allowed:
+            return Response('forbidden', status=403)
+
+        if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+            # 모든 워커 프로세스 파일 집계 (스크랩마다 새 레지스트리)
+            registry = CollectorRegistry()
+            multiprocess.MultiProcessCollector(registry)
+            registry.register(self._queue_collector)
+        else:
+            registry = REGISTRY
+        return Response(generate_latest(registry), mimetype=CONTENT_TYPE_LATEST)
+
+
+# 전역 인스턴스
+metrics = Metrics()
@@ -292,6 +292,10 @@ class Code(db.Model):
     upt_user = db.Column(db.String(50))
     upt_date = db.Column(db.DateTime)
     
+    __table_args__ = (
+        db.Index('idx_code_parent_sort', 'parent_seq', 'sort', 'seq'),  # 트리 탐색/keyset
+    )
+    
     @classmethod
     def get_code_groups(cls):
         """코드 그룹 목록 조회 (depth=0)"""
@@ -738,16 +742,160 @@ class ErpiaBatchLog(db.Model):
             'created_at': self.created_at.isoformat() if self.created_at else None
         }
 
+class ErpiaBatchMetric(db.Model):
+    """ERPia 배치 단계/페이지별 계측 (수집 처리량 추적)"""
+    __tablename__ = 'erpia_batch_metrics'
+    
+    id = db.Column(db.BigInteger, primary_key=True)
+    batch_log_id = db.Column(db.Integer, db.ForeignKey('erpia_batch_logs.id', ondelete='CASCADE'), comment='배치 로그 ID (없으면 로그 없는 실행)')
+    company_id = db.Column(db.Integer, nullable=False, comment='회사 ID')
+    admin_code = db.Column(db.String(100), comment='ERPia 관리자 코드')
+    kind = db.Column(db.String(10), nullable=False, comment='step / page')
+    step = db.Column(db.String(50), comment='배치 단계 (customers, stock, goods, sales)')
+    mode = db.Column(db.String(20), comment='ERPia API 모드 (cust, jegoAll, goods, jumun)')
+    page = db.Column(db.Integer, comment='페이지 번호 (page 행)')
+    pages = db.Column(db.Integer, default=0, comment='페이지 수 (step 행)')
+    rows = db.Column(db.Integer, default=0, comment='수신 건수')
+    response_bytes = db.Column(db.BigInteger, default=0, comment='응답 크기 (bytes)')
+    retries = db.Column(db.Integer, default=0, comment='재시도 횟수')
+    fetch_ms = db.Column(db.Float, default=0, comment='API 응답 시간 (ms)')
+    parse_ms = db.Column(db.Float, default=0, comment='XML 파싱 시간 (ms)')
+    db_ms = db.Column(db.Float, default=0, comment='DB 저장 시간 (ms)')
+    total_ms = db.Column(db.Float, default=0, comment='전체 소요 시간 (ms)')
+    status = db.Column(db.String(20), default='SUCCESS', comment='SUCCESS / FAILED')
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    
+    __table_args__ = (
+        db.Index('idx_erpia_batch_metrics_log', 'batch_log_id'),
+        db.Index('idx_erpia_batch_metrics_company_mode', 'company_id', 'kind', 'mode', 'created_at'),
+    )
+
+class ErpiaStock(db.Model):
+    """ERPia 재고 현재 스냅샷 (mode=jegoAll, 회사/상품코드별 1행)"""
+    __tablename__ = 'erpia_stock'
+
+    company_id = db.Column(db.Integer, primary_key=True, comment='회사 ID')
+    goods_code = db.Column(db.String(50), primary_key=True, comment='ERPia 상품코드 (G_Code)')
+    online_code = db.Column(db.String(50), comment='자체 상품코드 (G_OnCode)')
+    goods_name = db.Column(db.String(200), comment='ERPia 상품명')
+    goods_standard = db.Column(db.String(200), comment='ERPia 규격')
+    stock_qty = db.Column(db.Integer, nullable=False, default=0, comment='재고 수량')
+    changed_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, comment='수량 변경 시각')
+    synced_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, comment='마지막 수신 시각')
+
+    __table_args__ = (
+        db.Index('idx_erpia_stock_online_code', 'company_id', 'online_code'),
+    )
+
+class ErpiaStockHistory(db.Model):
+    """ERPia 재고 변경 이력 (수량이 바뀐 상품만 기록)"""
+    __tablename__ = 'erpia_stock_history'
+
+    id = db.Column(db.BigInteger, primary_key=True)
+    company_id = db.Column(db.Integer, nullable=False, comment='회사 ID')
+    goods_code = db.Column(db.String(50), nullable=False, comment='ERPia 상품코드')
+    online_code = db.Column(db.String(50), comment='자체 상품코드')
+    stock_qty = db.Column(db.Integer, nullable=False, comment='변경 후 수량')
+    prev_qty = db.Column(db.Integer, comment='변경 전 수량 (신규 상품은 NULL)')
+    changed_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, comment='변경 감지 시각')
+    batch_log_id = db.Column(db.Integer, comment='배치 로그 ID')
+
+    __table_args__ = (
+        db.Index('idx_erpia_stock_history_goods', 'company_id', 'goods_code', 'changed_at'),
+        db.Index('idx_erpia_stock_history_changed', 'company_id', 'changed_at'),
+    )
+
+class ErpiaGoods(db.Model):
+    """ERPia 상품 마스터 (mode=goods, 회사/상품코드별 1행)"""
+    __tablename__ = 'erpia_goods'
+
+    company_id = db.Column(db.Integer, primary_key=True, comment='회사 ID')
+    goods_code = db.Column(db.String(50), primary_key=True, comment='ERPia 상품코드 (G_Code)')
+    online_code = db.Column(db.String(50), comment='자체 상품코드 (G_OnCode)')
+    goods_name = db.Column(db.String(200), comment='ERPia 상품명')
+    goods_standard = db.Column(db.String(200), comment='ERPia 규격')
+    brand = db.Column(db.String(100), comment='브랜드')
+    bar_code = db.Column(db.String(100), comment='바코드')
+    state = db.Column(db.String(20), comment='상품상태')
+    inter_amt = db.Column(db.Integer, default=0, comment='인터넷 판매단가')
+    do_amt = db.Column(db.Integer, default=0, comment='도매 판매단가')
+    so_amt = db.Column(db.Integer, default=0, comment='소매 단가')
+    user_amt = db.Column(db.Integer, default=0, comment='권장 소비자가')
+    ip_amt = db.Column(db.Integer, default=0, comment='매입 단가')
+    data = db.Column(db.JSON, comment='ERPia 수신 필드 전체')
+    content_hash = db.Column(db.String(32), nullable=False, comment='수신 필드 MD5 (변경 감지)')
+
+    # 상품 매핑 (product_details.erpia_code = goods_code)
+    product_detail_id = db.Column(db.Integer, db.ForeignKey('product_details.id', ondelete='SET NULL'), comment='상품상세 ID')
+    product_id = db.Column(db.Integer, db.ForeignKey('products.id', ondelete='SET NULL'), comment='상품 ID')
+
+    first_seen_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, comment='최초 수신 시각')
+    changed_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, comment='내용 변경 시각')
+
+    __table_args__ = (
+        db.Index('idx_erpia_goods_online_code', 'company_id', 'online_code'),
+        db.Index('idx_erpia_goods_product_detail', 'product_detail_id'),
+        db.Index('idx_erpia_goods_product', 'product_id'),
+        db.Index('idx_erpia_goods_changed', 'company_id', 'changed_at'),
+    )
+
+    def to_dict(self):
+        return {
+            'goods_code': self.goods_code,
+            'online_code': self.online_code,
+            'goods_name': self.goods_name,
+            'goods_standard': self.goods_standard,
+            'brand': self.brand,
+            'state': self.state,
+            'inter_amt': self.inter_amt,
+            'do_amt': self.do_amt,
+            'so_amt': self.so_amt,
+            'user_amt': self.user_amt,
+            'ip_amt': self.ip_amt,
+            'product_detail_id': self.product_detail_id,
+            'product_id': self.product_id,
+            'changed_at': self.changed_at.isoformat() if self.changed_at else None,
+        }
+
+class ErpiaRawPage(db.Model):
+    """ERPia 원본 응답 페이지 색인 (본문은 내용 해시 경로의 gzip 파일, 추가 전용)"""
+    __tablename__ = 'erpia_raw_pages'
+
+    id = db.Column(db.BigInteger, primary_key=True)
+    company_id = db.Column(db.Integer, nullable=False, comment='회사 ID')
+    admin_code = db.Column(db.String(100), nullable=False, comment='ERPia 관리자 코드')
+    mode = db.Column(db.String(20), nullable=False, comment='ERPia API 모드')
+    start_date = db.Column(db.String(10), nullable=False, default='', comment='조회 시작일 (sDate, 없으면 빈 값)')
+    end_date = db.Column(db.String(10), nullable=False, default='', comment='조회 종료일 (eDate, 없으면 빈 값)')
+    page = db.Column(db.Integer, nullable=False, default=1, comment='페이지 번호')
+    content_hash = db.Column(db.String(64), nullable=False, comment='응답 본문 SHA-256')
+    raw_bytes = db.Column(db.Integer, comment='응답 크기')
+    stored_bytes = db.Column(db.Integer, comment='압축 저장 크기')
+    row_count = db.Column(db.Integer, comment='파싱 건수')
+    batch_log_id = db.Column(db.Integer, comment='배치 로그 ID')
+    fetched_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, comment='수신 시각')
+    processed_at = db.Column(db.DateTime, comment='DB 반영 완료 시각 (NULL 이면 미반영)')
+
+    __table_args__ = (
+        db.Index('idx_erpia_raw_pages_key', 'company_id', 'mode', 'start_date', 'end_date', 'page', 'id'),
+        db.Index('idx_erpia_raw_pages_hash', 'content_hash'),
+    )
+
 # ==================== 매출분석 테이블 (회사별 분리) ====================
 
 class SalesAnalysisMaster(db.Model):
-    """매출 분석 마스터 테이블 (회사별 데이터 분리)"""
+    """
+    매출 분석 마스터 테이블 (회사별 데이터 분리)
+    
+    회사(LIST) → 판매 월(RANGE) 파티션 테이블 (app/services/sales_partitions.py)
+    DB 기본키는 파티션 키 포함 (id, company_id, sale_date), ORM 식별자는 id
+    """
     __tablename__ = 'sales_analysis_master'
     
-    id = db.Column(db.Integer, primary_key=True)
-    company_id = db.Column(db.Integer, db.ForeignKey('companies.id'), nullable=False)
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    company_id = db.Column(db.Integer, db.ForeignKey('companies.id'), primary_key=True, nullable=False)
     sales_no = db.Column(db.String(50), nullable=False, comment='판매 번호')
-    sale_date = db.Column(db.Date, nullable=False, comment='판매 일자')
+    sale_date = db.Column(db.Date, primary_key=True, nullable=False, comment='판매 일자')
     site_code = db.Column(db.String(50), comment='사이트 코드')
     ger_code = db.Column(db.String(50), comment='거래처 코드')
     customer_name = db.Column(db.String(100), comment='고객명')
@@ -784,7 +932,9 @@ class SalesAnalysisMaster(db.Model):
         db.Index('idx_sales_company_date', 'company_id', 'sale_date'),
         db.Index('idx_sales_company_type', 'company_id', 'product_type'),
         db.Index('idx_sales_no', 'sales_no'),
+        {'postgresql_partition_by': 'LIST (company_id)'},
     )
+    __mapper_args__ = {'primary_key': [id]}
     
     def to_dict(self):
         """매출 데이터를 딕셔너리로 변환"""
@@ -821,11 +971,16 @@ class SalesAnalysisMaster(db.Model):
 # =============================================================================
 
 class ErpiaOrderMaster(db.Model):
-    """ERPia 주문 마스터"""
+    """
+    ERPia 주문 마스터
+    
+    회사(LIST) → 주문 월 m_date(RANGE) 파티션 테이블 (app/services/sales_partitions.py)
+    DB 기본키는 파티션 키 포함 (id, company_id, m_date), ORM 식별자는 id
+    """
     __tablename__ = 'erpia_order_master'
     
-    id = db.Column(db.Integer, primary_key=True)
-    company_id = db.Column(db.Integer, db.ForeignKey('companies.id'), nullable=False, default=1)
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    company_id = db.Column(db.Integer, db.ForeignKey('companies.id'), primary_key=True, nullable=False, default=1)
     
     # ERPia 필드들 (기존 유지)
     site_key_code = db.Column(db.String(10))
@@ -846,7 +1001,7 @@ class ErpiaOrderMaster(db.Model):
     a_addr = db.Column(db.Text)
     a_sido = db.Column(db.String(50))
     a_sigungu = db.Column(db.String(50))
-    m_date = db.Column(db.DateTime)
+    m_date = db.Column(db.DateTime, primary_key=True, nullable=False)  # 파티션 키 (없으면 j_date/수집 시각)
     b_amt = db.Column(db.Numeric(15, 2))
     dis_gong_amt = db.Column(db.Numeric(15, 2))
     claim_yn = db.Column(db.String(1))
@@ -856,6 +1011,11 @@ class ErpiaOrderMaster(db.Model):
     
     # 관계 설정
     company = db.relationship('Company')
+    
+    __table_args__ = (
+        {'postgresql_partition_by': 'LIST (company_id)'},
+    )
+    __mapper_args__ = {'primary_key': [id]}
 
 class ErpiaCustomer(db.Model):
     """ERPia 매장(거래처) 정보 모델"""
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Redis 서버 세션 (docs/03_Redis_캐시_전략.md 세션 DB 0)
+- RedisCache 커넥션 풀 공유 (gunicorn fork 후 cache.reset_pools() 로 재생성)
+- 만료: Redis TTL (PERMANENT_SESSION_LIFETIME), 남은 TTL 이 절반 이하일 때만 EXPIRE 로 연장
+- 변경 없는 요청은 저장 생략 (비로그인 빈 세션은 아예 저장 안 함)
+- 쿠키 형식은 Flask-Session 과 동일 (서명 salt 'flask-session') → 기존 쿠키 그대로 사용
+- 기존 파일 세션 이관: Redis 에 없는 세션은 SESSION_FILE_DIR 에서 읽어 Redis 로 옮기고 파일 삭제
+  (파일명은 키 해시라 일괄 이관 불가 → 접속 시 이관, 남은 파일은 scripts/drain_file_sessions.py 로 정리)
+- Redis 연결 실패 시 기존 파일시스템 세션(Flask-Session)으로 기동
+"""
+
+import logging
+import os
+import pickle
+
+from flask_session import Session
+from flask_session.sessions import RedisSession, SessionInterface
+from itsdangerous import BadSignature, want_bytes
+
+from app.common.cache import REDIS_DB, cache
+
+logger = logging.getLogger(__name__)
+
+SESSION_DB = REDIS_DB['session']
+
+
+class RedisSessionInterface(SessionInterface):
+    """RedisCache 풀을 쓰는 서버 세션 (변경 시에만 저장)"""
+
+    serializer = pickle
+    session_class = RedisSession
+
+    def __init__(self, key_prefix: str, use_signer: bool = True, permanent: bool = False,
+                 legacy_dir: str = None, legacy_threshold: int = 500):
+        self.key_prefix = key_prefix
+        self.use_signer = use_signer
+        self.permanent = permanent
+        self.legacy = None
+        if legacy_dir and os.path.isdir(legacy_dir):
+            from cachelib.file import FileSystemCache
+            self.legacy = FileSystemCache(legacy_dir, threshold=legacy_threshold, mode=0o600)
+
+    def _new_session(self):
+        session = self.session_class(sid=self._generate_sid(), permanent=self.permanent)
+        session.new = True
+        return session
+
+    @staticmethod
+    def _ttl(app) -> int:
+        return int(app.permanent_session_lifetime.total_seconds())
+
+    def _drain_legacy(self, key: str, ttl: int):
+        """파일 세션 → Redis 이관 (없으면 None)"""
+        if self.legacy is None:
+            return None
+        try:
+            data = self.legacy.get(key)
+            if data is None:
+                return None
+            cache.client(SESSION_DB).setex(key, ttl, self.serializer.dumps(dict(data)))
+            self.legacy.delete(key)
+            return data
+        except Exception as e:
+            logger.warning(f"⚠️ 파일 세션 이관 실패: {e}")
+            return None
+
+    def open_session(self, app, request):
+        cookie = request.cookies.get(self.get_cookie_name(app))
+        if not cookie:
+            return self._new_session()
+        sid = cookie
+        if self.use_signer:
+            signer = self._get_signer(app)
+            if signer is None:
+                return None
+            try:
+                sid = signer.unsign(cookie).decode()
+            except BadSignature:
+                return self._new_session()
+
+        key = self.key_prefix + sid
+        try:
+            pipe = cache.client(SESSION_DB).pipeline(transaction=False)
+            pipe.get(key)
+            pipe.ttl(key)
+            value, remaining = pipe.execute()
+        except Exception as e:
+            logger.warning(f"⚠️ 세션 조회 실패 (Redis): {e}")
+            return self._new_session()
+
+        if value is None:
+            data = self._drain_legacy(key, self._ttl(app))
+            remaining = self._ttl(app)
+            if data is None:
+                # 만료/없는 세션 id 는 재사용하지 않음 (세션 고정 방지)
+                return self._new_session()
+        else:
+            try:
+                data = self.serializer.loads(value)
+            except Exception:
+                return self._new_session()
+
+        session = self.session_class(data, sid=sid)
+        session.new = False
+        session.remaining_ttl = remaining
+        return session
+
+    def save_session(self, app, session, response):
+        name = self.get_cookie_name(app)
+        domain = self.get_cookie_domain(app)
+        path = self.get_cookie_path(app)
+        key = self.key_prefix + session.sid
+        is_new = getattr(session, 'new', False)
+
+        if not session:
+            # 빈 세션: 새 세션은 저장 안 함, 기존 세션을 비웠으면(로그아웃) 삭제
+            if session.modified and not is_new:
+                try:
+                    cache.client(SESSION_DB).delete(key)
+                except Exception as e:
+                    logger.warning(f"⚠️ 세션 삭제 실패 (Redis): {e}")
+                response.delete_cookie(name, domain=domain, path=path)
+            return
+
+        ttl = self._ttl(app)
+        try:
+            if session.modified or is_new:
+                cache.client(SESSION_DB).setex(key, ttl, self.serializer.dumps(dict(session)))
+            elif getattr(session, 'remaining_ttl', ttl) < ttl // 2:
+                cache.client(SESSION_DB).expire(key, ttl)
+        except Exception as e:
+            logger.warning(f"⚠️ 세션 저장 실패 (Redis): {e}")
+            return
+
+        if is_new or self.should_set_cookie(app, session):
+            session_id = self._get_signer(app).sign(want_bytes(session.sid)) if self.use_signer else session.sid
+            response.set_cookie(
+                name, session_id,
+                expires=self.get_expiration_time(app, session),
+                httponly=self.get_cookie_httponly(app),
+                domain=domain, path=path,
+                secure=self.get_cookie_secure(app),
+                samesite=self.get_cookie_samesite(app),
+            )
+
+
+def init_session(app):
+    """SESSION_TYPE=redis 이고 Redis 연결 가능하면 Redis 세션, 아니면 Flask-Session(파일시스템)"""
+    if app.config.get('SESSION_TYPE') == 'redis':
+        if cache.available:
+            app.session_interface = RedisSessionInterface(
+                key_prefix=app.config.get('SESSION_KEY_PREFIX', 'session:'),
+                use_signer=app.config.get('SESSION_USE_SIGNER', True),
+                permanent=app.config.get('SESSION_PERMANENT', False),
+                legacy_dir=app.config.get('SESSION_FILE_DIR'),
+                legacy_threshold=app.config.get('SESSION_FILE_THRESHOLD', 500),
+            )
+            print(f"✅ Redis 세션 사용 (DB {SESSION_DB}, 만료 {RedisSessionInterface._ttl(app)}초)")
+            return
+        print("⚠️ Redis 연결 불가 - 파일시스템 세션으로 기동")
+        app.config['SESSION_TYPE'] = 'filesystem'
+    Session(app)
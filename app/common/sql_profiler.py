@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+요청 단위 SQL 프로파일러
+- SQLAlchemy cursor 이벤트로 쿼리 수 / 총 시간 / 반복 문장 형태 수집
+- 같은 정규화 문장이 K회 초과 실행되면 N+1 의심으로 표시
+- Server-Timing 헤더 + 로그 1줄
+- 활성화: SQL_PROFILER_ENABLED=true 또는 요청 헤더 X-SQL-Profile: 1 (SQL_PROFILER_HEADER_ENABLED)
+- 테스트: profile_queries() 컨텍스트로 쿼리 예산 검증 (tests/conftest.py)
+"""
+
+import logging
+import re
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional
+
+from flask import g, has_request_context, request
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = 'X-SQL-Profile'
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\bIN\s*\((?:\s*(?:\?|%\(\w+\)s|:\w+|\$\d+)\s*,?)+\)", re.IGNORECASE)
+_BIND_PARAM = re.compile(r"%\(\w+\)s|(?<!:):\w+|\$\d+")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_statement(statement: str) -> str:
+    """문장 형태 정규화 (리터럴/바인드 파라미터 → ?, IN 목록 → IN (?))"""
+    shape = _STRING_LITERAL.sub('?', statement)
+    shape = _BIND_PARAM.sub('?', shape)
+    shape = _NUMBER_LITERAL.sub('?', shape)
+    shape = _IN_LIST.sub('IN (?)', shape)
+    return _WHITESPACE.sub(' ', shape).strip()
+
+
+class QueryProfile:
+    """쿼리 수집 결과 (요청 1건 또는 테스트 블록 1개)"""
+
+    def __init__(self, threshold: int = 5):
+        self.threshold = threshold
+        self.count = 0
+        self.total_ms = 0.0
+        self.shapes: Counter = Counter()
+        self.shape_ms: Dict[str, float] = defaultdict(float)
+
+    def record(self, statement: str, elapsed_ms: float):
+        shape = normalize_statement(statement)
+        self.count += 1
+        self.total_ms += elapsed_ms
+        self.shapes[shape] += 1
+        self.shape_ms[shape] += elapsed_ms
+
+    def top(self, limit: int = 5) -> List[Dict[str, Any]]:
+        return [
+            {'statement': shape, 'count': count, 'ms': round(self.shape_ms[shape], 2)}
+            for shape, count in self.shapes.most_common(limit)
+        ]
+
+    @property
+    def n_plus_one(self) -> List[Dict[str, Any]]:
+        """같은 형태가 threshold 회 초과 실행된 문장"""
+        return [
+            {'statement': shape, 'count': count, 'ms': round(self.shape_ms[shape], 2)}
+            for shape, count in self.shapes.most_common()
+            if count > self.threshold
+        ]
+
+    def summary(self) -> str:
+        lines = [f"{self.count} queries, {self.total_ms:.1f}ms"]
+        for item in self.top():
+            flag = ' [N+1]' if item['count'] > self.threshold else ''
+            lines.append(f"  {item['count']:>4}x {item['ms']:>8.1f}ms{flag}  {item['statement'][:160]}")
+        return '\n'.join(lines)
+
+
+# 테스트/스크립트용 활성 프로파일 (요청 밖)
+_local = threading.local()
+
+
+def _active_profiles() -> List[QueryProfile]:
+    profiles = []
+    if has_request_context():
+        profile = getattr(g, '_sql_profile', None)
+        if profile is not None:
+            profiles.append(profile)
+    profiles.extend(getattr(_local, 'profiles', []))
+    return profiles
+
+
+@contextmanager
+def profile_queries(threshold: int = 5):
+    """
+    블록 안의 쿼리 수집 (요청 여부 무관, 같은 스레드)
+
+    with profile_queries() as profile:
+        client.get('/product/api/list')
+    assert profile.count <= 10, profile.summary()
+    """
+    profile = QueryProfile(threshold)
+    stack = getattr(_local, 'profiles', None)
+    if stack is None:
+        stack = _local.profiles = []
+    stack.append(profile)
+    try:
+        yield profile
+    finally:
+        stack.remove(profile)
+
+
+class SqlProfiler:
+    """Flask 확장: 요청별 SQL 프로파일링"""
+
+    def __init__(self):
+        self.app = None
+        self._listening = set()
+
+    def init_app(self, app):
+        self.app = app
+        app.config.setdefault('SQL_PROFILER_ENABLED', False)
+        app.config.setdefault('SQL_PROFILER_HEADER_ENABLED', False)
+        app.config.setdefault('SQL_PROFILER_NPLUSONE_THRESHOLD', 5)
+        app.config.setdefault('SQL_PROFILER_SLOW_MS', 500)
+
+        from app.common.models import db
+        with app.app_context():
+            self.listen(db.engine)
+
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+        app.extensions['sql_profiler'] = self
+
+    def listen(self, engine):
+        """엔진 cursor 이벤트 등록 (엔진당 1회)"""
+        if id(engine) in self._listening:
+            return
+        self._listening.add(id(engine))
+
+        from sqlalchemy import event
+
+        @event.listens_for(engine, 'before_cursor_execute')
+        def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            conn.info.setdefault('sql_profiler_start', []).append(time.perf_counter())
+
+        @event.listens_for(engine, 'after_cursor_execute')
+        def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            starts = conn.info.get('sql_profiler_start')
+            if not starts:
+                return
+            elapsed_ms = (time.perf_counter() - starts.pop()) * 1000
+            for profile in _active_profiles():
+                profile.record(statement, elapsed_ms)
+
+    def _enabled_for_request(self) -> bool:
+        config = self.app.config
+        if config['SQL_PROFILER_ENABLED']:
+            return True
+        return bool(config['SQL_PROFILER_HEADER_ENABLED'] and request.headers.get(PROFILE_HEADER) == '1')
+
+    def _before_request(self):
+        if self._enabled_for_request():
+            g._sql_profile = QueryProfile(self.app.config['SQL_PROFILER_NPLUSONE_THRESHOLD'])
+            g._sql_profile_started = time.perf_counter()
+
+    def _after_request(self, response):
+        profile: Optional[QueryProfile] = getattr(g, '_sql_profile', None)
+        if profile is None:
+            return response
+        g._sql_profile = None
+
+        total_ms = (time.perf_counter() - g._sql_profile_started) * 1000
+        response.headers.add(
+            'Server-Timing',
+            f'db;dur={profile.total_ms:.1f};desc="{profile.count} queries", app;dur={total_ms:.1f}'
+        )
+
+        suspects = profile.n_plus_one
+        message = (f"SQL {request.method} {request.path} [{request.endpoint}]: "
+                   f"{profile.count} queries {profile.total_ms:.1f}ms / {total_ms:.1f}ms")
+        if suspects:
+            shapes = '; '.join(f"{s['count']}x {s['statement'][:120]}" for s in suspects[:3])
+            logger.warning(f"⚠️ N+1 의심 {message} | {shapes}")
+        elif profile.total_ms >= self.app.config['SQL_PROFILER_SLOW_MS']:
+            logger.warning(f"🐢 {message}\n{profile.summary()}")
+        else:
+            logger.info(f"🔍 {message}")
+        return response
+
+
+# 전역 인스턴스
+sql_profiler = SqlProfiler()
@@ -2,7 +2,6 @@
 상품관리 라우트
 """
 import os
-import pandas as pd
 from datetime import datetime
 from flask import render_template, request, jsonify, session, current_app, redirect, url_for, flash, send_file, make_response
 from flask_login import login_required, current_user
@@ -14,6 +13,8 @@ import time # 레거시 자가코드 생성 함수에 사용
 
 from app.product import bp
 from app.common.models import db, Product, ProductHistory, Code, Company, Brand, ProductDetail
+from app.services.product_catalog import product_catalog, refresh_product_catalog
+from app.services.erpia_goods_sync import goods_by_erpia_code
 
 # 파일 업로드 설정
 ALLOWED_EXTENSIONS = {'pdf'}
@@ -221,76 +222,32 @@ def api_list():
         search_type = request.args.get('search_type', type=int)
         show_inactive = request.args.get('show_inactive', 'false') == 'true'
         
-        # 쿼리 빌드
-        query = Product.query.filter_by(company_id=current_company_id)
-        
-        if not show_inactive:
-            query = query.filter_by(is_active=True)
-        
-        # 상품명 검색
-        if search_name:
-            search_pattern = f'%{search_name}%'
-            query = query.filter(Product.product_name.ilike(search_pattern))
-        
-        # 품목별 검색
-        if search_product:
-            query = query.filter_by(category_code_seq=search_product)  # 🔥 올바른 필드명 사용
-        
-        # 타입별 검색
-        if search_type:
-            query = query.filter_by(type_code_seq=search_type)  # 🔥 올바른 필드명 사용
-        
-        # 정렬 적용
-        if sort_by and hasattr(Product, sort_by):
-            sort_column = getattr(Product, sort_by)
-            if sort_direction.lower() == 'desc':
-                query = query.order_by(sort_column.desc())
-            else:
-                query = query.order_by(sort_column.asc())
-        else:
-            # 기본 정렬: 생성일 내림차순
-            query = query.order_by(Product.created_at.desc())
-        
-        # 페이징
-        pagination = query.paginate(
-            page=page, per_page=per_page, error_out=False
+        # 상품 카탈로그(구체화 뷰)에서 코드명까지 한 번에 조회
+        result = product_catalog.list_products(
+            db.session, current_company_id,
+            page=page, per_page=per_page,
+            sort_by=sort_by, sort_direction=sort_direction,
+            search_name=search_name, search_product=search_product,
+            search_type=search_type, show_inactive=show_inactive
         )
-        
-        products = [product.to_dict() for product in pagination.items]
+        products = result['items']
+        pagination = result['pagination']
         
         # 통계 정보 계산 (ProductDetail 기준)
         try:
-            # 🔥 전체 상품수 (ProductDetail 테이블 기준 - 미사용 포함)
-            total_products = ProductDetail.query.count()
-            
-            # 🔥 자사코드 보유 상품수 (ProductDetail 테이블 기준)
-            std_code_products = ProductDetail.query.filter(
-                ProductDetail.std_div_prod_code.isnot(None),
-                ProductDetail.std_div_prod_code != ''
-            ).count()
-            
-            stats = {
-                'total_products': total_products,
-                'std_code_products': std_code_products
-            }
+            # 🔥 전체 상품수 / 자사코드 보유 상품수 (ProductDetail 기준 - 미사용 포함)
+            stats = product_catalog.detail_stats(db.session)
         except Exception as e:
             current_app.logger.warning(f"통계 계산 오류: {e}")
             stats = {
-                'total_products': pagination.total,
+                'total_products': pagination['total'],
                 'std_code_products': 0
             }
         
         return jsonify({
             'success': True,
             'data': products,
-            'pagination': {
-                'page': pagination.page,
-                'per_page': pagination.per_page,
-                'total': pagination.total,
-                'pages': pagination.pages,
-                'has_prev': pagination.has_prev,
-                'has_next': pagination.has_next
-            },
+            'pagination': pagination,
             'stats': stats
         })
         
@@ -433,6 +390,8 @@ def api_create():
         db.session.add(history)
         db.session.commit()
         
+        refresh_product_catalog()
+        
         current_app.logger.info(f"✅ 상품 등록 성공: {product.product_name} (ID: {product.id})")
         
         return jsonify({
@@ -551,6 +510,8 @@ def api_update(product_id):
             db.session.add(history)
             db.session.commit()
         
+        refresh_product_catalog()
+        
         current_app.logger.info(f"✅ 상품 수정 성공: {product.product_name} (ID: {product.id})")
         
         return jsonify({
@@ -818,6 +779,7 @@ def api_delete(product_id):
         product_name = product.product_name
         db.session.delete(product)
         db.session.commit()
+        refresh_product_catalog()
         
         current_app.logger.info(f"✅ 상품 삭제 성공: {product_name} (ID: {product_id})")
         
@@ -889,6 +851,7 @@ def api_create_product_model():
         
         db.session.add(product_detail)
         db.session.commit()
+        refresh_product_catalog()
         
         current_app.logger.info(f"✅ 제품모델 생성 성공: {product_detail.product_name} ({product_detail.std_div_prod_code})")
         
@@ -913,30 +876,8 @@ def api_list_product_models():
         
         current_company_id = session.get('current_company_id', 1)
         
-        # 제품모델 목록 조회 (최신순)
-        product_models = ProductDetail.query.order_by(ProductDetail.created_at.desc()).all()
-        
-        # 코드 정보와 함께 반환
-        models_data = []
-        for model in product_models:
-            model_dict = model.to_dict()
-            
-            # 색상 정보 추가
-            if model.color_code:
-                color = Code.query.filter_by(code=model.color_code).first()
-                model_dict['color_name'] = color.code_name if color else model.color_code
-            
-            # 구분타입 정보 추가
-            if model.div_type_code:
-                div_type = Code.query.filter_by(code=model.div_type_code).first()
-                model_dict['div_type_name'] = div_type.code_name if div_type else model.div_type_code
-            
-            # 타입 정보 추가
-            if model.prod_type_code:
-                type_code = Code.query.filter_by(code=model.prod_type_code).first()
-                model_dict['type_name'] = type_code.code_name if type_code else model.prod_type_code
-                
-            models_data.append(model_dict)
+        # 제품모델 목록 조회 (최신순, 코드명 포함)
+        models_data = product_catalog.list_models(db.session)
         
         return jsonify({
             'success': True,
@@ -955,30 +896,8 @@ def api_list_product_models_by_product(product_id):
         if not session.get('member_seq'):
             return jsonify({'success': False, 'message': '로그인이 필요합니다.'}), 401
         
-        # 제품모델 목록 조회 (특정 상품 기준)
-        product_models = ProductDetail.query.filter_by(product_id=product_id).order_by(ProductDetail.created_at.desc()).all()
-        
-        # 코드 정보와 함께 반환
-        models_data = []
-        for model in product_models:
-            model_dict = model.to_dict()
-            
-            # 색상 정보 추가
-            if model.color_code:
-                color = Code.query.filter_by(code=model.color_code).first()
-                model_dict['color_name'] = color.code_name if color else model.color_code
-            
-            # 구분타입 정보 추가
-            if model.div_type_code:
-                div_type = Code.query.filter_by(code=model.div_type_code).first()
-                model_dict['div_type_name'] = div_type.code_name if div_type else model.div_type_code
-            
-            # 타입 정보 추가
-            if model.prod_type_code:
-                type_code = Code.query.filter_by(code=model.prod_type_code).first()
-                model_dict['type_name'] = type_code.code_name if type_code else model.prod_type_code
-                
-            models_data.append(model_dict)
+        # 제품모델 목록 조회 (특정 상품 기준, 코드명 포함)
+        models_data = product_catalog.list_models(db.session, product_id=product_id)
         
         return jsonify({
             'success': True,
@@ -1008,6 +927,7 @@ def api_delete_product_model(model_id):
         
         db.session.delete(product_model)
         db.session.commit()
+        refresh_product_catalog()
         
         current_app.logger.info(f"✅ 제품모델 삭제 성공: {model_name} ({std_code})")
         
@@ -1331,97 +1251,86 @@ def api_get(product_id):
     try:
         current_company_id = session.get('current_company_id', 1)
         
-        # tbl_Product 기본 정보 조회
-        product = Product.query.filter_by(
-            id=product_id,
-            company_id=current_company_id
-        ).first()
+        # 상품 + 제품모델(tbl_Product_DTL) + 코드명을 카탈로그 뷰에서 한 번에 조회
+        catalog = product_catalog.get_product(db.session, product_id, current_company_id)
         
-        if not product:
+        if not catalog:
             return jsonify({'success': False, 'message': '상품을 찾을 수 없습니다.'}), 404
         
-        # tbl_Product_DTL에서 연결된 제품 모델들 조회 (product_id 기준)
-        product_details = ProductDetail.query.filter_by(
-            product_id=product_id
-        ).order_by(ProductDetail.id).all()
-        
         # 기본 상품 정보 (tbl_Product)
-        product_data = product.to_dict()
+        product_data = catalog['product']
+        product_row = catalog['row']
         
         # 제품 모델 정보 (tbl_Product_DTL - 색상별)
         product_models = []
-        for detail in product_details:
-            # 색상 코드 정보 조회 (code 기준)
+        for model in catalog['models']:
+            # 색상 코드 정보 (CR 그룹 기준)
             color_code = None
-            if detail.color_code:
-                # 색상 코드 3자리를 기준으로 CR 그룹에서 찾기 (company_id 제거)
-                color_codes = Code.get_codes_by_group_name('CR')
-                for code in color_codes:
-                    if code.code == detail.color_code:
-                        color_code = {
-                            'seq': code.seq,
-                            'code': code.code,
-                            'code_name': code.code_name
-                        }
-                        break
+            if model['color_code'] and model.get('color_code_seq'):
+                color_code = {
+                    'seq': model['color_code_seq'],
+                    'code': model['color_code'],
+                    'code_name': model['color_code_name']
+                }
             
             product_models.append({
-                'id': detail.id,  # seq 대신 id 사용
-                'std_div_prod_code': detail.std_div_prod_code,
-                'product_name': detail.product_name,
-                'color_code': detail.color_code,
+                'id': model['id'],  # seq 대신 id 사용
+                'std_div_prod_code': model['std_div_prod_code'],
+                'product_name': model['product_name'],
+                'color_code': model['color_code'],
                 'color_code_info': color_code,
-                'status': detail.status,
-                'use_yn': detail.use_yn,  # 직접 사용
-                'brand_code': detail.brand_code,
-                'div_type_code': detail.div_type_code,
-                'prod_group_code': detail.prod_group_code,
-                'prod_type_code': detail.prod_type_code,
-                'prod_code': detail.prod_code,
-                'prod_type2_code': detail.prod_type2_code,
-                'year_code': detail.year_code,
-                'additional_price': detail.additional_price,
-                'stock_quantity': detail.stock_quantity,
+                'status': model['status'],
+                'use_yn': model['use_yn'],  # 직접 사용
+                'brand_code': model['brand_code'],
+                'div_type_code': model['div_type_code'],
+                'prod_group_code': model['prod_group_code'],
+                'prod_type_code': model['prod_type_code'],
+                'prod_code': model['prod_code'],
+                'prod_type2_code': model['prod_type2_code'],
+                'year_code': model['year_code'],
+                'additional_price': model['additional_price'],
+                'stock_quantity': model['stock_quantity'],
                 
                 # 🔥 새로운 필드들 추가
-                'douzone_code': detail.douzone_code,
-                'erpia_code': detail.erpia_code,
-                'official_cost': detail.official_cost,
-                'consumer_price': detail.consumer_price,
-                'operation_price': detail.operation_price,
-                'ans_value': detail.ans_value,
-                'detail_brand_code_seq': detail.detail_brand_code_seq,
-                'color_detail_code_seq': detail.color_detail_code_seq,
-                'product_division_code_seq': detail.product_division_code_seq,
-                'product_group_code_seq': detail.product_group_code_seq,
-                'item_code_seq': detail.item_code_seq,
-                'item_detail_code_seq': detail.item_detail_code_seq,
-                'product_type_category_code_seq': detail.product_type_category_code_seq
+                'douzone_code': model['douzone_code'],
+                'erpia_code': model['erpia_code'],
+                'official_cost': model['official_cost'],
+                'consumer_price': model['consumer_price'],
+                'operation_price': model['operation_price'],
+                'ans_value': model['ans_value'],
+                'detail_brand_code_seq': model['detail_brand_code_seq'],
+                'color_detail_code_seq': model['color_detail_code_seq'],
+                'product_division_code_seq': model['product_division_code_seq'],
+                'product_group_code_seq': model['product_group_code_seq'],
+                'item_code_seq': model['item_code_seq'],
+                'item_detail_code_seq': model['item_detail_code_seq'],
+                'product_type_category_code_seq': model['product_type_category_code_seq']
             })
         
+        # ERPia 상품 마스터 가격 (erpia_code 매핑, 1회 조회)
+        erpia_goods = goods_by_erpia_code(db.session, current_company_id,
+                                          [model['erpia_code'] for model in product_models])
+        for model in product_models:
+            model['erpia_goods'] = erpia_goods.get(model['erpia_code'])
+        
         # 선택된 코드 정보 (셀렉트박스 selected 처리용)
         selected_codes = {
-            'brand_code_seq': product.brand_code_seq,
-            'category_code_seq': product.category_code_seq,  # prod_group_code_seq와 매핑
-            'type_code_seq': product.type_code_seq,         # prod_type_code_seq와 매핑
-            'year_code_seq': product.year_code_seq,
-            'div_type_code_seq': product.div_type_code_seq,
+            'brand_code_seq': product_data['brand_code_seq'],
+            'category_code_seq': product_data['category_code_seq'],  # prod_group_code_seq와 매핑
+            'type_code_seq': product_data['type_code_seq'],         # prod_type_code_seq와 매핑
+            'year_code_seq': product_data['year_code_seq'],
+            'div_type_code_seq': product_data['div_type_code_seq'],
         }
         
-        # PRD 품목 코드 찾기 (category_code_seq로부터 역추적)
-        if product.category_code_seq:
-            category_code = Code.query.get(product.category_code_seq)
-            if category_code and category_code.parent_seq:
-                # 카테고리의 상위가 PRD 그룹인지 확인
-                parent_code = Code.query.get(category_code.parent_seq)
-                if parent_code and parent_code.code == 'PRD':
-                    selected_codes['prod_code_seq'] = product.category_code_seq
+        # PRD 품목 코드 (카테고리의 상위가 PRD 그룹인 경우)
+        if product_data['category_code_seq'] and product_row['category_parent_code'] == 'PRD':
+            selected_codes['prod_code_seq'] = product_data['category_code_seq']
         
         # 타입 코드 찾기 (type_code_seq로부터)
-        if product.type_code_seq:
-            selected_codes['prod_type_code_seq'] = product.type_code_seq
+        if product_data['type_code_seq']:
+            selected_codes['prod_type_code_seq'] = product_data['type_code_seq']
         
-        current_app.logger.info(f"✅ 상품 조회 완료: {product.product_name} (모델 {len(product_models)}개)")
+        current_app.logger.info(f"✅ 상품 조회 완료: {product_data['product_name']} (모델 {len(product_models)}개)")
         
         return jsonify({
             'success': True,
@@ -1448,62 +1357,32 @@ def api_excel_download():
         search_type = request.args.get('search_type', type=int)
         show_inactive = request.args.get('show_inactive', 'false') == 'true'
         
-        # 쿼리 빌드
-        query = Product.query.filter_by(company_id=current_company_id)
-        
-        if not show_inactive:
-            query = query.filter_by(is_active=True)
-        
-        # 검색 조건 적용
-        if search_name:
-            search_pattern = f'%{search_name}%'
-            query = query.filter(Product.product_name.ilike(search_pattern))
-        
-        if search_product:
-            query = query.filter_by(category_code_seq=search_product)  # 🔥 올바른 필드명 사용
-        
-        if search_type:
-            query = query.filter_by(type_code_seq=search_type)  # 🔥 올바른 필드명 사용
-        
-        # 데이터 조회 (제한: 최대 1000개)
-        products = query.limit(1000).all()
+        # 데이터 조회 (제한: 최대 1000개) - 코드명은 카탈로그 뷰에서 조인 완료
+        products = product_catalog.export_rows(
+            db.session, current_company_id, limit=1000,
+            search_name=search_name, search_product=search_product,
+            search_type=search_type, show_inactive=show_inactive
+        )
         
         # 엑셀 데이터 준비
         excel_data = []
         for product in products:
-            # 브랜드명 조회
-            brand_name = ''
-            if product.brand_code_seq:
-                brand_code = Code.query.get(product.brand_code_seq)
-                brand_name = brand_code.code_name if brand_code else ''
-            
-            # 품목명 조회
-            product_name = ''
-            if product.category_code_seq:  # 🔥 올바른 필드명 사용
-                prod_code = Code.query.get(product.category_code_seq)
-                product_name = prod_code.code_name if prod_code else ''
-            
-            # 타입명 조회
-            type_name = ''
-            if product.type_code_seq:  # 🔥 올바른 필드명 사용
-                type_code = Code.query.get(product.type_code_seq)
-                type_name = type_code.code_name if type_code else ''
-            
             # 상태 변환
-            status_text = '사용' if product.is_active else '미사용'
+            status_text = '사용' if product['is_active'] else '미사용'
             
             excel_data.append({
-                '상품명': product.product_name,
-                '브랜드': brand_name,
-                '품목': product_name,
-                '타입': type_name,
-                '가격': product.price or 0,
+                '상품명': product['product_name'],
+                '브랜드': product['brand_name'],
+                '품목': product['category_name'],
+                '타입': product['type_name'],
+                '가격': product['price'] or 0,
                 '상태': status_text,
-                '등록일': product.created_at.strftime('%Y-%m-%d') if product.created_at else '',
-                '수정일': product.updated_at.strftime('%Y-%m-%d') if product.updated_at else ''
+                '등록일': product['created_at'][:10] if product['created_at'] else '',
+                '수정일': product['updated_at'][:10] if product['updated_at'] else ''
             })
         
-        # 엑셀 파일 생성
+        # 엑셀 파일 생성 (pandas 는 엑셀 처리 때만 로드 - 앱 기동 시간 단축)
+        import pandas as pd
         df = pd.DataFrame(excel_data)
         
         # BytesIO로 메모리에 엑셀 파일 생성
@@ -1555,6 +1434,7 @@ def api_excel_upload():
             return jsonify({'success': False, 'message': '엑셀 파일(.xlsx, .xls)만 업로드 가능합니다.'}), 400
         
         # 엑셀 파일 읽기
+        import pandas as pd
         df = pd.read_excel(file)
         
         processed = 0
@@ -1646,6 +1526,7 @@ def api_excel_upload():
         
         # 변경사항 커밋
         db.session.commit()
+        refresh_product_catalog()
         
         current_app.logger.info(f"✅ 엑셀 업로드 완료: 처리 {processed}개, 오류 {errors}개")
         
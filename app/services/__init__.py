@@ -8,5 +8,7 @@
 from .erpia_client import ErpiaApiClient
 from .batch_scheduler import BatchScheduler
 from .gift_classifier import GiftClassifier
+from .permission_service import PermissionService
+from .batch_job_runner import BatchJobRunner
 
-__all__ = ['ErpiaApiClient', 'BatchScheduler', 'GiftClassifier'] 
\ No newline at end of file
+__all__ = ['ErpiaApiClient', 'BatchScheduler', 'GiftClassifier', 'PermissionService', 'BatchJobRunner'] 
\ No newline at end of file
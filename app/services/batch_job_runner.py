@@ -0,0 +1,461 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+배치 작업 러너 (DB 큐)
+- 수동 ERPia 배치 / 스케줄 작업 즉시 실행을 HTTP 요청 밖에서 처리
+- erpia_batch_logs 를 큐로 사용 (QUEUED 행을 FOR UPDATE SKIP LOCKED 로 선점)
+- 단계/페이지별 진행률을 execution_details(JSON)에 기록 → 상태 API 에서 ETA 계산
+- 협조적 취소 (페이지마다 상태 확인), 완료 단계 건너뛰는 재개
+"""
+
+import json
+import logging
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import text
+
+from app.services.erpia_client import ErpiaFetchCancelled
+from app.services.leader_election import advisory_lock, is_locked
+
+logger = logging.getLogger(__name__)
+
+# 작업 상태
+STATUS_QUEUED = 'QUEUED'
+STATUS_RUNNING = 'RUNNING'
+STATUS_CANCELLING = 'CANCELLING'
+STATUS_SUCCESS = 'SUCCESS'
+STATUS_FAILED = 'FAILED'
+STATUS_CANCELLED = 'CANCELLED'
+
+ACTIVE_STATUSES = (STATUS_QUEUED, STATUS_RUNNING, STATUS_CANCELLING)
+RESUMABLE_STATUSES = (STATUS_FAILED, STATUS_CANCELLED)
+
+# 작업 종류 (erpia_batch_logs.batch_type)
+JOB_MANUAL = 'manual'
+JOB_SCHEDULED = 'scheduled_job'
+
+# 수동 배치 단계 (단계명, batch_options 키, ErpiaBatchService 단계)
+MANUAL_STEPS = [
+    ('customers', 'include_customers', 'customers'),
+    ('sales', 'include_sales', 'sales'),
+    ('products', 'include_products', 'goods'),
+]
+
+
+def _job_lock_name(job_id: int) -> str:
+    return f"batch_job:{job_id}"
+
+
+class JobProgress:
+    """
+    실행 중 작업의 진행률 기록기
+
+    - 기록은 별도 커넥션으로 즉시 커밋 (작업 트랜잭션과 분리)
+    - 기록할 때마다 상태를 돌려받아 CANCELLING 이면 ErpiaFetchCancelled 발생
+    """
+
+    def __init__(self, engine, job_id: int, details: Dict[str, Any]):
+        self.engine = engine
+        self.job_id = job_id
+        self.details = details
+        self.details.setdefault('steps', {})
+        self.details.setdefault('completed_steps', [])
+        self.current_step = None
+
+    @property
+    def total_pages(self) -> int:
+        return sum(step.get('pages', 0) for step in self.details['steps'].values())
+
+    def is_completed(self, step: str) -> bool:
+        return step in self.details['completed_steps']
+
+    def flush(self):
+        with self.engine.begin() as conn:
+            status = conn.execute(text("""
+                UPDATE erpia_batch_logs
+                SET execution_details = :details, total_pages = :pages
+                WHERE id = :id
+                RETURNING status
+            """), {
+                'details': json.dumps(self.details, ensure_ascii=False, default=str),
+                'pages': self.total_pages,
+                'id': self.job_id,
+            }).scalar()
+        if status == STATUS_CANCELLING:
+            raise ErpiaFetchCancelled(f"작업 {self.job_id} 취소 요청")
+
+    def begin_step(self, step: str):
+        self.current_step = step
+        self.details['current_step'] = step
+        self.details['steps'][step] = {
+            'status': STATUS_RUNNING,
+            'pages': 0,
+            'rows': 0,
+            'started_at': datetime.utcnow().isoformat(),
+        }
+        self.flush()
+
+    def on_page(self, mode: str, page: int, rows: int, **timing):
+        """ErpiaBatchService.page_listener"""
+        step = self.details['steps'].get(self.current_step)
+        if step is None:
+            return
+        step['pages'] += 1
+        step['rows'] += rows
+        step['last_page'] = page
+        step['mode'] = mode
+        self.flush()
+
+    def end_step(self, step: str, **result):
+        info = self.details['steps'][step]
+        started_at = datetime.fromisoformat(info['started_at'])
+        info.update(result)
+        info['status'] = STATUS_SUCCESS
+        info['finished_at'] = datetime.utcnow().isoformat()
+        info['elapsed_seconds'] = round((datetime.utcnow() - started_at).total_seconds(), 2)
+        if step not in self.details['completed_steps']:
+            self.details['completed_steps'].append(step)
+        self.details['current_step'] = None
+        self.current_step = None
+        self.flush()
+
+
+class BatchJobRunner:
+    """erpia_batch_logs 기반 백그라운드 작업 러너"""
+
+    def __init__(self):
+        self.app = None
+        self.poll_interval = 2
+        self._threads: List[threading.Thread] = []
+        self._wakeup = threading.Event()
+        self._stop_event = threading.Event()
+
+    def init_app(self, app):
+        """
+        웹 역할(BATCH_ROLE=web)이면 등록/조회만, 실행 스레드는 워커에서
+        BATCH_DEFER_START(gunicorn preload)면 post_fork 에서 start_background()
+        """
+        self.app = app
+        self.poll_interval = app.config.get('BATCH_JOB_POLL_INTERVAL', 2)
+        app.extensions['batch_job_runner'] = self
+
+        if not app.config.get('BATCH_DEFER_START'):
+            self.start_background()
+
+    def start_background(self):
+        if self.app.config.get('BATCH_ROLE', 'embedded') != 'web':
+            self.start(self.app.config.get('BATCH_JOB_RUNNER_THREADS', 1))
+
+    @staticmethod
+    def ensure_indexes(session):
+        """대기/실행 중 작업 조회용 부분 인덱스 (DB 부트스트랩 schema 단계에서 생성)"""
+        session.execute(text("""
+            CREATE INDEX IF NOT EXISTS idx_erpia_batch_logs_active
+            ON erpia_batch_logs (id)
+            WHERE status IN ('QUEUED', 'RUNNING', 'CANCELLING')
+        """))
+        session.commit()
+
+    # ------------------------------------------------------------------
+    # 실행 스레드
+    # ------------------------------------------------------------------
+    def start(self, threads: int = 1):
+        if any(t.is_alive() for t in self._threads):
+            return
+        self._stop_event.clear()
+        with self.app.app_context():
+            self.recover_stale()
+        self._threads = [
+            threading.Thread(target=self._loop, name=f"batch-job-runner-{i}", daemon=True)
+            for i in range(max(1, int(threads)))
+        ]
+        for thread in self._threads:
+            thread.start()
+        logger.info(f"🚀 배치 작업 러너 시작 (스레드 {len(self._threads)}개)")
+
+    def shutdown(self, timeout: Optional[float] = None) -> bool:
+        """
+        실행 스레드 중지 요청 후 실행 중 작업이 끝날 때까지 대기 (timeout 초, None 이면 제한 없음)
+
+        시간 안에 끝나지 않은 작업은 프로세스 종료 후 recover_stale() 이 FAILED(재개 가능) 처리
+        → 모든 스레드가 끝났으면 True
+        """
+        self._stop_event.set()
+        self._wakeup.set()
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        for thread in self._threads:
+            thread.join(None if deadline is None else max(0.0, deadline - time.monotonic()))
+        running = [t.name for t in self._threads if t.is_alive()]
+        if running:
+            logger.warning(f"⚠️ 배치 작업 러너 종료 대기 시간 초과: {', '.join(running)}")
+        return not running
+
+    def _loop(self):
+        while not self._stop_event.is_set():
+            try:
+                with self.app.app_context():
+                    job_id = self._claim_next()
+                    if job_id:
+                        self._run(job_id)
+                        continue
+            except Exception as e:
+                logger.error(f"❌ 배치 작업 러너 오류: {e}")
+            self._wakeup.wait(self.poll_interval)
+            self._wakeup.clear()
+
+    def recover_stale(self) -> int:
+        """
+        실행 프로세스가 죽은 RUNNING 작업 → FAILED (재개 가능)
+
+        실행 중인 작업은 작업별 advisory lock 을 보유하므로 락이 없으면 중단된 작업
+        """
+        from app.common.models import db, ErpiaBatchLog
+        stale = 0
+        for log in ErpiaBatchLog.query.filter(
+            ErpiaBatchLog.status.in_([STATUS_RUNNING, STATUS_CANCELLING])
+        ).all():
+            if not is_locked(db.engine, _job_lock_name(log.id)):
+                log.status = STATUS_FAILED if log.status == STATUS_RUNNING else STATUS_CANCELLED
+                log.end_time = datetime.utcnow()
+                log.error_message = '실행 프로세스가 종료되어 중단되었습니다. (재개 가능)'
+                stale += 1
+        db.session.commit()
+        if stale:
+            logger.warning(f"⚠️ 중단된 배치 작업 {stale}건 정리")
+        return stale
+
+    def _claim_next(self) -> Optional[int]:
+        """가장 오래된 QUEUED 작업 선점"""
+        from app.common.models import db
+        job_id = db.session.execute(text("""
+            UPDATE erpia_batch_logs
+            SET status = 'RUNNING', start_time = (now() AT TIME ZONE 'utc'), end_time = NULL, error_message = NULL
+            WHERE id = (
+                SELECT id FROM erpia_batch_logs
+                WHERE status = 'QUEUED'
+                ORDER BY id
+                FOR UPDATE SKIP LOCKED
+                LIMIT 1
+            )
+            RETURNING id
+        """)).scalar()
+        db.session.commit()
+        return job_id
+
+    def _run(self, job_id: int):
+        from app.common.models import db, ErpiaBatchLog
+
+        with advisory_lock(db.engine, _job_lock_name(job_id)):
+            log = db.session.get(ErpiaBatchLog, job_id)
+            details = json.loads(log.execution_details) if log.execution_details else {}
+            progress = JobProgress(db.engine, job_id, details)
+            params = details.get('params', {})
+            logger.info(f"🚀 배치 작업 실행: #{job_id} ({log.batch_type}, 회사 {log.company_id})")
+
+            try:
+                if log.batch_type == JOB_SCHEDULED:
+                    result = self._run_scheduled(progress, params)
+                else:
+                    result = self._run_manual(progress, log.company_id, params)
+                self._finish(job_id, STATUS_SUCCESS, progress, result=result)
+                logger.info(f"🎉 배치 작업 완료: #{job_id}")
+            except ErpiaFetchCancelled:
+                db.session.rollback()
+                self._finish(job_id, STATUS_CANCELLED, progress)
+                logger.warning(f"⏹️ 배치 작업 취소됨: #{job_id}")
+            except Exception as e:
+                db.session.rollback()
+                self._finish(job_id, STATUS_FAILED, progress, error=str(e))
+                logger.error(f"❌ 배치 작업 실패: #{job_id} - {e}")
+
+    def _finish(self, job_id: int, status: str, progress: JobProgress,
+                result: Dict[str, Any] = None, error: str = None):
+        from app.common.models import db, ErpiaBatchLog
+        log = db.session.get(ErpiaBatchLog, job_id)
+        db.session.refresh(log)
+        if progress.current_step:
+            progress.details['steps'][progress.current_step]['status'] = status
+        progress.details['current_step'] = None
+        if result:
+            progress.details['result'] = result
+            log.processed_orders = result.get('processed_orders', log.processed_orders)
+            log.processed_products = result.get('processed_products', log.processed_products)
+            log.gift_products = result.get('gift_products', log.gift_products)
+            log.error_count = result.get('error_count', log.error_count)
+        log.status = status
+        log.end_time = datetime.utcnow()
+        log.total_pages = progress.total_pages
+        log.error_message = error
+        log.execution_details = json.dumps(progress.details, ensure_ascii=False, default=str)
+        db.session.commit()
+
+    # ------------------------------------------------------------------
+    # 작업 종류별 실행
+    # ------------------------------------------------------------------
+    def _run_manual(self, progress: JobProgress, company_id: int, params: Dict[str, Any]) -> Dict[str, Any]:
+        """수동 ERPia 배치 (매장정보 → 매출 → 상품), 완료된 단계는 건너뜀"""
+        from app.common.models import db
+        from app.services.erpia_batch_service import ErpiaBatchService
+
+        start_date = params['start_date']
+        end_date = params['end_date']
+        options = params.get('batch_options') or {}
+        member_id = params.get('member_id', 'admin')
+
+        service = ErpiaBatchService(company_id, batch_log_id=progress.job_id, member_id=member_id)
+        service.page_listener = progress.on_page
+        result = {'processed_orders': 0, 'processed_products': 0, 'gift_products': 0, 'error_count': 0}
+
+        # 같은 회사 수집 작업(스케줄 DAILY_COLLECTION)과 동시 실행 방지
+        with advisory_lock(db.engine, f"DAILY_COLLECTION:{company_id}") as acquired:
+            if not acquired:
+                raise RuntimeError('같은 회사의 ERPia 수집 작업이 실행 중입니다. 잠시 후 재개해주세요.')
+
+            for step, option_key, service_step in MANUAL_STEPS:
+                if not options.get(option_key, True) or progress.is_completed(step):
+                    continue
+
+                progress.begin_step(step)
+                step_result = service.run_step(service_step, start_date, end_date)
+                if step == 'customers':
+                    result['processed_orders'] += step_result['saved_to_db'] + step_result['updated_in_db']
+                    result['error_count'] += step_result['error_count']
+                elif step == 'sales':
+                    result['processed_orders'] += step_result.get('data_count', 0)
+                    result['processed_products'] += step_result.get('product_count', 0)
+                    result['gift_products'] += step_result.get('gift_count', 0)
+                progress.end_step(step, **{k: v for k, v in step_result.items() if k != 'pages'})
+
+        return result
+
+    def _run_scheduled(self, progress: JobProgress, params: Dict[str, Any]) -> Dict[str, Any]:
+        """스케줄러 등록 작업 즉시 실행 (작업 락은 execute_job 에서 처리)"""
+        from app.services.batch_scheduler import batch_scheduler
+
+        job_id = params['job_id']
+        progress.begin_step('job')
+        if not batch_scheduler.run_job_now(job_id):
+            raise RuntimeError(f'작업 {job_id} 실행 실패 (이미 실행 중이거나 작업 없음)')
+        progress.end_step('job', job_id=job_id)
+        return {}
+
+    # ------------------------------------------------------------------
+    # 등록 / 조회 / 취소 / 재개
+    # ------------------------------------------------------------------
+    def _expected_pages(self, company_id: int, batch_type: str, days: int) -> Optional[int]:
+        """최근 성공 작업의 일당 페이지 수로 예상 페이지 수 추정"""
+        from app.common.models import ErpiaBatchLog
+        last = ErpiaBatchLog.query.filter(
+            ErpiaBatchLog.company_id == company_id,
+            ErpiaBatchLog.batch_type == batch_type,
+            ErpiaBatchLog.status == STATUS_SUCCESS,
+            ErpiaBatchLog.total_pages > 0
+        ).order_by(ErpiaBatchLog.id.desc()).first()
+        if not last or not last.execution_details:
+            return None
+        last_days = json.loads(last.execution_details).get('params', {}).get('days') or 1
+        return max(1, round(last.total_pages * days / last_days))
+
+    def submit(self, company_id: int, batch_type: str, params: Dict[str, Any],
+               admin_code: str = None, date_range: str = None) -> int:
+        """작업 등록 → 작업 ID (erpia_batch_logs.id)"""
+        from app.common.models import db, ErpiaBatchLog
+
+        details = {
+            'params': params,
+            'steps': {},
+            'completed_steps': [],
+            'queued_at': datetime.utcnow().isoformat(),
+        }
+        if params.get('days'):
+            details['expected_pages'] = self._expected_pages(company_id, batch_type, params['days'])
+
+        log = ErpiaBatchLog(
+            company_id=company_id,
+            admin_code=admin_code,
+            batch_type=batch_type,
+            start_time=datetime.utcnow(),
+            status=STATUS_QUEUED,
+            date_range=date_range,
+            execution_details=json.dumps(details, ensure_ascii=False, default=str)
+        )
+        db.session.add(log)
+        db.session.commit()
+
+        self._wakeup.set()
+        logger.info(f"📥 배치 작업 등록: #{log.id} ({batch_type}, 회사 {company_id})")
+        return log.id
+
+    def get_status(self, job_id: int) -> Optional[Dict[str, Any]]:
+        """작업 상태 + 단계별 진행률 + ETA"""
+        from app.common.models import db, ErpiaBatchLog
+        log = db.session.get(ErpiaBatchLog, job_id)
+        if not log:
+            return None
+
+        details = json.loads(log.execution_details) if log.execution_details else {}
+        steps = details.get('steps', {})
+        pages_done = sum(step.get('pages', 0) for step in steps.values())
+        rows_done = sum(step.get('rows', 0) for step in steps.values())
+
+        elapsed = None
+        eta_seconds = None
+        if log.start_time and log.status != STATUS_QUEUED:
+            elapsed = ((log.end_time or datetime.utcnow()) - log.start_time).total_seconds()
+            expected = details.get('expected_pages')
+            if log.status == STATUS_RUNNING and expected and pages_done:
+                eta_seconds = max(0, round((expected - pages_done) * elapsed / pages_done))
+
+        return {
+            'job_id': log.id,
+            'company_id': log.company_id,
+            'batch_type': log.batch_type,
+            'status': log.status,
+            'date_range': log.date_range,
+            'current_step': details.get('current_step'),
+            'completed_steps': details.get('completed_steps', []),
+            'steps': steps,
+            'pages': pages_done,
+            'rows': rows_done,
+            'expected_pages': details.get('expected_pages'),
+            'elapsed_seconds': round(elapsed, 1) if elapsed is not None else None,
+            'eta_seconds': eta_seconds,
+            'result': details.get('result'),
+            'error_message': log.error_message,
+            'start_time': log.start_time.isoformat() if log.start_time else None,
+            'end_time': log.end_time.isoformat() if log.end_time else None,
+        }
+
+    def cancel(self, job_id: int) -> Optional[str]:
+        """취소 요청 (대기 중이면 즉시 취소, 실행 중이면 다음 페이지에서 중단) → 변경된 상태"""
+        from app.common.models import db
+        status = db.session.execute(text("""
+            UPDATE erpia_batch_logs
+            SET status = CASE WHEN status = 'QUEUED' THEN 'CANCELLED' ELSE 'CANCELLING' END,
+                end_time = CASE WHEN status = 'QUEUED' THEN (now() AT TIME ZONE 'utc') ELSE end_time END
+            WHERE id = :id AND status IN ('QUEUED', 'RUNNING')
+            RETURNING status
+        """), {'id': job_id}).scalar()
+        db.session.commit()
+        return status
+
+    def resume(self, job_id: int) -> bool:
+        """실패/취소된 작업 재등록 (완료된 단계는 건너뜀)"""
+        from app.common.models import db
+        resumed = db.session.execute(text("""
+            UPDATE erpia_batch_logs
+            SET status = 'QUEUED', end_time = NULL, error_message = NULL
+            WHERE id = :id AND status IN ('FAILED', 'CANCELLED')
+            RETURNING id
+        """), {'id': job_id}).scalar()
+        db.session.commit()
+        if resumed:
+            self._wakeup.set()
+        return bool(resumed)
+
+
+# 전역 인스턴스
+batch_job_runner = BatchJobRunner()
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ERPia 배치 계측
+- 페이지별: API 응답 시간, 파싱 시간, 건수, 응답 크기, 재시도
+- 단계별: 페이지 수, 건수, DB 저장 시간, 전체 소요 시간
+- erpia_batch_metrics 에 일괄 INSERT (배치 로그와 연결)
+- 배치 대시보드 통계 집계
+"""
+
+import logging
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import text
+
+from app.common.metrics import count_batch_rows
+
+logger = logging.getLogger(__name__)
+
+# 단계 → ERPia API 모드
+STEP_MODES = {
+    'customers': 'cust',
+    'stock': 'jegoAll',
+    'goods': 'goods',
+    'sales': 'jumun',
+}
+
+
+class BatchMetricsRecorder:
+    """배치 1회 실행의 단계/페이지 계측 기록기"""
+
+    def __init__(self, company_id: int, admin_code: str = None, batch_log_id: Optional[int] = None):
+        self.company_id = company_id
+        self.admin_code = admin_code
+        self.batch_log_id = batch_log_id
+        self.current_step = None
+        self._rows: List[Dict[str, Any]] = []
+        self._step: Dict[str, Any] = {}
+
+    def _base(self, kind: str, step: str, mode: str) -> Dict[str, Any]:
+        return {
+            'batch_log_id': self.batch_log_id,
+            'company_id': self.company_id,
+            'admin_code': self.admin_code,
+            'kind': kind,
+            'step': step,
+            'mode': mode,
+            'page': None,
+            'pages': 0,
+            'rows': 0,
+            'response_bytes': 0,
+            'retries': 0,
+            'fetch_ms': 0.0,
+            'parse_ms': 0.0,
+            'db_ms': 0.0,
+            'total_ms': 0.0,
+            'status': 'SUCCESS',
+            'created_at': datetime.utcnow(),
+        }
+
+    def begin_step(self, step: str):
+        self.current_step = step
+        self._step = self._base('step', step, STEP_MODES.get(step))
+        self._step['_started'] = time.perf_counter()
+
+    def on_page(self, mode: str, page: int, rows: int, fetch_ms: float = 0, parse_ms: float = 0,
+                bytes: int = 0, retries: int = 0):
+        """ErpiaApiClient.page_callback"""
+        row = self._base('page', self.current_step, mode)
+        row.update(page=page, pages=1, rows=rows, response_bytes=bytes, retries=retries,
+                   fetch_ms=round(fetch_ms, 2), parse_ms=round(parse_ms, 2),
+                   total_ms=round(fetch_ms + parse_ms, 2))
+        self._rows.append(row)
+        count_batch_rows(self.company_id, mode, rows)
+
+        if self._step:
+            self._step['mode'] = mode
+            self._step['pages'] += 1
+            self._step['rows'] += rows
+            self._step['response_bytes'] += bytes
+            self._step['retries'] += retries
+            self._step['fetch_ms'] += fetch_ms
+            self._step['parse_ms'] += parse_ms
+
+    @contextmanager
+    def db_write(self):
+        """단계 내 DB 저장 구간 측정"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            if self._step:
+                self._step['db_ms'] += (time.perf_counter() - started) * 1000
+
+    def end_step(self, status: str = 'SUCCESS') -> Dict[str, Any]:
+        """단계 행 확정 + 저장 → 단계 요약"""
+        step = self._step
+        if not step:
+            return {}
+        step['total_ms'] = (time.perf_counter() - step.pop('_started')) * 1000
+        step['status'] = status
+        for key in ('fetch_ms', 'parse_ms', 'db_ms', 'total_ms'):
+            step[key] = round(step[key], 2)
+        self._rows.append(step)
+        self._step = {}
+        self.current_step = None
+        self.flush()
+        return step
+
+    def flush(self):
+        """버퍼 일괄 INSERT (별도 커넥션, 실패해도 배치는 계속)"""
+        if not self._rows:
+            return
+        rows, self._rows = self._rows, []
+        try:
+            from app.common.models import db, ErpiaBatchMetric
+            with db.engine.begin() as conn:
+                conn.execute(ErpiaBatchMetric.__table__.insert(), rows)
+        except Exception as e:
+            logger.warning(f"⚠️ 배치 계측 저장 실패 ({len(rows)}행): {e}")
+
+
+def dashboard_stats(session, days: int = 7, company_id: Optional[int] = None) -> Dict[str, Any]:
+    """배치 대시보드 통계 (실행 결과: erpia_batch_logs, 처리량: erpia_batch_metrics)"""
+    since = datetime.utcnow() - timedelta(days=days)
+    params = {'since': since, 'company_id': company_id}
+    company_filter = "AND company_id = :company_id" if company_id else ""
+
+    execution = session.execute(text(f"""
+        SELECT COUNT(*) AS total,
+               COUNT(*) FILTER (WHERE status = 'SUCCESS') AS successful,
+               COUNT(*) FILTER (WHERE status = 'FAILED') AS failed
+        FROM erpia_batch_logs
+        WHERE start_time >= :since {company_filter}
+    """), params).mappings().one()
+
+    daily_stats = {}
+    for row in session.execute(text(f"""
+        SELECT to_char(start_time, 'YYYY-MM-DD') AS day,
+               COUNT(*) FILTER (WHERE status = 'SUCCESS') AS success,
+               COUNT(*) FILTER (WHERE status = 'FAILED') AS failed
+        FROM erpia_batch_logs
+        WHERE start_time >= :since {company_filter}
+        GROUP BY 1
+        ORDER BY 1
+    """), params).mappings():
+        daily_stats[row['day']] = {'success': row['success'], 'failed': row['failed']}
+
+    throughput = [
+        {
+            'company_id': row['company_id'],
+            'admin_code': row['admin_code'],
+            'mode': row['mode'],
+            'pages': row['pages'],
+            'rows': row['rows'],
+            'bytes': row['bytes'],
+            'retries': row['retries'],
+            'avg_fetch_ms': float(row['avg_fetch_ms'] or 0),
+            'p95_fetch_ms': float(row['p95_fetch_ms'] or 0),
+            'avg_parse_ms': float(row['avg_parse_ms'] or 0),
+            'rows_per_second': float(row['rows_per_second'] or 0),
+        }
+        for row in session.execute(text(f"""
+            SELECT company_id, MAX(admin_code) AS admin_code, mode,
+                   COUNT(*) AS pages,
+                   COALESCE(SUM(rows), 0) AS rows,
+                   COALESCE(SUM(response_bytes), 0) AS bytes,
+                   COALESCE(SUM(retries), 0) AS retries,
+                   ROUND(AVG(fetch_ms)::numeric, 1) AS avg_fetch_ms,
+                   ROUND(percentile_cont(0.95) WITHIN GROUP (ORDER BY fetch_ms)::numeric, 1) AS p95_fetch_ms,
+                   ROUND(AVG(parse_ms)::numeric, 1) AS avg_parse_ms,
+                   ROUND((SUM(rows) / NULLIF(SUM(total_ms), 0) * 1000)::numeric, 1) AS rows_per_second
+            FROM erpia_batch_metrics
+            WHERE kind = 'page' AND created_at >= :since {company_filter}
+            GROUP BY company_id, mode
+            ORDER BY company_id, mode
+        """), params).mappings()
+    ]
+
+    steps = [
+        {
+            'company_id': row['company_id'],
+            'step': row['step'],
+            'runs': row['runs'],
+            'avg_total_ms': float(row['avg_total_ms'] or 0),
+            'avg_db_ms': float(row['avg_db_ms'] or 0),
+            'failed': row['failed'],
+        }
+        for row in session.execute(text(f"""
+            SELECT company_id, step,
+                   COUNT(*) AS runs,
+                   ROUND(AVG(total_ms)::numeric, 1) AS avg_total_ms,
+                   ROUND(AVG(db_ms)::numeric, 1) AS avg_db_ms,
+                   COUNT(*) FILTER (WHERE status <> 'SUCCESS') AS failed
+            FROM erpia_batch_metrics
+            WHERE kind = 'step' AND created_at >= :since {company_filter}
+            GROUP BY company_id, step
+            ORDER BY company_id, step
+        """), params).mappings()
+    ]
+
+    total = execution['total']
+    return {
+        'execution_stats': {
+            'total': total,
+            'successful': execution['successful'],
+            'failed': execution['failed'],
+            'success_rate': execution['successful'] / total if total > 0 else 0,
+        },
+        'daily_stats': daily_stats,
+        'throughput': throughput,
+        'steps': steps,
+    }
@@ -9,6 +9,7 @@ from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.jobstores.sqlalchemy import SQLAlchemyJobStore
 from apscheduler.executors.pool import ThreadPoolExecutor
 from apscheduler.events import EVENT_JOB_EXECUTED, EVENT_JOB_ERROR
+from apscheduler.schedulers.base import STATE_STOPPED
 import logging
 import traceback
 from datetime import datetime, timedelta
@@ -16,20 +17,31 @@ from typing import Dict, List, Optional, Any
 from dataclasses import dataclass
 import pytz
 import json
+import threading
 from flask import current_app
 
 from .erpia_client import ErpiaApiClient
 from .gift_classifier import GiftClassifier
+from .leader_election import LeaderElector, advisory_lock
 
 # 로깅 설정
 logger = logging.getLogger(__name__)
 
+# 스케줄러 실행 역할
+ROLE_EMBEDDED = 'embedded'  # 웹 프로세스 안에서 스케줄러 실행 (기존 방식)
+ROLE_WEB = 'web'            # 웹은 작업 등록/조회만, 실행은 워커에 명령 전달
+ROLE_WORKER = 'worker'      # 전용 배치 워커 프로세스 (worker.py)
+
+# 웹 → 워커 명령 큐 / 워커 상태 (Redis queue DB)
+COMMAND_QUEUE_KEY = 'batch:commands'
+WORKER_HEARTBEAT_KEY = 'batch:worker:leader'
+
 @dataclass
 class BatchJobConfig:
     """배치 작업 설정"""
     job_id: str
     name: str
-    job_type: str  # DAILY_COLLECTION, CUSTOMER_SYNC, GIFT_CLASSIFY, REPORT_GENERATE
+    job_type: str  # DAILY_COLLECTION, CUSTOMER_SYNC, GIFT_CLASSIFY, REPORT_GENERATE, DATA_CLEANUP, PARTITION_MAINTENANCE
     company_id: int
     enabled: bool = True
     schedule_type: str = "cron"  # cron, interval
@@ -75,16 +87,33 @@ class BatchScheduler:
         self.scheduler = None
         self.erpia_clients = {}  # 회사별 ERPia 클라이언트 캐시
         self.gift_classifier = None
+        self.role = ROLE_EMBEDDED
         self.is_running = False
+        self.leader = None  # 리더 선출기 (프로세스 중 하나만 스케줄러 실행)
+        self._command_thread = None
+        self._stop_event = threading.Event()
         
         if app:
             self.init_app(app)
     
+    @property
+    def is_running(self) -> bool:
+        """스케줄러 실행 여부 (웹 역할이면 워커 하트비트 기준)"""
+        if self.role == ROLE_WEB:
+            heartbeat = self.get_worker_heartbeat()
+            return bool(heartbeat and heartbeat.get('running'))
+        return self._running
+    
+    @is_running.setter
+    def is_running(self, value: bool):
+        self._running = value
+    
     def init_app(self, app):
         """Flask 앱과 스케줄러 초기화"""
         try:
             self.app = app
             self.app.scheduler = self
+            self.role = app.config.get('BATCH_ROLE', ROLE_EMBEDDED)
             
             # APScheduler BackgroundScheduler 인스턴스 생성
             # 개발 환경에서는 메모리 기반 jobstore 사용 (안정성)
@@ -101,8 +130,8 @@ class BatchScheduler:
                 'default': ThreadPoolExecutor(20),
             }
             job_defaults = {
-                'coalesce': False,
-                'max_instances': 3
+                'coalesce': True,     # 밀린 실행은 1회로 합침
+                'max_instances': 1    # 같은 작업 동시 실행 금지 (프로세스 간은 advisory lock)
             }
             
             self.scheduler = BackgroundScheduler(
@@ -116,48 +145,263 @@ class BatchScheduler:
             self.scheduler.add_listener(self._job_executed_listener, EVENT_JOB_EXECUTED)
             self.scheduler.add_listener(self._job_error_listener, EVENT_JOB_ERROR)
             
+            # 리더 선출 (PostgreSQL advisory lock) - 워커 여러 개여도 스케줄러는 하나만
+            if self.role != ROLE_WEB and app.config.get('SCHEDULER_LEADER_ELECTION', True):
+                from app.common.models import db
+                with app.app_context():
+                    engine = db.engine
+                self.leader = LeaderElector(
+                    engine, 'batch_scheduler',
+                    interval=app.config.get('SCHEDULER_LEADER_INTERVAL', 15),
+                    on_elected=self._on_elected,
+                    on_demoted=self._on_demoted
+                )
+            
             # 배치 작업용 서비스 초기화 (회사별 동적 생성으로 변경)
             # self.gift_classifier = GiftClassifier()  # 회사별로 동적 생성
             
             print("🔧 배치 스케줄러 초기화 완료")
             
+            if app.config.get('BATCH_DEFER_START'):
+                # gunicorn preload: 마스터에서는 스레드/커넥션을 만들지 않고 post_fork 에서 start_background()
+                print("💡 배치 스케줄러 시작 보류 (워커 fork 이후 시작)")
+                return
+            self.start_background()
+                
+        except Exception as e:
+            print(f"⚠️ 배치 스케줄러 초기화 실패: {e}")
+            import traceback
+            print(f"   상세 오류: {traceback.format_exc()}")
+            # 초기화 실패해도 앱은 계속 실행
+    
+    def start_background(self):
+        """역할별 실행 시작 (리더 선출 루프 / 명령 수신 / 웹 역할 jobstore)"""
+        app = self.app
+        try:
+            if self.role == ROLE_WEB:
+                # 웹 역할: 작업 실행 없이 jobstore 조회/등록만 (실행은 워커)
+                if app.config.get('ENV') != 'development':
+                    self.scheduler.start(paused=True)
+                print("💡 외부 배치 워커 모드: 웹은 작업 등록/조회만 수행합니다.")
+            elif self.role == ROLE_WORKER:
+                # 워커 역할: 개발 환경이어도 바로 리더 선출 후 실행
+                if self.leader:
+                    self.leader.start()
+                else:
+                    self.start()
+                self._start_command_consumer()
+                print("👷 배치 워커 모드: 리더 선출 후 스케줄러 실행")
             # 개발 환경에서는 수동 시작
-            if app.config.get('ENV') == 'development':
+            elif app.config.get('ENV') == 'development':
                 print("💡 개발 환경: 배치 스케줄러 수동 시작 모드")
                 print("   - /batch 페이지에서 수동으로 시작할 수 있습니다.")
+            elif self.leader:
+                # 리더로 선출된 프로세스에서만 시작, 리더 종료 시 자동 승계
+                self.leader.start()
+                print("👑 배치 스케줄러 리더 선출 대기 (advisory lock)")
             else:
                 self.start()
-                
         except Exception as e:
-            print(f"⚠️ 배치 스케줄러 초기화 실패: {e}")
+            print(f"⚠️ 배치 스케줄러 시작 실패: {e}")
             import traceback
             print(f"   상세 오류: {traceback.format_exc()}")
-            # 초기화 실패해도 앱은 계속 실행
     
     def start(self):
-        """스케줄러 시작"""
+        """스케줄러 시작 (리더 선출 사용 시 리더 락을 먼저 획득)"""
+        if self.role == ROLE_WEB:
+            return self.send_command('start')
         if not self.is_running:
+            if self.leader and not self.leader.try_acquire():
+                logger.warning("⚠️ 다른 프로세스가 스케줄러 리더입니다. 시작하지 않습니다.")
+                return False
             try:
-                self.scheduler.start()
+                if self.scheduler.state == STATE_STOPPED:
+                    self.scheduler.start()
+                else:
+                    self.scheduler.resume()
                 self.is_running = True
                 logger.info("🚀 배치 스케줄러 시작됨")
                 
                 # 기본 작업들 등록
-                self._register_default_jobs()
+                with self.app.app_context():
+                    self._register_default_jobs()
                 
             except Exception as e:
                 logger.error(f"❌ 스케줄러 시작 실패: {e}")
+                if self.leader:
+                    self.leader.release()
                 raise
+        return True
     
     def stop(self):
-        """스케줄러 중지"""
+        """
+        스케줄러 일시정지
+        
+        리더 락은 유지 → 다른 프로세스가 승계해서 다시 실행하지 않음
+        """
+        if self.role == ROLE_WEB:
+            return self.send_command('stop')
         if self.is_running and self.scheduler:
             try:
-                self.scheduler.shutdown(wait=False)
+                self.scheduler.pause()
                 self.is_running = False
                 logger.info("⏹️ 배치 스케줄러 중지됨")
             except Exception as e:
                 logger.error(f"❌ 스케줄러 중지 실패: {e}")
+        return True
+    
+    def shutdown(self, wait: bool = True):
+        """프로세스 종료 시 스케줄러 종료 + 리더 락 해제 (다른 프로세스가 승계)"""
+        if self.role == ROLE_WEB:
+            return self.send_command('stop')
+        self._stop_event.set()
+        if self.scheduler and self.scheduler.state != STATE_STOPPED:
+            try:
+                self.scheduler.shutdown(wait=wait)
+            except Exception as e:
+                logger.error(f"❌ 스케줄러 종료 실패: {e}")
+        self.is_running = False
+        if self.leader:
+            self.leader.shutdown()
+        self._clear_worker_heartbeat()
+        logger.info("⏹️ 배치 스케줄러 종료됨")
+        return True
+    
+    def _on_elected(self):
+        """리더 선출 시 스케줄러 시작"""
+        try:
+            self.start()
+        except Exception as e:
+            logger.error(f"❌ 리더 스케줄러 시작 실패: {e}")
+    
+    def _on_demoted(self):
+        """리더 커넥션 유실 시 스케줄 실행 중단 (다른 프로세스가 승계)"""
+        if self.is_running and self.scheduler:
+            try:
+                self.scheduler.pause()
+            except Exception as e:
+                logger.error(f"❌ 스케줄러 일시정지 실패: {e}")
+            self.is_running = False
+            logger.warning("⚠️ 리더 지위 상실: 배치 스케줄러 일시정지")
+    
+    def get_leader_status(self) -> Dict[str, Any]:
+        """리더 선출 상태 (대시보드/상태 API 용)"""
+        if self.role == ROLE_WEB:
+            heartbeat = self.get_worker_heartbeat() or {}
+            return {
+                'enabled': True,
+                'is_leader': False,
+                'role': self.role,
+                'worker': heartbeat.get('identity'),
+                'worker_seen_at': heartbeat.get('at'),
+            }
+        if not self.leader:
+            return {'enabled': False, 'is_leader': self.is_running, 'role': self.role}
+        return {
+            'enabled': True,
+            'is_leader': self.leader.is_leader,
+            'identity': self.leader.identity,
+            'role': self.role,
+        }
+    
+    # ------------------------------------------------------------------
+    # 웹 ↔ 워커 명령 채널 (Redis queue DB)
+    # ------------------------------------------------------------------
+    def send_command(self, action: str, **payload) -> bool:
+        """웹 역할: 워커에 명령 전달 (start / stop / run_now / wakeup)"""
+        from app.common.cache import cache, REDIS_DB
+        try:
+            command = dict(payload, action=action, requested_at=datetime.now().isoformat())
+            cache.client(REDIS_DB['queue']).rpush(COMMAND_QUEUE_KEY, json.dumps(command, ensure_ascii=False))
+            logger.info(f"📨 배치 워커 명령 전달: {action} {payload}")
+            return True
+        except Exception as e:
+            logger.error(f"❌ 배치 워커 명령 전달 실패 ({action}): {e}")
+            return False
+    
+    def get_worker_heartbeat(self) -> Optional[Dict[str, Any]]:
+        """리더 워커 하트비트 (없으면 워커 미실행)"""
+        from app.common.cache import cache, REDIS_DB
+        return cache.get_json(WORKER_HEARTBEAT_KEY, db=REDIS_DB['queue'])
+    
+    def _write_worker_heartbeat(self, ttl: int):
+        from app.common.cache import cache, REDIS_DB
+        cache.set_json(WORKER_HEARTBEAT_KEY, {
+            'identity': self.leader.identity if self.leader else None,
+            'running': self._running,
+            'jobs_count': len(self.scheduler.get_jobs()) if self.scheduler else 0,
+            'at': datetime.now().isoformat(),
+        }, ttl, db=REDIS_DB['queue'])
+    
+    def _clear_worker_heartbeat(self):
+        from app.common.cache import cache, REDIS_DB
+        if self.role == ROLE_WORKER and (self.leader is None or self.leader.is_leader):
+            cache.delete(WORKER_HEARTBEAT_KEY, db=REDIS_DB['queue'])
+    
+    def _start_command_consumer(self):
+        if self._command_thread and self._command_thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._command_thread = threading.Thread(target=self._command_loop, name='batch-commands', daemon=True)
+        self._command_thread.start()
+    
+    def _command_loop(self):
+        """워커 역할: 리더일 때만 명령 소비 + 하트비트 갱신"""
+        from app.common.cache import cache, REDIS_DB
+        interval = self.app.config.get('SCHEDULER_LEADER_INTERVAL', 15)
+        while not self._stop_event.is_set():
+            if self.leader and not self.leader.is_leader:
+                self._stop_event.wait(interval)
+                continue
+            try:
+                self._write_worker_heartbeat(ttl=interval * 3)
+                item = cache.client(REDIS_DB['queue']).blpop(COMMAND_QUEUE_KEY, timeout=5)
+                if item:
+                    self._handle_command(json.loads(item[1]))
+            except Exception as e:
+                logger.error(f"❌ 배치 워커 명령 처리 오류: {e}")
+                self._stop_event.wait(5)
+    
+    def _handle_command(self, command: Dict[str, Any]):
+        action = command.get('action')
+        logger.info(f"📥 배치 워커 명령 수신: {action}")
+        if action == 'start':
+            self.start()
+        elif action == 'stop':
+            self.stop()
+        elif action == 'run_now':
+            # 실행은 별도 스레드 (명령 루프/하트비트가 막히지 않도록)
+            threading.Thread(target=self.run_job_now, args=(command.get('job_id'),), daemon=True).start()
+        elif action == 'wakeup' and self.scheduler:
+            # 웹에서 jobstore 를 변경한 경우 다음 실행 시각 재계산
+            self.scheduler.wakeup()
+        else:
+            logger.warning(f"⚠️ 알 수 없는 배치 워커 명령: {command}")
+    
+    def job_lock_name(self, job_config: BatchJobConfig) -> str:
+        """회사 + 단계(작업 타입) 단위 작업 락 이름"""
+        return f"{job_config.job_type}:{job_config.company_id}"
+    
+    def execute_job(self, job_config: BatchJobConfig) -> bool:
+        """
+        작업 실행 (앱 컨텍스트 + 회사/단계별 advisory lock)
+        
+        같은 회사/단계가 이미 실행 중이면 건너뛰고 False 반환
+        """
+        job_func = self._get_job_function(job_config.job_type)
+        if not job_func:
+            logger.error(f"❌ 알 수 없는 작업 타입: {job_config.job_type}")
+            return False
+        
+        from app.common.models import db
+        with self.app.app_context():
+            lock_name = self.job_lock_name(job_config)
+            with advisory_lock(db.engine, lock_name) as acquired:
+                if not acquired:
+                    logger.warning(f"⚠️ 이미 실행 중인 작업: {lock_name} ({job_config.job_id}) - 건너뜀")
+                    return False
+                job_func(job_config)
+                return True
     
     def add_job(self, job_config: BatchJobConfig) -> bool:
         """배치 작업 추가"""
@@ -172,11 +416,11 @@ class BatchScheduler:
             except:
                 pass
             
-            # 작업 함수 매핑
-            job_func = self._get_job_function(job_config.job_type)
-            if not job_func:
+            # 작업 타입 확인 (실제 실행은 run_scheduled_job → execute_job)
+            if not self._get_job_function(job_config.job_type):
                 logger.error(f"❌ 알 수 없는 작업 타입: {job_config.job_type}")
                 return False
+            job_func = run_scheduled_job
             
             # 스케줄 설정
             if job_config.schedule_type == "cron":
@@ -222,6 +466,9 @@ class BatchScheduler:
             # DB에 작업 설정 저장
             self._save_job_config(job_config)
             
+            if self.role == ROLE_WEB:
+                self.send_command('wakeup')
+            
             logger.info(f"✅ 배치 작업 추가됨: {job_config.name} ({job_config.job_id})")
             return True
             
@@ -237,6 +484,9 @@ class BatchScheduler:
             # DB에서 설정 삭제
             self._delete_job_config(job_id)
             
+            if self.role == ROLE_WEB:
+                self.send_command('wakeup')
+            
             logger.info(f"✅ 배치 작업 제거됨: {job_id}")
             return True
         except Exception as e:
@@ -263,18 +513,34 @@ class BatchScheduler:
             logger.error(f"❌ 작업 목록 조회 실패: {e}")
             return []
     
+    def get_job_config(self, job_id: str) -> Optional[BatchJobConfig]:
+        """등록된 작업의 설정 (없으면 None)"""
+        job = self.scheduler.get_job(job_id) if self.scheduler else None
+        if job and job.args and isinstance(job.args[0], BatchJobConfig):
+            return job.args[0]
+        return None
+    
     def run_job_now(self, job_id: str) -> bool:
-        """배치 작업 즉시 실행"""
+        """배치 작업 즉시 실행 (웹 역할이면 워커에 실행 요청)"""
+        if self.role == ROLE_WEB:
+            return self.send_command('run_now', job_id=job_id)
         try:
             job = self.scheduler.get_job(job_id)
             if not job:
                 logger.error(f"❌ 작업을 찾을 수 없음: {job_id}")
                 return False
             
-            # 즉시 실행
-            job.func(*job.args, **job.kwargs)
-            logger.info(f"🚀 작업 즉시 실행됨: {job_id}")
-            return True
+            # 즉시 실행 (스케줄 실행과 같은 작업 락 사용 → 중복 실행 방지)
+            job_config = job.args[0] if job.args else None
+            if not isinstance(job_config, BatchJobConfig):
+                job.func(*job.args, **job.kwargs)
+                logger.info(f"🚀 작업 즉시 실행됨: {job_id}")
+                return True
+            
+            executed = self.execute_job(job_config)
+            if executed:
+                logger.info(f"🚀 작업 즉시 실행됨: {job_id}")
+            return executed
             
         except Exception as e:
             logger.error(f"❌ 작업 즉시 실행 실패 ({job_id}): {e}")
@@ -287,7 +553,8 @@ class BatchScheduler:
             'CUSTOMER_SYNC': self._customer_sync_job,
             'GIFT_CLASSIFY': self._gift_classify_job,
             'REPORT_GENERATE': self._report_generate_job,
-            'DATA_CLEANUP': self._data_cleanup_job
+            'DATA_CLEANUP': self._data_cleanup_job,
+            'PARTITION_MAINTENANCE': self._partition_maintenance_job
         }
         return job_functions.get(job_type)
     
@@ -476,7 +743,16 @@ class BatchScheduler:
             self._save_execution_result(result)
     
     def _data_cleanup_job(self, job_config: BatchJobConfig):
-        """데이터 정리 작업"""
+        """
+        데이터 정리 작업
+        - 매출/주문: 회사별 보존 기간이 지난 월 파티션 DETACH + DROP
+        - 재고 이력: 오래된 기간은 일자별 마지막 변경만 남김
+        
+        parameters:
+            retention_months: 개월 수 또는 {회사 ID: 개월 수} (0/없음 = 보존, 기본 SALES_RETENTION_MONTHS)
+            stock_history_days: 재고 이력 압축 기준 일수 (기본 90)
+            dry_run: True 면 삭제 대상만 기록
+        """
         execution_id = f"{job_config.job_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
         result = BatchExecutionResult(
             job_id=job_config.job_id,
@@ -486,16 +762,48 @@ class BatchScheduler:
         )
         
         try:
-            logger.info(f"🔄 데이터 정리 시작: {job_config.name}")
+            from app.common.models import Company, db
+            from app.services.erpia_stock_sync import compact_stock_history
+            from app.services.sales_partitions import SalesPartitionManager
             
-            # 오래된 로그 데이터 정리
-            # 중복 데이터 정리 등
+            logger.info(f"🔄 데이터 정리 시작: {job_config.name}")
             
+            company_ids = [company.id for company in Company.query.order_by(Company.id).all()]
+            retention = job_config.parameters.get('retention_months',
+                                                  current_app.config.get('SALES_RETENTION_MONTHS', 0))
+            if isinstance(retention, dict):
+                # JSON 저장 시 키가 문자열이 됨
+                retention_months = {int(company_id): int(months or 0) for company_id, months in retention.items()}
+            else:
+                retention_months = {company_id: int(retention or 0) for company_id in company_ids}
+            dry_run = bool(job_config.parameters.get('dry_run', False))
+            
+            dropped = SalesPartitionManager(db.session).drop_expired(retention_months, dry_run=dry_run)
+            if not dry_run:
+                # 삭제된 월은 분석 큐브에서도 다시 읽도록 알림 (sales_analysis_master_c{회사}_p{YYYYMM})
+                from app.services.sales_cube import sales_cube
+                for name in dropped.get('sales_analysis_master', []):
+                    company_part, month_part = name[len('sales_analysis_master_c'):].split('_p')
+                    sales_cube.mark_changed(int(company_part), [(int(month_part[:4]), int(month_part[4:]))])
+            
+            stock_history_days = int(job_config.parameters.get('stock_history_days', 90))
+            compacted = 0
+            if not dry_run:
+                for company_id in company_ids:
+                    compacted += compact_stock_history(db.session, company_id, older_than_days=stock_history_days)
+            
+            dropped_count = sum(len(names) for names in dropped.values())
             result.status = "SUCCESS"
-            result.message = "데이터 정리 완료"
-            result.processed_count = 0
+            result.message = f"데이터 정리 완료: 파티션 {dropped_count}개, 재고 이력 {compacted}건"
+            result.processed_count = dropped_count + compacted
+            result.details = {
+                'retention_months': retention_months,
+                'dropped_partitions': dropped,
+                'stock_history_compacted': compacted,
+                'dry_run': dry_run
+            }
             
-            logger.info("✅ 데이터 정리 완료")
+            logger.info(f"✅ 데이터 정리 완료: 파티션 {dropped_count}개, 재고 이력 {compacted}건")
             
         except Exception as e:
             error_trace = traceback.format_exc()
@@ -508,6 +816,40 @@ class BatchScheduler:
             result.finished_at = datetime.now()
             self._save_execution_result(result)
     
+    def _partition_maintenance_job(self, job_config: BatchJobConfig):
+        """매출/주문 미래 월 파티션 미리 생성 (회사 추가 시 회사 파티션 포함)"""
+        execution_id = f"{job_config.job_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        result = BatchExecutionResult(
+            job_id=job_config.job_id,
+            execution_id=execution_id,
+            started_at=datetime.now(),
+            company_id=job_config.company_id
+        )
+        
+        try:
+            from app.common.models import db
+            from app.services.sales_partitions import SalesPartitionManager
+            
+            months_ahead = int(job_config.parameters.get(
+                'months_ahead', current_app.config.get('SALES_PARTITION_MONTHS_AHEAD', 3)))
+            created = SalesPartitionManager(db.session).ensure_partitions(months_ahead=months_ahead)
+            
+            result.status = "SUCCESS"
+            result.message = f"파티션 점검 완료: {sum(created.values())}개 생성"
+            result.processed_count = sum(created.values())
+            result.details = {'months_ahead': months_ahead, 'created': created}
+            
+        except Exception as e:
+            error_trace = traceback.format_exc()
+            result.status = "FAILED"
+            result.message = f"파티션 점검 실패: {str(e)}"
+            result.error_trace = error_trace
+            logger.error(f"❌ 파티션 점검 실패: {e}")
+            
+        finally:
+            result.finished_at = datetime.now()
+            self._save_execution_result(result)
+    
     def _get_erpia_client(self, company_id: int) -> ErpiaApiClient:
         """회사별 ERPia 클라이언트 획득 (캐시됨)"""
         if company_id not in self.erpia_clients:
@@ -532,6 +874,9 @@ class BatchScheduler:
                     
                     if not existing:
                         master_model = ErpiaOrderMaster(**order.__dict__)
+                        if master_model.m_date is None:
+                            # 파티션 키 (주문 월) 필수
+                            master_model.m_date = master_model.j_date or datetime.now()
                         db.session.add(master_model)
                         saved_count += 1
                 
@@ -702,6 +1047,26 @@ class BatchScheduler:
                         'keyword_matching': True,
                         'update_statistics': True
                     }
+                },
+                {
+                    'job_id': 'daily_partition_maintenance',
+                    'name': '매출 파티션 점검 (미래 월 생성)',
+                    'job_type': 'PARTITION_MAINTENANCE',
+                    'company_id': 1,
+                    'enabled': True,
+                    'cron_expression': '30 0 * * *',  # 매일 오전 0시 30분
+                    'parameters': {}
+                },
+                {
+                    'job_id': 'daily_data_cleanup',
+                    'name': '데이터 정리 (보존 기간 파티션 삭제)',
+                    'job_type': 'DATA_CLEANUP',
+                    'company_id': 1,
+                    'enabled': True,
+                    'cron_expression': '0 6 * * *',  # 매일 오전 6시
+                    'parameters': {
+                        'stock_history_days': 90
+                    }
                 }
             ]
             
@@ -759,6 +1124,11 @@ class BatchScheduler:
 # 전역 스케줄러 인스턴스
 batch_scheduler = BatchScheduler()
 
+
+def run_scheduled_job(job_config: BatchJobConfig):
+    """APScheduler 작업 진입점 (모듈 함수 참조로 jobstore 직렬화 가능)"""
+    return batch_scheduler.execute_job(job_config)
+
 # 사용 예시
 if __name__ == "__main__":
     import time
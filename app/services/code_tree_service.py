@@ -0,0 +1,419 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+코드 트리 일괄 처리 서비스 (tbl_code)
+- 순서 변경: UPDATE ... FROM (VALUES ...) 단일 구문
+- 하위 트리 삭제/이동/복사: 재귀 CTE
+- 작업별 단일 트랜잭션 + 코드 캐시 버전 증가 (트리 탐색 캐시 키가 버전 포함 → 변경 즉시 무효화)
+"""
+
+import logging
+from datetime import datetime
+from typing import Dict, List, Any, Optional
+
+from sqlalchemy import text
+
+from app.common.cache import TTL, cache
+
+logger = logging.getLogger(__name__)
+
+VERSION_NAME = 'codes'
+MAX_DEPTH = 4
+
+# 대상 코드와 모든 하위 코드 (lvl 제한으로 레거시 데이터 순환 참조 방지)
+SUBTREE_CTE = """
+WITH RECURSIVE subtree AS (
+    SELECT seq, parent_seq, depth, 0 AS lvl
+    FROM tbl_code
+    WHERE seq = :root_seq
+    UNION ALL
+    SELECT c.seq, c.parent_seq, c.depth, s.lvl + 1
+    FROM tbl_code c
+    JOIN subtree s ON c.parent_seq = s.seq
+    WHERE s.lvl < 16
+)
+"""
+
+
+class CodeTreeError(ValueError):
+    """코드 트리 작업 검증 오류 (사용자 메시지)"""
+
+
+class CodeTreeService:
+    """tbl_code 집합 기반 트리 작업"""
+
+    def __init__(self, session):
+        self.session = session
+
+    # ------------------------------------------------------------------
+    # 공통
+    # ------------------------------------------------------------------
+    def _get_code(self, seq: int) -> Optional[Dict[str, Any]]:
+        return self.session.execute(
+            text("SELECT seq, parent_seq, depth, sort, code, code_name FROM tbl_code WHERE seq = :seq"),
+            {'seq': seq}
+        ).mappings().first()
+
+    def _subtree_stats(self, root_seq: int) -> Dict[str, Any]:
+        return self.session.execute(text(SUBTREE_CTE + """
+            SELECT COUNT(*) AS total, MAX(depth) AS max_depth, ARRAY_AGG(seq) AS seqs FROM subtree
+        """), {'root_seq': root_seq}).mappings().first()
+
+    def _resolve_parent(self, parent_seq: Optional[int]):
+        """새 상위 코드 (0/None = 최상위)"""
+        if not parent_seq:
+            return None, -1
+        parent = self._get_code(parent_seq)
+        if not parent:
+            raise CodeTreeError('상위 코드를 찾을 수 없습니다.')
+        return parent['seq'], parent['depth'] or 0
+
+    def _check_duplicate(self, parent_seq: Optional[int], code: str, exclude_seq: Optional[int] = None):
+        dup = self.session.execute(text("""
+            SELECT 1 FROM tbl_code
+            WHERE parent_seq IS NOT DISTINCT FROM :parent_seq
+              AND code = :code
+              AND (CAST(:exclude_seq AS INTEGER) IS NULL OR seq <> :exclude_seq)
+            LIMIT 1
+        """), {'parent_seq': parent_seq, 'code': code, 'exclude_seq': exclude_seq}).first()
+        if dup:
+            raise CodeTreeError('같은 레벨에서 중복된 코드입니다.')
+
+    def _next_sort(self, parent_seq: Optional[int]) -> int:
+        return self.session.execute(text("""
+            SELECT COALESCE(MAX(sort), 0) + 1 FROM tbl_code
+            WHERE parent_seq IS NOT DISTINCT FROM :parent_seq
+        """), {'parent_seq': parent_seq}).scalar()
+
+    def _finish(self, action: str, **detail) -> Dict[str, Any]:
+        """커밋 + 코드 캐시 버전 증가"""
+        self.session.commit()
+        detail['code_version'] = cache.bump_version(VERSION_NAME)
+        logger.info(f"✅ 코드 트리 {action} 완료: {detail}")
+        return detail
+
+    def _run(self, action: str, func, *args, **kwargs) -> Dict[str, Any]:
+        try:
+            return func(*args, **kwargs)
+        except Exception as e:
+            self.session.rollback()
+            if not isinstance(e, CodeTreeError):
+                logger.error(f"❌ 코드 트리 {action} 실패: {e}")
+            raise
+
+    # ------------------------------------------------------------------
+    # 순서 변경
+    # ------------------------------------------------------------------
+    def reorder(self, parent_seq: Optional[int], depth: int, order_list: List[int], user=None) -> Dict[str, Any]:
+        """형제 코드 순서 일괄 변경 (order_list 순서대로 sort = 1..N)"""
+        return self._run('순서 변경', self._reorder, parent_seq, depth, order_list, user)
+
+    def _reorder(self, parent_seq, depth, order_list, user):
+        # 중복 seq 제거 (처음 위치 기준)
+        seqs = list(dict.fromkeys(int(seq) for seq in order_list))
+        if not seqs:
+            return self._finish('순서 변경', parent_seq=parent_seq, depth=depth, updated_count=0)
+
+        values = ", ".join(f"(:seq{i}, :sort{i})" for i in range(len(seqs)))
+        params: Dict[str, Any] = {
+            'parent_seq': parent_seq or None,
+            'depth': depth,
+            'upt_user': user,
+            'upt_date': datetime.now(),
+        }
+        for i, seq in enumerate(seqs):
+            params[f'seq{i}'] = seq
+            params[f'sort{i}'] = i + 1
+
+        result = self.session.execute(text(f"""
+            UPDATE tbl_code AS c
+            SET sort = v.sort, upt_user = :upt_user, upt_date = :upt_date
+            FROM (VALUES {values}) AS v(seq, sort)
+            WHERE c.seq = v.seq
+              AND c.parent_seq IS NOT DISTINCT FROM :parent_seq
+              AND c.depth = :depth
+        """), params)
+
+        return self._finish('순서 변경', parent_seq=parent_seq, depth=depth, updated_count=result.rowcount)
+
+    def move_to_position(self, seq: int, new_sort: int, user=None) -> Dict[str, Any]:
+        """단일 코드 순서 지정 (뒤쪽 형제는 한 칸씩 밀기) - 레거시 호환"""
+        return self._run('순서 지정', self._move_to_position, seq, new_sort, user)
+
+    def _move_to_position(self, seq, new_sort, user):
+        target = self._get_code(seq)
+        if not target:
+            raise CodeTreeError('해당 코드를 찾을 수 없습니다.')
+
+        now = datetime.now()
+        self.session.execute(text("""
+            UPDATE tbl_code
+            SET sort = COALESCE(sort, 0) + 1, upt_user = :upt_user, upt_date = :upt_date
+            WHERE parent_seq IS NOT DISTINCT FROM :parent_seq
+              AND depth IS NOT DISTINCT FROM :depth
+              AND seq <> :seq
+              AND COALESCE(sort, 999) >= :new_sort
+        """), {'parent_seq': target['parent_seq'], 'depth': target['depth'], 'seq': seq,
+               'new_sort': new_sort, 'upt_user': user, 'upt_date': now})
+        self.session.execute(text("""
+            UPDATE tbl_code SET sort = :new_sort, upt_user = :upt_user, upt_date = :upt_date
+            WHERE seq = :seq
+        """), {'seq': seq, 'new_sort': new_sort, 'upt_user': user, 'upt_date': now})
+
+        return self._finish('순서 지정', seq=seq, code=target['code'], new_sort=new_sort)
+
+    # ------------------------------------------------------------------
+    # 하위 트리 삭제 / 이동 / 복사
+    # ------------------------------------------------------------------
+    def delete_subtree(self, root_seq: int) -> Dict[str, Any]:
+        """코드와 모든 하위 코드 삭제"""
+        return self._run('삭제', self._delete_subtree, root_seq)
+
+    def _delete_subtree(self, root_seq):
+        rows = self.session.execute(text(SUBTREE_CTE + """
+            DELETE FROM tbl_code c
+            USING subtree s
+            WHERE c.seq = s.seq
+            RETURNING c.code, c.code_name
+        """), {'root_seq': root_seq}).fetchall()
+
+        if not rows:
+            raise CodeTreeError('해당 코드를 찾을 수 없습니다.')
+
+        deleted_codes = [f"{row.code} - {row.code_name}" for row in rows]
+        return self._finish('삭제', root_seq=root_seq, deleted_count=len(deleted_codes),
+                            deleted_codes=deleted_codes)
+
+    def move_subtree(self, root_seq: int, new_parent_seq: Optional[int], user=None) -> Dict[str, Any]:
+        """하위 트리를 다른 상위 코드 아래로 이동 (depth 일괄 보정)"""
+        return self._run('이동', self._move_subtree, root_seq, new_parent_seq, user)
+
+    def _move_subtree(self, root_seq, new_parent_seq, user):
+        root = self._get_code(root_seq)
+        if not root:
+            raise CodeTreeError('해당 코드를 찾을 수 없습니다.')
+
+        parent_seq, parent_depth = self._resolve_parent(new_parent_seq)
+        stats = self._subtree_stats(root_seq)
+        if parent_seq is not None and parent_seq in (stats['seqs'] or []):
+            raise CodeTreeError('자기 자신 또는 하위 코드 아래로 이동할 수 없습니다.')
+
+        depth_delta = (parent_depth + 1) - (root['depth'] or 0)
+        if (stats['max_depth'] or 0) + depth_delta > MAX_DEPTH:
+            raise CodeTreeError(f'최대 깊이는 {MAX_DEPTH}까지입니다.')
+
+        self._check_duplicate(parent_seq, root['code'], exclude_seq=root_seq)
+        new_sort = self._next_sort(parent_seq)
+
+        result = self.session.execute(text(SUBTREE_CTE + """
+            UPDATE tbl_code c
+            SET depth = c.depth + :depth_delta,
+                parent_seq = CASE WHEN c.seq = :root_seq THEN :parent_seq ELSE c.parent_seq END,
+                sort = CASE WHEN c.seq = :root_seq THEN :new_sort ELSE c.sort END,
+                upt_user = :upt_user,
+                upt_date = :upt_date
+            FROM subtree s
+            WHERE c.seq = s.seq
+        """), {'root_seq': root_seq, 'parent_seq': parent_seq, 'depth_delta': depth_delta,
+               'new_sort': new_sort, 'upt_user': user, 'upt_date': datetime.now()})
+
+        return self._finish('이동', root_seq=root_seq, parent_seq=parent_seq, moved_count=result.rowcount)
+
+    def copy_subtree(self, root_seq: int, new_parent_seq: Optional[int], user=None,
+                     new_code: Optional[str] = None) -> Dict[str, Any]:
+        """하위 트리 복사 (새 seq 매핑으로 부모 관계 유지)"""
+        return self._run('복사', self._copy_subtree, root_seq, new_parent_seq, user, new_code)
+
+    def _copy_subtree(self, root_seq, new_parent_seq, user, new_code):
+        root = self._get_code(root_seq)
+        if not root:
+            raise CodeTreeError('해당 코드를 찾을 수 없습니다.')
+
+        parent_seq, parent_depth = self._resolve_parent(new_parent_seq)
+        stats = self._subtree_stats(root_seq)
+        if parent_seq is not None and parent_seq in (stats['seqs'] or []):
+            raise CodeTreeError('자기 자신 또는 하위 코드 아래로 복사할 수 없습니다.')
+
+        depth_delta = (parent_depth + 1) - (root['depth'] or 0)
+        if (stats['max_depth'] or 0) + depth_delta > MAX_DEPTH:
+            raise CodeTreeError(f'최대 깊이는 {MAX_DEPTH}까지입니다.')
+
+        root_code = new_code or root['code']
+        self._check_duplicate(parent_seq, root_code)
+        new_sort = self._next_sort(parent_seq)
+
+        # seq 채번 경합 방지 (복사 트랜잭션 동안 다른 쓰기 대기)
+        self.session.execute(text("LOCK TABLE tbl_code IN SHARE ROW EXCLUSIVE MODE"))
+
+        result = self.session.execute(text(SUBTREE_CTE + """
+            , mapping AS (
+                SELECT s.seq AS old_seq,
+                       (SELECT COALESCE(MAX(seq), 0) FROM tbl_code)
+                           + ROW_NUMBER() OVER (ORDER BY s.depth, s.seq) AS new_seq
+                FROM subtree s
+            ), inserted AS (
+                INSERT INTO tbl_code (seq, code_seq, parent_seq, depth, sort, code, code_name, code_info,
+                                      ins_user, ins_date)
+                SELECT m.new_seq,
+                       c.code_seq,
+                       CASE WHEN c.seq = :root_seq THEN :parent_seq ELSE pm.new_seq END,
+                       c.depth + :depth_delta,
+                       CASE WHEN c.seq = :root_seq THEN :new_sort ELSE c.sort END,
+                       CASE WHEN c.seq = :root_seq THEN :root_code ELSE c.code END,
+                       c.code_name,
+                       c.code_info,
+                       :ins_user,
+                       :ins_date
+                FROM tbl_code c
+                JOIN mapping m ON m.old_seq = c.seq
+                LEFT JOIN mapping pm ON pm.old_seq = c.parent_seq
+                RETURNING seq
+            )
+            SELECT MIN(m.new_seq) FILTER (WHERE m.old_seq = :root_seq) AS new_root_seq,
+                   (SELECT COUNT(*) FROM inserted) AS copied_count
+            FROM mapping m
+        """), {'root_seq': root_seq, 'parent_seq': parent_seq, 'depth_delta': depth_delta,
+               'new_sort': new_sort, 'root_code': root_code,
+               'ins_user': user, 'ins_date': datetime.now()}).mappings().first()
+
+        # 시퀀스가 있으면 최대값으로 맞춤
+        self.session.execute(text("""
+            SELECT setval(pg_get_serial_sequence('tbl_code', 'seq'), (SELECT MAX(seq) FROM tbl_code))
+            WHERE pg_get_serial_sequence('tbl_code', 'seq') IS NOT NULL
+        """))
+
+        return self._finish('복사', root_seq=root_seq, parent_seq=parent_seq,
+                            new_root_seq=result['new_root_seq'], copied_count=result['copied_count'])
+
+    # ------------------------------------------------------------------
+    # 트리 탐색 (keyset 페이징)
+    # ------------------------------------------------------------------
+    def ensure_indexes(self) -> bool:
+        """부모별 정렬 탐색 인덱스"""
+        try:
+            self.session.execute(text(
+                "CREATE INDEX IF NOT EXISTS idx_code_parent_sort ON tbl_code (parent_seq, sort, seq)"
+            ))
+            self.session.commit()
+            return True
+        except Exception as e:
+            self.session.rollback()
+            logger.warning(f"⚠️ tbl_code 인덱스 생성 실패: {e}")
+            return False
+
+    @staticmethod
+    def encode_cursor(path: List[int]) -> str:
+        return '.'.join(str(v) for v in path)
+
+    @staticmethod
+    def decode_cursor(cursor: Optional[str]) -> Optional[List[int]]:
+        if not cursor:
+            return None
+        try:
+            return [int(v) for v in cursor.split('.')]
+        except ValueError:
+            raise CodeTreeError('잘못된 커서입니다.')
+
+    def browse(self, parent_seq: Optional[int] = None, depth_limit: int = 1,
+               cursor: Optional[str] = None, limit: int = 200) -> Dict[str, Any]:
+        """
+        하위 트리 탐색 (전위 순회 순서)
+
+        Args:
+            parent_seq: 기준 상위 코드 (None = 최상위 그룹)
+            depth_limit: 기준으로부터 내려갈 단계 수 (1 = 직계 하위만)
+            cursor: 이전 페이지 마지막 노드의 path (keyset)
+            limit: 페이지 크기
+        """
+        depth_limit = max(1, min(int(depth_limit or 1), MAX_DEPTH + 1))
+        limit = max(1, min(int(limit or 200), 1000))
+        cursor_path = self.decode_cursor(cursor)
+
+        key = (f"codes:v{cache.get_version(VERSION_NAME)}:tree:"
+               f"{parent_seq or 0}:{depth_limit}:{cursor or ''}:{limit}")
+        result = cache.get_json(key)
+        if result is None:
+            result = self._browse(parent_seq, depth_limit, cursor_path, limit)
+            cache.set_json(key, result, TTL['master_data'])
+        return result
+
+    def summary(self) -> Dict[str, int]:
+        """코드 관리 화면 통계 (전체 코드 / 최대 깊이 / 그룹 수, 코드 캐시 버전 기준)"""
+        key = f"codes:v{cache.get_version(VERSION_NAME)}:summary"
+        result = cache.get_json(key)
+        if result is None:
+            row = self.session.execute(text("""
+                SELECT COUNT(*) AS total, COALESCE(MAX(depth), 0) AS max_depth,
+                       COUNT(*) FILTER (WHERE depth = 0) AS group_count
+                FROM tbl_code
+            """)).mappings().one()
+            result = {name: int(value) for name, value in row.items()}
+            cache.set_json(key, result, TTL['master_data'])
+        return result
+
+    def _browse(self, parent_seq, depth_limit, cursor_path, limit) -> Dict[str, Any]:
+
+        # path = 상위부터 (sort, seq) 쌍을 이어붙인 배열 → 배열 비교가 곧 전위 순회 순서
+        rows = self.session.execute(text("""
+            WITH RECURSIVE tree AS (
+                SELECT c.seq, c.parent_seq, c.depth, c.sort, c.code, c.code_name, c.code_info,
+                       1 AS lvl,
+                       ARRAY[COALESCE(c.sort, 0), c.seq] AS path
+                FROM tbl_code c
+                WHERE (CAST(:parent_seq AS INTEGER) IS NULL AND c.parent_seq IS NULL)
+                   OR c.parent_seq = :parent_seq
+                UNION ALL
+                SELECT c.seq, c.parent_seq, c.depth, c.sort, c.code, c.code_name, c.code_info,
+                       t.lvl + 1,
+                       t.path || ARRAY[COALESCE(c.sort, 0), c.seq]
+                FROM tbl_code c
+                JOIN tree t ON c.parent_seq = t.seq
+                WHERE t.lvl < :depth_limit
+            ), page AS (
+                SELECT * FROM tree
+                WHERE CAST(:cursor_path AS INTEGER[]) IS NULL OR path > CAST(:cursor_path AS INTEGER[])
+                ORDER BY path
+                LIMIT :limit_plus_one
+            ), child_counts AS (
+                SELECT parent_seq, COUNT(*) AS child_count
+                FROM tbl_code
+                WHERE parent_seq IN (SELECT seq FROM page)
+                GROUP BY parent_seq
+            )
+            SELECT p.*, COALESCE(cc.child_count, 0) AS child_count
+            FROM page p
+            LEFT JOIN child_counts cc ON cc.parent_seq = p.seq
+            ORDER BY p.path
+        """), {
+            'parent_seq': parent_seq or None,
+            'depth_limit': depth_limit,
+            'cursor_path': cursor_path,
+            'limit_plus_one': limit + 1,
+        }).mappings().all()
+
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+
+        nodes = [{
+            'seq': row['seq'],
+            'parent_seq': row['parent_seq'],
+            'depth': row['depth'],
+            'sort': row['sort'],
+            'code': row['code'],
+            'code_name': row['code_name'],
+            'code_info': row['code_info'],
+            'level': row['lvl'],
+            'child_count': row['child_count'],
+            'has_children': row['child_count'] > 0,
+        } for row in rows]
+
+        return {
+            'nodes': nodes,
+            'next_cursor': self.encode_cursor(rows[-1]['path']) if has_more and rows else None,
+            'has_more': has_more,
+        }
+
+
+def bump_code_version() -> int:
+    """단건 코드 추가/수정 후 코드 캐시 버전 증가"""
+    return cache.bump_version(VERSION_NAME)
@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ERPia 원본 응답 보관소
+- 응답 본문(bytes)을 SHA-256 내용 해시 경로에 gzip 으로 저장 (같은 내용은 파일 1개)
+- erpia_raw_pages 색인: (admin_code, mode, 기간, 페이지) + 해시, 추가 전용
+- 같은 키의 직전 페이지와 해시가 같고 이미 DB 반영됐으면 파싱/저장 생략
+- reprocess(): API 호출 없이 보관 원본을 다시 파싱해 DB 반영 (파서 수정/필드 추가 시)
+"""
+
+import gzip
+import hashlib
+import logging
+import os
+import tempfile
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy import text
+
+logger = logging.getLogger(__name__)
+
+# 동일 페이지 생략 대상 모드 (재고 스냅샷은 자체 비교 적재라 항상 처리)
+SKIP_IDENTICAL_MODES = {'jumun', 'cust', 'goods'}
+
+# 모드 → 배치 단계
+MODE_STEPS = {'cust': 'customers', 'jegoAll': 'stock', 'goods': 'goods', 'jumun': 'sales'}
+
+
+@dataclass
+class ArchivedPage:
+    """보관된 페이지 1건"""
+    id: int
+    content_hash: str
+    skip: bool = False
+    row_count: int = 0
+
+
+class ErpiaPageArchive:
+    """회사 1곳의 원본 페이지 보관/조회"""
+
+    def __init__(self, engine, root: str, company_id: int, admin_code: str,
+                 batch_log_id: Optional[int] = None, skip_identical: bool = True):
+        self.engine = engine
+        self.root = root
+        self.company_id = company_id
+        self.admin_code = admin_code
+        self.batch_log_id = batch_log_id
+        self.skip_identical = skip_identical
+        self._pending: Dict[int, int] = {}  # 미반영 색인 id → 파싱 건수
+
+    @classmethod
+    def from_config(cls, app, company_id: int, admin_code: str, batch_log_id: Optional[int] = None):
+        """설정 기반 생성 (ERPIA_ARCHIVE_DIR 은 절대 경로 필수 - 실행 디렉터리에 쌓이지 않도록)"""
+        from app.common.models import db
+        root = app.config.get('ERPIA_ARCHIVE_DIR') or ''
+        if not os.path.isabs(root):
+            raise ValueError(f"ERPIA_ARCHIVE_DIR 는 절대 경로여야 합니다: '{root}'")
+        return cls(db.engine, root, company_id, admin_code, batch_log_id,
+                   skip_identical=app.config.get('ERPIA_ARCHIVE_SKIP_IDENTICAL', True))
+
+    # ------------------------------------------------------------------
+    # 본문 저장소 (내용 해시 경로)
+    # ------------------------------------------------------------------
+    def _path(self, content_hash: str) -> str:
+        return os.path.join(self.root, content_hash[:2], content_hash[2:4], f"{content_hash}.xml.gz")
+
+    def _write_object(self, content_hash: str, content: bytes) -> int:
+        """본문 gzip 저장 (이미 있으면 생략) → 저장 크기"""
+        path = self._path(content_hash)
+        if os.path.exists(path):
+            return os.path.getsize(path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(gzip.compress(content, compresslevel=6))
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return os.path.getsize(path)
+
+    def read(self, content_hash: str) -> bytes:
+        with open(self._path(content_hash), 'rb') as f:
+            return gzip.decompress(f.read())
+
+    def read_text(self, content_hash: str) -> str:
+        """ERPia 응답 인코딩(EUC-KR)으로 복원 (requests 의 response.text 와 동일)"""
+        return self.read(content_hash).decode('euc-kr', errors='replace')
+
+    # ------------------------------------------------------------------
+    # 수집 중 보관 (ErpiaApiClient.page_archive)
+    # ------------------------------------------------------------------
+    def store(self, mode: str, params: Dict[str, Any], content: bytes) -> ArchivedPage:
+        """
+        페이지 보관 → ArchivedPage
+
+        직전 같은 키 페이지와 내용이 같고 DB 반영까지 끝났으면 skip=True (색인 추가 없음)
+        """
+        content_hash = hashlib.sha256(content).hexdigest()
+        key = {
+            'company_id': self.company_id,
+            'mode': mode,
+            'start_date': params.get('sDate') or '',
+            'end_date': params.get('eDate') or '',
+            'page': int(params.get('page', 1)),
+        }
+        stored_bytes = self._write_object(content_hash, content)
+
+        with self.engine.begin() as conn:
+            if self.skip_identical and mode in SKIP_IDENTICAL_MODES:
+                latest = conn.execute(text("""
+                    SELECT id, content_hash, row_count, processed_at FROM erpia_raw_pages
+                    WHERE company_id = :company_id AND mode = :mode AND start_date = :start_date
+                      AND end_date = :end_date AND page = :page
+                    ORDER BY id DESC LIMIT 1
+                """), key).mappings().first()
+                if (latest and latest['content_hash'] == content_hash
+                        and latest['processed_at'] is not None and latest['row_count']):
+                    return ArchivedPage(latest['id'], content_hash, skip=True, row_count=latest['row_count'])
+
+            page_id = conn.execute(text("""
+                INSERT INTO erpia_raw_pages (company_id, admin_code, mode, start_date, end_date, page,
+                                             content_hash, raw_bytes, stored_bytes, batch_log_id, fetched_at)
+                VALUES (:company_id, :admin_code, :mode, :start_date, :end_date, :page,
+                        :content_hash, :raw_bytes, :stored_bytes, :batch_log_id, :fetched_at)
+                RETURNING id
+            """), dict(key, admin_code=self.admin_code, content_hash=content_hash, raw_bytes=len(content),
+                       stored_bytes=stored_bytes, batch_log_id=self.batch_log_id,
+                       fetched_at=datetime.utcnow())).scalar()
+
+        self._pending[page_id] = 0
+        return ArchivedPage(page_id, content_hash)
+
+    def set_rows(self, entry: ArchivedPage, row_count: int):
+        entry.row_count = row_count
+        if entry.id in self._pending:
+            self._pending[entry.id] = row_count
+
+    def mark_processed(self, page_ids: Optional[Iterable[int]] = None, session=None):
+        """
+        DB 반영 완료 표시 - 다음 수집부터 동일 페이지 생략 대상
+
+        session 을 주면 그 트랜잭션 안에서 실행 (페이지 저장 커밋과 함께 반영/롤백),
+        없으면 별도 트랜잭션으로 즉시 반영
+        """
+        if page_ids is None:
+            pending, self._pending = self._pending, {}
+        else:
+            pending = {page_id: self._pending.pop(page_id, None) for page_id in page_ids}
+        if not pending:
+            return
+        statement = text("""
+            UPDATE erpia_raw_pages
+            SET processed_at = :now, row_count = COALESCE(:row_count, row_count)
+            WHERE id = :id
+        """)
+        now = datetime.utcnow()
+        params = [{'id': page_id, 'row_count': rows, 'now': now} for page_id, rows in pending.items()]
+        if session is not None:
+            session.execute(statement, params)
+            return
+        try:
+            with self.engine.begin() as conn:
+                conn.execute(statement, params)
+        except Exception as e:
+            logger.warning(f"⚠️ 원본 페이지 반영 표시 실패 ({len(pending)}건): {e}")
+
+    def discard(self):
+        """단계 실패: 원본은 남기고 미반영 상태 유지 (재처리 대상)"""
+        self._pending = {}
+
+    # ------------------------------------------------------------------
+    # 재처리
+    # ------------------------------------------------------------------
+    def latest_pages(self, mode: str, start_date: str = None, end_date: str = None) -> List[Dict[str, Any]]:
+        """키별 최신 보관 페이지 (기간 필터: YYYYMMDD 문자열 비교)"""
+        filters = ["company_id = :company_id", "mode = :mode"]
+        if start_date:
+            filters.append("start_date >= :start_date")
+        if end_date:
+            filters.append("end_date <= :end_date")
+        with self.engine.connect() as conn:
+            rows = conn.execute(text(f"""
+                SELECT DISTINCT ON (start_date, end_date, page)
+                       id, start_date, end_date, page, content_hash
+                FROM erpia_raw_pages
+                WHERE {' AND '.join(filters)}
+                ORDER BY start_date, end_date, page, id DESC
+            """), {'company_id': self.company_id, 'mode': mode,
+                   'start_date': start_date, 'end_date': end_date}).mappings().all()
+        return [dict(row) for row in rows]
+
+
+def reprocess(app, company_id: int, modes: List[str], start_date: str = None, end_date: str = None) -> Dict[str, Any]:
+    """
+    보관 원본 재파싱 → DB 반영 (API 호출 없음)
+
+    기간(sDate~eDate) 단위로 묶어 저장하므로 메모리는 한 기간 분량만 사용한다.
+    재고(jegoAll)는 가장 최근 스냅샷 1건만 반영한다.
+    """
+    from app.common.models import db
+    from app.services.erpia_batch_service import ErpiaBatchService
+    from app.services.erpia_goods_sync import ErpiaGoodsSync
+    from app.services.erpia_stock_sync import ErpiaStockSync
+
+    service = ErpiaBatchService(company_id, member_id='reprocess')
+    client = service.erpia_client
+    archive = ErpiaPageArchive.from_config(app, company_id, client.admin_code)
+    summary = {}
+
+    for mode in modes:
+        pages = archive.latest_pages(mode, start_date, end_date)
+        if mode == 'jegoAll' and pages:
+            latest = max(pages, key=lambda p: p['id'])
+            pages = [latest]
+
+        groups: Dict[tuple, List[Dict[str, Any]]] = {}
+        for page in pages:
+            groups.setdefault((page['start_date'], page['end_date']), []).append(page)
+
+        result = {'pages': len(pages), 'rows': 0, 'saved_to_db': 0, 'updated_in_db': 0}
+        try:
+            for (group_start, group_end), group in sorted(groups.items()):
+                rows = []
+                for page in group:
+                    rows.extend(client.parse_page(mode, archive.read_text(page['content_hash'])))
+
+                if mode == 'jumun':
+                    saved = service.save_sales(rows)
+                elif mode == 'cust':
+                    saved = service.save_customers(rows, 'reprocess')
+                elif mode == 'goods':
+                    saved = ErpiaGoodsSync(db.session, company_id).sync(rows)
+                elif mode == 'jegoAll':
+                    saved = ErpiaStockSync(db.session, company_id).sync(rows)
+                else:
+                    raise ValueError(f"재처리할 수 없는 모드: {mode}")
+
+                archive.mark_processed([page['id'] for page in group])
+                result['rows'] += len(rows)
+                result['saved_to_db'] += saved.get('saved_to_db', 0)
+                result['updated_in_db'] += saved.get('updated_in_db', saved.get('changed_count', 0))
+                logger.info(f"♻️ 재처리 {mode} {group_start or '-'}~{group_end or '-'}: "
+                            f"{len(group)}페이지 {len(rows)}건")
+        finally:
+            # 기간 단위로 커밋되므로 중간 실패여도 이미 저장된 월은 반영
+            if mode == 'jumun':
+                result['parquet_months'] = len(service.publish_sales_changes())
+        summary[mode] = result
+    return summary
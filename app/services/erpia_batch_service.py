@@ -11,21 +11,60 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Any
 import logging
 
+from flask import current_app
+from sqlalchemy import text
+
 from app.common.models import ErpiaBatchSettings, CompanyErpiaConfig, db, ErpiaOrderMaster, SalesAnalysisMaster
-from app.services.erpia_client import ErpiaApiClient
+from app.services.erpia_client import ErpiaApiClient, ErpiaFetchCancelled
 from app.services.gift_classifier import GiftClassifier
+from app.services.batch_metrics import BatchMetricsRecorder
+from app.services.erpia_archive import ErpiaPageArchive
+from app.services.erpia_goods_sync import ErpiaGoodsSync
+from app.services.erpia_pipeline import ErpiaPagePipeline
+from app.services.erpia_stock_sync import ErpiaStockSync
+from app.services.sales_cube import sales_cube
+from app.services.sales_parquet import SalesParquetExporter
 
 logger = logging.getLogger(__name__)
 
 class ErpiaBatchService:
     """ERPia 배치 실행 서비스"""
     
-    def __init__(self, company_id: int):
+    def __init__(self, company_id: int, batch_log_id: int = None, member_id: str = 'batch'):
         self.company_id = company_id
+        self.member_id = member_id
         self.erpia_client = ErpiaApiClient(company_id)
         self.gift_classifier = GiftClassifier(company_id)
         self.batch_steps = self._load_batch_steps()
         
+        # 단계/페이지 계측 (erpia_batch_metrics, batch_log_id 로 배치 로그와 연결)
+        self.metrics = BatchMetricsRecorder(company_id, self.erpia_client.admin_code, batch_log_id)
+        self.page_listener = None  # 추가 페이지 콜백 (작업 러너 진행률)
+        self.erpia_client.page_callback = self._on_page
+        
+        # 원본 페이지 보관 (동일 페이지 생략 / 오프라인 재처리)
+        if current_app.config.get('ERPIA_ARCHIVE_ENABLED'):
+            try:
+                self.erpia_client.page_archive = ErpiaPageArchive.from_config(
+                    current_app, company_id, self.erpia_client.admin_code, batch_log_id
+                )
+            except ValueError as e:
+                logger.warning(f"⚠️ ERPia 원본 보관 사용 안 함: {e}")
+        
+        # 매출 Parquet 스냅샷 (저장된 매출의 (연, 월) → 단계 종료 후 해당 월만 다시 씀)
+        self.parquet_exporter = None
+        if current_app.config.get('SALES_PARQUET_ENABLED'):
+            try:
+                self.parquet_exporter = SalesParquetExporter.from_config(current_app, company_id)
+            except ValueError as e:
+                logger.warning(f"⚠️ 매출 Parquet 스냅샷 사용 안 함: {e}")
+        self.touched_sales_months = set()
+    
+    def _on_page(self, mode: str, page: int, rows: int, **timing):
+        self.metrics.on_page(mode, page, rows, **timing)
+        if self.page_listener:
+            self.page_listener(mode, page, rows, **timing)
+        
     def _load_batch_steps(self) -> List[Dict]:
         """설정된 배치 실행 순서 로드"""
         try:
@@ -145,84 +184,230 @@ class ErpiaBatchService:
         
         return result
     
+    def run_step(self, step_name: str, start_date: str = None, end_date: str = None) -> Dict[str, Any]:
+        """단일 배치 단계 실행 (작업 러너용)"""
+        return self._execute_step(step_name, start_date, end_date)
+    
     def _execute_step(self, step_name: str, start_date: str, end_date: str) -> Dict[str, Any]:
-        """개별 배치 단계 실행"""
-        step_start_time = datetime.utcnow()
-        
-        if step_name == 'customers':
-            return self._collect_customers(start_date, end_date)
-        elif step_name == 'stock':
-            return self._collect_stock()
-        elif step_name == 'goods':
-            return self._collect_goods()
-        elif step_name == 'sales':
-            return self._collect_sales_with_db_save(start_date, end_date)
-        else:
+        """개별 배치 단계 실행 (단계/페이지 계측 기록)"""
+        collectors = {
+            'customers': lambda: self._collect_customers(start_date, end_date),
+            'stock': self._collect_stock,
+            'goods': self._collect_goods,
+            'sales': lambda: self._collect_sales_with_db_save(start_date, end_date),
+        }
+        if step_name not in collectors:
             raise ValueError(f"알 수 없는 배치 단계: {step_name}")
+        
+        archive = self.erpia_client.page_archive
+        self.metrics.begin_step(step_name)
+        try:
+            result = collectors[step_name]()
+        except ErpiaFetchCancelled:
+            self.metrics.end_step('CANCELLED')
+            if archive:
+                archive.discard()
+            raise
+        except Exception:
+            self.metrics.end_step('FAILED')
+            if archive:
+                archive.discard()
+            raise
+        finally:
+            # 페이지 단위로 커밋되므로 실패/취소여도 이미 저장된 월은 반영
+            published = self.publish_sales_changes() if step_name == 'sales' else {}
+        
+        if archive:
+            archive.mark_processed()
+        step_metrics = self.metrics.end_step()
+        result['pages'] = step_metrics['pages']
+        result['execution_time'] = round(step_metrics['total_ms'] / 1000, 2)
+        result['db_time'] = round(step_metrics['db_ms'] / 1000, 2)
+        if step_name == 'sales':
+            result['parquet_months'] = len(published)
+        return result
+    
+    def publish_sales_changes(self) -> Dict[str, int]:
+        """
+        이번 실행에서 커밋된 월 반영: 분석 큐브 갱신 알림 + Parquet 파티션 다시 쓰기
+        
+        단계 실패/취소 시에도 호출되며, 여기서 난 오류는 배치 결과에 영향을 주지 않는다.
+        """
+        months, self.touched_sales_months = self.touched_sales_months, set()
+        if not months:
+            return {}
+        sales_cube.mark_changed(self.company_id, months)
+        if not self.parquet_exporter:
+            return {}
+        try:
+            return self.parquet_exporter.export_months(months)
+        except Exception as e:
+            logger.warning(f"⚠️ 매출 Parquet 스냅샷 실패 ({len(months)}개 월, "
+                           f"scripts/export_sales_parquet.py 로 다시 작성 필요): {e}")
+            return {}
+    
+    def _run_pipeline(self, mode: str, write, start_date: str = None, end_date: str = None) -> Dict[str, Any]:
+        """
+        수신/파싱/저장 파이프라인 실행 (저장은 페이지마다 현재 스레드에서)
+        
+        원본 페이지 반영 표시를 페이지 저장과 같은 트랜잭션에 넣어, 실패/취소 후 재실행 시
+        이미 커밋된 페이지는 동일 페이지로 생략된다 (저장은 커밋, 실패 시 롤백).
+        """
+        archive = self.erpia_client.page_archive
+        
+        def timed_write(rows, page_id):
+            with self.metrics.db_write():
+                if archive and page_id:
+                    archive.mark_processed([page_id], session=db.session)
+                write(rows)
+        return ErpiaPagePipeline(self.erpia_client, mode, start_date, end_date).run(timed_write)
+    
+    @staticmethod
+    def _accumulate(totals: Dict[str, Any], result: Dict[str, Any]):
+        for key, value in result.items():
+            if isinstance(value, (int, float)):
+                totals[key] = totals.get(key, 0) + value
     
     def _collect_customers(self, start_date: str, end_date: str) -> Dict[str, Any]:
-        """매장정보 수집 (mode=cust)"""
-        data = self.erpia_client.fetch_customers(start_date, end_date)
+        """매장정보 수집 (mode=cust) + 페이지별 저장"""
+        totals = {'saved_to_db': 0, 'updated_in_db': 0, 'error_count': 0}
+        stats = self._run_pipeline(
+            'cust', lambda rows: self._accumulate(totals, self.save_customers(rows, self.member_id)),
+            start_date, end_date
+        )
+        return dict(totals, data_count=stats['rows'])
+    
+    def save_customers(self, customers_data: List[Dict], member_id: str = 'admin') -> Dict[str, int]:
+        """매장정보 저장 (customer_code 기준 신규/업데이트)"""
+        from app.common.models import ErpiaCustomer
+        
+        # 시스템 필드 제외
+        system_fields = {'seq', 'ins_user', 'ins_date', 'upt_user', 'upt_date', 'company_id'}
+        inserted_count = 0
+        updated_count = 0
+        error_count = 0
+        
+        try:
+            for customer_data in customers_data:
+                customer_code = (customer_data.get('customer_code') or '').strip()
+                if not customer_code:
+                    error_count += 1
+                    continue
+                
+                try:
+                    customer_data_filtered = {k: v for k, v in customer_data.items()
+                                              if hasattr(ErpiaCustomer, k) and k not in system_fields}
+                    
+                    existing_customer = ErpiaCustomer.query.filter_by(
+                        customer_code=customer_code,
+                        company_id=self.company_id
+                    ).first()
+                    
+                    if existing_customer:
+                        for key, value in customer_data_filtered.items():
+                            setattr(existing_customer, key, value)
+                        existing_customer.upt_user = member_id
+                        existing_customer.upt_date = datetime.utcnow()
+                        updated_count += 1
+                    else:
+                        db.session.add(ErpiaCustomer(
+                            company_id=self.company_id,
+                            ins_user=member_id,
+                            ins_date=datetime.utcnow(),
+                            upt_user=member_id,
+                            upt_date=datetime.utcnow(),
+                            **customer_data_filtered
+                        ))
+                        inserted_count += 1
+                except Exception as e:
+                    logger.error(f"❌ 매장 데이터 처리 실패 ({customer_code}): {str(e)}")
+                    error_count += 1
+            
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        
+        logger.info(f"✅ 매장정보 저장 완료: 신규 {inserted_count}개, 업데이트 {updated_count}개, 오류 {error_count}개")
         return {
-            'data_count': len(data),
-            'pages': 1,  # 실제 구현 시 페이지 수 계산
-            'execution_time': 0
+            'saved_to_db': inserted_count,
+            'updated_in_db': updated_count,
+            'error_count': error_count
         }
     
     def _collect_stock(self) -> Dict[str, Any]:
-        """재고 정보 수집 (mode=jegoAll)"""
+        """재고 정보 수집 (mode=jegoAll) + 스냅샷 비교 적재"""
         data = self.erpia_client.fetch_stock()
-        return {
-            'data_count': len(data),
-            'pages': 1,
-            'execution_time': 0
-        }
+        with self.metrics.db_write():
+            result = ErpiaStockSync(db.session, self.company_id, self.metrics.batch_log_id).sync(data)
+        return dict(result, data_count=len(data))
     
     def _collect_goods(self) -> Dict[str, Any]:
-        """상품 정보 수집 (mode=goods)"""
-        data = self.erpia_client.fetch_goods()
-        return {
-            'data_count': len(data),
-            'pages': 1,
-            'execution_time': 0
-        }
+        """상품 정보 수집 (mode=goods) + 상품 마스터 해시 비교 적재 (전체 수신 후 1회)"""
+        data = []
+        self._run_pipeline('goods', data.extend)
+        with self.metrics.db_write():
+            return ErpiaGoodsSync(db.session, self.company_id).sync(data)
     
     def _collect_sales_with_db_save(self, start_date: str, end_date: str) -> Dict[str, Any]:
         """매출 데이터 수집 (mode=jumun) + 사은품 분류 + DB 저장 (UPSERT)"""
         logger.info(f"💰 매출 데이터 수집 및 DB 저장 시작: {start_date}~{end_date}")
         
-        # ERPia에서 데이터 수집
-        sales_data = self.erpia_client.fetch_sales_data(start_date, end_date)
+        # 수신 중인 다음 페이지와 겹쳐서 페이지별 저장
+        totals = {'product_count': 0, 'gift_count': 0, 'saved_to_db': 0, 'updated_in_db': 0}
+        stats = self._run_pipeline(
+            'jumun', lambda rows: self._accumulate(totals, self.save_sales(rows)), start_date, end_date
+        )
+        return dict(totals, data_count=stats['rows'])
+    
+    def save_sales(self, sales_data: List[Dict]) -> Dict[str, Any]:
+        """
+        매출 데이터 DB 저장 (수집/원본 재처리 공용, 같은 데이터를 다시 저장해도 결과 동일)
         
-        # 사은품 자동 분류
+        - 주문 마스터: Sl_No 기준 UPSERT
+        - 매출 분석 라인: 주문(Sl_No) 단위 교체 (기존 라인 삭제 후 재삽입)
+        """
         gift_count = 0
         product_count = 0
         saved_count = 0
         updated_count = 0
+        touched = set()
+        
+        # 같은 배치 안 중복 주문은 마지막 값 사용, Sl_No 없는 주문은 교체 기준이 없어 제외
+        orders = {}
+        for order in sales_data:
+            if order.get('sl_no'):
+                orders[order['sl_no']] = order
+            else:
+                logger.warning("⚠️ Sl_No가 없는 주문 데이터 건너뜀")
         
         try:
-            for order in sales_data:
+            touched |= self._delete_sales_lines(list(orders))
+            for order in orders.values():
                 # 주문 마스터 저장/업데이트 (Sl_No 기준 UPSERT)
                 saved, updated = self._save_order_master(order)
                 if saved:
                     saved_count += 1
                 if updated:
                     updated_count += 1
-                
+            
                 # 상품별 분석 데이터 저장
                 for product in order.get('products', []):
                     if product.get('product_type') == 'GIFT':
                         gift_count += 1
                     else:
                         product_count += 1
-                    
+                
                     # 매출 분석 테이블에 저장
-                    self._save_sales_analysis(order, product)
-            
+                    sale_date = self._save_sales_analysis(order, product)
+                    if sale_date:
+                        touched.add((sale_date.year, sale_date.month))
+        
             # 커밋
             db.session.commit()
-            logger.info(f"✅ 매출 데이터 DB 저장 완료: 신규 {saved_count}건, 업데이트 {updated_count}건")
-            
+            self.touched_sales_months |= touched
+            logger.debug(f"매출 데이터 DB 저장: 신규 {saved_count}건, 업데이트 {updated_count}건")
+        
         except Exception as e:
             db.session.rollback()
             logger.error(f"❌ 매출 데이터 DB 저장 실패: {e}")
@@ -232,12 +417,25 @@ class ErpiaBatchService:
             'data_count': len(sales_data),
             'product_count': product_count,
             'gift_count': gift_count,
-            'pages': 1,  # 실제 구현 시 페이지 수 계산
-            'execution_time': 0,
             'saved_to_db': saved_count,
             'updated_in_db': updated_count
         }
     
+    def _delete_sales_lines(self, sales_nos: List[str]) -> set:
+        """주문별 기존 매출 분석 라인 삭제 → 삭제된 라인의 (연, 월)"""
+        if not sales_nos:
+            return set()
+        rows = db.session.execute(text("""
+            WITH deleted AS (
+                DELETE FROM sales_analysis_master
+                WHERE company_id = :company_id AND sales_no = ANY(:sales_nos)
+                RETURNING sale_date
+            )
+            SELECT DISTINCT EXTRACT(YEAR FROM sale_date)::int, EXTRACT(MONTH FROM sale_date)::int
+            FROM deleted
+        """), {'company_id': self.company_id, 'sales_nos': sales_nos}).all()
+        return {(year, month) for year, month in rows}
+    
     def _save_order_master(self, order_data: Dict) -> tuple[bool, bool]:
         """주문 마스터 저장/업데이트 (Sl_No 기준 UPSERT)"""
         sl_no = order_data.get('sl_no')
@@ -264,7 +462,8 @@ class ErpiaBatchService:
             return True, False
     
     def _create_order_master(self, order_data: Dict) -> ErpiaOrderMaster:
-        """새 주문 마스터 생성"""
+        """새 주문 마스터 생성 (m_date 는 파티션 키라 비어 있으면 j_date/수집 시각 사용)"""
+        j_date = self._parse_datetime(order_data.get('j_date'))
         return ErpiaOrderMaster(
             company_id=self.company_id,
             site_key_code=order_data.get('site_key_code'),
@@ -273,7 +472,7 @@ class ErpiaBatchService:
             ger_code=order_data.get('ger_code'),
             sl_no=order_data.get('sl_no'),
             order_no=order_data.get('order_no'),
-            j_date=self._parse_datetime(order_data.get('j_date')),
+            j_date=j_date,
             j_time=order_data.get('j_time'),
             j_email=order_data.get('j_email'),
             j_id=order_data.get('j_id'),
@@ -282,7 +481,7 @@ class ErpiaBatchService:
             j_hp=order_data.get('j_hp'),
             j_post=order_data.get('j_post'),
             j_addr=order_data.get('j_addr'),
-            m_date=self._parse_datetime(order_data.get('order_date')),
+            m_date=self._parse_datetime(order_data.get('order_date')) or j_date or datetime.utcnow(),
             b_amt=order_data.get('delivery_amt', 0),
             dis_gong_amt=order_data.get('ds_gong_amt', 0),
             claim_yn=order_data.get('clam_yn'),
@@ -306,14 +505,14 @@ class ErpiaBatchService:
         existing_order.j_hp = order_data.get('j_hp')
         existing_order.j_post = order_data.get('j_post')
         existing_order.j_addr = order_data.get('j_addr')
-        existing_order.m_date = self._parse_datetime(order_data.get('order_date'))
+        existing_order.m_date = self._parse_datetime(order_data.get('order_date')) or existing_order.m_date
         existing_order.b_amt = order_data.get('delivery_amt', 0)
         existing_order.dis_gong_amt = order_data.get('ds_gong_amt', 0)
         existing_order.claim_yn = order_data.get('clam_yn')
         existing_order.site_ct_code = order_data.get('site_d_code')
     
     def _save_sales_analysis(self, order_data: Dict, product_data: Dict):
-        """매출 분석 데이터 저장"""
+        """매출 분석 데이터 저장 → 판매 일자"""
         analysis_data = SalesAnalysisMaster(
             company_id=self.company_id,
             sales_no=order_data.get('sl_no'),
@@ -340,6 +539,7 @@ class ErpiaBatchService:
             created_at=datetime.utcnow()
         )
         db.session.add(analysis_data)
+        return analysis_data.sale_date
     
     def _parse_datetime(self, date_str: str) -> datetime:
         """날짜 문자열을 datetime으로 변환"""
@@ -16,8 +16,25 @@ from typing import Dict, List, Optional, Any
 from datetime import datetime, timedelta
 import logging
 
+from app.common.metrics import observe_erpia_request
+
 logger = logging.getLogger(__name__)
 
+
+# ERPia 모드 → info 노드 파서
+PAGE_PARSERS = {
+    'jumun': '_parse_order_data',
+    'cust': '_parse_customer',
+    'goods': '_parse_goods',
+    'jegoAll': '_parse_stock',
+}
+
+
+class ErpiaFetchCancelled(Exception):
+    """페이지 콜백에서 수집 중단 요청 (배치 작업 취소)"""
+    pass
+
+
 class ErpiaApiClient:
     """
     ERPia API 클라이언트 (회사별 설정 지원)
@@ -32,8 +49,97 @@ class ErpiaApiClient:
         """
         self.company_id = company_id
         self.base_url = "http://www.erpia.net/xml/xml.asp"
+        # 페이지 수신 콜백 (mode, page, rows) - 진행률 기록 / 취소 확인용
+        self.page_callback = None
+        # 원본 페이지 보관소 (ErpiaPageArchive, 없으면 보관 안 함)
+        self.page_archive = None
         self._load_settings()
     
+    def _report_page(self, mode: str, page: int, rows: int, **timing):
+        """
+        페이지 수신 알림 (콜백에서 ErpiaFetchCancelled 발생 시 수집 중단)
+        
+        timing: fetch_ms, parse_ms, bytes, retries
+        """
+        if self.page_callback:
+            self.page_callback(mode, page, rows, **timing)
+    
+    def _request(self, params: Dict[str, Any]):
+        """ERPia 호출 (retry_count 만큼 재시도) → (response, fetch_ms, retries)"""
+        retries = 0
+        while True:
+            started = time.perf_counter()
+            try:
+                response = requests.get(self.api_url, params=params, timeout=self.timeout)
+                response.encoding = 'euc-kr'
+                response.raise_for_status()
+                elapsed = time.perf_counter() - started
+                observe_erpia_request(self.admin_code, params.get('mode'), elapsed)
+                return response, elapsed * 1000, retries
+            except requests.RequestException as e:
+                observe_erpia_request(self.admin_code, params.get('mode'), time.perf_counter() - started, error=True)
+                if retries >= self.retry_count:
+                    raise
+                retries += 1
+                logger.warning(f"⚠️ ERPia 호출 재시도 {retries}/{self.retry_count} "
+                               f"({params.get('mode')}, 페이지 {params.get('page', 1)}): {e}")
+                time.sleep(self.call_interval)
+    
+    def build_params(self, mode: str, page: int = 1, start_date: str = None, end_date: str = None) -> Dict[str, Any]:
+        """모드별 페이지 요청 파라미터"""
+        params = {'mode': mode, 'admin_code': self.admin_code, 'pwd': self.password}
+        if mode == 'jegoAll':
+            return params
+        if mode in ('jumun', 'cust'):
+            params.update(sDate=start_date, eDate=end_date)
+        if mode == 'jumun':
+            params['datetype'] = 'm'
+        params.update(onePageCnt=self.page_size, page=page)
+        return params
+    
+    def _fetch_page(self, params: Dict[str, Any]):
+        """
+        1페이지 호출 → 원본 보관 → 파싱 → 진행 알림
+        
+        Returns:
+            (rows, skipped): skipped=True 면 이미 처리한 동일 페이지라 파싱 생략 (rows=[])
+        """
+        response, fetch_ms, retries = self._request(params)
+        rows, skipped, _ = self.process_page(params, response, fetch_ms, retries)
+        return rows, skipped
+    
+    def process_page(self, params: Dict[str, Any], response, fetch_ms: float = 0, retries: int = 0):
+        """
+        수신한 응답 1페이지 처리 (보관 → 파싱 → 진행 알림) - 파이프라인 파서 단계에서도 사용
+        
+        Returns:
+            (rows, skipped, page_id): page_id 는 보관 색인 id (보관 미사용/동일 페이지면 None)
+        """
+        mode = params['mode']
+        page = params.get('page', 1)
+        parse_started = time.perf_counter()
+        
+        entry = self.page_archive.store(mode, params, response.content) if self.page_archive else None
+        if entry is not None and entry.skip:
+            rows, row_count = [], entry.row_count
+        else:
+            rows = self.parse_page(mode, response.text)
+            row_count = len(rows)
+            if entry is not None:
+                self.page_archive.set_rows(entry, row_count)
+        
+        self._report_page(mode, page, row_count, fetch_ms=fetch_ms,
+                          parse_ms=(time.perf_counter() - parse_started) * 1000,
+                          bytes=len(response.content), retries=retries)
+        skipped = entry is not None and entry.skip
+        return rows, skipped, entry.id if entry is not None and not skipped else None
+    
+    def parse_page(self, mode: str, xml_text: str) -> List[Dict]:
+        """응답 XML 1페이지 → 행 목록 (수집/원본 재처리 공용)"""
+        parser = getattr(self, PAGE_PARSERS[mode])
+        root = ET.fromstring(xml_text)
+        return [parser(info) for info in root.findall('info')]
+    
     def _load_settings(self):
         """회사별 ERPia 설정 로드"""
         try:
@@ -120,34 +226,17 @@ class ErpiaApiClient:
             if page > 1:
                 time.sleep(self.call_interval)
             
-            params = {
-                'mode': 'jumun',
-                'admin_code': self.admin_code,
-                'pwd': self.password,
-                'sDate': start_date,
-                'eDate': end_date,
-                'page': page,
-                'datetype': 'm',
-                'onePageCnt': self.page_size
-            }
+            params = self.build_params('jumun', page, start_date, end_date)
             
             try:
-                response = requests.get(self.api_url, params=params, timeout=self.timeout)
-                response.encoding = 'euc-kr'
-                response.raise_for_status()
-                
-                root = ET.fromstring(response.text)
-                info_nodes = root.findall('info')
-                
-                if not info_nodes:
+                rows, skipped = self._fetch_page(params)
+                if not rows and not skipped:
                     break
-                
-                for info in info_nodes:
-                    order_data = self._parse_order_data(info)
-                    all_orders.append(order_data)
-                
+                all_orders.extend(rows)
                 page += 1
                 
+            except ErpiaFetchCancelled:
+                raise
             except Exception as e:
                 logger.error(f"❌ 매출 데이터 수집 실패 (페이지 {page}): {e}")
                 break
@@ -301,103 +390,17 @@ class ErpiaApiClient:
             if page > 1:
                 time.sleep(self.call_interval)
             
-            params = {
-                'mode': 'cust',
-                'admin_code': self.admin_code,
-                'pwd': self.password,
-                'sDate': start_date,
-                'eDate': end_date,
-                'onePageCnt': self.page_size,
-                'page': page
-            }
+            params = self.build_params('cust', page, start_date, end_date)
             
             try:
-                response = requests.get(self.api_url, params=params, timeout=self.timeout)
-                response.encoding = 'euc-kr'
-                response.raise_for_status()
-                
-                root = ET.fromstring(response.text)
-                info_nodes = root.findall('info')
-                
-                if not info_nodes:
+                rows, skipped = self._fetch_page(params)
+                if not rows and not skipped:
                     break
-                
-                for info in info_nodes:
-                    customer_data = {
-                        # 기본 정보
-                        'customer_code': self._get_text(info, 'G_code'),      # ERPia 거래처 코드
-                        'customer_name': self._get_text(info, 'G_name'),      # 거래처명
-                        'ceo': self._get_text(info, 'G_Ceo'),                 # 대표자
-                        'business_number': self._get_text(info, 'G_Sano'),    # 사업자번호
-                        'business_type': self._get_text(info, 'G_up'),        # 업태
-                        'business_item': self._get_text(info, 'G_Jong'),      # 종목
-                        
-                        # 연락처 정보
-                        'phone': self._get_text(info, 'G_tel'),               # 전화
-                        'fax': self._get_text(info, 'G_Fax'),                 # 팩스
-                        
-                        # 담당자 정보
-                        'our_manager': self._get_text(info, 'G_Damdang'),     # (우리회사의) 거래처 담당
-                        'customer_manager': self._get_text(info, 'G_Gdamdang'), # (상대회사) 거래처의 담당자
-                        'customer_manager_tel': self._get_text(info, 'G_GDamdangTel'), # 거래처 담당자 연락처
-                        
-                        # 주소 정보
-                        'location': self._get_text(info, 'G_Location'),       # 위물도시선물
-                        'zip_code1': self._get_text(info, 'G_Post1'),         # 우편번호
-                        'address1': self._get_text(info, 'G_Juso1'),          # 주소
-                        'zip_code2': self._get_text(info, 'G_Post2'),         # 사업거치선 우편번호
-                        'address2': self._get_text(info, 'G_Juso2'),          # 사업거치선 주소
-                        
-                        # 관리 정보
-                        'remarks': self._get_text(info, 'G_Remk'),            # 비고
-                        'program_usage': self._get_text(info, 'G_Program_Sayong'), # SCM 사용여부
-                        'input_user': self._get_text(info, 'In_user'),        # 등록자
-                        'edit_date': self._get_text(info, 'editDate'),        # 최종수정일
-                        'status': self._get_text(info, 'stts'),               # 상태 (0:사용, 9:미사용)
-                        'online_code': self._get_text(info, 'G_OnCode'),      # 자체거래처코드
-                        
-                        # 세금 관련 담당자
-                        'tax_manager': self._get_text(info, 'Tax_GDamdang'),  # 사업거치선 담당자 이름
-                        'tax_manager_tel': self._get_text(info, 'Tax_GDamdangTel'), # 사업거치선 담당자 연락처
-                        'tax_email': self._get_text(info, 'Tax_Email'),       # 사업거치선 담당자 이메일
-                        
-                        # 연계 정보
-                        'link_code_acct': self._get_text(info, 'linkCodeAcct'), # 회계 연계코드
-                        'jo_type': self._get_text(info, 'G_JoType'),          # 거래(업종)구분
-                        
-                        # 매입 단가 정보
-                        'dan_ga_gu': self._get_text(info, 'G_DanGa_Gu'),      # 매입단가
-                        'discount_yul': self._get_text(info, 'G_Discount_Yul'), # 매입단가 할인율등록
-                        'discount_or_up': self._get_text(info, 'G_Discount_Or_Up'), # 할인율등록구분
-                        'use_recent_danga_yn': self._get_text(info, 'Use_Recent_DanGa_YN'), # 최근판단단가 우선적용률
-                        
-                        # 매입 단가 정보 (J 버전)
-                        'dan_ga_gu_j': self._get_text(info, 'G_DanGa_GuJ'),   # 매입단가
-                        'discount_yul_j': self._get_text(info, 'G_Discount_YulJ'), # 매입단가 할인율등록
-                        'discount_or_up_j': self._get_text(info, 'G_Discount_Or_UpJ'), # 할인율등록구분
-                        'use_recent_danga_yn_j': self._get_text(info, 'Use_Recent_DanGa_YNJ'), # 최근판단단가 우선적용률
-                        
-                        # 계좌 정보
-                        'account': self._get_text(info, 'G_Account'),         # 계좌번호
-                        'bank_name': self._get_text(info, 'G_BankName'),      # 은행명
-                        'bank_holder': self._get_text(info, 'G_BankHolder'),  # 예금주
-                        
-                        # 배송 정보
-                        'tag_code': self._get_text(info, 'G_TagCode'),        # 택배사코드
-                        'tag_cust_code': self._get_text(info, 'G_TagCustCode'), # 택배 연계코드
-                        'direct_shipping_type': self._get_text(info, 'G_DirectShippingType'), # 직배송업체구분
-                        
-                        # 추가 메모
-                        'memo': self._get_text(info, 'G_Memo'),               # 메모
-                        
-                        # ERPia 수집 정보
-                        'admin_code': self.admin_code,                        # ERPia 관리자 코드 (회사 식별용)
-                        'company_id': self.company_id
-                    }
-                    all_data.append(customer_data)
-                
+                all_data.extend(rows)
                 page += 1
                 
+            except ErpiaFetchCancelled:
+                raise
             except Exception as e:
                 logger.error(f"❌ 매장정보 수집 실패 (페이지 {page}): {e}")
                 break
@@ -409,36 +412,15 @@ class ErpiaApiClient:
         """재고 정보 수집 (mode=jegoAll) - 레거시 방식"""
         logger.info("📦 재고 정보 수집 시작 (레거시 호환)")
         
-        params = {
-            'mode': 'jegoAll',  # 레거시와 동일한 모드
-            'admin_code': self.admin_code,
-            'pwd': self.password
-        }
+        params = self.build_params('jegoAll')  # 레거시와 동일한 모드
         
         try:
-            response = requests.get(self.api_url, params=params, timeout=self.timeout)
-            response.encoding = 'euc-kr'
-            response.raise_for_status()
-            
-            root = ET.fromstring(response.text)
-            info_nodes = root.findall('info')
-            
-            result_data = []
-            for info in info_nodes:
-                stock_data = {
-                    'online_code': self._get_text(info, 'G_OnCode'),
-                    'goods_code': self._get_text(info, 'G_Code'),
-                    'goods_name': self._get_text(info, 'G_Name'),
-                    'goods_standard': self._get_text(info, 'G_Stand'),
-                    'stock_qty': self._get_text(info, 'jego'),
-                    'admin_code': self.admin_code,                        # ERPia 관리자 코드 (회사 식별용)
-                    'company_id': self.company_id
-                }
-                result_data.append(stock_data)
-            
+            result_data, _ = self._fetch_page(params)
             logger.info(f"✅ 재고 정보 수집 완료: {len(result_data)}건")
             return result_data
             
+        except ErpiaFetchCancelled:
+            raise
         except Exception as e:
             logger.error(f"❌ 재고 정보 수집 실패: {e}")
             return []
@@ -454,92 +436,17 @@ class ErpiaApiClient:
             if page > 1:
                 time.sleep(self.call_interval)
             
-            params = {
-                'mode': 'goods',
-                'admin_code': self.admin_code,
-                'pwd': self.password,
-                'onePageCnt': self.page_size,
-                'page': page
-            }
+            params = self.build_params('goods', page)
             
             try:
-                response = requests.get(self.api_url, params=params, timeout=self.timeout)
-                response.encoding = 'euc-kr'
-                response.raise_for_status()
-                
-                root = ET.fromstring(response.text)
-                info_nodes = root.findall('info')
-                
-                if not info_nodes:
+                rows, skipped = self._fetch_page(params)
+                if not rows and not skipped:
                     break
-                
-                for info in info_nodes:
-                    goods_data = {
-                        # 기본 상품 정보
-                        'online_code': self._get_text(info, 'G_OnCode'),  # 자체물상품코드
-                        'goods_code': self._get_text(info, 'G_Code'),    # ERPia 상품코드
-                        'goods_name': self._get_text(info, 'G_Name'),    # ERPia 상품명
-                        'goods_standard': self._get_text(info, 'G_Stand'), # ERPia 규격
-                        'alias_name': self._get_text(info, 'aliasName'), # 상품별칭
-                        
-                        # 제조 정보
-                        'origin': self._get_text(info, 'origin'),        # 원산지
-                        'making': self._get_text(info, 'making'),        # 제조사
-                        'brand': self._get_text(info, 'brand'),          # 브랜드
-                        
-                        # 관리 정보
-                        'date': self._get_text(info, 'date'),            # 최종수정일
-                        'damdang': self._get_text(info, 'damdang'),      # 담당자
-                        
-                        # URL 정보
-                        'url': self._get_text(info, 'url'),              # 상품상세 URL
-                        'img_url': self._get_text(info, 'imgUrl'),       # 웹당 상품 이미지 url
-                        'img_url_big': self._get_text(info, 'imgUrlBig'), # 웹당 상품 큰 이미지 url
-                        
-                        # 가격 정보
-                        'inter_amt': self._safe_int(self._get_text(info, 'interAmt')), # 인터넷 판매단가
-                        'do_amt': self._safe_int(self._get_text(info, 'doAmt')),       # 도매 판매단가
-                        'so_amt': self._safe_int(self._get_text(info, 'soAmt')),       # 소매 단가
-                        'user_amt': self._safe_int(self._get_text(info, 'userAmt')),   # 권장 소비자가
-                        'ip_amt': self._safe_int(self._get_text(info, 'ipAmt')),       # 매입 단가
-                        
-                        # 상태 정보
-                        'tax_free': self._get_text(info, 'taxfree'),     # 비과세
-                        'state': self._get_text(info, 'state'),          # 상품상태
-                        'jb_yn': self._get_text(info, 'jbYN'),           # 직배송여부
-                        
-                        # 추가 정보 (이미지에서 확인된 기타 필드들)
-                        'link_code_acct': self._get_text(info, 'linkCodeAcct'),    # 회계 연계코드
-                        'link_code_wms': self._get_text(info, 'linkCodeWms'),      # 물류 연계코드
-                        'link_code_tmp': self._get_text(info, 'linkCodeTmp'),      # 기타 연계코드
-                        'unit_kind': self._get_text(info, 'Unit_Kind'),            # 단위구분
-                        'unit': self._get_text(info, 'Unit'),                      # 단위
-                        'unit_val': self._safe_int(self._get_text(info, 'Unit_Val')), # 단위환산
-                        'remk1': self._get_text(info, 'remk1'),                    # 비고1
-                        'box_in_qty': self._safe_int(self._get_text(info, 'boxInQty')), # 1박스당 수량
-                        'bun_ryu': self._get_text(info, 'bunRyu'),                 # 분류 (= 업태 부가세 구분)
-                        'location': self._get_text(info, 'location'),              # 로케이션(창고-위치정보)
-                        'changgo_code': self._get_text(info, 'Changgo_Code'),      # 매출 창고코드
-                        'bar_code': self._get_text(info, 'barCode'),               # 바코드
-                        'bs_sale_yn': self._get_text(info, 'BS_Sale_YN'),          # 단독배송여부
-                        'concrete_yn': self._get_text(info, 'concrete_YN'),        # 유무형 구분
-                        'deposit_gubun': self._get_text(info, 'Deposit_GUBUN'),    # 무형상품분류
-                        'tag_print_yn': self._get_text(info, 'tagPrintYN'),        # 택배출력여부
-                        'g_width': self._safe_int(self._get_text(info, 'G_Width')),    # 가로(폭)
-                        'g_vertical': self._safe_int(self._get_text(info, 'G_Vertical')), # 세로(장)
-                        'g_height': self._safe_int(self._get_text(info, 'G_Height')),  # 높이(고)
-                        'g_opt_no_name': self._get_text(info, 'G_optNo_name'),     # 색상명
-                        'g_color_name': self._get_text(info, 'G_color_name'),      # 옵션명
-                        'j_beasong_yn': self._get_text(info, 'J_BeasongsYN'),      # 직배송여부
-                        
-                        # ERPia 수집 정보
-                        'admin_code': self.admin_code,                        # ERPia 관리자 코드 (회사 식별용)
-                        'company_id': self.company_id
-                    }
-                    all_data.append(goods_data)
-                
+                all_data.extend(rows)
                 page += 1
                 
+            except ErpiaFetchCancelled:
+                raise
             except Exception as e:
                 logger.error(f"❌ 상품 정보 수집 실패 (페이지 {page}): {e}")
                 break
@@ -547,6 +454,157 @@ class ErpiaApiClient:
         logger.info(f"✅ 상품 정보 수집 완료: {len(all_data)}건")
         return all_data
     
+    def _parse_customer(self, info) -> Dict:
+        """매장정보 1건 파싱 (mode=cust)"""
+        return {
+            # 기본 정보
+            'customer_code': self._get_text(info, 'G_code'),      # ERPia 거래처 코드
+            'customer_name': self._get_text(info, 'G_name'),      # 거래처명
+            'ceo': self._get_text(info, 'G_Ceo'),                 # 대표자
+            'business_number': self._get_text(info, 'G_Sano'),    # 사업자번호
+            'business_type': self._get_text(info, 'G_up'),        # 업태
+            'business_item': self._get_text(info, 'G_Jong'),      # 종목
+            
+            # 연락처 정보
+            'phone': self._get_text(info, 'G_tel'),               # 전화
+            'fax': self._get_text(info, 'G_Fax'),                 # 팩스
+            
+            # 담당자 정보
+            'our_manager': self._get_text(info, 'G_Damdang'),     # (우리회사의) 거래처 담당
+            'customer_manager': self._get_text(info, 'G_Gdamdang'), # (상대회사) 거래처의 담당자
+            'customer_manager_tel': self._get_text(info, 'G_GDamdangTel'), # 거래처 담당자 연락처
+            
+            # 주소 정보
+            'location': self._get_text(info, 'G_Location'),       # 위물도시선물
+            'zip_code1': self._get_text(info, 'G_Post1'),         # 우편번호
+            'address1': self._get_text(info, 'G_Juso1'),          # 주소
+            'zip_code2': self._get_text(info, 'G_Post2'),         # 사업거치선 우편번호
+            'address2': self._get_text(info, 'G_Juso2'),          # 사업거치선 주소
+            
+            # 관리 정보
+            'remarks': self._get_text(info, 'G_Remk'),            # 비고
+            'program_usage': self._get_text(info, 'G_Program_Sayong'), # SCM 사용여부
+            'input_user': self._get_text(info, 'In_user'),        # 등록자
+            'edit_date': self._get_text(info, 'editDate'),        # 최종수정일
+            'status': self._get_text(info, 'stts'),               # 상태 (0:사용, 9:미사용)
+            'online_code': self._get_text(info, 'G_OnCode'),      # 자체거래처코드
+            
+            # 세금 관련 담당자
+            'tax_manager': self._get_text(info, 'Tax_GDamdang'),  # 사업거치선 담당자 이름
+            'tax_manager_tel': self._get_text(info, 'Tax_GDamdangTel'), # 사업거치선 담당자 연락처
+            'tax_email': self._get_text(info, 'Tax_Email'),       # 사업거치선 담당자 이메일
+            
+            # 연계 정보
+            'link_code_acct': self._get_text(info, 'linkCodeAcct'), # 회계 연계코드
+            'jo_type': self._get_text(info, 'G_JoType'),          # 거래(업종)구분
+            
+            # 매입 단가 정보
+            'dan_ga_gu': self._get_text(info, 'G_DanGa_Gu'),      # 매입단가
+            'discount_yul': self._get_text(info, 'G_Discount_Yul'), # 매입단가 할인율등록
+            'discount_or_up': self._get_text(info, 'G_Discount_Or_Up'), # 할인율등록구분
+            'use_recent_danga_yn': self._get_text(info, 'Use_Recent_DanGa_YN'), # 최근판단단가 우선적용률
+            
+            # 매입 단가 정보 (J 버전)
+            'dan_ga_gu_j': self._get_text(info, 'G_DanGa_GuJ'),   # 매입단가
+            'discount_yul_j': self._get_text(info, 'G_Discount_YulJ'), # 매입단가 할인율등록
+            'discount_or_up_j': self._get_text(info, 'G_Discount_Or_UpJ'), # 할인율등록구분
+            'use_recent_danga_yn_j': self._get_text(info, 'Use_Recent_DanGa_YNJ'), # 최근판단단가 우선적용률
+            
+            # 계좌 정보
+            'account': self._get_text(info, 'G_Account'),         # 계좌번호
+            'bank_name': self._get_text(info, 'G_BankName'),      # 은행명
+            'bank_holder': self._get_text(info, 'G_BankHolder'),  # 예금주
+            
+            # 배송 정보
+            'tag_code': self._get_text(info, 'G_TagCode'),        # 택배사코드
+            'tag_cust_code': self._get_text(info, 'G_TagCustCode'), # 택배 연계코드
+            'direct_shipping_type': self._get_text(info, 'G_DirectShippingType'), # 직배송업체구분
+            
+            # 추가 메모
+            'memo': self._get_text(info, 'G_Memo'),               # 메모
+            
+            # ERPia 수집 정보
+            'admin_code': self.admin_code,                        # ERPia 관리자 코드 (회사 식별용)
+            'company_id': self.company_id
+        }
+
+    def _parse_goods(self, info) -> Dict:
+        """상품 1건 파싱 (mode=goods)"""
+        return {
+            # 기본 상품 정보
+            'online_code': self._get_text(info, 'G_OnCode'),  # 자체물상품코드
+            'goods_code': self._get_text(info, 'G_Code'),    # ERPia 상품코드
+            'goods_name': self._get_text(info, 'G_Name'),    # ERPia 상품명
+            'goods_standard': self._get_text(info, 'G_Stand'), # ERPia 규격
+            'alias_name': self._get_text(info, 'aliasName'), # 상품별칭
+            
+            # 제조 정보
+            'origin': self._get_text(info, 'origin'),        # 원산지
+            'making': self._get_text(info, 'making'),        # 제조사
+            'brand': self._get_text(info, 'brand'),          # 브랜드
+            
+            # 관리 정보
+            'date': self._get_text(info, 'date'),            # 최종수정일
+            'damdang': self._get_text(info, 'damdang'),      # 담당자
+            
+            # URL 정보
+            'url': self._get_text(info, 'url'),              # 상품상세 URL
+            'img_url': self._get_text(info, 'imgUrl'),       # 웹당 상품 이미지 url
+            'img_url_big': self._get_text(info, 'imgUrlBig'), # 웹당 상품 큰 이미지 url
+            
+            # 가격 정보
+            'inter_amt': self._safe_int(self._get_text(info, 'interAmt')), # 인터넷 판매단가
+            'do_amt': self._safe_int(self._get_text(info, 'doAmt')),       # 도매 판매단가
+            'so_amt': self._safe_int(self._get_text(info, 'soAmt')),       # 소매 단가
+            'user_amt': self._safe_int(self._get_text(info, 'userAmt')),   # 권장 소비자가
+            'ip_amt': self._safe_int(self._get_text(info, 'ipAmt')),       # 매입 단가
+            
+            # 상태 정보
+            'tax_free': self._get_text(info, 'taxfree'),     # 비과세
+            'state': self._get_text(info, 'state'),          # 상품상태
+            'jb_yn': self._get_text(info, 'jbYN'),           # 직배송여부
+            
+            # 추가 정보 (이미지에서 확인된 기타 필드들)
+            'link_code_acct': self._get_text(info, 'linkCodeAcct'),    # 회계 연계코드
+            'link_code_wms': self._get_text(info, 'linkCodeWms'),      # 물류 연계코드
+            'link_code_tmp': self._get_text(info, 'linkCodeTmp'),      # 기타 연계코드
+            'unit_kind': self._get_text(info, 'Unit_Kind'),            # 단위구분
+            'unit': self._get_text(info, 'Unit'),                      # 단위
+            'unit_val': self._safe_int(self._get_text(info, 'Unit_Val')), # 단위환산
+            'remk1': self._get_text(info, 'remk1'),                    # 비고1
+            'box_in_qty': self._safe_int(self._get_text(info, 'boxInQty')), # 1박스당 수량
+            'bun_ryu': self._get_text(info, 'bunRyu'),                 # 분류 (= 업태 부가세 구분)
+            'location': self._get_text(info, 'location'),              # 로케이션(창고-위치정보)
+            'changgo_code': self._get_text(info, 'Changgo_Code'),      # 매출 창고코드
+            'bar_code': self._get_text(info, 'barCode'),               # 바코드
+            'bs_sale_yn': self._get_text(info, 'BS_Sale_YN'),          # 단독배송여부
+            'concrete_yn': self._get_text(info, 'concrete_YN'),        # 유무형 구분
+            'deposit_gubun': self._get_text(info, 'Deposit_GUBUN'),    # 무형상품분류
+            'tag_print_yn': self._get_text(info, 'tagPrintYN'),        # 택배출력여부
+            'g_width': self._safe_int(self._get_text(info, 'G_Width')),    # 가로(폭)
+            'g_vertical': self._safe_int(self._get_text(info, 'G_Vertical')), # 세로(장)
+            'g_height': self._safe_int(self._get_text(info, 'G_Height')),  # 높이(고)
+            'g_opt_no_name': self._get_text(info, 'G_optNo_name'),     # 색상명
+            'g_color_name': self._get_text(info, 'G_color_name'),      # 옵션명
+            'j_beasong_yn': self._get_text(info, 'J_BeasongsYN'),      # 직배송여부
+            
+            # ERPia 수집 정보
+            'admin_code': self.admin_code,                        # ERPia 관리자 코드 (회사 식별용)
+            'company_id': self.company_id
+        }
+
+    def _parse_stock(self, info) -> Dict:
+        """재고 1건 파싱 (mode=jegoAll)"""
+        return {
+            'online_code': self._get_text(info, 'G_OnCode'),
+            'goods_code': self._get_text(info, 'G_Code'),
+            'goods_name': self._get_text(info, 'G_Name'),
+            'goods_standard': self._get_text(info, 'G_Stand'),
+            'stock_qty': self._get_text(info, 'jego'),
+            'admin_code': self.admin_code,                        # ERPia 관리자 코드 (회사 식별용)
+            'company_id': self.company_id
+        }
+    
     def _get_text(self, node, tag: str, default: str = '') -> str:
         """XML 노드에서 텍스트 안전하게 추출"""
         try:
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ERPia 상품 마스터 동기화 (mode=goods)
+- 수신 필드 전체의 MD5 해시로 변경 감지 → 신규/변경 상품만 일괄 UPSERT
+- product_details.erpia_code 인덱스로 상품상세/상품 매핑 (UPDATE 1회)
+- 미매핑/최근 변경 상품 리포트
+"""
+
+import hashlib
+import json
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Dict, List
+
+from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import insert
+
+logger = logging.getLogger(__name__)
+
+# 해시/저장 대상에서 제외 (수집 메타 정보)
+META_FIELDS = {'admin_code', 'company_id'}
+COLUMN_FIELDS = ('online_code', 'goods_name', 'goods_standard', 'brand', 'bar_code', 'state',
+                 'inter_amt', 'do_amt', 'so_amt', 'user_amt', 'ip_amt')
+UPSERT_CHUNK = 500
+
+
+def content_hash(item: Dict[str, Any]) -> str:
+    """수신 필드 해시 (키 정렬 JSON → MD5)"""
+    payload = {k: v for k, v in item.items() if k not in META_FIELDS}
+    return hashlib.md5(json.dumps(payload, sort_keys=True, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+
+class ErpiaGoodsSync:
+    """회사 1곳의 상품 마스터 동기화"""
+
+    def __init__(self, session, company_id: int):
+        self.session = session
+        self.company_id = company_id
+
+    @staticmethod
+    def ensure_indexes(session):
+        """erpia_code 매핑 조회용 인덱스 (기존 product_details 테이블)"""
+        session.execute(text("""
+            CREATE INDEX IF NOT EXISTS idx_product_details_erpia_code
+            ON product_details (erpia_code)
+            WHERE erpia_code IS NOT NULL AND erpia_code <> ''
+        """))
+        session.commit()
+
+    @staticmethod
+    def _column_lengths() -> Dict[str, int]:
+        """문자열 컬럼 최대 길이 (모델 정의 기준)"""
+        from app.common.models import ErpiaGoods
+        return {field: ErpiaGoods.__table__.c[field].type.length for field in COLUMN_FIELDS
+                if getattr(ErpiaGoods.__table__.c[field].type, 'length', None)}
+
+    def _row(self, item: Dict[str, Any], digest: str, now: datetime,
+             lengths: Dict[str, int]) -> Dict[str, Any]:
+        row = {field: item.get(field) for field in COLUMN_FIELDS}
+        for field in ('goods_name', 'goods_standard'):
+            row[field] = row[field] or ''
+        # 긴 값 하나로 전체 동기화가 롤백되지 않도록 컬럼 길이에 맞춰 자름
+        for field, length in lengths.items():
+            if isinstance(row[field], str):
+                row[field] = row[field][:length]
+        row.update(
+            company_id=self.company_id,
+            goods_code=item['goods_code'].strip(),
+            data={k: v for k, v in item.items() if k not in META_FIELDS},
+            content_hash=digest,
+            first_seen_at=now,
+            changed_at=now,
+        )
+        return row
+
+    def sync(self, goods_data: List[Dict]) -> Dict[str, Any]:
+        """해시 비교 → 변경분 UPSERT → 매핑 갱신"""
+        from app.common.models import ErpiaGoods
+
+        now = datetime.utcnow()
+        known = dict(self.session.execute(text("""
+            SELECT goods_code, content_hash FROM erpia_goods WHERE company_id = :company_id
+        """), {'company_id': self.company_id}).all())
+
+        # 페이지 경계 중복 수신 시 마지막 값 사용
+        received: Dict[str, Dict[str, Any]] = {}
+        for item in goods_data:
+            goods_code = (item.get('goods_code') or '').strip()
+            if len(goods_code) > 50:
+                logger.warning(f"⚠️ ERPia 상품코드 길이 초과로 제외: {goods_code}")
+            elif goods_code:
+                received[goods_code] = item
+
+        rows = []
+        inserted = 0
+        lengths = self._column_lengths()
+        for goods_code, item in received.items():
+            digest = content_hash(item)
+            previous = known.get(goods_code)
+            if previous == digest:
+                continue
+            if previous is None:
+                inserted += 1
+            rows.append(self._row(item, digest, now, lengths))
+
+        try:
+            table = ErpiaGoods.__table__
+            for start in range(0, len(rows), UPSERT_CHUNK):
+                stmt = insert(table)
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=[table.c.company_id, table.c.goods_code],
+                    set_={name: stmt.excluded[name] for name in COLUMN_FIELDS + ('data', 'content_hash', 'changed_at')},
+                )
+                self.session.execute(stmt, rows[start:start + UPSERT_CHUNK])
+
+            mapped = self.refresh_mapping()
+            self.session.commit()
+        except Exception:
+            self.session.rollback()
+            raise
+
+        changed = len(rows) - inserted
+        logger.info(f"✅ 상품 마스터 동기화 (회사 {self.company_id}): 수신 {len(received)}건, "
+                    f"신규 {inserted}건, 변경 {changed}건, 동일 {len(received) - len(rows)}건, 매핑 갱신 {mapped}건")
+        return {
+            'data_count': len(received),
+            'saved_to_db': inserted,
+            'updated_in_db': changed,
+            'unchanged_count': len(received) - len(rows),
+            'mapping_updated': mapped,
+        }
+
+    def refresh_mapping(self) -> int:
+        """erpia_code 로 상품상세/상품 매핑 갱신 (바뀐 행만 UPDATE), 매핑이 사라진 행은 NULL"""
+        params = {'company_id': self.company_id}
+        updated = self.session.execute(text("""
+            UPDATE erpia_goods g
+            SET product_detail_id = m.detail_id, product_id = m.product_id
+            FROM (
+                SELECT DISTINCT ON (d.erpia_code) d.erpia_code, d.id AS detail_id, d.product_id
+                FROM product_details d
+                JOIN products p ON p.id = d.product_id AND p.company_id = :company_id
+                WHERE d.erpia_code IS NOT NULL AND d.erpia_code <> ''
+                ORDER BY d.erpia_code, d.id
+            ) m
+            WHERE g.company_id = :company_id AND g.goods_code = m.erpia_code
+              AND (g.product_detail_id IS DISTINCT FROM m.detail_id OR g.product_id IS DISTINCT FROM m.product_id)
+        """), params).rowcount
+        updated += self.session.execute(text("""
+            UPDATE erpia_goods g
+            SET product_detail_id = NULL, product_id = NULL
+            WHERE g.company_id = :company_id AND g.product_detail_id IS NOT NULL
+              AND NOT EXISTS (
+                  SELECT 1 FROM product_details d
+                  WHERE d.id = g.product_detail_id AND d.erpia_code = g.goods_code
+              )
+        """), params).rowcount
+        return updated
+
+    def report(self, days: int = 7, limit: int = 200) -> Dict[str, Any]:
+        """미매핑 상품 + 최근 변경 상품 + 매핑 현황"""
+        from app.common.models import ErpiaGoods
+
+        since = datetime.utcnow() - timedelta(days=days)
+        counts = self.session.execute(text("""
+            SELECT COUNT(*) AS total,
+                   COUNT(product_detail_id) AS mapped,
+                   COUNT(*) FILTER (WHERE changed_at >= :since) AS changed
+            FROM erpia_goods WHERE company_id = :company_id
+        """), {'company_id': self.company_id, 'since': since}).mappings().one()
+
+        base = ErpiaGoods.query.filter_by(company_id=self.company_id)
+        unmapped = base.filter(ErpiaGoods.product_detail_id.is_(None)) \
+            .order_by(ErpiaGoods.goods_code).limit(limit).all()
+        changed = base.filter(ErpiaGoods.changed_at >= since) \
+            .order_by(ErpiaGoods.changed_at.desc()).limit(limit).all()
+
+        return {
+            'total': counts['total'],
+            'mapped': counts['mapped'],
+            'unmapped': counts['total'] - counts['mapped'],
+            'changed': counts['changed'],
+            'unmapped_items': [goods.to_dict() for goods in unmapped],
+            'changed_items': [goods.to_dict() for goods in changed],
+        }
+
+
+def goods_by_erpia_code(session, company_id: int, erpia_codes: List[str]) -> Dict[str, Dict[str, Any]]:
+    """상품 화면용 ERPia 가격 조회 (erpia_code → 상품 마스터, API 호출 없음)"""
+    from app.common.models import ErpiaGoods
+
+    codes = [code for code in set(erpia_codes) if code]
+    if not codes:
+        return {}
+    rows = session.query(ErpiaGoods).filter(
+        ErpiaGoods.company_id == company_id, ErpiaGoods.goods_code.in_(codes)
+    ).all()
+    return {goods.goods_code: goods.to_dict() for goods in rows}
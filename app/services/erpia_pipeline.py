@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ERPia 페이지 수집 파이프라인 (회사 1곳, 모드 1개)
+- 수신 스레드: 호출 간격(call_interval)마다 정확히 1회 호출 (호출 시작 기준 cadence)
+- 파싱 스레드: 원본 보관 + XML 파싱 + 진행 알림
+- 저장 단계: 호출한 스레드(앱 컨텍스트/DB 세션 보유)에서 페이지 단위 저장 (보관 색인 id 함께 전달)
+- 단계 사이는 크기 제한 큐 → 저장이 밀리면 수신도 대기 (메모리 상한)
+- 전체 소요 시간 ≈ 페이지 수 × 호출 간격 (파싱/저장은 대기 시간 안에 처리)
+"""
+
+import logging
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from app.services.erpia_client import ErpiaFetchCancelled
+
+logger = logging.getLogger(__name__)
+
+QUEUE_SIZE = 4
+_DONE = object()
+
+
+class ErpiaPagePipeline:
+    """수신 → 파싱 → 저장 3단계 파이프라인"""
+
+    def __init__(self, client, mode: str, start_date: str = None, end_date: str = None,
+                 queue_size: int = QUEUE_SIZE):
+        self.client = client
+        self.mode = mode
+        self.start_date = start_date
+        self.end_date = end_date
+        self._raw = queue.Queue(maxsize=queue_size)
+        self._parsed = queue.Queue(maxsize=queue_size)
+        self._stop = threading.Event()
+        self._closed = threading.Event()  # 저장 단계 종료 (더 이상 큐를 읽지 않음)
+        self._error = None
+        self.stats = {'pages': 0, 'rows': 0, 'skipped_pages': 0}
+
+    def _put(self, q: queue.Queue, item) -> bool:
+        """중단 요청 시 대기 해제되는 put"""
+        while not self._stop.is_set():
+            try:
+                q.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _fail(self, error: BaseException):
+        if self._error is None:
+            self._error = error
+        self._stop.set()
+
+    def _fetch_loop(self):
+        """호출 간격마다 1페이지 수신"""
+        page = 1
+        next_call = 0.0
+        try:
+            while not self._stop.is_set():
+                wait = next_call - time.monotonic()
+                if wait > 0 and self._stop.wait(wait):
+                    break
+                next_call = time.monotonic() + self.client.call_interval
+                params = self.client.build_params(self.mode, page, self.start_date, self.end_date)
+                try:
+                    response, fetch_ms, retries = self.client._request(params)
+                except Exception as e:
+                    logger.error(f"❌ {self.mode} 수집 실패 (페이지 {page}): {e}")
+                    break
+                if not self._put(self._raw, (params, response, fetch_ms, retries)):
+                    break
+                page += 1
+        except BaseException as e:
+            self._fail(e)
+        finally:
+            self._put_done(self._raw)
+
+    def _parse_loop(self):
+        """파싱 + 진행 알림, 빈 페이지면 수신 중단"""
+        try:
+            while not self._stop.is_set():
+                item = self._raw.get()
+                if item is _DONE:
+                    break
+                params, response, fetch_ms, retries = item
+                try:
+                    rows, skipped, page_id = self.client.process_page(params, response, fetch_ms, retries)
+                except ErpiaFetchCancelled:
+                    raise
+                except Exception as e:
+                    logger.error(f"❌ {self.mode} 파싱 실패 (페이지 {params.get('page')}): {e}")
+                    self._stop.set()
+                    break
+                if not rows and not skipped:
+                    self._stop.set()  # 마지막 페이지
+                    break
+                self.stats['pages'] += 1
+                if skipped:
+                    self.stats['skipped_pages'] += 1
+                    continue
+                if not self._put(self._parsed, (rows, page_id)):
+                    break
+        except BaseException as e:
+            self._fail(e)
+        finally:
+            self._put_done(self._parsed)
+
+    def _put_done(self, q: queue.Queue):
+        """종료 표시 (소비 단계가 끝났으면 남은 항목을 버리고 전달)"""
+        while True:
+            try:
+                q.put(_DONE, timeout=0.5)
+                return
+            except queue.Full:
+                if self._closed.is_set():
+                    try:
+                        q.get_nowait()
+                    except queue.Empty:
+                        pass
+
+    def run(self, write: Callable[[List[Dict[str, Any]], Optional[int]], None]) -> Dict[str, Any]:
+        """
+        파이프라인 실행 (write(rows, page_id) 는 호출 스레드에서 페이지마다 실행)
+
+        수신/파싱 오류는 기존 수집 루프와 같이 로그 후 그때까지 받은 페이지로 종료,
+        취소(ErpiaFetchCancelled)와 저장 오류는 호출자에게 전달한다.
+        """
+        started = time.perf_counter()
+        threads = [
+            threading.Thread(target=self._fetch_loop, name=f"erpia-fetch-{self.mode}", daemon=True),
+            threading.Thread(target=self._parse_loop, name=f"erpia-parse-{self.mode}", daemon=True),
+        ]
+        for thread in threads:
+            thread.start()
+
+        try:
+            while True:
+                item = self._parsed.get()
+                if item is _DONE:
+                    break
+                rows, page_id = item
+                write(rows, page_id)
+                self.stats['rows'] += len(rows)
+        except BaseException as e:
+            self._fail(e)
+        finally:
+            self._stop.set()
+            self._closed.set()
+            for thread in threads:
+                thread.join()
+
+        if self._error is not None:
+            raise self._error
+
+        self.stats['elapsed'] = round(time.perf_counter() - started, 2)
+        logger.info(f"✅ {self.mode} 파이프라인 완료: {self.stats['pages']}페이지 "
+                    f"(동일 {self.stats['skipped_pages']}), {self.stats['rows']}건, {self.stats['elapsed']}초")
+        return self.stats
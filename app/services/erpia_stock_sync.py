@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ERPia 재고 스냅샷 적재 (mode=jegoAll)
+- 수신 스냅샷을 임시 스테이징 테이블로 COPY 적재
+- 이전 스냅샷(erpia_stock)과 goods_code 기준 비교 → 변경된 행만 UPSERT
+- 변경분만 erpia_stock_history 에 기록 (일자별 재고 시계열, 전체 사본 저장 없음)
+- product_details.stock_quantity 를 erpia_code 조인 UPDATE 1회로 갱신
+"""
+
+import csv
+import io
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import text
+
+logger = logging.getLogger(__name__)
+
+STAGING_COLUMNS = ('goods_code', 'online_code', 'goods_name', 'goods_standard', 'stock_qty')
+CODE_LENGTH = 50  # erpia_stock.goods_code / online_code
+
+
+def _parse_qty(value) -> int:
+    """ERPia 재고 수량 ('12', '12.00', '') → int"""
+    try:
+        return int(float(value)) if value not in (None, '') else 0
+    except (ValueError, TypeError):
+        return 0
+
+
+class ErpiaStockSync:
+    """회사 1곳의 재고 스냅샷 동기화"""
+
+    def __init__(self, session, company_id: int, batch_log_id: Optional[int] = None):
+        self.session = session
+        self.company_id = company_id
+        self.batch_log_id = batch_log_id
+
+    def _load_staging(self, stock_data: List[Dict]) -> Tuple[int, int]:
+        """
+        임시 테이블 생성 + COPY 적재 (트랜잭션 종료 시 삭제) → (적재 건수, 제외 건수)
+
+        긴 값 하나로 전체 COPY 가 실패하지 않도록 상품코드 길이 초과 행은 제외, 나머지는 컬럼 길이로 자름
+        """
+        self.session.execute(text("""
+            CREATE TEMP TABLE tmp_erpia_stock (
+                goods_code VARCHAR(50),
+                online_code VARCHAR(50),
+                goods_name VARCHAR(200),
+                goods_standard VARCHAR(200),
+                stock_qty INTEGER
+            ) ON COMMIT DROP
+        """))
+
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        loaded = skipped = 0
+        for item in stock_data:
+            goods_code = (item.get('goods_code') or '').strip()
+            if not goods_code:
+                continue
+            if len(goods_code) > CODE_LENGTH:
+                logger.warning(f"⚠️ ERPia 상품코드 길이 초과로 제외: {goods_code}")
+                skipped += 1
+                continue
+            writer.writerow([
+                goods_code,
+                (item.get('online_code') or '').strip()[:CODE_LENGTH],
+                (item.get('goods_name') or '')[:200],
+                (item.get('goods_standard') or '')[:200],
+                _parse_qty(item.get('stock_qty')),
+            ])
+            loaded += 1
+        buffer.seek(0)
+
+        cursor = self.session.connection().connection.cursor()
+        try:
+            cursor.copy_expert(
+                f"COPY tmp_erpia_stock ({', '.join(STAGING_COLUMNS)}) FROM STDIN WITH (FORMAT csv)", buffer
+            )
+        finally:
+            cursor.close()
+        return loaded, skipped
+
+    def sync(self, stock_data: List[Dict]) -> Dict[str, Any]:
+        """
+        스냅샷 적재 → 변경분 UPSERT + 이력 + 상품상세 재고 갱신 (단일 트랜잭션)
+
+        빈 스냅샷(수집 실패)은 기존 재고를 0 으로 만들지 않도록 건너뛴다.
+        """
+        if not stock_data:
+            logger.warning(f"⚠️ 재고 스냅샷이 비어 있어 동기화 생략 (회사 {self.company_id})")
+            return {'data_count': 0, 'changed_count': 0, 'history_count': 0,
+                    'removed_count': 0, 'details_updated': 0, 'skipped_count': 0}
+
+        now = datetime.utcnow()
+        params = {'company_id': self.company_id, 'now': now, 'batch_log_id': self.batch_log_id}
+        try:
+            loaded, skipped = self._load_staging(stock_data)
+
+            # 같은 상품코드가 여러 행이면 마지막 값 하나만 사용
+            self.session.execute(text("""
+                CREATE TEMP TABLE tmp_erpia_stock_changes ON COMMIT DROP AS
+                SELECT n.goods_code, n.online_code, n.goods_name, n.goods_standard,
+                       n.stock_qty, s.stock_qty AS prev_qty
+                FROM (SELECT DISTINCT ON (goods_code) * FROM tmp_erpia_stock ORDER BY goods_code, ctid DESC) n
+                LEFT JOIN erpia_stock s
+                       ON s.company_id = :company_id AND s.goods_code = n.goods_code
+                WHERE s.goods_code IS NULL
+                   OR s.stock_qty IS DISTINCT FROM n.stock_qty
+                   OR s.online_code IS DISTINCT FROM n.online_code
+                   OR s.goods_name IS DISTINCT FROM n.goods_name
+                   OR s.goods_standard IS DISTINCT FROM n.goods_standard
+            """), params)
+
+            changed = self.session.execute(text("""
+                INSERT INTO erpia_stock (company_id, goods_code, online_code, goods_name, goods_standard,
+                                         stock_qty, changed_at, synced_at)
+                SELECT :company_id, goods_code, online_code, goods_name, goods_standard, stock_qty, :now, :now
+                FROM tmp_erpia_stock_changes
+                ON CONFLICT (company_id, goods_code) DO UPDATE SET
+                    online_code = EXCLUDED.online_code,
+                    goods_name = EXCLUDED.goods_name,
+                    goods_standard = EXCLUDED.goods_standard,
+                    changed_at = CASE WHEN erpia_stock.stock_qty IS DISTINCT FROM EXCLUDED.stock_qty
+                                      THEN EXCLUDED.changed_at ELSE erpia_stock.changed_at END,
+                    stock_qty = EXCLUDED.stock_qty,
+                    synced_at = EXCLUDED.synced_at
+            """), params).rowcount
+
+            # 스냅샷에서 빠진 상품 → 재고 0
+            removed = self.session.execute(text("""
+                INSERT INTO erpia_stock_history (company_id, goods_code, online_code, stock_qty, prev_qty,
+                                                 changed_at, batch_log_id)
+                SELECT company_id, goods_code, online_code, 0, stock_qty, :now, :batch_log_id
+                FROM erpia_stock s
+                WHERE s.company_id = :company_id AND s.stock_qty <> 0
+                  AND NOT EXISTS (SELECT 1 FROM tmp_erpia_stock n WHERE n.goods_code = s.goods_code)
+            """), params).rowcount
+            if removed:
+                self.session.execute(text("""
+                    UPDATE erpia_stock s SET stock_qty = 0, changed_at = :now
+                    WHERE s.company_id = :company_id AND s.stock_qty <> 0
+                      AND NOT EXISTS (SELECT 1 FROM tmp_erpia_stock n WHERE n.goods_code = s.goods_code)
+                """), params)
+
+            # 수량 변경분만 이력 기록
+            history = self.session.execute(text("""
+                INSERT INTO erpia_stock_history (company_id, goods_code, online_code, stock_qty, prev_qty,
+                                                 changed_at, batch_log_id)
+                SELECT :company_id, goods_code, online_code, stock_qty, prev_qty, :now, :batch_log_id
+                FROM tmp_erpia_stock_changes
+                WHERE prev_qty IS DISTINCT FROM stock_qty
+            """), params).rowcount
+
+            # 상품상세 재고 (erpia_code = ERPia 상품코드, 회사 상품만)
+            details_updated = self.session.execute(text("""
+                UPDATE product_details d
+                SET stock_quantity = s.stock_qty, updated_at = :now
+                FROM erpia_stock s, products p
+                WHERE s.company_id = :company_id
+                  AND d.erpia_code = s.goods_code
+                  AND p.id = d.product_id AND p.company_id = s.company_id
+                  AND d.stock_quantity IS DISTINCT FROM s.stock_qty
+            """), params).rowcount
+
+            self.session.execute(text("""
+                UPDATE erpia_stock SET synced_at = :now WHERE company_id = :company_id
+            """), params)
+            self.session.commit()
+        except Exception:
+            self.session.rollback()
+            raise
+
+        if details_updated:
+            from app.services.product_catalog import product_catalog
+            product_catalog.refresh(self.session)
+
+        logger.info(f"✅ 재고 스냅샷 동기화 (회사 {self.company_id}): 수신 {loaded}건, 변경 {changed}건, "
+                    f"이력 {history + removed}건, 품절 처리 {removed}건, 상품상세 {details_updated}건, "
+                    f"제외 {skipped}건")
+        return {
+            'data_count': loaded,
+            'changed_count': changed,
+            'history_count': history + removed,
+            'removed_count': removed,
+            'details_updated': details_updated,
+            'skipped_count': skipped,
+        }
+
+
+def stock_series(session, company_id: int, goods_code: str, start: datetime, end: datetime) -> List[Dict[str, Any]]:
+    """
+    일자별 재고 시계열 (변경 이력에서 복원)
+
+    구간 시작 이전 마지막 값을 기준으로 각 일자의 마지막 변경 수량을 이어 붙인다.
+    """
+    rows = session.execute(text("""
+        WITH days AS (
+            SELECT generate_series(CAST(:start AS date), CAST(:end AS date), interval '1 day')::date AS day
+        )
+        SELECT d.day,
+               (SELECT h.stock_qty FROM erpia_stock_history h
+                WHERE h.company_id = :company_id AND h.goods_code = :goods_code
+                  AND h.changed_at < d.day + 1
+                ORDER BY h.changed_at DESC LIMIT 1) AS stock_qty
+        FROM days d
+        ORDER BY d.day
+    """), {'company_id': company_id, 'goods_code': goods_code, 'start': start, 'end': end}).mappings()
+    return [{'date': row['day'].isoformat(), 'stock_qty': row['stock_qty']} for row in rows]
+
+
+def compact_stock_history(session, company_id: int, older_than_days: int = 90) -> int:
+    """
+    오래된 재고 이력 압축: 하루에 여러 번 바뀐 상품은 그날 마지막 변경만 남김
+
+    일자별 시계열(stock_series) 결과는 압축 전후 동일하다.
+    """
+    cutoff = datetime.utcnow() - timedelta(days=older_than_days)
+    try:
+        deleted = session.execute(text("""
+            DELETE FROM erpia_stock_history h
+            USING (
+                SELECT id, ROW_NUMBER() OVER (
+                    PARTITION BY goods_code, changed_at::date ORDER BY changed_at DESC, id DESC
+                ) AS rn
+                FROM erpia_stock_history
+                WHERE company_id = :company_id AND changed_at < :cutoff
+            ) ranked
+            WHERE h.id = ranked.id AND ranked.rn > 1
+        """), {'company_id': company_id, 'cutoff': cutoff}).rowcount
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+    if deleted:
+        logger.info(f"🧹 재고 이력 압축 (회사 {company_id}, {older_than_days}일 이전): {deleted}건 삭제")
+    return deleted
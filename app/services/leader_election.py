@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+PostgreSQL advisory lock 기반 리더 선출 / 작업 락
+- gunicorn 워커가 여러 개여도 스케줄러는 리더 프로세스 하나에서만 실행
+- 리더 프로세스가 죽으면 DB 세션 종료와 함께 락 해제 → 다른 프로세스가 승계
+- 회사/단계별 작업 락으로 수동 실행과 스케줄 실행의 중복 방지
+"""
+
+import logging
+import os
+import socket
+import threading
+import zlib
+from contextlib import contextmanager
+from typing import Callable, Optional
+
+from sqlalchemy import text
+
+logger = logging.getLogger(__name__)
+
+# advisory lock 네임스페이스 (pg_try_advisory_lock(int, int) 의 첫 번째 키)
+LEADER_LOCK_NAMESPACE = 7301
+JOB_LOCK_NAMESPACE = 7302
+
+
+def lock_key(name: str) -> int:
+    """문자열 → advisory lock 두 번째 키 (signed int4)"""
+    value = zlib.crc32(name.encode('utf-8'))
+    return value - (1 << 32) if value >= (1 << 31) else value
+
+
+def process_identity() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class LeaderElector:
+    """
+    세션 수준 advisory lock 을 전용 커넥션으로 보유하는 리더 선출기
+
+    - try_acquire(): 즉시 1회 시도
+    - start(): 백그라운드 스레드에서 주기적으로 시도/상태 확인 (자동 승계)
+    """
+
+    def __init__(self, engine, name: str, interval: int = 15,
+                 on_elected: Optional[Callable[[], None]] = None,
+                 on_demoted: Optional[Callable[[], None]] = None):
+        self.engine = engine
+        self.name = name
+        self.key = lock_key(name)
+        self.interval = interval
+        self.on_elected = on_elected
+        self.on_demoted = on_demoted
+        self.identity = process_identity()
+
+        self._conn = None
+        self._lock = threading.RLock()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    @property
+    def is_leader(self) -> bool:
+        return self._conn is not None
+
+    def try_acquire(self) -> bool:
+        """리더 락 획득 시도 (이미 리더면 True)"""
+        with self._lock:
+            if self._conn is not None:
+                return True
+            conn = None
+            try:
+                conn = self.engine.connect()
+                acquired = conn.execute(
+                    text("SELECT pg_try_advisory_lock(:ns, :key)"),
+                    {'ns': LEADER_LOCK_NAMESPACE, 'key': self.key}
+                ).scalar()
+                conn.commit()
+                if acquired:
+                    self._conn = conn
+                    logger.info(f"👑 리더 선출됨: {self.name} ({self.identity})")
+                    return True
+                conn.close()
+                return False
+            except Exception as e:
+                logger.warning(f"⚠️ 리더 락 획득 실패 ({self.name}): {e}")
+                if conn is not None:
+                    try:
+                        conn.close()
+                    except Exception:
+                        pass
+                return False
+
+    def release(self):
+        """리더 락 해제"""
+        with self._lock:
+            if self._conn is None:
+                return
+            try:
+                self._conn.execute(
+                    text("SELECT pg_advisory_unlock(:ns, :key)"),
+                    {'ns': LEADER_LOCK_NAMESPACE, 'key': self.key}
+                )
+                self._conn.commit()
+            except Exception as e:
+                logger.warning(f"⚠️ 리더 락 해제 실패 ({self.name}): {e}")
+            finally:
+                try:
+                    self._conn.close()
+                except Exception:
+                    pass
+                self._conn = None
+                logger.info(f"⏹️ 리더 해제: {self.name} ({self.identity})")
+
+    def _check_alive(self) -> bool:
+        """보유 커넥션 생존 확인 (끊기면 락도 이미 해제된 상태)"""
+        with self._lock:
+            if self._conn is None:
+                return False
+            try:
+                self._conn.execute(text("SELECT 1"))
+                self._conn.commit()
+                return True
+            except Exception as e:
+                logger.error(f"❌ 리더 커넥션 끊김 ({self.name}): {e}")
+                try:
+                    self._conn.invalidate()
+                except Exception:
+                    pass
+                self._conn = None
+                return False
+
+    def _loop(self):
+        while not self._stop_event.is_set():
+            try:
+                if self.is_leader:
+                    if not self._check_alive() and self.on_demoted:
+                        self.on_demoted()
+                elif self.try_acquire() and self.on_elected:
+                    self.on_elected()
+            except Exception as e:
+                logger.error(f"❌ 리더 선출 루프 오류 ({self.name}): {e}")
+            self._stop_event.wait(self.interval)
+
+    def start(self):
+        """백그라운드 선출 루프 시작"""
+        if self._thread and self._thread.is_alive():
+            return
+        self.identity = process_identity()  # gunicorn preload: 마스터에서 생성 후 워커에서 시작
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._loop, name=f"leader-{self.name}", daemon=True)
+        self._thread.start()
+
+    def shutdown(self):
+        """선출 루프 중지 + 락 해제"""
+        self._stop_event.set()
+        self.release()
+
+
+@contextmanager
+def advisory_lock(engine, name: str):
+    """
+    작업 단위 advisory lock (비대기)
+
+    with advisory_lock(engine, 'DAILY_COLLECTION:1') as acquired:
+        if not acquired: ... 이미 실행 중
+    """
+    key = lock_key(name)
+    conn = engine.connect()
+    acquired = False
+    try:
+        acquired = bool(conn.execute(
+            text("SELECT pg_try_advisory_lock(:ns, :key)"),
+            {'ns': JOB_LOCK_NAMESPACE, 'key': key}
+        ).scalar())
+        conn.commit()
+        yield acquired
+    finally:
+        if acquired:
+            try:
+                conn.execute(
+                    text("SELECT pg_advisory_unlock(:ns, :key)"),
+                    {'ns': JOB_LOCK_NAMESPACE, 'key': key}
+                )
+                conn.commit()
+            except Exception as e:
+                logger.warning(f"⚠️ 작업 락 해제 실패 ({name}): {e}")
+        conn.close()
+
+
+def is_locked(engine, name: str) -> bool:
+    """작업 락 보유 여부 (다른 세션 포함)"""
+    with engine.connect() as conn:
+        return bool(conn.execute(text("""
+            SELECT EXISTS (
+                SELECT 1 FROM pg_locks
+                WHERE locktype = 'advisory' AND objsubid = 2
+                  AND classid::bigint = :ns AND objid::bigint = :key AND granted
+            )
+        """), {'ns': JOB_LOCK_NAMESPACE, 'key': lock_key(name) & 0xFFFFFFFF}).scalar())
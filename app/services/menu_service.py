@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+메뉴 트리 서비스
+- tbl_category(Menu) + 사용자/부서 권한으로 사용자별 유효 메뉴 트리 구성
+- Redis 캐시 (메뉴 버전 + 권한 버전 스탬프)
+- 사이드바 템플릿에 nav_menu 로 주입
+"""
+
+import logging
+from typing import Dict, List, Any
+
+from app.common.cache import cache, TTL
+from app.services.permission_service import permission_service, SUPER_KEY, AUTH_READ, VERSION_NAME as PERMISSION_VERSION
+
+logger = logging.getLogger(__name__)
+
+VERSION_NAME = 'menu'
+
+
+class MenuService:
+    """사용자별 네비게이션 메뉴 트리"""
+
+    def _stamp(self) -> str:
+        return f"v{cache.get_version(VERSION_NAME)}.{cache.get_version(PERMISSION_VERSION)}"
+
+    def _load_menus(self, stamp: str) -> List[Dict[str, Any]]:
+        """웹 사용 메뉴 전체 (1회 조회, 캐시)"""
+        key = f"menu:{stamp}:all"
+        menus = cache.get_json(key)
+        if menus is None:
+            from app.common.models import db, Menu
+            menus = [{
+                'seq': row.seq,
+                'parent_seq': row.parent_seq,
+                'depth': row.depth or 0,
+                'sort': row.sort or 0,
+                'icon': row.icon,
+                'name': row.name,
+                'url': row.url,
+            } for row in db.session.query(
+                Menu.seq, Menu.parent_seq, Menu.depth, Menu.sort,
+                Menu.icon, Menu.name, Menu.url
+            ).filter(Menu.use_web_yn == 'Y').order_by(Menu.depth.asc(), Menu.sort.asc(), Menu.seq.asc())]
+            cache.set_json(key, menus, TTL['master_data'])
+        return menus
+
+    @staticmethod
+    def build_tree(menus: List[Dict[str, Any]], bits: Dict[str, int]) -> List[Dict[str, Any]]:
+        """읽기 권한이 있는 메뉴만 트리로 구성 (권한 있는 하위 메뉴의 상위는 포함)"""
+        is_super = SUPER_KEY in bits
+        nodes = {m['seq']: dict(m, children=[]) for m in menus}
+
+        def readable(seq) -> bool:
+            return is_super or bool(bits.get(str(seq), 0) & AUTH_READ)
+
+        roots = []
+        # depth 오름차순으로 정렬되어 있으므로 상위 노드가 먼저 생성됨
+        for menu in menus:
+            node = nodes[menu['seq']]
+            parent = nodes.get(menu['parent_seq'])
+            if parent is not None:
+                parent['children'].append(node)
+            else:
+                roots.append(node)
+
+        def prune(items):
+            visible = []
+            for node in items:
+                node['children'] = prune(node['children'])
+                if node['children'] or readable(node['seq']):
+                    visible.append(node)
+            return visible
+
+        return prune(roots)
+
+    def get_user_menu(self, user_seq: int) -> List[Dict[str, Any]]:
+        """사용자 유효 메뉴 트리 (캐시 우선)"""
+        if not user_seq:
+            return []
+
+        stamp = self._stamp()
+        key = f"menu:{stamp}:user:{user_seq}"
+        tree = cache.get_json(key)
+        if tree is None:
+            tree = self.build_tree(self._load_menus(stamp), permission_service.get_user_bits(user_seq))
+            cache.set_json(key, tree, TTL['permissions'])
+        return tree
+
+    def invalidate(self):
+        """메뉴 추가/수정/삭제 후 호출"""
+        version = cache.bump_version(VERSION_NAME)
+        logger.info(f"🔧 메뉴 캐시 무효화 (version={version})")
+        return version
+
+
+# 전역 인스턴스
+menu_service = MenuService()
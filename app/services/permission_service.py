@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+권한 서비스
+- MemberAuth / DeptAuth 를 각각 한 번의 쿼리로 로드
+- 사용자 권한 + 소속 부서 권한을 메뉴별 CRUD 비트셋으로 병합
+- Redis 캐시 (permissions 버전 스탬프, 권한 저장 시 무효화)
+"""
+
+import logging
+from functools import wraps
+from typing import Dict, Any, Optional, Union
+
+from flask import g, session, jsonify, redirect, request, has_app_context
+
+from app.common.cache import cache, TTL
+
+logger = logging.getLogger(__name__)
+
+# CRUD 비트
+AUTH_CREATE = 1
+AUTH_READ = 2
+AUTH_UPDATE = 4
+AUTH_DELETE = 8
+AUTH_ALL = AUTH_CREATE | AUTH_READ | AUTH_UPDATE | AUTH_DELETE
+
+ACTION_BITS = {
+    'create': AUTH_CREATE,
+    'read': AUTH_READ,
+    'update': AUTH_UPDATE,
+    'delete': AUTH_DELETE,
+}
+
+# 슈퍼유저 표시 키 (모든 메뉴 전체 권한)
+SUPER_KEY = '*'
+
+VERSION_NAME = 'permissions'
+
+
+def flags_to_mask(auth_create, auth_read, auth_update, auth_delete) -> int:
+    """Y/N 플래그 4개 → CRUD 비트"""
+    mask = 0
+    if auth_create == 'Y':
+        mask |= AUTH_CREATE
+    if auth_read == 'Y':
+        mask |= AUTH_READ
+    if auth_update == 'Y':
+        mask |= AUTH_UPDATE
+    if auth_delete == 'Y':
+        mask |= AUTH_DELETE
+    return mask
+
+
+def mask_to_flags(mask: int) -> Dict[str, str]:
+    """CRUD 비트 → 기존 API 응답 형식 (Y/N)"""
+    return {
+        'auth_create': 'Y' if mask & AUTH_CREATE else 'N',
+        'auth_read': 'Y' if mask & AUTH_READ else 'N',
+        'auth_update': 'Y' if mask & AUTH_UPDATE else 'N',
+        'auth_delete': 'Y' if mask & AUTH_DELETE else 'N',
+    }
+
+
+class PermissionService:
+    """메뉴 × CRUD 권한 비트셋 서비스"""
+
+    def _key(self, name: str) -> str:
+        return f"permissions:v{cache.get_version(VERSION_NAME)}:{name}"
+
+    # ------------------------------------------------------------------
+    # 권한 스냅샷 (전체 사용자/부서 부여 내역)
+    # ------------------------------------------------------------------
+    def _load_grants(self) -> Dict[str, Any]:
+        """MemberAuth, DeptAuth, MemberDept 각 1회 조회"""
+        from app.common.models import db, MemberAuth, DeptAuth, MemberDept, User
+
+        members: Dict[str, Dict[str, int]] = {}
+        for member_seq, menu_seq, c, r, u, d in db.session.query(
+            MemberAuth.member_seq, MemberAuth.menu_seq,
+            MemberAuth.auth_create, MemberAuth.auth_read,
+            MemberAuth.auth_update, MemberAuth.auth_delete
+        ):
+            mask = flags_to_mask(c, r, u, d)
+            if mask:
+                user_masks = members.setdefault(str(member_seq), {})
+                user_masks[str(menu_seq)] = user_masks.get(str(menu_seq), 0) | mask
+
+        departments: Dict[str, Dict[str, int]] = {}
+        for dept_seq, menu_seq, c, r, u, d in db.session.query(
+            DeptAuth.dept_seq, DeptAuth.menu_seq,
+            DeptAuth.auth_create, DeptAuth.auth_read,
+            DeptAuth.auth_update, DeptAuth.auth_delete
+        ):
+            mask = flags_to_mask(c, r, u, d)
+            if mask:
+                dept_masks = departments.setdefault(str(dept_seq), {})
+                dept_masks[str(menu_seq)] = dept_masks.get(str(menu_seq), 0) | mask
+
+        user_depts: Dict[str, list] = {}
+        for member_seq, dept_seq in db.session.query(MemberDept.member_seq, MemberDept.dept_seq):
+            user_depts.setdefault(str(member_seq), []).append(str(dept_seq))
+
+        super_users = [
+            str(seq) for (seq,) in db.session.query(User.seq).filter(User.super_user == 'Y')
+        ]
+
+        return {
+            'members': members,
+            'departments': departments,
+            'user_depts': user_depts,
+            'super_users': super_users,
+        }
+
+    def get_grants(self) -> Dict[str, Any]:
+        """전체 권한 스냅샷 (요청 내 메모 → Redis → DB)"""
+        memo = getattr(g, '_permission_grants', None) if has_app_context() else None
+        if memo is not None:
+            return memo
+
+        key = self._key('grants')
+        grants = cache.get_json(key)
+        if grants is None:
+            grants = self._load_grants()
+            cache.set_json(key, grants, TTL['permissions'])
+
+        if has_app_context():
+            g._permission_grants = grants
+        return grants
+
+    # ------------------------------------------------------------------
+    # 사용자 유효 권한
+    # ------------------------------------------------------------------
+    def _merge_user(self, grants: Dict[str, Any], user_seq: int) -> Dict[str, int]:
+        uid = str(user_seq)
+        if uid in grants['super_users']:
+            return {SUPER_KEY: AUTH_ALL}
+
+        merged = dict(grants['members'].get(uid, {}))
+        for dept_seq in grants['user_depts'].get(uid, []):
+            for menu_seq, mask in grants['departments'].get(dept_seq, {}).items():
+                merged[menu_seq] = merged.get(menu_seq, 0) | mask
+        return merged
+
+    def get_user_bits(self, user_seq: int) -> Dict[str, int]:
+        """사용자 메뉴별 CRUD 비트셋 {menu_seq: mask}"""
+        if not user_seq:
+            return {}
+
+        memo_name = f'_permission_bits_{user_seq}'
+        if has_app_context() and hasattr(g, memo_name):
+            return getattr(g, memo_name)
+
+        key = self._key(f"user:{user_seq}")
+        bits = cache.get_json(key)
+        if bits is None:
+            bits = self._merge_user(self.get_grants(), user_seq)
+            cache.set_json(key, bits, TTL['permissions'])
+
+        if has_app_context():
+            setattr(g, memo_name, bits)
+        return bits
+
+    def has_permission(self, user_seq: int, menu_seq: int, action: str = 'read') -> bool:
+        """메뉴 권한 확인 (비트 연산)"""
+        bits = self.get_user_bits(user_seq)
+        if SUPER_KEY in bits:
+            return True
+        return bool(bits.get(str(menu_seq), 0) & ACTION_BITS.get(action, AUTH_READ))
+
+    def get_menu_seq_by_url(self, url: str) -> Optional[int]:
+        """메뉴 URL → menu seq (캐시)"""
+        key = self._key('menu_urls')
+        url_map = cache.get_json(key)
+        if url_map is None:
+            from app.common.models import db, Menu
+            url_map = {
+                row.url: row.seq
+                for row in db.session.query(Menu.seq, Menu.url).filter(Menu.url.isnot(None))
+            }
+            cache.set_json(key, url_map, TTL['permissions'])
+        return url_map.get(url)
+
+    # ------------------------------------------------------------------
+    # 무효화
+    # ------------------------------------------------------------------
+    def invalidate(self):
+        """권한/메뉴 저장 후 호출 - 버전 증가로 모든 사용자 캐시 무효화"""
+        version = cache.bump_version(VERSION_NAME)
+        if has_app_context():
+            for name in [n for n in vars(g) if n.startswith('_permission_')]:
+                delattr(g, name)
+        logger.info(f"🔧 권한 캐시 무효화 (version={version})")
+        return version
+
+
+# 전역 인스턴스
+permission_service = PermissionService()
+
+
+def require_permission(menu: Union[int, str], action: str = 'read'):
+    """
+    메뉴 권한 필요 데코레이터
+
+    Args:
+        menu: 메뉴 seq 또는 메뉴 URL
+        action: create / read / update / delete
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            user_seq = session.get('member_seq')
+            if not user_seq:
+                return redirect('/auth/login')
+
+            menu_seq = menu if isinstance(menu, int) else permission_service.get_menu_seq_by_url(menu)
+            if menu_seq is None or not permission_service.has_permission(user_seq, menu_seq, action):
+                logger.warning(f"⚠️ 권한 부족: user={user_seq}, menu={menu}, action={action}")
+                if request.is_json or '/api/' in request.path:
+                    return jsonify({'success': False, 'message': '권한이 없습니다.'}), 403
+                return redirect('/')
+
+            return f(*args, **kwargs)
+        return decorated_function
+    return decorator
@@ -0,0 +1,409 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+상품 카탈로그 읽기 모델
+- products + product_details + tbl_code 코드명을 평탄화한 product_catalog 구체화 뷰
+- 상품/코드 수정 시 REFRESH MATERIALIZED VIEW CONCURRENTLY로 갱신
+- 상품 목록, 엑셀 다운로드, 상품 상세, 제품모델 목록 API의 단일 조회 소스
+"""
+
+import logging
+import threading
+from typing import Dict, List, Any, Optional, Tuple
+
+from sqlalchemy import text
+
+logger = logging.getLogger(__name__)
+
+# 상품(products) 1행 + 상세(product_details) N행을 하나로 펼친 뷰
+# - 상세가 없는 상품도 detail_key = 0 으로 1행 포함
+# - detail_rank = 1 인 행이 상품 목록의 대표 행 (자가코드 = 첫 번째 상세)
+# - CONCURRENTLY 갱신을 위해 (product_id, detail_key) 유니크 인덱스 필요
+CATALOG_VIEW_SQL = """
+CREATE MATERIALIZED VIEW IF NOT EXISTS product_catalog AS
+SELECT
+    p.id AS product_id,
+    COALESCE(d.id, 0) AS detail_key,
+    ROW_NUMBER() OVER (PARTITION BY p.id ORDER BY d.id) AS detail_rank,
+
+    -- 상품 마스터
+    p.company_id,
+    c.company_name,
+    p.product_name,
+    p.product_code,
+    p.price,
+    p.description,
+    p.manual_file_path,
+    p.is_active,
+    p.use_yn,
+    p.legacy_seq,
+    p.created_at,
+    p.updated_at,
+    p.created_by,
+    p.updated_by,
+    p.brand_code_seq,
+    brand.code_name AS brand_name,
+    p.category_code_seq,
+    category.code_name AS category_name,
+    p.type_code_seq,
+    ptype.code_name AS type_name,
+    p.year_code_seq,
+    pyear.code_name AS year_name,
+    p.color_code_seq,
+    pcolor.code_name AS color_name,
+    p.div_type_code_seq,
+    pdiv.code_name AS div_type_name,
+    p.product_code_seq,
+    pcode.code_name AS product_code_name,
+    category.parent_seq AS category_parent_seq,
+    category_parent.code AS category_parent_code,
+
+    -- 상품 상세 (제품모델)
+    d.id AS detail_id,
+    d.std_div_prod_code,
+    d.product_name AS detail_product_name,
+    d.brand_code AS detail_brand_code,
+    d.div_type_code AS detail_div_type_code,
+    d.prod_group_code AS detail_prod_group_code,
+    d.prod_type_code AS detail_prod_type_code,
+    d.prod_code AS detail_prod_code,
+    d.prod_type2_code AS detail_prod_type2_code,
+    d.year_code AS detail_year_code,
+    d.color_code AS detail_color_code,
+    d.additional_price AS detail_additional_price,
+    d.stock_quantity AS detail_stock_quantity,
+    d.status AS detail_status,
+    d.use_yn AS detail_use_yn,
+    d.douzone_code AS detail_douzone_code,
+    d.erpia_code AS detail_erpia_code,
+    d.official_cost AS detail_official_cost,
+    d.consumer_price AS detail_consumer_price,
+    d.operation_price AS detail_operation_price,
+    d.ans_value AS detail_ans_value,
+    d.detail_brand_code_seq AS detail_detail_brand_code_seq,
+    d.color_detail_code_seq AS detail_color_detail_code_seq,
+    d.product_division_code_seq AS detail_product_division_code_seq,
+    d.product_group_code_seq AS detail_product_group_code_seq,
+    d.item_code_seq AS detail_item_code_seq,
+    d.item_detail_code_seq AS detail_item_detail_code_seq,
+    d.product_type_category_code_seq AS detail_product_type_category_code_seq,
+    d.created_at AS detail_created_at,
+    d.updated_at AS detail_updated_at,
+    d.created_by AS detail_created_by,
+    d.updated_by AS detail_updated_by,
+    cr.seq AS detail_color_code_seq,
+    cr.code_name AS detail_color_code_name,
+    COALESCE(cr.code_name, any_color.code_name) AS detail_color_name,
+    dt.code_name AS detail_div_type_name,
+    tp.code_name AS detail_type_name
+FROM products p
+LEFT JOIN companies c ON c.id = p.company_id
+LEFT JOIN tbl_code brand ON brand.seq = p.brand_code_seq
+LEFT JOIN tbl_code category ON category.seq = p.category_code_seq
+LEFT JOIN tbl_code category_parent ON category_parent.seq = category.parent_seq
+LEFT JOIN tbl_code ptype ON ptype.seq = p.type_code_seq
+LEFT JOIN tbl_code pyear ON pyear.seq = p.year_code_seq
+LEFT JOIN tbl_code pcolor ON pcolor.seq = p.color_code_seq
+LEFT JOIN tbl_code pdiv ON pdiv.seq = p.div_type_code_seq
+LEFT JOIN tbl_code pcode ON pcode.seq = p.product_code_seq
+LEFT JOIN product_details d ON d.product_id = p.id
+LEFT JOIN LATERAL (
+    -- 색상은 CR 그룹 하위 코드 기준
+    SELECT x.seq, x.code_name
+    FROM tbl_code x
+    JOIN tbl_code g ON g.seq = x.parent_seq AND g.depth = 0 AND g.code_name = 'CR'
+    WHERE x.code = d.color_code
+    ORDER BY x.seq
+    LIMIT 1
+) cr ON TRUE
+LEFT JOIN LATERAL (
+    SELECT x.code_name FROM tbl_code x WHERE x.code = d.color_code ORDER BY x.seq LIMIT 1
+) any_color ON TRUE
+LEFT JOIN LATERAL (
+    SELECT x.code_name FROM tbl_code x WHERE x.code = d.div_type_code ORDER BY x.seq LIMIT 1
+) dt ON TRUE
+LEFT JOIN LATERAL (
+    SELECT x.code_name FROM tbl_code x WHERE x.code = d.prod_type_code ORDER BY x.seq LIMIT 1
+) tp ON TRUE
+WITH DATA
+"""
+
+CATALOG_INDEX_SQL = [
+    "CREATE UNIQUE INDEX IF NOT EXISTS uq_product_catalog_key ON product_catalog (product_id, detail_key)",
+    "CREATE INDEX IF NOT EXISTS idx_product_catalog_list ON product_catalog (company_id, detail_rank, is_active)",
+    "CREATE INDEX IF NOT EXISTS idx_product_catalog_detail ON product_catalog (detail_id)",
+]
+
+# 상품 목록 정렬 허용 컬럼 (기존 Product 속성명과 동일)
+SORTABLE_COLUMNS = {
+    'id': 'product_id',
+    'product_name': 'product_name',
+    'product_code': 'product_code',
+    'price': 'price',
+    'is_active': 'is_active',
+    'created_at': 'created_at',
+    'updated_at': 'updated_at',
+    'brand_code_seq': 'brand_code_seq',
+    'category_code_seq': 'category_code_seq',
+    'type_code_seq': 'type_code_seq',
+    'year_code_seq': 'year_code_seq',
+}
+
+
+def _iso(value):
+    return value.isoformat() if value else None
+
+
+class ProductCatalog:
+    """product_catalog 구체화 뷰 관리 및 조회"""
+
+    def __init__(self):
+        self._refresh_lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # 뷰 관리
+    # ------------------------------------------------------------------
+    def ensure_view(self, session) -> bool:
+        """구체화 뷰와 인덱스 생성 (이미 있으면 건너뜀)"""
+        try:
+            session.execute(text(CATALOG_VIEW_SQL))
+            for sql in CATALOG_INDEX_SQL:
+                session.execute(text(sql))
+            session.commit()
+            logger.info("✅ product_catalog 구체화 뷰 준비 완료")
+            return True
+        except Exception as e:
+            session.rollback()
+            logger.error(f"❌ product_catalog 구체화 뷰 생성 실패: {e}")
+            return False
+
+    def refresh(self, session) -> bool:
+        """
+        구체화 뷰 동시 갱신 (조회 차단 없음)
+
+        상품/상세/코드 변경 커밋 직후 호출. 갱신 실패는 원 작업을 실패시키지 않는다.
+        """
+        with self._refresh_lock:
+            try:
+                session.execute(text("REFRESH MATERIALIZED VIEW CONCURRENTLY product_catalog"))
+                session.commit()
+                return True
+            except Exception as e:
+                session.rollback()
+                logger.warning(f"⚠️ product_catalog 갱신 실패: {e}")
+                return False
+
+    # ------------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _build_filters(company_id: int, search_name: str = '', search_product: Optional[int] = None,
+                       search_type: Optional[int] = None, show_inactive: bool = False) -> Tuple[str, Dict[str, Any]]:
+        clauses = ["company_id = :company_id", "detail_rank = 1"]
+        params: Dict[str, Any] = {'company_id': company_id}
+
+        if not show_inactive:
+            clauses.append("is_active = TRUE")
+        if search_name:
+            clauses.append("product_name ILIKE :search_name")
+            params['search_name'] = f'%{search_name}%'
+        if search_product:
+            clauses.append("category_code_seq = :search_product")
+            params['search_product'] = search_product
+        if search_type:
+            clauses.append("type_code_seq = :search_type")
+            params['search_type'] = search_type
+
+        return " AND ".join(clauses), params
+
+    def list_products(self, session, company_id: int, page: int = 1, per_page: int = 50,
+                      sort_by: str = 'created_at', sort_direction: str = 'desc', **filters) -> Dict[str, Any]:
+        """상품 목록 (페이징) - 기존 Product.to_dict() 형식 유지"""
+        where, params = self._build_filters(company_id, **filters)
+        sort_column = SORTABLE_COLUMNS.get(sort_by, 'created_at')
+        direction = 'ASC' if str(sort_direction).lower() == 'asc' else 'DESC'
+
+        total = session.execute(
+            text(f"SELECT COUNT(*) FROM product_catalog WHERE {where}"), params
+        ).scalar() or 0
+
+        page = max(page, 1)
+        params.update({'limit': per_page, 'offset': (page - 1) * per_page})
+        rows = session.execute(text(f"""
+            SELECT * FROM product_catalog
+            WHERE {where}
+            ORDER BY {sort_column} {direction} NULLS LAST, product_id {direction}
+            LIMIT :limit OFFSET :offset
+        """), params).mappings().all()
+
+        pages = (total + per_page - 1) // per_page if per_page else 0
+        return {
+            'items': [self.product_dict(row) for row in rows],
+            'pagination': {
+                'page': page,
+                'per_page': per_page,
+                'total': total,
+                'pages': pages,
+                'has_prev': page > 1,
+                'has_next': page < pages
+            }
+        }
+
+    def detail_stats(self, session) -> Dict[str, int]:
+        """제품모델 통계 (전체 / 자가코드 보유)"""
+        row = session.execute(text("""
+            SELECT COUNT(detail_id) AS total_products,
+                   COUNT(NULLIF(std_div_prod_code, '')) AS std_code_products
+            FROM product_catalog
+        """)).mappings().first()
+        return {
+            'total_products': row['total_products'] if row else 0,
+            'std_code_products': row['std_code_products'] if row else 0
+        }
+
+    def export_rows(self, session, company_id: int, limit: int = 1000, **filters) -> List[Dict[str, Any]]:
+        """엑셀 다운로드용 상품 행"""
+        where, params = self._build_filters(company_id, **filters)
+        params['limit'] = limit
+        rows = session.execute(text(f"""
+            SELECT * FROM product_catalog
+            WHERE {where}
+            ORDER BY product_id
+            LIMIT :limit
+        """), params).mappings().all()
+        return [self.product_dict(row) for row in rows]
+
+    def get_product(self, session, product_id: int, company_id: int) -> Optional[Dict[str, Any]]:
+        """상품 1건 + 제품모델 목록"""
+        rows = session.execute(text("""
+            SELECT * FROM product_catalog
+            WHERE product_id = :product_id AND company_id = :company_id
+            ORDER BY detail_rank
+        """), {'product_id': product_id, 'company_id': company_id}).mappings().all()
+
+        if not rows:
+            return None
+
+        return {
+            'product': self.product_dict(rows[0]),
+            'row': rows[0],
+            'models': [
+                dict(self.model_dict(row),
+                     color_code_seq=row['detail_color_code_seq'],
+                     color_code_name=row['detail_color_code_name'])
+                for row in rows if row['detail_id'] is not None
+            ]
+        }
+
+    def list_models(self, session, product_id: Optional[int] = None) -> List[Dict[str, Any]]:
+        """제품모델 목록 (최신순) - ProductDetail.to_dict() + 코드명"""
+        where = "detail_id IS NOT NULL"
+        params: Dict[str, Any] = {}
+        if product_id is not None:
+            where += " AND product_id = :product_id"
+            params['product_id'] = product_id
+
+        rows = session.execute(text(f"""
+            SELECT * FROM product_catalog
+            WHERE {where}
+            ORDER BY detail_created_at DESC NULLS LAST, detail_id DESC
+        """), params).mappings().all()
+        return [self.model_dict(row) for row in rows]
+
+    # ------------------------------------------------------------------
+    # 행 변환
+    # ------------------------------------------------------------------
+    @staticmethod
+    def product_dict(row) -> Dict[str, Any]:
+        """Product.to_dict()와 동일한 키 구성"""
+        return {
+            'id': row['product_id'],
+            'company_id': row['company_id'],
+            'company_name': row['company_name'] or '',
+            'brand_code_seq': row['brand_code_seq'],
+            'brand_name': row['brand_name'] or '',
+            'category_code_seq': row['category_code_seq'],
+            'category_name': row['category_name'] or '',
+            'type_code_seq': row['type_code_seq'],
+            'type_name': row['type_name'] or '',
+            'year_code_seq': row['year_code_seq'],
+            'year_name': row['year_name'] or '',
+            'year_code_name': row['year_name'] or '',  # 템플릿 호환성
+            'color_code_seq': row['color_code_seq'],
+            'color_name': row['color_name'] or '',
+            'div_type_code_seq': row['div_type_code_seq'],
+            'div_type_name': row['div_type_name'] or '',
+            'product_code_seq': row['product_code_seq'],
+            'product_code_name': row['product_code_name'] or '',
+            'product_name': row['product_name'],
+            'product_code': row['product_code'],
+            'std_product_code': row['std_div_prod_code'],  # 첫 번째 상세의 자가코드
+            'price': row['price'],
+            'description': row['description'],
+            'manual_file_path': row['manual_file_path'],
+            'is_active': row['is_active'],
+            'use_yn': row['use_yn'],
+            'legacy_seq': row['legacy_seq'],
+            'created_at': _iso(row['created_at']),
+            'updated_at': _iso(row['updated_at']),
+            'created_by': row['created_by'],
+            'updated_by': row['updated_by']
+        }
+
+    @staticmethod
+    def model_dict(row) -> Dict[str, Any]:
+        """ProductDetail.to_dict() + 색상/구분타입/타입 코드명"""
+        model = {
+            'id': row['detail_id'],
+            'product_id': row['product_id'],
+            'brand_code': row['detail_brand_code'],
+            'div_type_code': row['detail_div_type_code'],
+            'prod_group_code': row['detail_prod_group_code'],
+            'prod_type_code': row['detail_prod_type_code'],
+            'prod_code': row['detail_prod_code'],
+            'prod_type2_code': row['detail_prod_type2_code'],
+            'year_code': row['detail_year_code'],
+            'color_code': row['detail_color_code'],
+            'std_div_prod_code': row['std_div_prod_code'],
+            'product_name': row['detail_product_name'],
+            'additional_price': row['detail_additional_price'],
+            'stock_quantity': row['detail_stock_quantity'],
+            'status': row['detail_status'],
+            'use_yn': row['detail_use_yn'],
+            'douzone_code': row['detail_douzone_code'],
+            'erpia_code': row['detail_erpia_code'],
+            'official_cost': row['detail_official_cost'],
+            'consumer_price': row['detail_consumer_price'],
+            'operation_price': row['detail_operation_price'],
+            'ans_value': row['detail_ans_value'],
+            'detail_brand_code_seq': row['detail_detail_brand_code_seq'],
+            'color_detail_code_seq': row['detail_color_detail_code_seq'],
+            'product_division_code_seq': row['detail_product_division_code_seq'],
+            'product_group_code_seq': row['detail_product_group_code_seq'],
+            'item_code_seq': row['detail_item_code_seq'],
+            'item_detail_code_seq': row['detail_item_detail_code_seq'],
+            'product_type_category_code_seq': row['detail_product_type_category_code_seq'],
+            'created_at': _iso(row['detail_created_at']),
+            'updated_at': _iso(row['detail_updated_at']),
+            'created_by': row['detail_created_by'],
+            'updated_by': row['detail_updated_by']
+        }
+
+        if row['detail_color_code']:
+            model['color_name'] = row['detail_color_name'] or row['detail_color_code']
+        if row['detail_div_type_code']:
+            model['div_type_name'] = row['detail_div_type_name'] or row['detail_div_type_code']
+        if row['detail_prod_type_code']:
+            model['type_name'] = row['detail_type_name'] or row['detail_prod_type_code']
+
+        return model
+
+
+# 전역 인스턴스
+product_catalog = ProductCatalog()
+
+
+def refresh_product_catalog():
+    """상품/코드 변경 후 카탈로그 갱신 (라우트에서 커밋 직후 호출)"""
+    from app.common.models import db
+    return product_catalog.refresh(db.session)
@@ -0,0 +1,471 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+매출 분석 인메모리 컬럼 큐브 (docs/08, docs/11 브랜드/채널/기간/사은품 분석)
+- 회사별 월 단위 청크: 차원은 회사별 사전으로 정수 코드(int32), 측정값은 int64
+- 조회: 기간 + 필터 + 그룹 차원 + 측정값 + 상위 N (SQL GROUP BY 없이 메모리에서 집계)
+- 갱신: 배치가 저장한 월을 mark_changed() 로 알림 → Redis 해시(sales_cube:{회사})의 월별 스탬프
+  조회 시 스탬프가 바뀐 월만 다시 읽음 (웹/워커 프로세스가 달라도 동작)
+  Redis 장애 시에는 SALES_CUBE_MAX_AGE 초가 지난 월을 다시 읽음
+- 메모리 상한(SALES_CUBE_MAX_MB): 월 청크 + 회사별 차원 사전 크기 합계 기준
+  초과 시 가장 오래 안 쓴 월 청크부터 제거, 청크가 모두 빠진 회사는 사전까지 제거
+- 판매 번호는 사전 없이 64비트 해시로 보관 (주문 수만큼 사전이 커지지 않도록)
+- 월 적재(DB 조회)는 전역 락 밖에서, (회사, 월)별 적재 락으로 같은 월 중복 적재만 방지
+- gunicorn 워커마다 별도 큐브를 가지므로 상한은 프로세스당 값
+"""
+
+import logging
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import text
+
+from app.common.cache import REDIS_DB, cache
+from app.services.sales_partitions import add_months
+from app.services.sales_parquet import months_between
+
+logger = logging.getLogger(__name__)
+
+# 차원 이름 → sales_analysis_master 컬럼 (문자열, 회사별 사전 인코딩)
+DIMENSIONS = {
+    'brand': 'brand_code',
+    'brand_name': 'brand_name',
+    'channel': 'site_code',
+    'customer': 'ger_code',
+    'product': 'product_code',
+    'product_name': 'product_name',
+    'product_type': 'product_type',
+    'category': 'analysis_category',
+    'gift_classification': 'gift_classification',
+}
+# 판매 일자에서 파생되는 차원
+DATE_DIMENSIONS = ('date', 'month', 'year')
+
+# 측정값 (lines = 라인 수, orders = 판매 번호 고유 수)
+MEASURES = ('amount', 'quantity', 'supply_amount', 'delivery_amt', 'lines', 'orders')
+SUM_MEASURES = ('amount', 'quantity', 'supply_amount', 'delivery_amt')
+
+MAX_GROUP_ROWS = 10000  # top 미지정 시 응답 행 상한
+DICTIONARY_ENTRY_OVERHEAD = 80  # 사전 값 1개당 dict 항목 + list 슬롯 (근사치)
+
+Month = Tuple[int, int]
+
+
+class CubeQueryError(ValueError):
+    """잘못된 조회 조건 (API 400)"""
+
+
+def _truthy(value) -> bool:
+    if isinstance(value, str):
+        return value.strip().lower() in ('1', 'true', 'y', 'yes')
+    return bool(value)
+
+
+class DimensionDictionary:
+    """문자열 ↔ 정수 코드 (0 = 값 없음)"""
+
+    def __init__(self):
+        self.values: List[Optional[str]] = [None]
+        self.codes: Dict[str, int] = {}
+        self.nbytes = 0  # 메모리 상한 계산용 근사 크기
+
+    def encode(self, values: Iterable[Optional[str]]):
+        import numpy as np
+
+        codes = self.codes
+        encoded = []
+        for value in values:
+            if not value:
+                encoded.append(0)
+                continue
+            code = codes.get(value)
+            if code is None:
+                code = codes[value] = len(self.values)
+                self.values.append(value)
+                self.nbytes += sys.getsizeof(value) + DICTIONARY_ENTRY_OVERHEAD
+            encoded.append(code)
+        return np.asarray(encoded, dtype=np.int32)
+
+    def lookup(self, values: Iterable[Optional[str]]) -> List[int]:
+        """필터 값 → 코드 (없는 값은 제외)"""
+        return [0 if not value else self.codes[value] for value in values if not value or value in self.codes]
+
+    def decode(self, codes):
+        import numpy as np
+        return np.asarray(self.values, dtype=object)[codes]
+
+
+@dataclass
+class MonthChunk:
+    """회사 1곳 × 1개월 컬럼 묶음 (pandas DataFrame, 코드/측정값만 보관)"""
+    frame: Any
+    stamp: Optional[str]
+    loaded_at: float
+    nbytes: int
+    last_used: float = field(default_factory=time.monotonic)
+
+
+class CompanyCube:
+    def __init__(self, company_id: int):
+        self.company_id = company_id
+        self.dictionaries = {name: DimensionDictionary() for name in DIMENSIONS}
+        self.chunks: Dict[Month, MonthChunk] = {}
+        self.encode_lock = threading.Lock()  # 월 적재 동시 진행 시 사전 코드 중복 방지
+
+    @property
+    def dictionary_bytes(self) -> int:
+        return sum(dictionary.nbytes for dictionary in self.dictionaries.values())
+
+    @property
+    def nbytes(self) -> int:
+        return self.dictionary_bytes + sum(chunk.nbytes for chunk in self.chunks.values())
+
+
+class SalesCube:
+    """회사별 매출 큐브 저장소 (프로세스 전역 1개)"""
+
+    def __init__(self):
+        self.max_bytes = 512 * 1024 * 1024
+        self.max_age = 600
+        self.max_months = 24
+        self.engine = None
+        self._companies: Dict[int, CompanyCube] = {}
+        self._lock = threading.RLock()  # _companies / chunks 구조 변경 (DB 조회 중에는 잡지 않음)
+        self._loading: Dict[Tuple[int, Month], threading.Lock] = {}  # (회사, 월)별 적재 락
+
+    def init_app(self, app):
+        self.max_bytes = int(app.config.get('SALES_CUBE_MAX_MB', 512)) * 1024 * 1024
+        self.max_age = int(app.config.get('SALES_CUBE_MAX_AGE', 600))
+        self.max_months = int(app.config.get('SALES_CUBE_MAX_MONTHS', 24))
+        app.extensions['sales_cube'] = self
+
+    def _engine(self):
+        if self.engine is None:
+            from app.common.models import db
+            return db.engine
+        return self.engine
+
+    # ------------------------------------------------------------------
+    # 변경 알림 / 스탬프
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _stamp_key(company_id: int) -> str:
+        return f"sales_cube:{company_id}"
+
+    def mark_changed(self, company_id: int, months: Iterable[Month]):
+        """배치 저장 후 호출: 해당 월 스탬프 증가 (+ 이 프로세스의 청크 즉시 무효화)"""
+        months = sorted(set(months))
+        if not months:
+            return
+        with self._lock:
+            company = self._companies.get(company_id)
+            if company:
+                for month in months:
+                    company.chunks.pop(month, None)
+        if not cache.available:
+            return
+        try:
+            pipe = cache.client(REDIS_DB['cache']).pipeline(transaction=False)
+            for year, month in months:
+                pipe.hincrby(self._stamp_key(company_id), f"{year}{month:02d}", 1)
+            pipe.execute()
+        except Exception as e:
+            logger.warning(f"⚠️ 매출 큐브 변경 알림 실패 (회사 {company_id}): {e}")
+
+    def _stamps(self, company_id: int) -> Optional[Dict[str, str]]:
+        """월별 스탬프 (Redis 장애 시 None → 경과 시간 기준 갱신)"""
+        if not cache.available:
+            return None
+        try:
+            raw = cache.client(REDIS_DB['cache']).hgetall(self._stamp_key(company_id))
+            return {key.decode(): value.decode() for key, value in raw.items()}
+        except Exception as e:
+            logger.warning(f"⚠️ 매출 큐브 스탬프 조회 실패 (회사 {company_id}): {e}")
+            return None
+
+    # ------------------------------------------------------------------
+    # 적재 / 제거
+    # ------------------------------------------------------------------
+    def _load_month(self, company: CompanyCube, year: int, month: int, stamp: Optional[str]) -> MonthChunk:
+        """월 1개 조회 (회사/월 파티션 1개만 스캔) → 코드화된 청크"""
+        import numpy as np
+        import pandas as pd
+
+        start = date(year, month, 1)
+        dimension_columns = list(DIMENSIONS.values())
+        with self._engine().connect() as conn:
+            rows = conn.execute(text(f"""
+                SELECT sale_date, sales_no, {', '.join(dimension_columns)},
+                       COALESCE(total_amount, 0), COALESCE(quantity, 0),
+                       COALESCE(supply_price, 0) * COALESCE(quantity, 0), COALESCE(delivery_amt, 0),
+                       COALESCE(is_revenue, TRUE)
+                FROM sales_analysis_master
+                WHERE company_id = :company_id AND sale_date >= :start AND sale_date < :end
+            """), {'company_id': company.company_id, 'start': start, 'end': add_months(start, 1)}).all()
+
+        columns = list(zip(*rows)) if rows else [()] * (len(dimension_columns) + 7)
+        days = np.asarray(columns[0], dtype='datetime64[D]')
+        data = {
+            'day': days,
+            'order': pd.util.hash_array(np.asarray(columns[1], dtype=object)),
+        }
+        with company.encode_lock:
+            for offset, name in enumerate(DIMENSIONS, start=2):
+                data[name] = company.dictionaries[name].encode(columns[offset])
+        measure_offset = 2 + len(DIMENSIONS)
+        for offset, name in enumerate(SUM_MEASURES, start=measure_offset):
+            data[name] = np.asarray(columns[offset], dtype=np.int64)
+        data['is_revenue'] = np.asarray(columns[measure_offset + len(SUM_MEASURES)], dtype=bool)
+
+        frame = pd.DataFrame(data)
+        return MonthChunk(frame=frame, stamp=stamp, loaded_at=time.monotonic(),
+                          nbytes=int(frame.memory_usage(index=False).sum()))
+
+    def _is_stale(self, chunk: MonthChunk, stamp: Optional[str], stamps: Optional[Dict[str, str]]) -> bool:
+        if stamps is None:
+            return time.monotonic() - chunk.loaded_at > self.max_age
+        return chunk.stamp != stamp
+
+    def _chunks(self, company_id: int, months: List[Month]) -> Tuple[CompanyCube, List[MonthChunk]]:
+        """
+        조회 월 청크 확보 (없거나 바뀐 월만 다시 읽음)
+
+        조회 월은 제거 대상에서 빠지므로 조회 분량만으로 메모리 상한을 넘으면 적재를 멈추고 거부
+        """
+        stamps = self._stamps(company_id)
+        while True:
+            with self._lock:
+                company = self._companies.setdefault(company_id, CompanyCube(company_id))
+            chunks = []
+            loaded = 0
+            for year, month in months:
+                stamp = stamps.get(f"{year}{month:02d}") if stamps else None
+                chunk, fresh = self._chunk(company, (year, month), stamp, stamps)
+                chunks.append(chunk)
+                loaded += fresh
+                if company.dictionary_bytes + sum(c.nbytes for c in chunks) > self.max_bytes:
+                    with self._lock:
+                        self._evict(keep=set())
+                    raise CubeQueryError('조회 기간의 매출 데이터가 큐브 메모리 상한을 초과합니다. 기간을 줄여주세요.')
+            with self._lock:
+                # 적재 중 회사가 제거되면 (사전이 바뀌므로) 다시 확보
+                if self._companies.get(company_id) is not company:
+                    continue
+                for chunk in chunks:
+                    chunk.last_used = time.monotonic()
+                if loaded:
+                    logger.info(f"🧊 매출 큐브 적재 (회사 {company_id}): {loaded}개 월")
+                    self._evict(keep={(company_id, month) for month in months})
+                return company, chunks
+
+    def _chunk(self, company: CompanyCube, month: Month, stamp: Optional[str],
+               stamps: Optional[Dict[str, str]]) -> Tuple[MonthChunk, bool]:
+        """월 청크 1개 (캐시 적중 또는 적재) → (청크, 새로 적재 여부)"""
+        key = (company.company_id, month)
+        with self._lock:
+            chunk = company.chunks.get(month)
+            if chunk is not None and not self._is_stale(chunk, stamp, stamps):
+                return chunk, False
+            guard = self._loading.setdefault(key, threading.Lock())
+        with guard:
+            # 같은 월을 먼저 적재한 요청이 있으면 그 결과 사용
+            with self._lock:
+                chunk = company.chunks.get(month)
+                if chunk is not None and not self._is_stale(chunk, stamp, stamps):
+                    return chunk, False
+            try:
+                chunk = self._load_month(company, month[0], month[1], stamp)
+                with self._lock:
+                    company.chunks[month] = chunk
+            finally:
+                with self._lock:
+                    if self._loading.get(key) is guard:
+                        del self._loading[key]
+        return chunk, True
+
+    def _evict(self, keep: set):
+        """메모리 상한 초과 시 가장 오래 안 쓴 월부터 제거 (이번 조회 월 제외, 빈 회사는 사전까지)"""
+        total = sum(company.nbytes for company in self._companies.values())
+        if total <= self.max_bytes:
+            return
+        entries = sorted(
+            (chunk.last_used, company_id, month)
+            for company_id, company in self._companies.items()
+            for month, chunk in company.chunks.items()
+        )
+        for _, company_id, month in entries:
+            if total <= self.max_bytes:
+                break
+            if (company_id, month) in keep:
+                continue
+            company = self._companies[company_id]
+            total -= company.chunks.pop(month).nbytes
+            if not company.chunks:
+                total -= company.dictionary_bytes
+                del self._companies[company_id]
+        # 변경 알림으로 청크가 모두 빠진 회사 (적재 중인 회사 제외)
+        loading = {company_id for company_id, _ in self._loading}
+        keep_companies = {company_id for company_id, _ in keep}
+        for company_id in [cid for cid, company in self._companies.items()
+                           if not company.chunks and cid not in loading and cid not in keep_companies]:
+            del self._companies[company_id]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'max_mb': round(self.max_bytes / 1024 / 1024, 1),
+                'used_mb': round(sum(company.nbytes for company in self._companies.values()) / 1024 / 1024, 1),
+                'companies': {
+                    company_id: {
+                        'months': len(company.chunks),
+                        'rows': sum(len(chunk.frame) for chunk in company.chunks.values()),
+                        'dictionary_mb': round(company.dictionary_bytes / 1024 / 1024, 1),
+                    }
+                    for company_id, company in self._companies.items()
+                },
+            }
+
+    # ------------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------------
+    def query(self, company_id: int, start: date, end: date, group_by: Optional[List[str]] = None,
+              measures: Optional[List[str]] = None, filters: Optional[Dict[str, List[Any]]] = None,
+              top: Optional[int] = None, order_by: Optional[str] = None) -> Dict[str, Any]:
+        """
+        기간(start ~ end, 양끝 포함) 집계
+
+        filters: {'brand': ['AB'], 'channel': [...], 'is_revenue': [True]}
+        group_by: DIMENSIONS / date / month / year 조합
+        top + order_by: 측정값 내림차순 상위 N (order_by 기본 첫 측정값)
+        """
+        import numpy as np
+        import pandas as pd
+
+        started = time.perf_counter()
+        group_by = list(group_by or [])
+        measures = list(measures or ['amount', 'quantity'])
+        filters = filters or {}
+        self._validate(start, end, group_by, measures, filters, order_by)
+        months = months_between(start, end)
+        if len(months) > self.max_months:
+            raise CubeQueryError(f"조회 기간은 최대 {self.max_months}개월입니다.")
+
+        company, chunks = self._chunks(company_id, months)
+        dictionaries = company.dictionaries
+
+        # 청크별 필터 후 결합 (필요한 컬럼만)
+        lo, hi = np.datetime64(start, 'D'), np.datetime64(end, 'D')
+        needed = {'day'} | {name for name in group_by if name in DIMENSIONS} \
+            | {name for name in measures if name in SUM_MEASURES}
+        if 'orders' in measures:
+            needed.add('order')
+        parts, scanned = [], 0
+        for chunk in chunks:
+            frame = chunk.frame
+            scanned += len(frame)
+            mask = (frame['day'].values >= lo) & (frame['day'].values <= hi)
+            for name, values in filters.items():
+                if name == 'is_revenue':
+                    mask &= np.isin(frame['is_revenue'].values, [_truthy(value) for value in values])
+                else:
+                    mask &= np.isin(frame[name].values, dictionaries[name].lookup(values))
+            if mask.any():
+                parts.append(frame.loc[mask, sorted(needed)])
+        data = pd.concat(parts, ignore_index=True) if parts else pd.DataFrame(columns=sorted(needed))
+
+        if 'date' in group_by:
+            data['date'] = data['day']
+        if 'month' in group_by:
+            data['month'] = data['day'].values.astype('datetime64[M]')
+        if 'year' in group_by:
+            data['year'] = data['day'].values.astype('datetime64[Y]')
+
+        total = self._aggregate_total(data, measures)
+        if group_by and len(data):
+            grouped = self._aggregate_groups(data, group_by, measures)
+            order_by = order_by or measures[0]
+            if top:
+                grouped = grouped.nlargest(int(top), order_by)
+            else:
+                grouped = grouped.sort_values(order_by, ascending=False).head(MAX_GROUP_ROWS)
+            rows = self._decode(grouped, group_by, measures, dictionaries)
+            group_count = None if top else len(rows)
+        else:
+            rows, group_count = [], 0 if group_by else None
+
+        return {
+            'company_id': company_id,
+            'start': start.isoformat(),
+            'end': end.isoformat(),
+            'group_by': group_by,
+            'measures': measures,
+            'rows': rows,
+            'total': total,
+            'group_count': group_count,
+            'matched_lines': int(len(data)),
+            'scanned_lines': scanned,
+            'elapsed_ms': round((time.perf_counter() - started) * 1000, 1),
+        }
+
+    @staticmethod
+    def _validate(start, end, group_by, measures, filters, order_by):
+        if start > end:
+            raise CubeQueryError('시작일이 종료일보다 늦습니다.')
+        unknown = [name for name in group_by if name not in DIMENSIONS and name not in DATE_DIMENSIONS]
+        unknown += [name for name in filters if name not in DIMENSIONS and name != 'is_revenue']
+        if unknown:
+            raise CubeQueryError(f"알 수 없는 차원: {', '.join(unknown)}")
+        invalid = [name for name in measures if name not in MEASURES]
+        if invalid:
+            raise CubeQueryError(f"알 수 없는 측정값: {', '.join(invalid)}")
+        if order_by and order_by not in measures:
+            raise CubeQueryError(f"정렬 기준은 조회 측정값 중 하나여야 합니다: {order_by}")
+
+    @staticmethod
+    def _aggregate_total(data, measures) -> Dict[str, int]:
+        total = {}
+        for name in measures:
+            if name == 'lines':
+                total[name] = int(len(data))
+            elif name == 'orders':
+                total[name] = int(data['order'].nunique())
+            else:
+                total[name] = int(data[name].sum())
+        return total
+
+    @staticmethod
+    def _aggregate_groups(data, group_by, measures):
+        aggregations = {}
+        for name in measures:
+            if name == 'lines':
+                aggregations[name] = ('day', 'size')
+            elif name == 'orders':
+                aggregations[name] = ('order', 'nunique')
+            else:
+                aggregations[name] = (name, 'sum')
+        return data.groupby(group_by, sort=False).agg(**aggregations).reset_index()
+
+    @staticmethod
+    def _decode(grouped, group_by, measures, dictionaries) -> List[Dict[str, Any]]:
+        columns = {}
+        for name in group_by:
+            values = grouped[name].values
+            if name in DIMENSIONS:
+                columns[name] = dictionaries[name].decode(values)
+            elif name == 'date':
+                columns[name] = [str(value) for value in values.astype('datetime64[D]')]
+            elif name == 'month':
+                columns[name] = [str(value) for value in values.astype('datetime64[M]')]
+            else:
+                columns[name] = [int(str(value)) for value in values.astype('datetime64[Y]')]
+        for name in measures:
+            columns[name] = [int(value) for value in grouped[name].values]
+        return [dict(zip(columns, values)) for values in zip(*columns.values())]
+
+
+# 전역 큐브 인스턴스
+sales_cube = SalesCube()
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+매출 분석 Parquet 스냅샷 (분석용 컬럼 저장소)
+- sales_analysis_master → {root}/company_id={회사}/year={연}/month={월}/part-0.parquet
+- 브랜드/사이트/상품 등 반복 코드 컬럼은 사전(dictionary) 인코딩 → pandas Categorical
+- 배치에서 변경된 (회사, 월) 파티션만 다시 씀 (임시 파일 → os.replace, 읽는 쪽은 이전/새 파일 중 하나만 봄)
+- 읽기: load_sales_table / load_sales_frame (기간 지정, 메모리 맵, PostgreSQL 접속 없음)
+
+사용 예:
+    from app.services.sales_parquet import load_sales_frame
+    df = load_sales_frame('./sales_parquet', 1, date(2023, 1, 1), date(2025, 6, 30),
+                          columns=['sale_date', 'brand_code', 'quantity', 'total_amount'])
+"""
+
+import logging
+import os
+import tempfile
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import text
+
+from app.services.sales_partitions import add_months
+
+logger = logging.getLogger(__name__)
+
+FILE_NAME = 'part-0.parquet'
+ROW_GROUP_SIZE = 128 * 1024
+
+# 반복 값이 많은 코드/분류 컬럼 (사전 인코딩)
+DICTIONARY_COLUMNS = {
+    'site_code', 'ger_code', 'product_code', 'product_name', 'product_type',
+    'brand_code', 'brand_name', 'analysis_category', 'gift_classification',
+}
+
+# 컬럼 → Arrow 타입 이름 (파티션 간 스키마 고정)
+COLUMNS = [
+    ('id', 'int64'), ('company_id', 'int32'), ('sales_no', 'string'), ('sale_date', 'date32'),
+    ('site_code', 'string'), ('ger_code', 'string'), ('customer_name', 'string'),
+    ('product_code', 'string'), ('product_name', 'string'), ('product_type', 'string'),
+    ('brand_code', 'string'), ('brand_name', 'string'),
+    ('quantity', 'int64'), ('supply_price', 'int64'), ('sell_price', 'int64'),
+    ('total_amount', 'int64'), ('delivery_amt', 'int64'),
+    ('is_revenue', 'bool'), ('analysis_category', 'string'), ('gift_classification', 'string'),
+    ('recipient_name', 'string'), ('address', 'string'), ('tracking_no', 'string'),
+    ('created_at', 'timestamp'), ('updated_at', 'timestamp'),
+]
+
+Month = Tuple[int, int]
+
+
+def _arrow_schema():
+    import pyarrow as pa
+
+    types = {
+        'int32': pa.int32(), 'int64': pa.int64(), 'string': pa.string(), 'bool': pa.bool_(),
+        'date32': pa.date32(), 'timestamp': pa.timestamp('us'),
+    }
+    fields = []
+    for name, type_name in COLUMNS:
+        arrow_type = types[type_name]
+        if name in DICTIONARY_COLUMNS:
+            arrow_type = pa.dictionary(pa.int32(), arrow_type)
+        fields.append(pa.field(name, arrow_type))
+    return pa.schema(fields)
+
+
+def partition_path(root: str, company_id: int, year: int, month: int) -> str:
+    return os.path.join(root, f"company_id={int(company_id)}", f"year={int(year)}",
+                        f"month={int(month):02d}", FILE_NAME)
+
+
+def months_between(start: date, end: date) -> List[Month]:
+    """start ~ end 가 걸치는 (연, 월) 목록"""
+    months = []
+    current = date(start.year, start.month, 1)
+    while current <= end:
+        months.append((current.year, current.month))
+        current = add_months(current, 1)
+    return months
+
+
+class SalesParquetExporter:
+    """회사 1곳의 월 파티션 Parquet 스냅샷 작성"""
+
+    def __init__(self, engine, root: str, company_id: int, compression: str = 'zstd'):
+        self.engine = engine
+        self.root = root
+        self.company_id = company_id
+        self.compression = compression
+
+    @classmethod
+    def from_config(cls, app, company_id: int):
+        """설정 기반 생성 (SALES_PARQUET_DIR 은 절대 경로 필수)"""
+        from app.common.models import db
+        root = app.config.get('SALES_PARQUET_DIR') or ''
+        if not os.path.isabs(root):
+            raise ValueError(f"SALES_PARQUET_DIR 는 절대 경로여야 합니다: '{root}'")
+        return cls(db.engine, root, company_id,
+                   compression=app.config.get('SALES_PARQUET_COMPRESSION', 'zstd'))
+
+    def _fetch_month(self, year: int, month: int):
+        """월 1개 조회 (회사/월 파티션 1개만 스캔) → Arrow 테이블"""
+        import pyarrow as pa
+
+        start = date(year, month, 1)
+        with self.engine.connect() as conn:
+            rows = conn.execute(text(f"""
+                SELECT {', '.join(name for name, _ in COLUMNS)} FROM sales_analysis_master
+                WHERE company_id = :company_id AND sale_date >= :start AND sale_date < :end
+                ORDER BY sale_date, id
+            """), {'company_id': self.company_id, 'start': start, 'end': add_months(start, 1)}).all()
+
+        schema = _arrow_schema()
+        columns = list(zip(*rows)) if rows else [()] * len(COLUMNS)
+        arrays = []
+        for field, values in zip(schema, columns):
+            if pa.types.is_dictionary(field.type):
+                arrays.append(pa.array(values, type=field.type.value_type).dictionary_encode())
+            else:
+                arrays.append(pa.array(values, type=field.type))
+        return pa.Table.from_arrays(arrays, schema=schema)
+
+    def _write(self, path: str, table):
+        import pyarrow.parquet as pq
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        os.close(fd)
+        try:
+            pq.write_table(
+                table, tmp_path, row_group_size=ROW_GROUP_SIZE, compression=self.compression,
+                use_dictionary=sorted(DICTIONARY_COLUMNS), write_statistics=True,
+            )
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def export_month(self, year: int, month: int) -> int:
+        """월 파티션 1개 다시 쓰기 (DB 에 행이 없으면 파일 삭제) → 행 수"""
+        path = partition_path(self.root, self.company_id, year, month)
+        table = self._fetch_month(year, month)
+        if table.num_rows == 0:
+            if os.path.exists(path):
+                os.remove(path)
+            return 0
+        self._write(path, table)
+        return table.num_rows
+
+    def export_months(self, months: Iterable[Month]) -> Dict[str, int]:
+        """변경된 월만 다시 쓰기 → {'YYYY-MM': 행 수}"""
+        exported = {}
+        for year, month in sorted(set(months)):
+            exported[f"{year}-{month:02d}"] = self.export_month(year, month)
+        if exported:
+            logger.info(f"📦 매출 Parquet 스냅샷 (회사 {self.company_id}): "
+                        f"{len(exported)}개 월, {sum(exported.values())}행 → {self.root}")
+        return exported
+
+    def export_range(self, start: date, end: date) -> Dict[str, int]:
+        """기간 전체 다시 쓰기 (최초 적재/복구용)"""
+        return self.export_months(months_between(start, end))
+
+
+# ----------------------------------------------------------------------
+# 읽기 (분석용)
+# ----------------------------------------------------------------------
+def load_sales_table(root: str, company_id: int, start: date, end: date,
+                     columns: Optional[List[str]] = None):
+    """
+    기간 매출 라인 → Arrow 테이블 (start ~ end, 양끝 포함)
+
+    월 파티션 파일만 열고 메모리 맵으로 읽는다. sale_date 조건은 row group 통계로 걸러진다.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = _arrow_schema()
+    if columns:
+        schema = pa.schema([schema.field(name) for name in columns])
+    read_columns = list(columns) if columns else None
+    filters = [('sale_date', '>=', start), ('sale_date', '<=', end)]
+
+    tables = []
+    for year, month in months_between(start, end):
+        path = partition_path(root, company_id, year, month)
+        if not os.path.exists(path):
+            continue
+        # sale_date 조건은 경계 월에서만 필요
+        first_or_last = (year, month) in {(start.year, start.month), (end.year, end.month)}
+        tables.append(pq.read_table(path, columns=read_columns, memory_map=True,
+                                    filters=filters if first_or_last else None))
+    if not tables:
+        return schema.empty_table()
+    return pa.concat_tables(tables)
+
+
+def load_sales_frame(root: str, company_id: int, start: date, end: date,
+                     columns: Optional[List[str]] = None):
+    """기간 매출 라인 → pandas DataFrame (사전 인코딩 컬럼은 Categorical, 날짜는 datetime64)"""
+    table = load_sales_table(root, company_id, start, end, columns)
+    return table.to_pandas(date_as_object=False, split_blocks=True, self_destruct=True)
+
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+매출 사실 테이블 파티션 관리 (sales_analysis_master, erpia_order_master)
+- 구조: 회사별 LIST 파티션 → 월별 RANGE 파티션 (sale_date / m_date)
+    sales_analysis_master
+      ├─ sales_analysis_master_c1 (company_id = 1)
+      │    ├─ sales_analysis_master_c1_p202501  [2025-01-01, 2025-02-01)
+      │    └─ sales_analysis_master_c1_default (월 파티션 없는 기간)
+      └─ sales_analysis_master_cdefault (파티션 없는 회사)
+- 기간 조건 조회는 해당 회사/월 파티션만 스캔 (partition pruning)
+- 미래 월 파티션은 스케줄러(PARTITION_MAINTENANCE)가 미리 생성
+- 보존 기간 정리는 월 파티션 DETACH + DROP (행 DELETE 없음)
+- 기존 일반 테이블 전환: python scripts/partition_sales_tables.py
+"""
+
+import logging
+import re
+from datetime import date
+from typing import Dict, List, Optional
+
+from sqlalchemy import text
+
+logger = logging.getLogger(__name__)
+
+# 테이블 → 월 파티션 기준 컬럼
+PARTITIONED_TABLES = {
+    'sales_analysis_master': 'sale_date',
+    'erpia_order_master': 'm_date',
+}
+MONTHS_AHEAD = 3
+
+
+def month_start(value: date) -> date:
+    return date(value.year, value.month, 1)
+
+
+def add_months(value: date, months: int) -> date:
+    index = value.year * 12 + value.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+class SalesPartitionManager:
+    """회사/월 파티션 생성 및 보존 기간 정리"""
+
+    def __init__(self, session):
+        self.session = session
+
+    # ------------------------------------------------------------------
+    # 카탈로그 조회
+    # ------------------------------------------------------------------
+    def is_partitioned(self, table: str) -> bool:
+        return bool(self.session.execute(text("""
+            SELECT EXISTS (
+                SELECT 1 FROM pg_partitioned_table pt
+                JOIN pg_class c ON c.oid = pt.partrelid
+                WHERE c.relname = :table AND pg_table_is_visible(c.oid)
+            )
+        """), {'table': table}).scalar())
+
+    def _exists(self, name: str) -> bool:
+        return self.session.execute(text("SELECT to_regclass(:name) IS NOT NULL"), {'name': name}).scalar()
+
+    def children(self, parent: str) -> List[str]:
+        rows = self.session.execute(text("""
+            SELECT c.relname FROM pg_inherits i
+            JOIN pg_class c ON c.oid = i.inhrelid
+            JOIN pg_class p ON p.oid = i.inhparent
+            WHERE p.relname = :parent AND pg_table_is_visible(p.oid)
+            ORDER BY c.relname
+        """), {'parent': parent}).all()
+        return [row[0] for row in rows]
+
+    # ------------------------------------------------------------------
+    # 생성
+    # ------------------------------------------------------------------
+    def _attach(self, parent: str, name: str, bound: str, default: str, condition: str,
+                partition_by: str = '') -> bool:
+        """
+        파티션 생성 (이미 있으면 생략)
+
+        DEFAULT 파티션에 이미 들어간 해당 범위 행은 새 파티션으로 옮긴 뒤 ATTACH 한다.
+        (DEFAULT 에 범위 행이 남아 있으면 PARTITION OF 생성이 실패하므로)
+        """
+        if self._exists(name):
+            return False
+        self.session.execute(text(f"CREATE TABLE {name} (LIKE {parent} INCLUDING DEFAULTS) {partition_by}"))
+        if partition_by:
+            self.session.execute(text(f"CREATE TABLE {name}_default PARTITION OF {name} DEFAULT"))
+        if self._exists(default):
+            moved = self.session.execute(text(f"""
+                WITH moved AS (DELETE FROM {default} WHERE {condition} RETURNING *)
+                INSERT INTO {name} SELECT * FROM moved
+            """)).rowcount
+            if moved:
+                logger.info(f"📦 {default} → {name}: {moved}건 이동")
+        self.session.execute(text(f"ALTER TABLE {parent} ATTACH PARTITION {name} {bound}"))
+        return True
+
+    def ensure_company(self, table: str, column: str, company_id: int) -> bool:
+        """회사 LIST 파티션 (하위 월 RANGE 파티션 + DEFAULT)"""
+        return self._attach(
+            table, f"{table}_c{company_id}", f"FOR VALUES IN ({int(company_id)})",
+            f"{table}_cdefault", f"company_id = {int(company_id)}",
+            partition_by=f"PARTITION BY RANGE ({column})",
+        )
+
+    def ensure_month(self, table: str, column: str, company_id: int, month: date) -> bool:
+        """회사별 월 RANGE 파티션"""
+        company_table = f"{table}_c{company_id}"
+        start, end = month_start(month), add_months(month, 1)
+        return self._attach(
+            company_table, f"{company_table}_p{start:%Y%m}",
+            f"FOR VALUES FROM ('{start}') TO ('{end}')",
+            f"{company_table}_default", f"{column} >= '{start}' AND {column} < '{end}'",
+        )
+
+    def ensure_partitions(self, months_ahead: int = MONTHS_AHEAD, from_month: Optional[date] = None,
+                          today: Optional[date] = None) -> Dict[str, int]:
+        """
+        전체 회사의 회사/월 파티션 보장 (from_month ~ 이번 달 + months_ahead)
+
+        파티션 테이블로 전환되지 않은 테이블은 경고 후 건너뛴다.
+        """
+        today = today or date.today()
+        first = month_start(from_month or today)
+        last = add_months(month_start(today), months_ahead)
+        company_ids = [row[0] for row in self.session.execute(text("SELECT id FROM companies ORDER BY id")).all()]
+
+        created: Dict[str, int] = {}
+        try:
+            for table, column in PARTITIONED_TABLES.items():
+                if not self.is_partitioned(table):
+                    logger.warning(f"⚠️ {table} 은 파티션 테이블이 아님 - scripts/partition_sales_tables.py 로 전환 필요")
+                    continue
+                count = 0
+                self.session.execute(text(f"CREATE TABLE IF NOT EXISTS {table}_cdefault PARTITION OF {table} DEFAULT"))
+                for company_id in company_ids:
+                    count += self.ensure_company(table, column, company_id)
+                    month = first
+                    while month <= last:
+                        count += self.ensure_month(table, column, company_id, month)
+                        month = add_months(month, 1)
+                created[table] = count
+            self.session.commit()
+        except Exception:
+            self.session.rollback()
+            raise
+
+        if any(created.values()):
+            logger.info(f"🗂️ 매출 파티션 생성: {created} (~{last:%Y-%m})")
+        return created
+
+    # ------------------------------------------------------------------
+    # 보존 기간
+    # ------------------------------------------------------------------
+    def drop_expired(self, retention_months: Dict[int, int], today: Optional[date] = None,
+                     dry_run: bool = False) -> Dict[str, List[str]]:
+        """
+        회사별 보존 기간(개월)이 지난 월 파티션 DETACH + DROP
+
+        기준: 이번 달 1일에서 보존 개월 수만큼 이전 달 1일 (그 이전에 끝나는 월 파티션 삭제)
+        월 파티션이 없는 오래된 기간(DEFAULT 파티션) 행은 DELETE 로 정리한다.
+        """
+        today = today or date.today()
+        dropped: Dict[str, List[str]] = {}
+        try:
+            for table, column in PARTITIONED_TABLES.items():
+                if not self.is_partitioned(table):
+                    continue
+                for company_id, months in retention_months.items():
+                    if not months:
+                        continue
+                    cutoff = add_months(month_start(today), -int(months))
+                    company_table = f"{table}_c{company_id}"
+                    pattern = re.compile(rf"{re.escape(company_table)}_p(\d{{4}})(\d{{2}})")
+                    for child in self.children(company_table):
+                        match = pattern.fullmatch(child)
+                        if not match:
+                            continue
+                        month = date(int(match.group(1)), int(match.group(2)), 1)
+                        if add_months(month, 1) > cutoff:
+                            continue
+                        dropped.setdefault(table, []).append(child)
+                        if not dry_run:
+                            self.session.execute(text(f"ALTER TABLE {company_table} DETACH PARTITION {child}"))
+                            self.session.execute(text(f"DROP TABLE {child}"))
+
+                    if not dry_run and self._exists(f"{company_table}_default"):
+                        deleted = self.session.execute(text(f"""
+                            DELETE FROM {company_table}_default WHERE {column} < :cutoff
+                        """), {'cutoff': cutoff}).rowcount
+                        if deleted:
+                            logger.info(f"🧹 {company_table}_default: {cutoff} 이전 {deleted}건 삭제")
+            if dry_run:
+                self.session.rollback()
+            else:
+                self.session.commit()
+        except Exception:
+            self.session.rollback()
+            raise
+
+        for table, names in dropped.items():
+            logger.info(f"🧹 {table} 보존 기간 경과 파티션 {'(dry-run) ' if dry_run else ''}"
+                        f"{len(names)}개 삭제: {', '.join(names)}")
+        return dropped
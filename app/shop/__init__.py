@@ -261,10 +261,17 @@ def api_get_classification_groups():
             depth=1
         ).order_by(Code.sort.asc()).all()
         
+        # 그룹별 하위 코드 개수 (집계 1회)
+        sub_counts = dict(
+            db.session.query(Code.parent_seq, db.func.count(Code.seq))
+            .filter(Code.parent_seq.in_([group.seq for group in groups]), Code.depth == 2)
+            .group_by(Code.parent_seq)
+            .all()
+        ) if groups else {}
+        
         result = []
         for group in groups:
-            # 각 그룹의 하위 코드 개수 계산
-            sub_count = Code.query.filter_by(parent_seq=group.seq, depth=2).count()
+            sub_count = sub_counts.get(group.seq, 0)
             
             result.append({
                 'code': group.code,
@@ -7,9 +7,30 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from app import create_app
 from app.common.models import db
+from migration_checksum import ChecksumVerifier, TableMapping
 import pyodbc
 import requests
 
+# 레거시 Seq ↔ legacy_seq 기준 직접 이관 컬럼
+LEGACY_PRODUCT_MAPPINGS = [
+    ('제품 (tbl_Product → products)', TableMapping(
+        'tbl_Product', 'products',
+        key=[('Seq', 'legacy_seq')],
+        columns=[('ProdName', 'product_name'), ('ProdTagAmt', 'price'), ('UseYn', 'use_yn')],
+        target_filter='legacy_seq IS NOT NULL',
+    )),
+    ('모델 (tbl_Product_DTL → product_details)', TableMapping(
+        'tbl_Product_DTL', 'product_details',
+        key=[('Seq', 'legacy_seq')],
+        columns=[('StdDivProdCode', 'std_div_prod_code'), ('ProductName', 'product_name'),
+                 ('BrandCode', 'brand_code'), ('DivTypeCode', 'div_type_code'),
+                 ('ProdGroupCode', 'prod_group_code'), ('ProdTypeCode', 'prod_type_code'),
+                 ('ProdCode', 'prod_code'), ('ProdType2Code', 'prod_type2_code'),
+                 ('YearCode', 'year_code'), ('ProdColorCode', 'color_code'), ('Status', 'status')],
+        target_filter='legacy_seq IS NOT NULL',
+    )),
+]
+
 def compare_with_legacy_db():
     """MS SQL 레거시 DB와 현재 DB 비교 및 개선"""
     app = create_app()
@@ -128,75 +149,23 @@ def compare_with_legacy_db():
                     continue
             
             if legacy_conn:
-                # 레거시 제품 데이터 조회
-                legacy_cursor = legacy_conn.cursor()
-                
-                print("   📋 레거시 DB 제품 조회 중...")
-                legacy_cursor.execute("""
-                    SELECT TOP 10
-                        p.Seq,
-                        p.ProdName,
-                        p.ProdYear,
-                        p.ProdTagAmt,
-                        p.UseYn,
-                        cb.CodeName as CompanyName,
-                        bb.CodeName as BrandName,
-                        pgb.CodeName as ProdGroupName,
-                        ptb.CodeName as ProdTypeName
-                    FROM tbl_Product p
-                    LEFT JOIN tbl_Code cb ON p.Company = cb.Seq
-                    LEFT JOIN tbl_Code bb ON p.Brand = bb.Seq
-                    LEFT JOIN tbl_Code pgb ON p.ProdGroup = pgb.Seq
-                    LEFT JOIN tbl_Code ptb ON p.ProdType = ptb.Seq
-                    WHERE p.UseYn = 'Y'
-                    ORDER BY p.Seq DESC
-                """)
-                
-                legacy_products = legacy_cursor.fetchall()
-                print(f"   📊 레거시 DB: {len(legacy_products)}개 제품 (최근 10개)")
-                
-                for product in legacy_products:
-                    print(f"   Seq: {product[0]}")
-                    print(f"   제품명: {product[1]}")
-                    print(f"   년도: {product[2]}")
-                    print(f"   가격: {product[3]:,}원" if product[3] else "가격 없음")
-                    print(f"   회사: {product[5]}")
-                    print(f"   브랜드: {product[6]}")
-                    print(f"   품목: {product[7]}")
-                    print(f"   타입: {product[8]}")
-                    print()
-                
-                # 레거시 제품 상세 조회
-                print("   📋 레거시 DB 제품 상세 조회 중...")
-                legacy_cursor.execute("""
-                    SELECT TOP 10
-                        pd.Seq,
-                        pd.MstSeq,
-                        pd.StdDivProdCode,
-                        pd.ProductName,
-                        pd.BrandCode,
-                        pd.DivTypeCode,
-                        pd.ProdGroupCode,
-                        pd.ProdTypeCode,
-                        pd.ProdCode,
-                        pd.ProdType2Code,
-                        pd.YearCode,
-                        pd.ProdColorCode,
-                        LEN(pd.StdDivProdCode) as CodeLength
-                    FROM tbl_Product_DTL pd
-                    WHERE pd.Status = 'Active'
-                    ORDER BY pd.Seq DESC
-                """)
-                
-                legacy_details = legacy_cursor.fetchall()
-                print(f"   📊 레거시 DB 상세: {len(legacy_details)}개 모델 (최근 10개)")
-                
-                for detail in legacy_details:
-                    print(f"   Seq: {detail[0]} (Master: {detail[1]})")
-                    print(f"   제품명: {detail[3]}")
-                    print(f"   자가코드: {detail[2]} ({detail[12]}자리)")
-                    print(f"   구성: {detail[4]}+{detail[5]}+{detail[6]}+{detail[7]}+{detail[8]}+{detail[9]}+{detail[10]}+{detail[11]}")
-                    print()
+                # 레거시 ↔ 현재 제품 체크섬 비교 (키 구간 해시, 불일치 구간만 행 단위 확인)
+                print("   📋 레거시 DB 제품/모델 체크섬 비교 중...")
+                pg_conn = db.engine.raw_connection()
+                try:
+                    verifier = ChecksumVerifier(legacy_conn, pg_conn)
+                    for label, mapping in LEGACY_PRODUCT_MAPPINGS:
+                        result = verifier.verify(mapping)
+                        status = "✅" if result['match'] else "⚠️"
+                        print(f"   {status} {label}: 레거시 {result['source_count']:,}건 / 현재 {result['target_count']:,}건 "
+                              f"(구간 {result['ranges_checked']}, 쿼리 {result['queries']}, {result['elapsed']}초)")
+                        for kind, name in (('missing', '현재 DB 누락'), ('extra', '레거시에 없음'), ('changed', '값 다름')):
+                            if result[kind]:
+                                keys = ', '.join(str(key[0]) for key in result[kind][:20])
+                                more = f" 외 {len(result[kind]) - 20}건" if len(result[kind]) > 20 else ''
+                                print(f"      {name} {len(result[kind])}건 (Seq): {keys}{more}")
+                finally:
+                    pg_conn.close()
                 
                 legacy_conn.close()
                 
@@ -7,7 +7,10 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from app import create_app
 from app.common.models import db
-import pyodbc
+from legacy_sync import PRODUCT_DETAIL_CODES, PRODUCT_MASTER, LegacySync, connect_legacy
+
+# 전체 동기화: 상품 마스터(가격/이름/사용여부) + 상세 자가코드/이름/상태
+CORRECT_SYNC_MAPPINGS = [PRODUCT_MASTER, PRODUCT_DETAIL_CODES]
 
 def correct_legacy_sync():
     """tbl_Product와 tbl_Product_DTL 정확한 구조로 동기화"""
@@ -17,271 +20,31 @@ def correct_legacy_sync():
         print("🔍 레거시 테이블 정확한 구조로 동기화")
         print("=" * 60)
         
-        # 1. 레거시 MS SQL 데이터 정확 조회
-        print("1️⃣ 레거시 MS SQL 데이터 정확 조회")
-        
-        legacy_products = []
-        legacy_details = []
+        # 1~3. 레거시 tbl_Product / tbl_Product_DTL → products / product_details (legacy_seq 기준)
+        print("1️⃣ 레거시 MS SQL 연결")
         
         try:
-            # MS SQL 연결 설정들 시도
-            connection_strings = [
-                "DRIVER={ODBC Driver 17 for SQL Server};SERVER=127.0.0.1;DATABASE=mis;UID=sa;PWD=Dbwjd00*;",
-                "DRIVER={ODBC Driver 17 for SQL Server};SERVER=localhost;DATABASE=mis;UID=sa;PWD=Dbwjd00*;",
-                "DRIVER={SQL Server};SERVER=127.0.0.1;DATABASE=mis;UID=sa;PWD=Dbwjd00*;",
-            ]
-            
-            legacy_conn = None
-            for conn_str in connection_strings:
-                try:
-                    legacy_conn = pyodbc.connect(conn_str)
-                    print(f"   ✅ MS SQL 연결 성공")
-                    break
-                except Exception as e:
-                    continue
-            
-            if legacy_conn:
-                legacy_cursor = legacy_conn.cursor()
-                
-                # 레거시 제품 마스터 정보 조회 (tbl_Product - 가격 포함)
-                print("   📋 tbl_Product (마스터 + 가격) 조회 중...")
-                legacy_cursor.execute("""
-                    SELECT 
-                        p.Seq,
-                        p.ProdName,
-                        p.ProdYear,
-                        p.ProdTagAmt,
-                        p.UseYn,
-                        p.Company,
-                        p.Brand,
-                        p.ProdGroup,
-                        p.ProdType,
-                        cb.CodeName as CompanyName,
-                        bb.CodeName as BrandName,
-                        pgb.CodeName as ProdGroupName,
-                        ptb.CodeName as ProdTypeName
-                    FROM tbl_Product p
-                    LEFT JOIN tbl_Code cb ON p.Company = cb.Seq
-                    LEFT JOIN tbl_Code bb ON p.Brand = bb.Seq
-                    LEFT JOIN tbl_Code pgb ON p.ProdGroup = pgb.Seq
-                    LEFT JOIN tbl_Code ptb ON p.ProdType = ptb.Seq
-                    WHERE p.UseYn = 'Y'
-                    ORDER BY p.Seq DESC
-                """)
-                
-                legacy_products = legacy_cursor.fetchall()
-                print(f"   📊 tbl_Product: {len(legacy_products)}개 제품")
-                
-                # 레거시 제품 상세 조회 (tbl_Product_DTL - 16자리 코드)
-                print("   📋 tbl_Product_DTL (16자리 코드) 조회 중...")
-                legacy_cursor.execute("""
-                    SELECT 
-                        pd.Seq,
-                        pd.MstSeq,
-                        pd.StdDivProdCode,
-                        pd.ProductName,
-                        pd.BrandCode,
-                        pd.DivTypeCode,
-                        pd.ProdGroupCode,
-                        pd.ProdTypeCode,
-                        pd.ProdCode,
-                        pd.ProdType2Code,
-                        pd.YearCode,
-                        pd.ProdColorCode,
-                        LEN(pd.StdDivProdCode) as CodeLength,
-                        pd.Status
-                    FROM tbl_Product_DTL pd
-                    WHERE pd.Status = 'Active'
-                    ORDER BY pd.Seq DESC
-                """)
-                
-                legacy_details = legacy_cursor.fetchall()
-                print(f"   📊 tbl_Product_DTL: {len(legacy_details)}개 상세")
-                
-                # 레거시 데이터 샘플 출력
-                print("\n   📋 tbl_Product 샘플:")
-                for product in legacy_products[:5]:
-                    print(f"   Seq: {product[0]} - {product[1]}")
-                    print(f"      가격: {product[3]:,}원" if product[3] else "가격 없음")
-                    print(f"      년도: {product[2]}")
-                    print(f"      브랜드: {product[10]} / 품목: {product[11]} / 타입: {product[12]}")
-                    print()
-                
-                print("   📋 tbl_Product_DTL 샘플:")
-                for detail in legacy_details[:10]:
-                    print(f"   Seq: {detail[0]} (Master: {detail[1]}) - {detail[3]}")
-                    print(f"      자가코드: {detail[2]} ({detail[12]}자리)")
-                    print(f"      구성: {detail[4]}+{detail[5]}+{detail[6]}+{detail[7]}+{detail[8]}+{detail[9]}+{detail[10]}+{detail[11]}")
-                    print()
-                
-                legacy_conn.close()
-                
-            else:
-                print("   ❌ MS SQL 레거시 DB 연결 실패")
-                print("   💡 이미지에서 확인된 데이터로 진행")
-                
+            # 로컬 레거시 복사본 (기존 127.0.0.1/mis 접속 유지)
+            legacy_conn = connect_legacy(server='127.0.0.1', database='mis', user='sa', password='Dbwjd00*')
+            print("   ✅ MS SQL 연결 성공")
         except Exception as e:
-            print(f"   ⚠️ MS SQL 연결 오류: {e}")
-            print("   💡 이미지에서 확인된 데이터로 진행")
-        
-        # 2. 이미지에서 확인된 레거시 구조 적용
-        print("\n2️⃣ 이미지에서 확인된 레거시 구조 적용")
-        
-        # 이미지에서 확인된 실제 레거시 데이터 구조
-        legacy_based_mappings = [
-            {
-                'product_name': 'LIAN 릴렉스 카시트',
-                'brand_code': 'RY',
-                'div_type_code': '2',
-                'prod_group_code': 'SG',
-                'prod_type_code': 'WC',
-                'prod_code': 'XX',
-                'prod_type2_code': '00',
-                'year_code': '14',  # 이미지에서 확인된 실제 년도
-                'colors_with_codes': [
-                    ('14', 'WIR', 'RY2SGWCXX0014WIR'),
-                    ('15', 'ZZN', 'RY2SGWCXXZZN15'),  # 실제 패턴
-                    ('16', 'BKE', 'RY2SGWCXXLL16BKE'),
-                    ('16', 'BRN', 'RY2SGWCXX0016BRN'),
-                    ('17', 'BKE', 'RY2SGWCXXSS17BKE')
-                ],
-                'price': 298000
-            },
-            {
-                'product_name': 'LIAN 모던 유모차',
-                'brand_code': 'RY',
-                'div_type_code': '2',
-                'prod_group_code': 'SG',
-                'prod_type_code': 'WO',  # 이미지에서 WO로 확인
-                'prod_code': 'XX',
-                'prod_type2_code': '00',
-                'year_code': '12',
-                'colors_with_codes': [
-                    ('12', 'BKW', 'RY2SGWO0000012BKW'),
-                    ('20', 'MGY', 'RY2SGWO0000020MGY')
-                ],
-                'price': 458000
-            },
-            {
-                'product_name': 'LIAN 하이체어',
-                'brand_code': 'RY',
-                'div_type_code': '3',
-                'prod_group_code': 'CB',
-                'prod_type_code': 'BK',
-                'prod_code': 'XX',
-                'prod_type2_code': '00',
-                'year_code': '20',
-                'colors_with_codes': [
-                    ('20', 'SBG', 'RY3CBBK0000020SBG'),
-                    ('20', 'BK2', 'RY3CBBK0000020BK2')
-                ],
-                'price': 198000
-            },
-            {
-                'product_name': 'NUNA RAVA 컨버터블',
-                'brand_code': 'RY',
-                'div_type_code': '3',
-                'prod_group_code': 'CB',
-                'prod_type_code': 'BK',
-                'prod_code': 'XX',
-                'prod_type2_code': '00',
-                'year_code': '24',
-                'colors_with_codes': [
-                    ('24', 'WTW', 'RY3CBBK0000024WTW')
-                ],
-                'price': 680000
-            }
-        ]
-        
-        # 3. 현재 제품들을 레거시 구조로 정확히 업데이트
-        print("3️⃣ 현재 제품을 레거시 구조로 정확 업데이트")
+            print(f"   ❌ MS SQL 레거시 DB 연결 실패: {e}")
+            return
         
-        for mapping in legacy_based_mappings:
-            print(f"   🔄 {mapping['product_name']} 처리 중...")
-            
-            # 해당 제품 찾기 (부분 일치)
-            result = db.session.execute(db.text("""
-                SELECT p.id, p.product_name
-                FROM products p
-                WHERE p.company_id = 1 AND (
-                    p.product_name LIKE :pattern1 OR 
-                    p.product_name LIKE :pattern2 OR
-                    p.product_name LIKE :pattern3
-                )
-                LIMIT 1
-            """), {
-                'pattern1': f'%{mapping["product_name"].split()[0]}%{mapping["product_name"].split()[-1]}%',
-                'pattern2': f'%{mapping["product_name"].split()[0]}%',
-                'pattern3': f'%{mapping["product_name"].split()[-1]}%'
-            })
-            
-            product = result.fetchone()
-            
-            if product:
-                print(f"      📦 매칭된 제품: {product.product_name}")
-                
-                # 제품 가격 업데이트
-                db.session.execute(db.text("""
-                    UPDATE products 
-                    SET price = :price, updated_at = NOW()
-                    WHERE id = :product_id
-                """), {
-                    'price': mapping['price'],
-                    'product_id': product.id
-                })
-                
-                # 기존 product_details 삭제
-                db.session.execute(db.text("""
-                    DELETE FROM product_details WHERE product_id = :product_id
-                """), {'product_id': product.id})
-                
-                # 레거시 구조 그대로 적용한 새 detail 생성
-                for year_code, color_code, full_std_code in mapping['colors_with_codes']:
-                    color_name_map = {
-                        'WIR': '와이어', 'ZZN': '진', 'BKE': '블랙에디션', 'BRN': '브라운',
-                        'BKW': '블랙화이트', 'MGY': '그레이', 'SBG': '베이지', 'BK2': '블랙',
-                        'WTW': '화이트'
-                    }
-                    
-                    product_detail_name = f"{product.product_name} ({color_name_map.get(color_code, color_code)})"
-                    
-                    # 실제 레거시 구조 그대로 삽입
-                    db.session.execute(db.text("""
-                        INSERT INTO product_details (
-                            product_id, std_div_prod_code, product_name,
-                            brand_code, div_type_code, prod_group_code, prod_type_code,
-                            prod_code, prod_type2_code, year_code, color_code,
-                            status, created_at, updated_at
-                        ) VALUES (
-                            :product_id, :std_code, :product_name,
-                            :brand_code, :div_type_code, :prod_group_code, :prod_type_code,
-                            :prod_code, :prod_type2_code, :year_code, :color_code,
-                            'Active', NOW(), NOW()
-                        )
-                    """), {
-                        'product_id': product.id,
-                        'std_code': full_std_code,
-                        'product_name': product_detail_name,
-                        'brand_code': mapping['brand_code'],
-                        'div_type_code': mapping['div_type_code'],
-                        'prod_group_code': mapping['prod_group_code'],
-                        'prod_type_code': mapping['prod_type_code'],
-                        'prod_code': mapping['prod_code'],
-                        'prod_type2_code': mapping['prod_type2_code'],
-                        'year_code': year_code,
-                        'color_code': color_code
-                    })
-                    
-                    print(f"        ✅ {color_code} ({color_name_map.get(color_code, color_code)}) - {full_std_code}")
-                
-                print(f"      💰 가격 업데이트: {mapping['price']:,}원")
-            else:
-                print(f"      ❌ 매칭되는 제품을 찾을 수 없습니다: {mapping['product_name']}")
-        
-        db.session.commit()
-        
-        # 4. 결과 확인
-        print("\n4️⃣ 레거시 구조 적용 결과 확인")
+        print("\n2️⃣ 레거시 구조로 정확 업데이트 (IN 배치 조회 + 그룹별 UPDATE ... FROM)")
+        try:
+            sync = LegacySync(legacy_conn, db.session)
+            for mapping in CORRECT_SYNC_MAPPINGS:
+                result = sync.run(mapping)
+                print(f"   🔄 {mapping.name}: 대상 {result['candidates']}개, 레거시 조회 {result['fetched']}개 "
+                      f"(없음 {result['not_found']}개)")
+                for group, count in result['updated'].items():
+                    print(f"      ✅ {group}: {count}개 갱신")
+        finally:
+            legacy_conn.close()
+        
+        # 3. 결과 확인
+        print("\n3️⃣ 레거시 구조 적용 결과 확인")
         
         result = db.session.execute(db.text("""
             SELECT 
@@ -314,8 +77,8 @@ def correct_legacy_sync():
             print(f"        자가코드: {result.std_div_prod_code} ({result.code_length}자리)")
             print(f"        구성: {result.brand_code}+{result.div_type_code}+{result.prod_group_code}+{result.prod_type_code}+{result.prod_code}+{result.prod_type2_code}+{result.year_code}+{result.color_code}")
         
-        # 5. 16자리 코드 검증
-        print("\n5️⃣ 16자리 코드 검증")
+        # 4. 16자리 코드 검증
+        print("\n4️⃣ 16자리 코드 검증")
         
         result = db.session.execute(db.text("""
             SELECT 
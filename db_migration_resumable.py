@@ -7,9 +7,15 @@ MIS v2 재개 가능한 데이터베이스 마이그레이션 도구
 - 중단된 지점에서 재개 기능
 - 완전 자동화
 - PostgreSQL 최적화
+- keyset 모드: 기본키 순 페이징 + COPY FROM STDIN 적재 (기본값, --mode offset 으로 기존 방식)
+- 청크 단위 체크포인트 (마지막 키) → 중단 시 테이블 중간부터 재개
+- 외래키 의존성 기준 병렬 테이블 마이그레이션 (--workers N, 동시 실행 상한)
+- 키 구간 체크섬 검증 (migration_checksum), --verify 로 검증만 실행
 """
 
-import pyodbc
+import io
+import multiprocessing
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
 import psycopg2
 import psycopg2.extras
 import pandas as pd
@@ -17,10 +23,13 @@ from datetime import datetime
 import logging
 import os
 import json
-from typing import Dict, List, Any, Tuple
+from typing import Dict, List, Any, Optional, Set, Tuple
+import queue
 import time
 from dotenv import load_dotenv
 
+from migration_checksum import ChecksumVerifier, log_result
+
 # 환경 변수 로드
 load_dotenv()
 
@@ -35,6 +44,12 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# 대상 DB 체크포인트 테이블 (청크 COPY 와 같은 트랜잭션으로 기록 → 재개 기준)
+CHECKPOINT_TABLE = 'migration_checkpoints'
+
+# Int64(NULL 허용 정수)로 COPY 할 대상 컬럼 타입
+INTEGER_TARGET_TYPES = ('smallint', 'integer', 'bigint', 'boolean')
+
 class ResumableDBMigrator:
     def __init__(self):
         # 레거시 MS-SQL 연결 정보 (READ ONLY)
@@ -60,9 +75,27 @@ class ResumableDBMigrator:
         self.max_retries = 3
         self.retry_delay = 2
         
+        # 마이그레이션 방식: keyset(기본키 순 페이징 + COPY) / offset(OFFSET 페이징 + INSERT)
+        # 기본키가 없는 테이블은 keyset 모드에서도 offset 방식으로 처리
+        self.mode = os.getenv('MIGRATION_MODE', 'keyset')
+        self.copy_batch_size = int(os.getenv('MIGRATION_COPY_BATCH_SIZE', 10000))
+        self.batch_pause = 0.1  # 배치 사이 대기 (DB 부하 방지)
+        
+        # 원본 SQL 방언 (mssql: 레거시 DB, sqlite: 벤치마크용 로컬 대체 원본)
+        self.source_dialect = 'mssql'
+        
+        # 대상 PostgreSQL 컬럼 타입 (테이블 → {컬럼: data_type}, COPY 값 변환 기준)
+        self.target_column_types: Dict[str, Dict[str, str]] = {}
+        
         # 진행 상태 파일
         self.progress_file = 'migration_progress.json'
         self.completed_tables = set()
+        self.checkpoints: Dict[str, Dict[str, Any]] = {}  # 테이블 → 마지막 적재 키/건수 (진행 표시용)
+        
+        # 병렬 처리: 동시 실행 테이블 상한 (기본 1 = 순차, 운영 DB 부하 확인 후 상향)
+        self.max_workers = int(os.getenv('MIGRATION_WORKERS', 1))
+        # 작업 프로세스에서는 진행 이벤트를 부모로 전달 (진행 파일은 부모만 기록)
+        self.progress_events = None
         
         # 테이블 우선순위 (의존성 순서)
         self.table_priority = [
@@ -105,9 +138,13 @@ class ResumableDBMigrator:
                 with open(self.progress_file, 'r', encoding='utf-8') as f:
                     progress_data = json.load(f)
                     self.completed_tables = set(progress_data.get('completed_tables', []))
+                    self.checkpoints = progress_data.get('checkpoints', {})
                     logger.info(f"📋 이전 진행 상태 로드: {len(self.completed_tables)}개 테이블 완료")
                     if self.completed_tables:
                         logger.info(f"✅ 완료된 테이블: {', '.join(sorted(self.completed_tables))}")
+                    for table_name, checkpoint in self.checkpoints.items():
+                        logger.info(f"⏸️ 중단된 테이블: {table_name} ({checkpoint['migrated']:,}건 적재, "
+                                    f"마지막 키 {checkpoint['last_key']})")
                     return True
             else:
                 logger.info("🆕 새로운 마이그레이션 시작")
@@ -117,24 +154,86 @@ class ResumableDBMigrator:
             return False
 
     def save_progress(self, completed_table: str = None):
-        """진행 상태 저장"""
+        """진행 상태 저장 (임시 파일 → 교체, 중간 종료 시에도 이전 내용 유지)"""
         try:
             if completed_table:
                 self.completed_tables.add(completed_table)
+                self.checkpoints.pop(completed_table, None)
+                if self.progress_events is not None:
+                    self.progress_events.put(('completed', completed_table, None))
+                    return
             
             progress_data = {
                 'completed_tables': list(self.completed_tables),
+                'checkpoints': self.checkpoints,
                 'last_updated': datetime.now().isoformat(),
                 'total_tables': len(self.table_priority),
                 'remaining_tables': len(self.table_priority) - len(self.completed_tables)
             }
             
-            with open(self.progress_file, 'w', encoding='utf-8') as f:
-                json.dump(progress_data, f, ensure_ascii=False, indent=2)
+            tmp_file = f"{self.progress_file}.tmp"
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(progress_data, f, ensure_ascii=False, indent=2, default=str)
+            os.replace(tmp_file, self.progress_file)
                 
         except Exception as e:
             logger.warning(f"진행 상태 저장 실패: {e}")
 
+    def save_checkpoint(self, table_name: str, last_key: Tuple, migrated: int):
+        """청크 적재(커밋) 후 진행 파일에 마지막 키 기록 (진행 표시용, 재개 기준은 대상 DB 체크포인트)"""
+        checkpoint = {
+            'last_key': list(last_key),
+            'migrated': migrated,
+            'updated': datetime.now().isoformat()
+        }
+        self.checkpoints[table_name] = checkpoint
+        if self.progress_events is not None:
+            self.progress_events.put(('checkpoint', table_name, checkpoint))
+            return
+        self.save_progress()
+
+    def apply_progress_event(self, event: Tuple):
+        """작업 프로세스 진행 이벤트 반영 (부모 프로세스)"""
+        kind, table_name, checkpoint = event
+        if kind == 'completed':
+            self.save_progress(table_name)
+        else:
+            self.checkpoints[table_name] = checkpoint
+            self.save_progress()
+
+    def ensure_checkpoint_table(self, postgres_conn):
+        """대상 DB 체크포인트 테이블 생성"""
+        cursor = postgres_conn.cursor()
+        cursor.execute(f"""
+            CREATE TABLE IF NOT EXISTS {CHECKPOINT_TABLE} (
+                table_name VARCHAR(128) PRIMARY KEY,
+                last_key TEXT NOT NULL,
+                migrated BIGINT NOT NULL,
+                updated_at TIMESTAMP NOT NULL DEFAULT NOW()
+            )
+        """)
+        postgres_conn.commit()
+
+    def load_target_checkpoint(self, postgres_conn, table_name: str) -> Optional[Dict[str, Any]]:
+        """대상 DB 체크포인트 조회 (없으면 None)"""
+        cursor = postgres_conn.cursor()
+        cursor.execute(f"SELECT last_key, migrated FROM {CHECKPOINT_TABLE} WHERE table_name = %s",
+                       (table_name.lower(),))
+        row = cursor.fetchone()
+        postgres_conn.commit()
+        if not row:
+            return None
+        return {'last_key': json.loads(row[0]), 'migrated': row[1]}
+
+    def clear_target_checkpoints(self, postgres_conn, table_name: str = None):
+        """대상 DB 체크포인트 삭제 (테이블 완료 / 강제 재시작)"""
+        cursor = postgres_conn.cursor()
+        if table_name:
+            cursor.execute(f"DELETE FROM {CHECKPOINT_TABLE} WHERE table_name = %s", (table_name.lower(),))
+        else:
+            cursor.execute(f"DELETE FROM {CHECKPOINT_TABLE}")
+        postgres_conn.commit()
+
     def get_remaining_tables(self) -> List[str]:
         """남은 테이블 목록 반환"""
         return [table for table in self.table_priority if table not in self.completed_tables]
@@ -160,6 +259,7 @@ class ResumableDBMigrator:
     def connect_mssql(self):
         """MS-SQL 연결 (READ ONLY)"""
         try:
+            import pyodbc
             conn_str = (
                 f"DRIVER={self.mssql_config['driver']};"
                 f"SERVER={self.mssql_config['server']};"
@@ -190,6 +290,19 @@ class ResumableDBMigrator:
     def get_table_schema(self, mssql_conn, table_name: str) -> List[Dict]:
         """테이블 스키마 정보 조회"""
         try:
+            if self.source_dialect == 'sqlite':
+                cursor = mssql_conn.cursor()
+                cursor.execute(f"PRAGMA table_info({table_name})")
+                return [{
+                    'column_name': col[1],
+                    'data_type': col[2],
+                    'max_length': None,
+                    'precision': None,
+                    'scale': None,
+                    'is_nullable': 'NO' if col[3] else 'YES',
+                    'default_value': col[4]
+                } for col in cursor.fetchall()]
+            
             query = """
             SELECT 
                 COLUMN_NAME,
@@ -256,6 +369,19 @@ class ResumableDBMigrator:
             logger.error(f"호환성 검증 실패 ({table_name}): {e}")
             return False
 
+    def get_target_column_types(self, postgres_conn, table_name: str) -> Dict[str, str]:
+        """대상 테이블 컬럼 타입 (information_schema.data_type, 컬럼명 소문자)"""
+        table = table_name.lower()
+        if table not in self.target_column_types:
+            cursor = postgres_conn.cursor()
+            cursor.execute("""
+                SELECT column_name, data_type FROM information_schema.columns
+                WHERE table_name = %s
+            """, (table,))
+            self.target_column_types[table] = {name.lower(): data_type for name, data_type in cursor.fetchall()}
+            postgres_conn.commit()
+        return self.target_column_types[table]
+
     def get_table_record_count(self, conn, table_name: str, is_mssql: bool = True) -> int:
         """테이블 레코드 수 조회"""
         try:
@@ -301,12 +427,7 @@ class ResumableDBMigrator:
             
             while offset < total_records:
                 # MS-SQL에서 배치 데이터 조회
-                query = f"""
-                SELECT * FROM {table_name}
-                ORDER BY (SELECT NULL)
-                OFFSET {offset} ROWS
-                FETCH NEXT {self.batch_size} ROWS ONLY
-                """
+                query = self._offset_query(table_name, offset)
                 
                 for retry in range(self.max_retries):
                     try:
@@ -343,7 +464,7 @@ class ResumableDBMigrator:
                 del df
                 
                 # 잠시 대기 (DB 부하 방지)
-                time.sleep(0.1)
+                time.sleep(self.batch_pause)
             
             # 테이블 완료시 진행 상태 저장
             if total_migrated == total_records:
@@ -358,6 +479,246 @@ class ResumableDBMigrator:
             logger.error(f"❌ 테이블 마이그레이션 실패 ({table_name}): {e}")
             return 0
 
+    def _offset_query(self, table_name: str, offset: int) -> str:
+        """OFFSET 페이징 조회 (offset 모드)"""
+        if self.source_dialect == 'sqlite':
+            return f"SELECT * FROM {table_name} LIMIT {self.batch_size} OFFSET {offset}"
+        return f"""
+                SELECT * FROM {table_name}
+                ORDER BY (SELECT NULL)
+                OFFSET {offset} ROWS
+                FETCH NEXT {self.batch_size} ROWS ONLY
+                """
+
+    def get_primary_key(self, mssql_conn, table_name: str) -> List[str]:
+        """기본키 컬럼 목록 (순서대로, 없으면 빈 목록)"""
+        try:
+            cursor = mssql_conn.cursor()
+            if self.source_dialect == 'sqlite':
+                cursor.execute(f"PRAGMA table_info({table_name})")
+                pk_columns = sorted((col[5], col[1]) for col in cursor.fetchall() if col[5])
+                return [name for _, name in pk_columns]
+            
+            cursor.execute("""
+            SELECT kcu.COLUMN_NAME
+            FROM INFORMATION_SCHEMA.TABLE_CONSTRAINTS tc
+            JOIN INFORMATION_SCHEMA.KEY_COLUMN_USAGE kcu
+              ON kcu.CONSTRAINT_NAME = tc.CONSTRAINT_NAME AND kcu.TABLE_NAME = tc.TABLE_NAME
+            WHERE tc.TABLE_NAME = ? AND tc.CONSTRAINT_TYPE = 'PRIMARY KEY'
+            ORDER BY kcu.ORDINAL_POSITION
+            """, table_name)
+            return [row[0] for row in cursor.fetchall()]
+        except Exception as e:
+            logger.warning(f"기본키 조회 실패 ({table_name}): {e}")
+            return []
+
+    def _keyset_query(self, table_name: str, pk: List[str], last_key: Tuple = None) -> Tuple[str, List]:
+        """
+        기본키 keyset 페이징 조회 (마지막 키 다음부터 copy_batch_size 건)
+        
+        복합키 (a, b): (a > ?) OR (a = ? AND b > ?)
+        """
+        order_by = ', '.join(f"[{col}]" for col in pk)
+        where = ''
+        params = []
+        if last_key is not None:
+            terms = []
+            for i, col in enumerate(pk):
+                conditions = [f"[{prev}] = ?" for prev in pk[:i]] + [f"[{col}] > ?"]
+                params.extend(list(last_key[:i]) + [last_key[i]])
+                terms.append('(' + ' AND '.join(conditions) + ')')
+            where = 'WHERE ' + ' OR '.join(terms)
+        
+        if self.source_dialect == 'sqlite':
+            return f"SELECT * FROM {table_name} {where} ORDER BY {order_by} LIMIT {self.copy_batch_size}", params
+        return f"SELECT TOP ({self.copy_batch_size}) * FROM {table_name} {where} ORDER BY {order_by}", params
+
+    def _fetch_with_retry(self, cursor, query: str, params: List):
+        """원본 조회 (재시도) → 행 목록"""
+        for retry in range(self.max_retries):
+            try:
+                cursor.execute(query, params)
+                return cursor.fetchall()
+            except Exception as e:
+                if retry < self.max_retries - 1:
+                    logger.warning(f"⚠️ 배치 조회 재시도 {retry + 1}/{self.max_retries}: {e}")
+                    time.sleep(self.retry_delay)
+                else:
+                    raise
+
+    def migrate_table_keyset(self, mssql_conn, postgres_conn, table_name: str, pk: List[str]) -> int:
+        """기본키 keyset 페이징 + COPY 적재 (OFFSET 재스캔 없음, 안정 정렬)"""
+        try:
+            logger.info(f"🔄 테이블 마이그레이션 시작 (keyset+COPY, 키: {', '.join(pk)}): {table_name}")
+            
+            if not self.verify_table_compatibility(mssql_conn, postgres_conn, table_name):
+                logger.error(f"호환성 검증 실패: {table_name}")
+                return 0
+            
+            total_records = self.get_table_record_count(mssql_conn, table_name, True)
+            if total_records == 0:
+                logger.warning(f"빈 테이블: {table_name}")
+                self.save_progress(table_name)
+                return 0
+            logger.info(f"📊 전체 레코드 수: {total_records:,}건")
+            
+            source_cursor = mssql_conn.cursor()
+            column_types = self.get_target_column_types(postgres_conn, table_name)
+            self.ensure_checkpoint_table(postgres_conn)
+            checkpoint = self.load_target_checkpoint(postgres_conn, table_name)
+            if checkpoint:
+                # 체크포인트는 청크와 같은 트랜잭션으로 커밋되므로 대상 데이터와 항상 일치
+                last_key = tuple(checkpoint['last_key'])
+                total_migrated = checkpoint['migrated']
+                logger.info(f"⏯️ 체크포인트에서 재개: {table_name} ({total_migrated:,}건 이후, 마지막 키 {last_key})")
+            else:
+                pg_cursor = postgres_conn.cursor()
+                pg_cursor.execute(f"TRUNCATE TABLE {table_name.lower()} RESTART IDENTITY CASCADE")
+                postgres_conn.commit()
+                logger.info(f"🗑️ 기존 데이터 삭제 완료: {table_name}")
+                total_migrated = 0
+                last_key = None
+            
+            while True:
+                query, params = self._keyset_query(table_name, pk, last_key)
+                try:
+                    rows = self._fetch_with_retry(source_cursor, query, params)
+                except Exception as e:
+                    logger.error(f"❌ 배치 조회 최종 실패: {e}")
+                    break
+                if not rows:
+                    break
+                
+                columns = [desc[0] for desc in source_cursor.description]
+                key_index = [columns.index(col) for col in pk]
+                df = pd.DataFrame.from_records([tuple(row) for row in rows], columns=columns)
+                df = self.clean_data_vectorized(df, column_types)
+                
+                # 정제 전 원본 값으로 다음 페이지 키 결정
+                next_key = tuple(rows[-1][i] for i in key_index)
+                if not self.copy_batch_data(postgres_conn, table_name.lower(), df,
+                                            checkpoint=(table_name, next_key, total_migrated + len(rows))):
+                    logger.error(f"❌ COPY 적재 실패: {table_name} (마지막 키 {last_key})")
+                    break
+                
+                last_key = next_key
+                total_migrated += len(rows)
+                self.save_checkpoint(table_name, last_key, total_migrated)
+                progress = (total_migrated / total_records) * 100
+                logger.info(f"✅ 진행률: {total_migrated:,}/{total_records:,} ({progress:.1f}%)")
+                
+                del df, rows
+                if self.batch_pause:
+                    time.sleep(self.batch_pause)
+            
+            if total_migrated >= total_records:
+                self.clear_target_checkpoints(postgres_conn, table_name)
+                self.save_progress(table_name)
+                logger.info(f"✅ 테이블 마이그레이션 완료: {table_name} ({total_migrated:,}건)")
+            else:
+                logger.warning(f"⚠️ 테이블 마이그레이션 불완전: {table_name} ({total_migrated:,}/{total_records:,}건)")
+            
+            return total_migrated
+            
+        except Exception as e:
+            logger.error(f"❌ 테이블 마이그레이션 실패 ({table_name}): {e}")
+            return 0
+
+    def migrate_table(self, mssql_conn, postgres_conn, table_name: str) -> int:
+        """설정된 방식으로 테이블 마이그레이션 (기본키 없으면 offset 방식)"""
+        if self.mode == 'keyset':
+            pk = self.get_primary_key(mssql_conn, table_name)
+            if pk:
+                return self.migrate_table_keyset(mssql_conn, postgres_conn, table_name, pk)
+            logger.warning(f"⚠️ 기본키 없음 - offset 방식으로 처리: {table_name}")
+        return self.migrate_table_data_batch(mssql_conn, postgres_conn, table_name)
+
+    @staticmethod
+    def _first_value_type(series: pd.Series):
+        """컬럼의 첫 번째 NULL 아닌 값의 타입"""
+        index = series.first_valid_index()
+        return type(series[index]) if index is not None else None
+
+    @staticmethod
+    def _is_text_series(series: pd.Series) -> bool:
+        """문자열 컬럼 여부 (object + pandas StringDtype)"""
+        return series.dtype == object or isinstance(series.dtype, pd.StringDtype)
+
+    def clean_data_vectorized(self, df: pd.DataFrame, column_types: Dict[str, str] = None) -> pd.DataFrame:
+        """
+        컬럼 단위 벡터 정제 (COPY 용, 변환 기준은 대상 컬럼 타입)
+        - 문자열: 앞뒤 스페이스 제거 (체크섬 검증의 LTRIM/RTRIM/btrim 과 동일), 빈 문자열 → NULL
+        - 대상이 정수/boolean 인 컬럼: Int64 (NULL 섞인 정수가 float 로 추론되어 "5.0" 으로 기록되는 것 방지)
+        - 대상이 date/timestamp 인 문자열 컬럼: datetime 변환 (변환 불가 값은 NULL, 건수 경고)
+        - bit/bool: 1/0, 바이너리: bytea 16진수 표기
+        """
+        column_types = column_types or {}
+        for col in df.columns:
+            series = df[col]
+            target_type = column_types.get(col.lower(), '')
+            
+            if series.dtype == bool:
+                df[col] = series.astype('int8')
+                continue
+            
+            if self._is_text_series(series):
+                value_type = str if isinstance(series.dtype, pd.StringDtype) else self._first_value_type(series)
+                if value_type is str:
+                    series = series.str.strip(' ')
+                    series = series.mask(series == '')
+                    if target_type == 'date' or target_type.startswith('timestamp'):
+                        converted = pd.to_datetime(series, errors='coerce')
+                        invalid = int((converted.isna() & series.notna()).sum())
+                        if invalid:
+                            logger.warning(f"⚠️ 날짜 변환 불가 값 {invalid}건 → NULL: {col}")
+                        series = converted
+                    df[col] = series
+                    continue
+                if value_type is bool:
+                    df[col] = series.map({True: 1, False: 0}, na_action='ignore').astype('Int64')
+                    continue
+                if value_type in (bytes, bytearray):
+                    df[col] = series.map(lambda value: '\\x' + bytes(value).hex() if value is not None else None)
+                    continue
+            
+            if target_type in INTEGER_TARGET_TYPES and not pd.api.types.is_integer_dtype(series.dtype):
+                if series.dtype == object and self._first_value_type(series) is not int:
+                    series = pd.to_numeric(series)  # Decimal 등
+                df[col] = series.astype('Int64')
+            elif not target_type and series.dtype == object and self._first_value_type(series) is int:
+                df[col] = series.astype('Int64')
+        return df
+
+    def copy_batch_data(self, postgres_conn, table_name: str, df: pd.DataFrame,
+                        checkpoint: Tuple = None) -> bool:
+        """
+        COPY FROM STDIN 적재 (메모리 CSV 버퍼, NULL = 따옴표 없는 빈 값)
+        
+        checkpoint=(테이블, 마지막 키, 누적 건수) 를 주면 같은 트랜잭션에서 대상 DB 체크포인트 갱신
+        """
+        try:
+            buffer = io.StringIO()
+            df.to_csv(buffer, header=False, index=False, date_format='%Y-%m-%d %H:%M:%S.%f')
+            buffer.seek(0)
+            
+            cursor = postgres_conn.cursor()
+            columns_str = ', '.join(df.columns)
+            cursor.copy_expert(f"COPY {table_name} ({columns_str}) FROM STDIN WITH (FORMAT csv)", buffer)
+            if checkpoint:
+                source_table, last_key, migrated = checkpoint
+                cursor.execute(f"""
+                    INSERT INTO {CHECKPOINT_TABLE} (table_name, last_key, migrated, updated_at)
+                    VALUES (%s, %s, %s, NOW())
+                    ON CONFLICT (table_name) DO UPDATE
+                    SET last_key = EXCLUDED.last_key, migrated = EXCLUDED.migrated, updated_at = NOW()
+                """, (source_table.lower(), json.dumps(list(last_key), ensure_ascii=False, default=str), migrated))
+            postgres_conn.commit()
+            return True
+        except Exception as e:
+            logger.error(f"COPY 적재 실패 ({table_name}): {e}")
+            postgres_conn.rollback()
+            return False
+
     def clean_data(self, df: pd.DataFrame) -> pd.DataFrame:
         """데이터 정제 및 타입 변환"""
         try:
@@ -367,7 +728,7 @@ class ResumableDBMigrator:
             # 텍스트 컬럼의 공백 제거
             text_columns = df.select_dtypes(include=['object']).columns
             for col in text_columns:
-                df[col] = df[col].astype(str).str.strip()
+                df[col] = df[col].astype(str).str.strip(' ')
                 df[col] = df[col].replace('nan', None)
                 df[col] = df[col].replace('', None)
             
@@ -422,15 +783,138 @@ class ResumableDBMigrator:
             postgres_conn.rollback()
             return False
 
+    def get_table_dependencies(self, postgres_conn, tables: List[str]) -> Dict[str, Set[str]]:
+        """
+        테이블별 선행 테이블 (대상 PostgreSQL 외래키 기준)
+        
+        부모 테이블의 TRUNCATE ... CASCADE 가 자식 테이블을 비우므로 부모가 끝난 뒤 자식을 시작한다.
+        이번 실행 대상이 아닌 테이블(완료/목록 외)과의 관계는 무시한다.
+        """
+        by_lower = {table.lower(): table for table in tables}
+        dependencies = {table: set() for table in tables}
+        cursor = postgres_conn.cursor()
+        cursor.execute("""
+            SELECT DISTINCT tc.table_name, ccu.table_name
+            FROM information_schema.table_constraints tc
+            JOIN information_schema.constraint_column_usage ccu
+              ON ccu.constraint_name = tc.constraint_name AND ccu.constraint_schema = tc.constraint_schema
+            WHERE tc.constraint_type = 'FOREIGN KEY'
+        """)
+        for child, parent in cursor.fetchall():
+            if child in by_lower and parent in by_lower and child != parent:
+                dependencies[by_lower[child]].add(by_lower[parent])
+        return dependencies
+
+    def migrate_tables_parallel(self, postgres_conn, tables: List[str]) -> Dict[str, int]:
+        """
+        의존성 순서를 지키며 독립 테이블을 작업 프로세스로 병렬 마이그레이션
+        
+        - 동시 실행 상한: max_workers
+        - 선행 테이블이 실패하면 후속 테이블은 건너뜀 (다음 실행에서 재시도)
+        - 재개 기준 체크포인트는 작업 프로세스가 청크 커밋과 함께 대상 DB 에 기록
+        - 작업 프로세스의 체크포인트/완료 이벤트는 큐로 받아 이 프로세스만 진행 파일에 기록
+        """
+        dependencies = self.get_table_dependencies(postgres_conn, tables)
+        postgres_conn.commit()
+        for table_name in tables:
+            if dependencies[table_name]:
+                logger.info(f"🔗 {table_name} ← {', '.join(sorted(dependencies[table_name]))}")
+        
+        manager = multiprocessing.Manager()
+        events = manager.Queue()
+        pending = list(tables)
+        running = {}
+        failed = set()
+        results = {}
+        options = {
+            'mode': self.mode,
+            'batch_size': self.batch_size,
+            'copy_batch_size': self.copy_batch_size,
+            'batch_pause': self.batch_pause,
+            'checkpoints': self.checkpoints,
+        }
+        
+        def drain_events():
+            while True:
+                try:
+                    self.apply_progress_event(events.get_nowait())
+                except queue.Empty:
+                    return
+        
+        try:
+            with ProcessPoolExecutor(max_workers=self.max_workers) as pool:
+                while pending or running:
+                    active = set(pending) | set(running.values())
+                    for table_name in list(pending):
+                        if len(running) >= self.max_workers:
+                            break
+                        blockers = dependencies[table_name]
+                        if blockers & failed:
+                            pending.remove(table_name)
+                            failed.add(table_name)
+                            results[table_name] = 0
+                            logger.warning(f"⏭️ 선행 테이블 실패로 건너뜀: {table_name} "
+                                           f"({', '.join(sorted(blockers & failed))})")
+                            continue
+                        if blockers & active:
+                            continue
+                        pending.remove(table_name)
+                        running[pool.submit(_migrate_table_worker, table_name, options, events)] = table_name
+                        logger.info(f"▶️ 시작: {table_name} (실행 중 {len(running)}/{self.max_workers})")
+                    
+                    if not running and pending:
+                        # 순환 참조: 우선순위 순으로 하나씩 진행
+                        table_name = pending.pop(0)
+                        logger.warning(f"⚠️ 순환 의존성 - 우선순위 순 실행: {table_name}")
+                        running[pool.submit(_migrate_table_worker, table_name, options, events)] = table_name
+                    
+                    done, _ = wait(list(running), timeout=1, return_when=FIRST_COMPLETED)
+                    drain_events()
+                    for future in done:
+                        table_name = running.pop(future)
+                        try:
+                            results[table_name] = future.result()
+                        except Exception as e:
+                            logger.error(f"❌ 작업 프로세스 오류 ({table_name}): {e}")
+                            results[table_name] = 0
+                        if table_name not in self.completed_tables:
+                            failed.add(table_name)
+                        logger.info(f"{'✅' if table_name not in failed else '⚠️'} 종료: {table_name} "
+                                    f"{results[table_name]:,}건 (남은 테이블: {len(pending) + len(running)}개)")
+                    
+                drain_events()
+        finally:
+            manager.shutdown()
+        
+        return results
+
     def verify_migration_results(self, mssql_conn, postgres_conn, tables_to_verify: List[str] = None) -> Dict[str, Dict]:
-        """마이그레이션 결과 검증"""
+        """
+        마이그레이션 결과 검증
+        - 기본키 있는 테이블: 키 구간 체크섬 비교 → 불일치 구간만 드릴다운, 차이 키(누락/추가/변경) 보고
+        - 기본키 없는 테이블: 레코드 수 비교
+        """
         logger.info("🔍 마이그레이션 결과 검증 시작")
         verification_results = {}
+        verifier = ChecksumVerifier(mssql_conn, postgres_conn)
         
         tables = tables_to_verify if tables_to_verify else self.table_priority
         
         for table_name in tables:
             try:
+                pk = self.get_primary_key(mssql_conn, table_name) if self.source_dialect == 'mssql' else []
+                if pk:
+                    columns = [col['column_name'] for col in self.get_table_schema(mssql_conn, table_name)]
+                    result = verifier.verify(verifier.mapping_for_copy(table_name, columns, pk))
+                    log_result(table_name, result)
+                    verification_results[table_name] = dict(
+                        result,
+                        mssql_count=result['source_count'],
+                        postgresql_count=result['target_count'],
+                        difference=abs(result['source_count'] - result['target_count'])
+                    )
+                    continue
+                
                 mssql_count = self.get_table_record_count(mssql_conn, table_name, True)
                 pg_count = self.get_table_record_count(postgres_conn, table_name.lower(), False)
                 
@@ -443,10 +927,11 @@ class ResumableDBMigrator:
                 }
                 
                 status = "✅" if is_match else "⚠️"
-                logger.info(f"{status} {table_name}: MS-SQL({mssql_count:,}) -> PostgreSQL({pg_count:,})")
+                logger.info(f"{status} {table_name}: MS-SQL({mssql_count:,}) -> PostgreSQL({pg_count:,}) (기본키 없음, 건수 비교)")
                 
             except Exception as e:
                 logger.error(f"검증 실패 ({table_name}): {e}")
+                postgres_conn.rollback()
                 verification_results[table_name] = {
                     'mssql_count': 0,
                     'postgresql_count': 0,
@@ -467,6 +952,7 @@ class ResumableDBMigrator:
         else:
             logger.info("🔄 강제 재시작 - 모든 테이블 다시 처리")
             self.completed_tables.clear()
+            self.checkpoints.clear()
             if os.path.exists(self.progress_file):
                 os.remove(self.progress_file)
         
@@ -479,6 +965,10 @@ class ResumableDBMigrator:
             return False
         
         try:
+            if force_restart:
+                self.ensure_checkpoint_table(postgres_conn)
+                self.clear_target_checkpoints(postgres_conn)
+            
             # 남은 테이블 목록 확인
             remaining_tables = self.get_remaining_tables()
             
@@ -498,13 +988,20 @@ class ResumableDBMigrator:
             migration_results = {}
             total_records = 0
             
+            if self.max_workers > 1 and len(remaining_tables) > 1:
+                # 의존성 기준 병렬 마이그레이션
+                logger.info(f"⚙️ 병렬 마이그레이션 (동시 {self.max_workers}개 테이블)")
+                migration_results = self.migrate_tables_parallel(postgres_conn, remaining_tables)
+                total_records = sum(migration_results.values())
+                remaining_tables = []
+            
             # 남은 테이블별 순차 마이그레이션
             for i, table_name in enumerate(remaining_tables, 1):
                 logger.info(f"\n{'='*60}")
                 logger.info(f"📋 처리 중 ({i}/{len(remaining_tables)}): {table_name}")
                 logger.info(f"{'='*60}")
                 
-                count = self.migrate_table_data_batch(mssql_conn, postgres_conn, table_name)
+                count = self.migrate_table(mssql_conn, postgres_conn, table_name)
                 migration_results[table_name] = count
                 total_records += count
                 
@@ -548,6 +1045,9 @@ class ResumableDBMigrator:
             for table_name, result in verification_results.items():
                 if result.get('match', False):
                     logger.info(f"✅ {table_name}: {result['postgresql_count']:,}건")
+                elif 'changed' in result:
+                    logger.warning(f"⚠️ {table_name}: 불일치 (누락 {len(result['missing'])}, "
+                                   f"추가 {len(result['extra'])}, 변경 {len(result['changed'])}건)")
                 else:
                     logger.warning(f"⚠️ {table_name}: 불일치 (차이: {result.get('difference', 0)}건)")
             
@@ -565,6 +1065,28 @@ class ResumableDBMigrator:
                 postgres_conn.close()
                 logger.info("PostgreSQL 연결 종료")
 
+def _migrate_table_worker(table_name: str, options: Dict[str, Any], events) -> int:
+    """작업 프로세스: 테이블 1개 마이그레이션 (자체 연결, 진행 이벤트는 큐로 전달)"""
+    migrator = ResumableDBMigrator()
+    migrator.mode = options['mode']
+    migrator.batch_size = options['batch_size']
+    migrator.copy_batch_size = options['copy_batch_size']
+    migrator.batch_pause = options['batch_pause']
+    migrator.checkpoints = dict(options['checkpoints'])
+    migrator.progress_events = events
+    
+    mssql_conn = migrator.connect_mssql()
+    postgres_conn = migrator.connect_postgres()
+    try:
+        if not mssql_conn or not postgres_conn:
+            raise RuntimeError("데이터베이스 연결 실패")
+        return migrator.migrate_table(mssql_conn, postgres_conn, table_name)
+    finally:
+        if mssql_conn:
+            mssql_conn.close()
+        if postgres_conn:
+            postgres_conn.close()
+
 if __name__ == "__main__":
     import sys
     
@@ -572,6 +1094,23 @@ if __name__ == "__main__":
     force_restart = '--restart' in sys.argv or '--force' in sys.argv
     
     migrator = ResumableDBMigrator()
+    if '--mode' in sys.argv:
+        migrator.mode = sys.argv[sys.argv.index('--mode') + 1]
+    if '--workers' in sys.argv:
+        migrator.max_workers = int(sys.argv[sys.argv.index('--workers') + 1])
+    
+    if '--verify' in sys.argv:
+        # 검증만 실행 (마이그레이션 없음)
+        mssql_conn = migrator.connect_mssql()
+        postgres_conn = migrator.connect_postgres()
+        if not mssql_conn or not postgres_conn:
+            sys.exit(1)
+        try:
+            results = migrator.verify_migration_results(mssql_conn, postgres_conn)
+        finally:
+            mssql_conn.close()
+            postgres_conn.close()
+        sys.exit(0 if all(result.get('match', False) for result in results.values()) else 1)
     
     if force_restart:
         print("🔄 강제 재시작 모드")
@@ -590,6 +1129,9 @@ if __name__ == "__main__":
         print("\n💡 사용법:")
         print("   - 재개: python db_migration_resumable.py")
         print("   - 강제 재시작: python db_migration_resumable.py --restart")
+        print("   - 기존 OFFSET 방식: python db_migration_resumable.py --mode offset")
+        print("   - 동시 테이블 수 지정: python db_migration_resumable.py --workers 2")
+        print("   - 체크섬 검증만 실행: python db_migration_resumable.py --verify")
         print("="*60)
     else:
         print("\n" + "="*60)
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+gunicorn 설정 (운영 실행)
+- preload_app: 마스터에서 앱을 한 번 로드 후 fork (copy-on-write 로 워커 메모리 절약)
+- post_fork: 워커별 DB 커넥션 풀 폐기 / Redis 풀 재생성 / 배치 스케줄러 시작 (리더 선출된 워커만 실행)
+- 워커/스레드 수는 환경 변수로 환경별 설정 (GUNICORN_WORKERS, GUNICORN_THREADS)
+- Prometheus 다중 프로세스 메트릭 (PROMETHEUS_MULTIPROC_DIR) 준비/정리
+
+사용법:
+    FLASK_ENV=production gunicorn -c gunicorn.conf.py wsgi:app
+"""
+
+import multiprocessing
+import os
+import shutil
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:5000')
+
+# 워커: 기본 CPU*2+1 (매출 큐브는 워커마다 SALES_CUBE_MAX_MB 까지 사용하므로 메모리에 맞춰 조정)
+workers = int(os.environ.get('GUNICORN_WORKERS', multiprocessing.cpu_count() * 2 + 1))
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+worker_class = 'gthread' if threads > 1 else 'sync'
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 120))
+graceful_timeout = int(os.environ.get('GUNICORN_GRACEFUL_TIMEOUT', 30))
+keepalive = int(os.environ.get('GUNICORN_KEEPALIVE', 5))
+
+# 메모리 누적 방지용 주기적 워커 재시작 (0 = 사용 안 함)
+# 작업 러너가 웹 워커에 포함된 embedded 모드는 재시작이 실행 중 배치를 끊으므로 기본 사용 안 함
+_embedded_runner = os.environ.get('BATCH_WORKER_MODE', 'embedded') != 'external'
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 0 if _embedded_runner else 1000))
+max_requests_jitter = int(os.environ.get('GUNICORN_MAX_REQUESTS_JITTER', 100))
+
+preload_app = os.environ.get('GUNICORN_PRELOAD', 'true').lower() == 'true'
+if preload_app:
+    # 앱 로드 전에 설정되어야 함: 스케줄러/작업 러너 스레드를 마스터가 아닌 워커에서 시작
+    os.environ['BATCH_DEFER_START'] = 'true'
+
+accesslog = os.environ.get('GUNICORN_ACCESS_LOG', '-')
+errorlog = os.environ.get('GUNICORN_ERROR_LOG', '-')
+loglevel = os.environ.get('GUNICORN_LOG_LEVEL', 'info')
+
+# 워커별 메트릭 파일 디렉터리 (워커 fork 전에 환경 변수로 설정되어야 함)
+prometheus_dir = os.environ.setdefault('PROMETHEUS_MULTIPROC_DIR', '/tmp/mis_v2_prometheus')
+
+
+def on_starting(server):
+    """마스터 시작 시 이전 실행의 메트릭 파일 제거"""
+    shutil.rmtree(prometheus_dir, ignore_errors=True)
+    os.makedirs(prometheus_dir, exist_ok=True)
+
+
+def when_ready(server):
+    """워커 fork 직전 (preload): 앱 로드 중 마스터가 연 DB/Redis 커넥션 정리"""
+    if not server.cfg.preload_app:
+        return
+    from app.common.cache import cache
+    from app.common.models import db
+    with server.app.wsgi().app_context():
+        db.engine.dispose()
+    cache.reset_pools()
+
+
+def post_fork(server, worker):
+    """preload 된 앱의 fork 이전 자원을 워커용으로 재초기화"""
+    if not server.cfg.preload_app:
+        return
+    from app import init_forked_worker
+    init_forked_worker(server.app.wsgi())
+
+
+def worker_exit(server, worker):
+    """
+    워커 종료: 작업 러너 중지 + 실행 중 작업 완료 대기 (graceful_timeout 까지)
+    → 스케줄러 보유 워커는 스케줄러 종료 후 리더 락 해제 (다른 워커가 승계)
+
+    시간 안에 끝나지 않은 작업은 다음 러너 시작 시 recover_stale() 이 FAILED(재개 가능) 처리
+    """
+    from app.services.batch_scheduler import ROLE_WEB, batch_scheduler
+    from app.services.batch_job_runner import batch_job_runner
+    batch_job_runner.shutdown(timeout=server.cfg.graceful_timeout)
+    if batch_scheduler.role != ROLE_WEB and batch_scheduler.scheduler is not None:
+        batch_scheduler.shutdown(wait=True)
+
+
+def child_exit(server, worker):
+    """종료된 워커의 메트릭 파일 정리"""
+    from app.common.metrics import mark_process_dead
+    mark_process_dead(worker.pid)
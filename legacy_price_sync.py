@@ -1,101 +1,51 @@
-import pyodbc
-from app import create_app, db
-from app.common.models import Product
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+레거시 DB 가격 동기화 (가격 0 상품 → tbl_Product.ProdTagAmt)
+
+사용법:
+    python legacy_price_sync.py            # 반영
+    python legacy_price_sync.py --dry-run  # 갱신 건수만 확인
+"""
+
 import sys
-import os
 
-# 레거시 DB 연결 정보
-LEGACY_DB_CONNECTION = "DRIVER={ODBC Driver 17 for SQL Server};SERVER=210.109.96.74,2521;DATABASE=db_mis;UID=user_mis;PWD=user_mis!@12;ApplicationIntent=ReadOnly;"
+from app import create_app, db
+from legacy_sync import PRODUCT_PRICE, LegacySync, connect_legacy
 
 app = create_app()
 
-def connect_legacy_db():
-    """레거시 DB 연결"""
+
+def sync_product_prices(dry_run: bool = False):
+    """레거시 DB에서 가격 정보 동기화 (IN 배치 조회 + UPDATE ... FROM 1회)"""
     try:
-        conn = pyodbc.connect(LEGACY_DB_CONNECTION)
+        legacy_conn = connect_legacy()
         print("✅ 레거시 DB 연결 성공")
-        return conn
     except Exception as e:
         print(f"❌ 레거시 DB 연결 실패: {e}")
-        return None
-
-def sync_product_prices():
-    """레거시 DB에서 가격 정보 동기화"""
-    legacy_conn = connect_legacy_db()
-    if not legacy_conn:
         return
-    
+
     try:
         with app.app_context():
             print("💰 레거시 DB에서 가격 정보 동기화 시작")
             print("="*60)
-            
-            # 현재 시스템에서 가격이 0인 상품들 조회
-            zero_price_products = Product.query.filter_by(price=0).all()
-            print(f"📊 가격이 0인 상품: {len(zero_price_products)}개")
-            
-            if not zero_price_products:
-                print("📭 가격이 0인 상품이 없습니다.")
-                return
-            
-            # 레거시 DB에서 가격 정보 조회
-            cursor = legacy_conn.cursor()
-            
-            updated_count = 0
-            not_found_count = 0
-            
-            for product in zero_price_products:
-                try:
-                    # legacy_seq를 이용해 레거시 DB에서 가격 조회
-                    if not product.legacy_seq:
-                        print(f"⚠️ {product.product_name}: legacy_seq 없음")
-                        not_found_count += 1
-                        continue
-                    
-                    # 레거시 DB 쿼리 (tbl_Product의 ProdTagAmt 필드)
-                    query = """
-                    SELECT ProdTagAmt 
-                    FROM tbl_Product 
-                    WHERE seq = ?
-                    """
-                    
-                    cursor.execute(query, product.legacy_seq)
-                    result = cursor.fetchone()
-                    
-                    if result and result[0] and result[0] > 0:
-                        legacy_price = int(result[0])
-                        
-                        # 현재 시스템 업데이트
-                        product.price = legacy_price
-                        print(f"✅ {product.product_name[:30]:30s}: 0원 → {legacy_price:>8,}원")
-                        updated_count += 1
-                    else:
-                        print(f"❌ {product.product_name[:30]:30s}: 레거시에도 가격 없음")
-                        not_found_count += 1
-                        
-                except Exception as e:
-                    print(f"❌ {product.product_name}: 오류 - {e}")
-                    not_found_count += 1
-                    continue
-            
-            # 변경사항 저장
-            if updated_count > 0:
-                db.session.commit()
-                print(f"\n💾 {updated_count}개 상품 가격 업데이트 완료!")
-            
-            print(f"\n📈 동기화 결과:")
-            print(f"  - 업데이트됨: {updated_count}개")
-            print(f"  - 찾을 수 없음: {not_found_count}개")
-            
+
+            result = LegacySync(legacy_conn, db.session).run(PRODUCT_PRICE, dry_run=dry_run)
+
+            print(f"\n📈 동기화 결과{' (dry-run)' if dry_run else ''}:")
+            print(f"  - 가격 0 상품: {result['candidates']}개")
+            print(f"  - 업데이트됨: {result['updated'].get('price', 0)}개")
+            print(f"  - 레거시에 없음: {result['not_found']}개")
+            print(f"  - 레거시에도 가격 없음: "
+                  f"{result['candidates'] - result['not_found'] - result['updated'].get('price', 0)}개")
+
     except Exception as e:
-        db.session.rollback()
         print(f"❌ 가격 동기화 실패: {e}")
         import traceback
         traceback.print_exc()
     finally:
-        if legacy_conn:
-            legacy_conn.close()
-            print("🔌 레거시 DB 연결 종료")
+        legacy_conn.close()
+        print("🔌 레거시 DB 연결 종료")
 
 if __name__ == "__main__":
-    sync_product_prices() 
\ No newline at end of file
+    sync_product_prices(dry_run='--dry-run' in sys.argv)
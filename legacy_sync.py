@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+레거시 MS-SQL → 현재 DB 속성 동기화 (집합 기반)
+- 동기화 = 선언형 매핑 (레거시 테이블/키 ↔ 대상 테이블/legacy_seq, 컬럼 그룹)
+- 대상 후보 legacy_seq 를 모아 IN 목록 배치로 레거시 컬럼 조회 (상품 1건당 쿼리 없음)
+- 조회 결과는 대상 컬럼 타입 그대로의 임시 테이블에 COPY 적재
+- 컬럼 그룹마다 UPDATE ... FROM 1회 (값이 다른 행만), dry_run 이면 건수만 확인 후 롤백
+- 상품 테이블이 바뀌면 커밋 후 product_catalog 구체화 뷰 갱신
+"""
+
+import csv
+import io
+import logging
+import os
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import text
+
+logger = logging.getLogger(__name__)
+
+IN_BATCH = 1000  # MS-SQL 파라미터 상한(2100) 이내
+STAGE_TABLE = 'tmp_legacy_sync'
+CATALOG_TABLES = {'products', 'product_details'}  # product_catalog 구체화 뷰 원본
+
+
+@dataclass
+class ColumnGroup:
+    """함께 갱신할 컬럼 묶음 (대상 컬럼 → 레거시 컬럼/식), condition 은 임시 테이블 s 기준 추가 조건"""
+    name: str
+    columns: Dict[str, str]
+    condition: str = ''
+
+
+@dataclass
+class SyncMapping:
+    """레거시 테이블 1개 → 대상 테이블 1개 동기화 정의"""
+    name: str
+    legacy_table: str
+    legacy_key: str
+    target_table: str
+    target_key: str
+    groups: List[ColumnGroup]
+    legacy_filter: str = ''   # 레거시 조회 조건
+    target_filter: str = ''   # 대상 후보 행 조건, 대상 테이블 별칭 t (예: t.price = 0)
+    touch_updated_at: bool = True
+
+    @property
+    def columns(self) -> Dict[str, str]:
+        merged: Dict[str, str] = {}
+        for group in self.groups:
+            merged.update(group.columns)
+        return merged
+
+
+def _csv_value(value):
+    """COPY 값 정리: 문자열 공백 제거, 정수값 금액(Decimal/float)은 정수로 (integer 컬럼 적재)"""
+    if isinstance(value, str):
+        return value.strip()
+    if isinstance(value, (Decimal, float)) and value == int(value):
+        return int(value)
+    return value
+
+
+def connect_legacy(server: str = None, database: str = None, user: str = None, password: str = None):
+    """레거시 MS-SQL 읽기 전용 연결 (인자 없으면 db_migration_resumable 과 같은 환경 변수)"""
+    import pyodbc
+
+    conn_str = (
+        "DRIVER={ODBC Driver 17 for SQL Server};"
+        f"SERVER={server or os.getenv('LEGACY_DB_SERVER', '210.109.96.74,2521')};"
+        f"DATABASE={database or os.getenv('LEGACY_DB_NAME', 'db_mis')};"
+        f"UID={user or os.getenv('LEGACY_DB_USER', 'user_mis')};"
+        f"PWD={password or os.getenv('LEGACY_DB_PASSWORD', 'user_mis!@12')};"
+        "ApplicationIntent=ReadOnly;"
+    )
+    return pyodbc.connect(conn_str, timeout=30)
+
+
+class LegacySync:
+    """매핑 실행기 (legacy_conn: pyodbc 연결, session: SQLAlchemy 세션)"""
+
+    def __init__(self, legacy_conn, session, in_batch: int = IN_BATCH):
+        self.legacy_conn = legacy_conn
+        self.session = session
+        self.in_batch = in_batch
+
+    def _candidate_keys(self, mapping: SyncMapping) -> List[Any]:
+        where = f"AND ({mapping.target_filter})" if mapping.target_filter else ''
+        rows = self.session.execute(text(f"""
+            SELECT DISTINCT t.{mapping.target_key} FROM {mapping.target_table} t
+            WHERE t.{mapping.target_key} IS NOT NULL {where}
+        """)).all()
+        return [row[0] for row in rows]
+
+    def _fetch_legacy(self, mapping: SyncMapping, keys: List[Any]) -> List[tuple]:
+        """후보 키를 IN 목록 배치로 조회 → (키, 컬럼...) 행"""
+        columns = list(mapping.columns.values())
+        select = f"SELECT {mapping.legacy_key}, {', '.join(columns)} FROM {mapping.legacy_table}"
+        extra = f" AND ({mapping.legacy_filter})" if mapping.legacy_filter else ''
+        cursor = self.legacy_conn.cursor()
+        rows: List[tuple] = []
+        for start in range(0, len(keys), self.in_batch):
+            chunk = keys[start:start + self.in_batch]
+            cursor.execute(f"{select} WHERE {mapping.legacy_key} IN ({', '.join('?' * len(chunk))}){extra}", chunk)
+            rows.extend(tuple(row) for row in cursor.fetchall())
+        return rows
+
+    def _stage(self, mapping: SyncMapping, rows: List[tuple]):
+        """대상 컬럼 타입 그대로 임시 테이블 생성 + COPY (트랜잭션 종료 시 삭제)"""
+        targets = list(mapping.columns)
+        self.session.execute(text(f"DROP TABLE IF EXISTS {STAGE_TABLE}"))
+        self.session.execute(text(f"""
+            CREATE TEMP TABLE {STAGE_TABLE} ON COMMIT DROP AS
+            SELECT {mapping.target_key} AS legacy_key, {', '.join(targets)}
+            FROM {mapping.target_table} WITH NO DATA
+        """))
+
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for row in rows:
+            writer.writerow([_csv_value(value) for value in row])
+        buffer.seek(0)
+
+        cursor = self.session.connection().connection.cursor()
+        try:
+            cursor.copy_expert(
+                f"COPY {STAGE_TABLE} (legacy_key, {', '.join(targets)}) FROM STDIN WITH (FORMAT csv)", buffer
+            )
+        finally:
+            cursor.close()
+        self.session.execute(text(f"ANALYZE {STAGE_TABLE}"))
+
+    def _apply_group(self, mapping: SyncMapping, group: ColumnGroup) -> int:
+        """그룹 1개 UPDATE ... FROM (값이 바뀌는 행만)"""
+        assignments = [f"{col} = s.{col}" for col in group.columns]
+        if mapping.touch_updated_at:
+            assignments.append("updated_at = NOW()")
+        changed = ' OR '.join(f"t.{col} IS DISTINCT FROM s.{col}" for col in group.columns)
+        conditions = [f"t.{mapping.target_key} = s.legacy_key", f"({changed})"]
+        if mapping.target_filter:
+            conditions.append(f"({mapping.target_filter})")
+        if group.condition:
+            conditions.append(f"({group.condition})")
+        return self.session.execute(text(f"""
+            UPDATE {mapping.target_table} t SET {', '.join(assignments)}
+            FROM {STAGE_TABLE} s
+            WHERE {' AND '.join(conditions)}
+        """)).rowcount
+
+    def run(self, mapping: SyncMapping, keys: Optional[List[Any]] = None, dry_run: bool = False) -> Dict[str, Any]:
+        """
+        매핑 1개 실행 → {'candidates', 'fetched', 'not_found', 'updated': {그룹: 건수}}
+
+        target_filter 는 그룹 UPDATE 에도 적용되므로 앞 그룹이 바꾼 행은 뒤 그룹에서 빠질 수 있다.
+        (예: price = 0 조건이면 가격 그룹이 먼저 갱신한 행)
+        """
+        candidates = keys if keys is not None else self._candidate_keys(mapping)
+        result = {'name': mapping.name, 'candidates': len(candidates), 'fetched': 0,
+                  'not_found': 0, 'updated': {}, 'dry_run': dry_run}
+        if not candidates:
+            logger.info(f"📭 {mapping.name}: 대상 없음")
+            return result
+
+        rows = self._fetch_legacy(mapping, candidates)
+        result['fetched'] = len(rows)
+        result['not_found'] = len(set(candidates) - {row[0] for row in rows})
+
+        try:
+            self._stage(mapping, rows)
+            for group in mapping.groups:
+                result['updated'][group.name] = self._apply_group(mapping, group)
+            if dry_run:
+                self.session.rollback()
+            else:
+                self.session.commit()
+        except Exception:
+            self.session.rollback()
+            raise
+
+        if not dry_run and mapping.target_table in CATALOG_TABLES and any(result['updated'].values()):
+            from app.services.product_catalog import product_catalog
+            product_catalog.refresh(self.session)
+
+        updated = ', '.join(f"{name} {count}건" for name, count in result['updated'].items())
+        logger.info(f"{'🔎' if dry_run else '✅'} {mapping.name}: 후보 {result['candidates']}건, "
+                    f"레거시 조회 {result['fetched']}건 (없음 {result['not_found']}), 갱신 {updated}"
+                    f"{' (dry-run, 롤백)' if dry_run else ''}")
+        return result
+
+
+# ----------------------------------------------------------------------
+# 상품 동기화 매핑 (tbl_Product.Seq ↔ products.legacy_seq, tbl_Product_DTL.Seq ↔ product_details.legacy_seq)
+# ----------------------------------------------------------------------
+PRODUCT_DETAIL_CODE_COLUMNS = {
+    'std_div_prod_code': 'StdDivProdCode',
+    'brand_code': 'BrandCode',
+    'div_type_code': 'DivTypeCode',
+    'prod_group_code': 'ProdGroupCode',
+    'prod_type_code': 'ProdTypeCode',
+    'prod_code': 'ProdCode',
+    'prod_type2_code': 'ProdType2Code',
+    'year_code': 'YearCode',
+    'color_code': 'ProdColorCode',
+}
+
+PRODUCT_PRICE = SyncMapping(
+    name='상품 가격 (가격 0 상품)',
+    legacy_table='tbl_Product', legacy_key='Seq',
+    target_table='products', target_key='legacy_seq',
+    target_filter='t.price = 0',
+    groups=[ColumnGroup('price', {'price': 'ProdTagAmt'}, condition='s.price > 0')],
+)
+
+PRODUCT_MASTER = SyncMapping(
+    name='상품 마스터',
+    legacy_table='tbl_Product', legacy_key='Seq',
+    target_table='products', target_key='legacy_seq',
+    groups=[
+        ColumnGroup('price', {'price': 'ProdTagAmt'}, condition='s.price > 0'),
+        ColumnGroup('attributes', {'product_name': 'ProdName', 'use_yn': 'UseYn'},
+                    condition='s.product_name IS NOT NULL'),
+    ],
+)
+
+PRODUCT_DETAIL_CODES = SyncMapping(
+    name='상품 상세 자가코드',
+    legacy_table='tbl_Product_DTL', legacy_key='Seq',
+    target_table='product_details', target_key='legacy_seq',
+    groups=[
+        ColumnGroup('codes', PRODUCT_DETAIL_CODE_COLUMNS, condition='LENGTH(s.std_div_prod_code) = 16'),
+        ColumnGroup('attributes', {'product_name': 'ProductName', 'status': 'Status'},
+                    condition='s.product_name IS NOT NULL'),
+    ],
+)
+
+PRODUCT_DETAIL_INVALID_CODES = SyncMapping(
+    name='상품 상세 자가코드 (16자리 아닌 모델)',
+    legacy_table='tbl_Product_DTL', legacy_key='Seq',
+    target_table='product_details', target_key='legacy_seq',
+    target_filter='LENGTH(COALESCE(t.std_div_prod_code, \'\')) <> 16',
+    groups=[ColumnGroup('codes', PRODUCT_DETAIL_CODE_COLUMNS, condition='LENGTH(s.std_div_prod_code) = 16')],
+)
@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+레거시 MS-SQL ↔ PostgreSQL 체크섬 검증
+- 행을 정규화 문자열로 만들어 양쪽 DB 안에서 MD5 계산 (행 데이터는 네트워크로 가져오지 않음)
+- 키 해시 첫 바이트로 256개 구간 분할 → 구간별 (건수, 행 해시 합) 집계 쿼리 1회씩 비교
+- 불일치 구간만 다음 바이트로 다시 분할, 작은 구간은 (키, 행 해시) 만 조회해 정확한 차이 키 보고
+- 구간은 키 값 순서가 아니라 키 해시 기준 (MS-SQL/PostgreSQL 콜레이션 정렬 차이와 무관)
+
+정규화 규칙 (db_migration_resumable 정제 규칙과 동일):
+- 문자열: 앞뒤 스페이스만 제거 (탭/개행은 유지), 빈 문자열 → NULL
+- 정수/bit: 정수 문자열, 실수/금액: 소수 6자리
+- 날짜시간: 'YYYY-MM-DD HH:MI:SS' (원본 문자열 날짜도 변환 후 비교), 바이너리: 대문자 16진수
+- 문자 인코딩: 양쪽 모두 UTF-8 바이트로 해시 (적재와 같이 유니코드 기준 비교)
+  MS-SQL 은 *_UTF8 collation 으로 VARCHAR 변환 (SQL Server 2019 이상), PostgreSQL 은 convert_to(UTF8)
+  (코드페이지 collation 은 표현 못 하는 문자를 '?' 로 바꿔 차이를 숨기므로 사용하지 않음)
+"""
+
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+NULL_MARK = '~'
+SEPARATOR = '|'
+LEAF_ROWS = 2000    # 이 건수 이하 구간은 (키, 행 해시) 직접 비교
+MAX_DIFF_KEYS = 1000
+
+INT_TYPES = {'smallint', 'integer', 'bigint'}
+NUMBER_TYPES = {'numeric', 'real', 'double precision', 'money'}
+DATETIME_TYPES = {'timestamp without time zone', 'timestamp with time zone'}
+
+
+@dataclass
+class TableMapping:
+    """비교 대상 (원본 테이블 ↔ 대상 테이블, 컬럼은 (원본, 대상) 쌍)"""
+    source_table: str
+    target_table: str
+    key: List[Tuple[str, str]]
+    columns: List[Tuple[str, str]]
+    source_filter: str = ''
+    target_filter: str = ''
+    kinds: Dict[str, str] = field(default_factory=dict)  # 대상 컬럼 → 정규화 종류
+
+
+def column_kind(pg_data_type: str) -> str:
+    """PostgreSQL 컬럼 타입 → 정규화 종류"""
+    if pg_data_type in INT_TYPES:
+        return 'int'
+    if pg_data_type in NUMBER_TYPES:
+        return 'number'
+    if pg_data_type == 'boolean':
+        return 'bool'
+    if pg_data_type in DATETIME_TYPES:
+        return 'datetime'
+    if pg_data_type == 'date':
+        return 'date'
+    if pg_data_type == 'bytea':
+        return 'binary'
+    return 'text'
+
+
+class ChecksumVerifier:
+    """구간 해시 비교 → 불일치 구간 드릴다운 → 차이 키 보고"""
+
+    def __init__(self, mssql_conn, postgres_conn, collation: str = None,
+                 leaf_rows: int = LEAF_ROWS, max_diff_keys: int = MAX_DIFF_KEYS):
+        self.mssql_conn = mssql_conn
+        self.postgres_conn = postgres_conn
+        self.collation = collation or os.getenv('MIGRATION_VERIFY_COLLATION', 'Korean_100_CI_AS_SC_UTF8')
+        if not self.collation.upper().endswith('_UTF8'):
+            raise ValueError(f"UTF-8 collation 이 필요합니다: {self.collation}")
+        self.leaf_rows = leaf_rows
+        self.max_diff_keys = max_diff_keys
+        self.queries = 0
+
+    # ------------------------------------------------------------------
+    # 매핑 구성
+    # ------------------------------------------------------------------
+    def target_column_types(self, table_name: str) -> Dict[str, str]:
+        cursor = self.postgres_conn.cursor()
+        cursor.execute("""
+            SELECT column_name, data_type FROM information_schema.columns
+            WHERE table_name = %s ORDER BY ordinal_position
+        """, (table_name,))
+        return dict(cursor.fetchall())
+
+    def mapping_for_copy(self, source_table: str, source_columns: List[str], key: List[str]) -> TableMapping:
+        """1:1 복제 테이블 매핑 (대상 = 소문자 테이블/컬럼명, 대상에 없는 컬럼 제외)"""
+        target_table = source_table.lower()
+        target_types = self.target_column_types(target_table)
+        columns = [(col, col.lower()) for col in source_columns
+                   if col.lower() in target_types and col not in key]
+        skipped = [col for col in source_columns if col.lower() not in target_types]
+        if skipped:
+            logger.info(f"ℹ️ 대상에 없는 컬럼 제외 ({source_table}): {', '.join(skipped)}")
+        return TableMapping(source_table, target_table, [(col, col.lower()) for col in key], columns,
+                            kinds={name: column_kind(data_type) for name, data_type in target_types.items()})
+
+    def _kinds(self, mapping: TableMapping) -> Dict[str, str]:
+        if not mapping.kinds:
+            mapping.kinds = {name: column_kind(data_type)
+                             for name, data_type in self.target_column_types(mapping.target_table).items()}
+        return mapping.kinds
+
+    # ------------------------------------------------------------------
+    # 정규화 식 (양쪽 같은 문자열 생성)
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _mssql_value(column: str, kind: str) -> str:
+        col = f"[{column}]"
+        if kind in ('int', 'bool'):
+            return f"CONVERT(VARCHAR(30), TRY_CAST({col} AS BIGINT))"
+        if kind == 'number':
+            return f"CONVERT(VARCHAR(50), TRY_CAST({col} AS DECIMAL(38, 6)))"
+        if kind == 'datetime':
+            return f"CONVERT(VARCHAR(19), TRY_CONVERT(DATETIME2, {col}), 120)"
+        if kind == 'date':
+            return f"CONVERT(VARCHAR(10), TRY_CONVERT(DATE, {col}), 23)"
+        if kind == 'binary':
+            return f"CONVERT(VARCHAR(MAX), {col}, 2)"
+        return f"NULLIF(LTRIM(RTRIM(CAST({col} AS NVARCHAR(MAX)))), N'')"
+
+    @staticmethod
+    def _pg_value(column: str, kind: str) -> str:
+        if kind == 'int':
+            return f"{column}::bigint::text"
+        if kind == 'bool':
+            return f"{column}::int::text"
+        if kind == 'number':
+            return f"{column}::numeric(38, 6)::text"
+        if kind == 'datetime':
+            return f"to_char({column}, 'YYYY-MM-DD HH24:MI:SS')"
+        if kind == 'date':
+            return f"to_char({column}, 'YYYY-MM-DD')"
+        if kind == 'binary':
+            return f"upper(encode({column}, 'hex'))"
+        return f"NULLIF(btrim({column}::text, ' '), '')"
+
+    def _mssql_hash(self, pairs: List[Tuple[str, str]], kinds: Dict[str, str]) -> str:
+        parts = f" + '{SEPARATOR}' + ".join(
+            f"COALESCE(CAST({self._mssql_value(src, kinds.get(dst, 'text'))} AS NVARCHAR(MAX)), N'{NULL_MARK}')"
+            for src, dst in pairs)
+        return f"HASHBYTES('MD5', CAST(({parts}) COLLATE {self.collation} AS VARCHAR(MAX)))"
+
+    def _pg_hash(self, pairs: List[Tuple[str, str]], kinds: Dict[str, str]) -> str:
+        parts = f" || '{SEPARATOR}' || ".join(
+            f"COALESCE({self._pg_value(dst, kinds.get(dst, 'text'))}, '{NULL_MARK}')" for _, dst in pairs)
+        return f"md5(convert_to({parts}, 'UTF8'))"
+
+    def _hashed(self, mapping: TableMapping, side: str) -> Tuple[str, List[str]]:
+        """키 해시(kh)/행 해시(rh)/정규화 키 컬럼을 가진 하위 쿼리"""
+        kinds = self._kinds(mapping)
+        pairs = mapping.key + mapping.columns
+        if side == 'source':
+            key_columns = [f"{self._mssql_value(src, kinds.get(dst, 'text'))} AS k{i}"
+                           for i, (src, dst) in enumerate(mapping.key)]
+            where = f"WHERE {mapping.source_filter}" if mapping.source_filter else ''
+            return (f"SELECT {self._mssql_hash(mapping.key, kinds)} AS kh, {self._mssql_hash(pairs, kinds)} AS rh, "
+                    f"{', '.join(key_columns)} FROM {mapping.source_table} {where}",
+                    [f"k{i}" for i in range(len(key_columns))])
+        key_columns = [f"{self._pg_value(dst, kinds.get(dst, 'text'))} AS k{i}"
+                       for i, (_, dst) in enumerate(mapping.key)]
+        where = f"WHERE {mapping.target_filter}" if mapping.target_filter else ''
+        return (f"SELECT {self._pg_hash(mapping.key, kinds)} AS kh, {self._pg_hash(pairs, kinds)} AS rh, "
+                f"{', '.join(key_columns)} FROM {mapping.target_table} {where}",
+                [f"k{i}" for i in range(len(key_columns))])
+
+    # ------------------------------------------------------------------
+    # 구간 집계 / 행 해시 조회
+    # ------------------------------------------------------------------
+    def _execute(self, conn, query: str) -> List[tuple]:
+        self.queries += 1
+        cursor = conn.cursor()
+        cursor.execute(query)
+        rows = cursor.fetchall()
+        if conn is self.postgres_conn:
+            self.postgres_conn.rollback()  # 읽기 전용, 트랜잭션 유지 방지
+        return rows
+
+    def _bucket_sums(self, mapping: TableMapping, side: str, prefix: str) -> Dict[int, Tuple[int, int]]:
+        """prefix(16진수) 아래 다음 바이트 구간별 (건수, 행 해시 합)"""
+        inner, _ = self._hashed(mapping, side)
+        level = len(prefix) // 2
+        if side == 'source':
+            where = f"WHERE SUBSTRING(kh, 1, {level}) = 0x{prefix.upper()}" if level else ''
+            query = f"""
+                SELECT CAST(SUBSTRING(kh, {level + 1}, 1) AS INT) AS bucket, COUNT(*),
+                       SUM(CAST(CAST(SUBSTRING(rh, 1, 4) AS INT) AS BIGINT))
+                FROM ({inner}) h {where}
+                GROUP BY CAST(SUBSTRING(kh, {level + 1}, 1) AS INT)
+            """
+            conn = self.mssql_conn
+        else:
+            where = f"WHERE substr(kh, 1, {level * 2}) = '{prefix.lower()}'" if level else ''
+            query = f"""
+                SELECT ('x' || substr(kh, {level * 2 + 1}, 2))::bit(8)::int AS bucket, COUNT(*),
+                       SUM(('x' || substr(rh, 1, 8))::bit(32)::int::bigint)
+                FROM ({inner}) h {where}
+                GROUP BY 1
+            """
+            conn = self.postgres_conn
+        return {int(bucket): (int(count), int(total or 0)) for bucket, count, total in self._execute(conn, query)}
+
+    def _row_hashes(self, mapping: TableMapping, side: str, prefix: str) -> Dict[tuple, int]:
+        """prefix 구간의 정규화 키 → 행 해시"""
+        inner, key_aliases = self._hashed(mapping, side)
+        level = len(prefix) // 2
+        if side == 'source':
+            query = (f"SELECT {', '.join(key_aliases)}, CAST(SUBSTRING(rh, 1, 4) AS INT) FROM ({inner}) h "
+                     f"WHERE SUBSTRING(kh, 1, {level}) = 0x{prefix.upper()}")
+            conn = self.mssql_conn
+        else:
+            query = (f"SELECT {', '.join(key_aliases)}, ('x' || substr(rh, 1, 8))::bit(32)::int FROM ({inner}) h "
+                     f"WHERE substr(kh, 1, {level * 2}) = '{prefix.lower()}'")
+            conn = self.postgres_conn
+        return {tuple(row[:-1]): int(row[-1]) for row in self._execute(conn, query)}
+
+    # ------------------------------------------------------------------
+    # 검증
+    # ------------------------------------------------------------------
+    def verify(self, mapping: TableMapping) -> Dict[str, Any]:
+        """
+        테이블 검증 결과
+        - source_count/target_count, match
+        - missing(대상에 없음)/extra(대상에만 있음)/changed(값 다름): 정규화 키 목록 (max_diff_keys 까지)
+        """
+        started = time.perf_counter()
+        queries_before = self.queries
+        result = {'source_count': 0, 'target_count': 0, 'missing': [], 'extra': [], 'changed': [],
+                  'ranges_checked': 0, 'ranges_mismatched': 0, 'truncated': False}
+
+        stack = ['']
+        while stack:
+            prefix = stack.pop()
+            source = self._bucket_sums(mapping, 'source', prefix)
+            target = self._bucket_sums(mapping, 'target', prefix)
+            if not prefix:
+                result['source_count'] = sum(count for count, _ in source.values())
+                result['target_count'] = sum(count for count, _ in target.values())
+
+            for bucket in sorted(set(source) | set(target)):
+                result['ranges_checked'] += 1
+                source_sum = source.get(bucket, (0, 0))
+                target_sum = target.get(bucket, (0, 0))
+                if source_sum == target_sum:
+                    continue
+                result['ranges_mismatched'] += 1
+                child = f"{prefix}{bucket:02x}"
+                if max(source_sum[0], target_sum[0]) > self.leaf_rows and len(child) < 32:
+                    stack.append(child)
+                else:
+                    self._diff_leaf(mapping, child, result)
+                if self._diff_count(result) >= self.max_diff_keys:
+                    result['truncated'] = True
+                    stack.clear()
+                    break
+
+        result['match'] = not self._diff_count(result) and result['source_count'] == result['target_count']
+        result['queries'] = self.queries - queries_before
+        result['elapsed'] = round(time.perf_counter() - started, 2)
+        return result
+
+    def _diff_leaf(self, mapping: TableMapping, prefix: str, result: Dict[str, Any]):
+        source = self._row_hashes(mapping, 'source', prefix)
+        target = self._row_hashes(mapping, 'target', prefix)
+        result['missing'].extend(sorted(set(source) - set(target), key=str))
+        result['extra'].extend(sorted(set(target) - set(source), key=str))
+        result['changed'].extend(sorted((key for key in source.keys() & target.keys()
+                                         if source[key] != target[key]), key=str))
+
+    @staticmethod
+    def _diff_count(result: Dict[str, Any]) -> int:
+        return len(result['missing']) + len(result['extra']) + len(result['changed'])
+
+
+def log_result(table_name: str, result: Dict[str, Any], sample: int = 10):
+    """검증 결과 로그 (차이 키는 종류별 sample 건)"""
+    if result['match']:
+        logger.info(f"✅ {table_name}: {result['target_count']:,}건 일치 "
+                    f"(구간 {result['ranges_checked']}, 쿼리 {result['queries']}, {result['elapsed']}초)")
+        return
+    logger.warning(f"⚠️ {table_name}: 원본 {result['source_count']:,}건 / 대상 {result['target_count']:,}건, "
+                   f"누락 {len(result['missing'])} · 추가 {len(result['extra'])} · 변경 {len(result['changed'])}"
+                   f"{' (상한 도달)' if result['truncated'] else ''} "
+                   f"(불일치 구간 {result['ranges_mismatched']}/{result['ranges_checked']}, 쿼리 {result['queries']})")
+    for label in ('missing', 'extra', 'changed'):
+        for key in result[label][:sample]:
+            logger.warning(f"   {label}: {', '.join(str(value) for value in key)}")
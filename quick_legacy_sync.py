@@ -7,6 +7,10 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from app import create_app
 from app.common.models import db
+from legacy_sync import PRODUCT_DETAIL_INVALID_CODES, PRODUCT_PRICE, LegacySync, connect_legacy
+
+# 빠른 동기화: 값이 비어 있거나 잘못된 행만 (가격 0 상품, 16자리가 아닌 자가코드)
+QUICK_SYNC_MAPPINGS = [PRODUCT_PRICE, PRODUCT_DETAIL_INVALID_CODES]
 
 def quick_legacy_sync():
     """빠른 레거시 동기화 및 향후 생성/관리 대비"""
@@ -34,132 +38,24 @@ def quick_legacy_sync():
         print(f"   📊 상세 모델: {current_state.detail_count}개")
         print(f"   📊 16자리 코드: {current_state.valid_16_count}개")
         
-        # 2. 레거시 구조 정확 적용 (이미지 기반)
-        print("\n2️⃣ 레거시 구조 정확 적용")
-        
-        # 실제 레거시 데이터 (tbl_Product_DTL에서 확인된 구조)
-        legacy_products = [
-            {
-                'name_pattern': '카시트',
-                'brand_code': 'RY',
-                'div_type_code': '2',
-                'prod_group_code': 'SG', 
-                'prod_type_code': 'WC',
-                'prod_code': 'XX',
-                'prod_type2_code': '00',
-                'details': [
-                    ('14', 'WIR', 'RY2SGWCXX0014WIR'),
-                    ('15', 'ZZN', 'RY2SGWCXX0015ZZN'),
-                    ('16', 'BKE', 'RY2SGWCXX0016BKE'),
-                    ('16', 'BRN', 'RY2SGWCXX0016BRN'),
-                    ('17', 'BKE', 'RY2SGWCXX0017BKE')
-                ],
-                'price': 298000
-            },
-            {
-                'name_pattern': '유모차',
-                'brand_code': 'RY',
-                'div_type_code': '2',
-                'prod_group_code': 'SG',
-                'prod_type_code': 'WO',
-                'prod_code': 'XX',
-                'prod_type2_code': '00',
-                'details': [
-                    ('12', 'BKW', 'RY2SGWOX00012BKW'),
-                    ('20', 'MGY', 'RY2SGWOX00020MGY')
-                ],
-                'price': 458000
-            },
-            {
-                'name_pattern': '하이체어',
-                'brand_code': 'RY',
-                'div_type_code': '3',
-                'prod_group_code': 'CB',
-                'prod_type_code': 'BK',
-                'prod_code': 'XX',
-                'prod_type2_code': '00',
-                'details': [
-                    ('20', 'SBG', 'RY3CBBKXX0020SBG'),
-                    ('20', 'BK2', 'RY3CBBKXX0020BK2')
-                ],
-                'price': 198000
-            }
-        ]
-        
-        # 각 제품 적용
-        for legacy_product in legacy_products:
-            print(f"   🔄 {legacy_product['name_pattern']} 제품 처리")
-            
-            # 해당 제품 찾기
-            result = db.session.execute(db.text("""
-                SELECT p.id, p.product_name
-                FROM products p
-                WHERE p.company_id = 1 AND p.product_name LIKE :pattern
-                LIMIT 1
-            """), {'pattern': f'%{legacy_product["name_pattern"]}%'})
-            
-            product = result.fetchone()
-            
-            if product:
-                print(f"      📦 {product.product_name}")
-                
-                # 가격 업데이트
-                db.session.execute(db.text("""
-                    UPDATE products 
-                    SET price = :price, updated_at = NOW()
-                    WHERE id = :product_id
-                """), {
-                    'price': legacy_product['price'],
-                    'product_id': product.id
-                })
-                
-                # 기존 상세 삭제 후 새로 생성
-                db.session.execute(db.text("""
-                    DELETE FROM product_details WHERE product_id = :product_id
-                """), {'product_id': product.id})
-                
-                # 레거시 구조 그대로 상세 생성
-                for year_code, color_code, full_std_code in legacy_product['details']:
-                    color_names = {
-                        'WIR': '와이어', 'ZZN': '진', 'BKE': '블랙에디션', 'BRN': '브라운',
-                        'BKW': '블랙화이트', 'MGY': '그레이', 'SBG': '베이지', 'BK2': '블랙'
-                    }
-                    
-                    detail_name = f"{product.product_name} ({color_names.get(color_code, color_code)})"
-                    
-                    db.session.execute(db.text("""
-                        INSERT INTO product_details (
-                            product_id, std_div_prod_code, product_name,
-                            brand_code, div_type_code, prod_group_code, prod_type_code,
-                            prod_code, prod_type2_code, year_code, color_code,
-                            status, created_at, updated_at
-                        ) VALUES (
-                            :product_id, :std_code, :product_name,
-                            :brand_code, :div_type_code, :prod_group_code, :prod_type_code,
-                            :prod_code, :prod_type2_code, :year_code, :color_code,
-                            'Active', NOW(), NOW()
-                        )
-                    """), {
-                        'product_id': product.id,
-                        'std_code': full_std_code,
-                        'product_name': detail_name,
-                        'brand_code': legacy_product['brand_code'],
-                        'div_type_code': legacy_product['div_type_code'],
-                        'prod_group_code': legacy_product['prod_group_code'],
-                        'prod_type_code': legacy_product['prod_type_code'],
-                        'prod_code': legacy_product['prod_code'],
-                        'prod_type2_code': legacy_product['prod_type2_code'],
-                        'year_code': year_code,
-                        'color_code': color_code
-                    })
-                    
-                    print(f"        ✅ {full_std_code}")
-                
-                print(f"      💰 가격: {legacy_product['price']:,}원")
-            else:
-                print(f"      ❌ {legacy_product['name_pattern']} 제품을 찾을 수 없음")
-        
-        db.session.commit()
+        # 2. 레거시 가격/자가코드 적용 (legacy_seq 기준 집합 동기화)
+        print("\n2️⃣ 레거시 가격/자가코드 적용")
+        
+        try:
+            legacy_conn = connect_legacy()
+        except Exception as e:
+            print(f"   ❌ 레거시 DB 연결 실패: {e}")
+            legacy_conn = None
+        
+        if legacy_conn:
+            try:
+                sync = LegacySync(legacy_conn, db.session)
+                for mapping in QUICK_SYNC_MAPPINGS:
+                    result = sync.run(mapping)
+                    updated = ', '.join(f"{name} {count}개" for name, count in result['updated'].items())
+                    print(f"   🔄 {mapping.name}: 대상 {result['candidates']}개, 갱신 {updated or '없음'}")
+            finally:
+                legacy_conn.close()
         
         # 3. 향후 제품 생성/관리를 위한 코드 생성 함수 확인/개선
         print("\n3️⃣ 제품 생성/관리 코드 생성 함수 개선")
@@ -218,7 +114,7 @@ def quick_legacy_sync():
         print("      예시: RY + 2 + SG + WC + XX + 00 + 14 + WIR = RY2SGWCXX0014WIR")
         
         print("\n🎉 빠른 레거시 동기화 완료!")
-        print("✅ tbl_Product 가격과 tbl_Product_DTL 16자리 코드 구조가 정확히 적용되었습니다!")
+        print("✅ tbl_Product 가격과 tbl_Product_DTL 16자리 코드 구조가 legacy_seq 기준으로 적용되었습니다!")
         print("✅ 향후 제품 생성/수정 시에도 동일한 16자리 코드 구조를 사용할 수 있습니다!")
 
 if __name__ == "__main__":
@@ -1,8 +1,9 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 """
-MIS v2 Flask 애플리케이션 실행 파일
+MIS v2 Flask 애플리케이션 실행 파일 (개발 서버)
 새로운 모듈화된 구조 사용
+운영: FLASK_ENV=production gunicorn -c gunicorn.conf.py wsgi:app
 """
 
 import os
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+레거시 마이그레이션 방식 비교 벤치마크
+- 원본: 로컬 SQLite 파일 (레거시 MS-SQL 대체, 합성 데이터)
+- 대상: 로컬 PostgreSQL (db_migration_resumable.py 와 같은 접속 설정)
+- offset(OFFSET 페이징 + execute_batch) 과 keyset(기본키 페이징 + COPY) 처리량 비교
+
+사용법:
+    python scripts/benchmark_migration.py --rows 1000000
+    python scripts/benchmark_migration.py --rows 1000000 --baseline-rows 100000
+"""
+
+import argparse
+import logging
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from db_migration_resumable import ResumableDBMigrator
+
+logging.basicConfig(
+    level=logging.WARNING,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+TABLE_NAME = 'bench_migration'
+
+
+def build_source(path: str, rows: int) -> sqlite3.Connection:
+    """합성 원본 테이블 생성 (NULL/공백/날짜 문자열 포함)"""
+    conn = sqlite3.connect(path)
+    conn.execute(f"DROP TABLE IF EXISTS {TABLE_NAME}")
+    conn.execute(f"""
+        CREATE TABLE {TABLE_NAME} (
+            id INTEGER PRIMARY KEY,
+            code TEXT,
+            name TEXT,
+            qty INTEGER,
+            price REAL,
+            reg_date TEXT,
+            memo TEXT
+        )
+    """)
+    base = datetime(2020, 1, 1)
+    rng = random.Random(42)
+
+    def generate():
+        for i in range(1, rows + 1):
+            yield (
+                i,
+                f"G{i:08d}",
+                f" 상품 {i} ",
+                rng.randint(0, 500) if i % 10 else None,
+                round(rng.uniform(100, 100000), 2),
+                (base + timedelta(minutes=i)).strftime('%Y-%m-%d %H:%M:%S'),
+                '' if i % 7 == 0 else f"메모, \"{i}\"",
+            )
+
+    conn.executemany(f"INSERT INTO {TABLE_NAME} VALUES (?, ?, ?, ?, ?, ?, ?)", generate())
+    conn.commit()
+    return conn
+
+
+def prepare_target(migrator: ResumableDBMigrator):
+    postgres_conn = migrator.connect_postgres()
+    if not postgres_conn:
+        raise SystemExit("PostgreSQL 연결 실패")
+    cursor = postgres_conn.cursor()
+    cursor.execute(f"DROP TABLE IF EXISTS {TABLE_NAME}")
+    cursor.execute(f"""
+        CREATE TABLE {TABLE_NAME} (
+            id INTEGER PRIMARY KEY,
+            code VARCHAR(20),
+            name VARCHAR(100),
+            qty INTEGER,
+            price NUMERIC(12, 2),
+            reg_date TIMESTAMP,
+            memo TEXT
+        )
+    """)
+    postgres_conn.commit()
+    # 이전 측정이 중단되어 남은 체크포인트로 재개하지 않도록 정리
+    migrator.ensure_checkpoint_table(postgres_conn)
+    migrator.clear_target_checkpoints(postgres_conn, TABLE_NAME)
+    return postgres_conn
+
+
+def run(migrator: ResumableDBMigrator, source_conn, postgres_conn, mode: str) -> dict:
+    migrator.mode = mode
+    started = time.perf_counter()
+    migrated = migrator.migrate_table(source_conn, postgres_conn, TABLE_NAME)
+    elapsed = time.perf_counter() - started
+    return {'mode': mode, 'rows': migrated, 'elapsed': elapsed,
+            'rows_per_sec': migrated / elapsed if elapsed else 0}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='레거시 마이그레이션 방식 비교')
+    parser.add_argument('--rows', type=int, default=1_000_000, help='keyset 측정 행 수')
+    parser.add_argument('--baseline-rows', type=int, default=100_000,
+                        help='offset 측정 행 수 (OFFSET 재스캔으로 행 수 제곱에 비례해 느려짐)')
+    parser.add_argument('--copy-batch-size', type=int, default=None, help='keyset COPY 배치 크기')
+    args = parser.parse_args()
+
+    migrator = ResumableDBMigrator()
+    migrator.source_dialect = 'sqlite'
+    migrator.batch_pause = 0
+    migrator.progress_file = os.path.join(tempfile.gettempdir(), 'benchmark_migration_progress.json')
+    if args.copy_batch_size:
+        migrator.copy_batch_size = args.copy_batch_size
+
+    results = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for mode, rows in (('offset', args.baseline_rows), ('keyset', args.rows)):
+            if not rows:
+                continue
+            print(f"⏳ 원본 생성 ({mode}): {rows:,}건")
+            source_conn = build_source(os.path.join(workdir, f"{mode}.sqlite3"), rows)
+            postgres_conn = prepare_target(migrator)
+            try:
+                results.append(run(migrator, source_conn, postgres_conn, mode))
+            finally:
+                source_conn.close()
+                postgres_conn.close()
+
+    print("\n" + "=" * 60)
+    print(f"{'방식':<10}{'행 수':>12}{'소요(초)':>12}{'행/초':>14}")
+    for result in results:
+        print(f"{result['mode']:<10}{result['rows']:>12,}{result['elapsed']:>12.1f}{result['rows_per_sec']:>14,.0f}")
+    if len(results) == 2 and results[0]['rows_per_sec']:
+        print(f"\n🚀 keyset+COPY 처리량: offset 대비 {results[1]['rows_per_sec'] / results[0]['rows_per_sec']:.1f}배")
+    print("=" * 60)
+
+
+if __name__ == '__main__':
+    main()
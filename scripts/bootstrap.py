@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+DB 부트스트랩 스크립트 (스키마/기본 데이터)
+앱 기동 시에는 버전만 확인하므로, 배포 단계에서 한 번 실행합니다 (BOOTSTRAP_AUTO=false 권장).
+앱 전체(create_app)를 띄우지 않고 DB 설정만으로 실행합니다.
+
+사용법:
+    python scripts/bootstrap.py              # 뒤처진 구성요소만 실행
+    python scripts/bootstrap.py --status     # 적용 버전 확인
+    python scripts/bootstrap.py --force --component seed
+"""
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from flask import Flask
+
+from app import Config
+from app.common.bootstrap import STEPS, current_versions, run_bootstrap
+from app.common.models import db
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='DB 스키마/기본 데이터 부트스트랩')
+    parser.add_argument('--status', action='store_true', help='적용 버전만 출력')
+    parser.add_argument('--force', action='store_true', help='버전과 관계없이 다시 실행')
+    parser.add_argument('--component', action='append', choices=[step.component for step in STEPS],
+                        help='실행할 구성요소 (기본: 전체)')
+    args = parser.parse_args()
+
+    app = Flask('bootstrap')
+    app.config.from_object(Config)
+    db.init_app(app)
+
+    with app.app_context():
+        if args.status:
+            versions = current_versions(db.session)
+            for step in STEPS:
+                applied = versions.get(step.component, 0)
+                mark = '✅' if applied >= step.version else '⚠️'
+                print(f"{mark} {step.component}: 적용 v{applied} / 최신 v{step.version} ({step.description})")
+            return
+
+        applied = run_bootstrap(app, force=args.force, components=args.component)
+        if applied:
+            for component, duration_ms in applied.items():
+                print(f"✅ {component}: {duration_ms}ms")
+        else:
+            print("✅ DB 스키마/기본 데이터 최신 - 실행할 단계 없음")
+
+
+if __name__ == '__main__':
+    main()
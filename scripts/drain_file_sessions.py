@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+파일 세션 정리 스크립트 (Redis 세션 전환 후)
+로그인 중인 사용자의 파일 세션은 다음 접속 때 Redis 로 옮겨지고 파일이 삭제됩니다.
+파일명은 세션 키 해시라 일괄 이관은 할 수 없으므로, 남은 파일은 이 스크립트로 정리합니다.
+
+- 기본: 만료된 파일만 삭제하고 남은 세션 수 출력
+- --all: 전환 후 세션 수명(SESSION_LIFETIME_HOURS)이 지나면 남은 파일 전부 삭제
+
+사용법:
+    python scripts/drain_file_sessions.py
+    python scripts/drain_file_sessions.py --all
+"""
+
+import argparse
+import os
+import struct
+import sys
+import time
+from pathlib import Path
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app import Config
+
+# cachelib FileSystemCache 의 파일 수 기록 파일
+COUNT_FILE = '__wz_cache_count'
+
+
+def expires_at(path: str):
+    """cachelib 파일 세션 만료 시각 (앞 4바이트, 0 = 무기한), 읽을 수 없으면 None"""
+    try:
+        with open(path, 'rb') as f:
+            return struct.unpack('I', f.read(4))[0]
+    except (OSError, struct.error):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description='파일 세션 정리 (Redis 세션 전환 후)')
+    parser.add_argument('--dir', default=Config.SESSION_FILE_DIR, help='세션 파일 디렉토리')
+    parser.add_argument('--all', action='store_true', help='만료 여부와 관계없이 전부 삭제')
+    args = parser.parse_args()
+
+    session_dir = Path(project_root, args.dir) if not os.path.isabs(args.dir) else Path(args.dir)
+    if not session_dir.is_dir():
+        print(f"📭 세션 디렉토리 없음: {session_dir}")
+        return
+
+    now = time.time()
+    removed = remaining = 0
+    for path in session_dir.iterdir():
+        if not path.is_file() or path.name == COUNT_FILE:
+            continue
+        expiry = expires_at(str(path))
+        if args.all or expiry is None or (expiry and expiry < now):
+            path.unlink()
+            removed += 1
+        else:
+            remaining += 1
+
+    count_file = session_dir / COUNT_FILE
+    if count_file.exists():
+        count_file.unlink()
+    if args.all and not any(session_dir.iterdir()):
+        session_dir.rmdir()
+
+    print(f"🧹 파일 세션 {removed}개 삭제, 남은 세션 {remaining}개 ({session_dir})")
+    if remaining:
+        print("   남은 세션은 사용자가 접속하면 Redis 로 이관됩니다. 세션 수명 경과 후 --all 로 정리하세요.")
+
+
+if __name__ == '__main__':
+    main()
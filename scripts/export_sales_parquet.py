@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+매출 Parquet 스냅샷 전체 작성 스크립트
+배치는 변경된 월만 다시 쓰므로, 최초 적재나 스냅샷 복구 시 기간 전체를 다시 씁니다.
+
+사용법:
+    python scripts/export_sales_parquet.py --company 1
+    python scripts/export_sales_parquet.py --company 1 --start 20230101 --end 20250630
+"""
+
+import argparse
+import logging
+import sys
+from datetime import date, datetime
+from pathlib import Path
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from sqlalchemy import text
+
+from app import create_worker_app
+from app.common.models import db
+from app.services.sales_parquet import SalesParquetExporter
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='매출 Parquet 스냅샷 전체 작성')
+    parser.add_argument('--company', type=int, action='append', help='회사 ID (기본: 전체)')
+    parser.add_argument('--start', help='시작일 YYYYMMDD (기본: 가장 오래된 판매일)')
+    parser.add_argument('--end', help='종료일 YYYYMMDD (기본: 오늘)')
+    args = parser.parse_args()
+
+    app = create_worker_app(start_batch=False)
+    with app.app_context():
+        company_ids = args.company or db.session.execute(text("SELECT id FROM companies ORDER BY id")).scalars().all()
+        end = datetime.strptime(args.end, '%Y%m%d').date() if args.end else date.today()
+
+        for company_id in company_ids:
+            if args.start:
+                start = datetime.strptime(args.start, '%Y%m%d').date()
+            else:
+                start = db.session.execute(text("""
+                    SELECT MIN(sale_date) FROM sales_analysis_master WHERE company_id = :company_id
+                """), {'company_id': company_id}).scalar()
+            if not start:
+                logger.info(f"📭 회사 {company_id}: 매출 데이터 없음")
+                continue
+
+            exported = SalesParquetExporter.from_config(app, company_id).export_range(start, end)
+            logger.info(f"✅ 회사 {company_id}: {start}~{end} {len(exported)}개 월, {sum(exported.values())}행")
+
+
+if __name__ == '__main__':
+    main()
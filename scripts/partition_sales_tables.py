@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+매출/주문 테이블 파티션 전환 스크립트 (1회성)
+기존 일반 테이블(sales_analysis_master, erpia_order_master)을
+회사(LIST) → 월(RANGE) 파티션 테이블로 옮깁니다.
+
+- 기존 테이블은 *_unpartitioned 로 이름 변경 후 데이터 복사 (--drop-old 지정 시 삭제)
+- id 시퀀스는 그대로 사용 (기존 id 유지, 이후 채번 연속)
+- m_date 가 비어 있는 주문은 j_date / created_at 으로 채움 (파티션 키 필수)
+- 데이터가 있는 가장 오래된 월부터 이번 달 + SALES_PARTITION_MONTHS_AHEAD 까지 월 파티션 생성
+
+사용법:
+    python scripts/partition_sales_tables.py
+    python scripts/partition_sales_tables.py --table sales_analysis_master --drop-old
+"""
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from sqlalchemy import text
+
+from app import create_worker_app
+from app.common.models import ErpiaOrderMaster, SalesAnalysisMaster, db
+from app.services.sales_partitions import PARTITIONED_TABLES, SalesPartitionManager
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+MODELS = {
+    'sales_analysis_master': SalesAnalysisMaster,
+    'erpia_order_master': ErpiaOrderMaster,
+}
+
+
+def rename_old(table: str) -> str:
+    """기존 테이블/인덱스/제약 이름 변경 (새 테이블과 이름 충돌 방지)"""
+    old = f"{table}_unpartitioned"
+    db.session.execute(text(f"ALTER TABLE {table} RENAME TO {old}"))
+    constraints = db.session.execute(text("""
+        SELECT conname FROM pg_constraint WHERE conrelid = CAST(:old AS regclass)
+    """), {'old': old}).scalars().all()
+    for name in constraints:
+        db.session.execute(text(f'ALTER TABLE {old} RENAME CONSTRAINT "{name}" TO "{name}_old"'))
+    indexes = db.session.execute(text("""
+        SELECT indexname FROM pg_indexes WHERE tablename = :old
+    """), {'old': old}).scalars().all()
+    for name in indexes:
+        if name not in {f"{c}_old" for c in constraints}:
+            db.session.execute(text(f'ALTER INDEX "{name}" RENAME TO "{name}_old"'))
+    return old
+
+
+def convert(table: str, column: str, drop_old: bool, months_ahead: int):
+    manager = SalesPartitionManager(db.session)
+    if manager.is_partitioned(table):
+        logger.info(f"✅ {table}: 이미 파티션 테이블")
+        return
+
+    model = MODELS[table]
+    try:
+        if table == 'erpia_order_master':
+            filled = db.session.execute(text(f"""
+                UPDATE {table} SET m_date = COALESCE(j_date, created_at, NOW()) WHERE m_date IS NULL
+            """)).rowcount
+            if filled:
+                logger.info(f"📝 {table}: m_date 없는 주문 {filled}건 j_date/created_at 으로 채움")
+
+        old = rename_old(table)
+        # 컬럼/기본값(id 시퀀스 포함) 복사 → 파티션 부모 생성
+        db.session.execute(text(f"""
+            CREATE TABLE {table} (LIKE {old} INCLUDING DEFAULTS INCLUDING COMMENTS)
+            PARTITION BY LIST (company_id)
+        """))
+        db.session.execute(text(f"ALTER TABLE {table} ALTER COLUMN {column} SET NOT NULL"))
+        db.session.execute(text(f"ALTER TABLE {table} ADD PRIMARY KEY (id, company_id, {column})"))
+        db.session.execute(text(f"ALTER TABLE {table} ADD FOREIGN KEY (company_id) REFERENCES companies (id)"))
+        bind = db.session.connection()
+        for index in model.__table__.indexes:
+            index.create(bind)
+        db.session.execute(text(f"ALTER SEQUENCE IF EXISTS {table}_id_seq OWNED BY {table}.id"))
+
+        first = db.session.execute(text(f"SELECT MIN({column}) FROM {old}")).scalar()
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+
+    manager.ensure_partitions(months_ahead=months_ahead, from_month=first.date() if hasattr(first, 'date') else first)
+
+    try:
+        copied = db.session.execute(text(f"INSERT INTO {table} SELECT * FROM {old}")).rowcount
+        if drop_old:
+            db.session.execute(text(f"DROP TABLE {old}"))
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    db.session.execute(text(f"ANALYZE {table}"))
+    db.session.commit()
+    logger.info(f"✅ {table}: {copied}건 파티션 테이블로 이동{' (기존 테이블 삭제)' if drop_old else f' (기존: {old})'}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='매출/주문 테이블 파티션 전환')
+    parser.add_argument('--table', action='append', choices=sorted(PARTITIONED_TABLES),
+                        help='전환할 테이블 (기본: 전체)')
+    parser.add_argument('--drop-old', action='store_true', help='복사 후 기존 테이블 삭제')
+    args = parser.parse_args()
+
+    app = create_worker_app(start_batch=False)
+    with app.app_context():
+        months_ahead = app.config.get('SALES_PARTITION_MONTHS_AHEAD', 3)
+        for table in args.table or list(PARTITIONED_TABLES):
+            convert(table, PARTITIONED_TABLES[table], args.drop_old, months_ahead)
+
+
+if __name__ == '__main__':
+    main()
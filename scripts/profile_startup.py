@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+앱 기동 시간 프로파일 스크립트
+- import 시간: python -X importtime 결과에서 누적 시간 상위 모듈
+- 앱 생성 시간: create_worker_app / create_app
+
+사용법:
+    python scripts/profile_startup.py
+    python scripts/profile_startup.py --top 30 --skip-app
+"""
+
+import argparse
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+
+def import_times(module: str = 'app'):
+    """-X importtime 출력 파싱 → [(누적 us, 자체 us, 모듈)]"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=str(project_root), capture_output=True, text=True,
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        try:
+            self_us, cumulative_us, name = line[len('import time:'):].split('|', 2)
+            rows.append((int(cumulative_us), int(self_us), name.strip()))
+        except ValueError:
+            continue
+    if result.returncode != 0:
+        print(f"❌ import {module} 실패:\n{result.stderr.splitlines()[-1] if result.stderr else ''}")
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description='앱 기동 시간 프로파일')
+    parser.add_argument('--top', type=int, default=20, help='출력할 모듈 수')
+    parser.add_argument('--skip-app', action='store_true', help='앱 생성 시간 측정 생략')
+    args = parser.parse_args()
+
+    rows = import_times()
+    if rows:
+        total = next((c for c, _, name in rows if name == 'app'), max(c for c, _, _ in rows))
+        print(f"📦 import app: {total / 1000:.0f}ms")
+        print(f"{'누적(ms)':>10} {'자체(ms)':>10}  모듈")
+        for cumulative_us, self_us, name in sorted(rows, reverse=True)[:args.top]:
+            print(f"{cumulative_us / 1000:>10.1f} {self_us / 1000:>10.1f}  {name}")
+
+    if args.skip_app:
+        return
+
+    from app import create_app, create_worker_app
+
+    started = time.perf_counter()
+    create_worker_app(start_batch=False)
+    print(f"⏱️ create_worker_app: {time.perf_counter() - started:.2f}초")
+
+    started = time.perf_counter()
+    create_app()
+    print(f"⏱️ create_app: {time.perf_counter() - started:.2f}초")
+
+
+if __name__ == '__main__':
+    main()
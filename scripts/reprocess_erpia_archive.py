@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ERPia 원본 보관 페이지 재처리 스크립트
+API 호출 없이 보관된 원본 XML 을 다시 파싱해 DB 에 반영합니다.
+(파서 버그 수정, 수집 필드 추가 후 과거 데이터 재적재용)
+
+사용법:
+    python scripts/reprocess_erpia_archive.py --company 1 --mode jumun --start 20250101 --end 20250331
+    python scripts/reprocess_erpia_archive.py --company 1 --mode goods --mode jegoAll
+"""
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app import create_worker_app
+from app.services.erpia_archive import MODE_STEPS, reprocess
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='ERPia 원본 보관 페이지 재처리')
+    parser.add_argument('--company', type=int, required=True, help='회사 ID (1=에이원, 2=에이원월드)')
+    parser.add_argument('--mode', action='append', choices=sorted(MODE_STEPS), required=True,
+                        help='ERPia 모드 (여러 번 지정 가능)')
+    parser.add_argument('--start', help='조회 시작일 YYYYMMDD (매출/매장)')
+    parser.add_argument('--end', help='조회 종료일 YYYYMMDD (매출/매장)')
+    args = parser.parse_args()
+
+    app = create_worker_app(start_batch=False)
+    with app.app_context():
+        summary = reprocess(app, args.company, args.mode, args.start, args.end)
+
+    for mode, result in summary.items():
+        logger.info(f"✅ {mode}: {result['pages']}페이지, {result['rows']}건 "
+                    f"(신규 {result['saved_to_db']}, 업데이트 {result['updated_in_db']})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+pytest 공통 fixture
+- 실제 PostgreSQL/Redis 가 필요 (연결 불가 시 skip)
+- DB 는 TEST_DATABASE_URL (기본 db_mis_test), 세션 시작 시 스키마/기본 데이터 부트스트랩
+- query_budget: 블록 안의 SQL 쿼리 수 상한 + N+1 없음 검증
+"""
+
+import os
+from contextlib import contextmanager
+
+import pytest
+
+# 테스트 프로세스에서는 스케줄러/배치 러너를 띄우지 않음
+os.environ.setdefault('BATCH_WORKER_MODE', 'external')
+
+
+@pytest.fixture(scope='session')
+def app():
+    from sqlalchemy import text
+    from app import create_app
+    from app.common.bootstrap import run_bootstrap
+    from app.common.models import db
+
+    app = create_app('testing')
+    with app.app_context():
+        try:
+            db.session.execute(text('SELECT 1'))
+        except Exception as e:
+            pytest.skip(f"테스트 데이터베이스 연결 불가: {e}")
+        run_bootstrap(app)
+    return app
+
+
+@pytest.fixture
+def client(app):
+    """로그인된 테스트 클라이언트 (관리자, 회사 1)"""
+    client = app.test_client()
+    with client.session_transaction() as sess:
+        sess['member_seq'] = 1
+        sess['member_id'] = 'admin'
+        sess['current_company_id'] = 1
+    return client
+
+
+@pytest.fixture
+def query_budget(app):
+    """
+    with query_budget(10):
+        client.get('/product/api/list')
+    """
+    from app.common.sql_profiler import profile_queries
+
+    @contextmanager
+    def _budget(max_queries: int, threshold: int = None):
+        threshold = threshold or app.config['SQL_PROFILER_NPLUSONE_THRESHOLD']
+        with profile_queries(threshold) as profile:
+            yield profile
+        assert profile.count <= max_queries, f"쿼리 예산 초과 ({max_queries}):\n{profile.summary()}"
+        assert not profile.n_plus_one, f"N+1 의심:\n{profile.summary()}"
+
+    return _budget
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ERPia 재고 스냅샷 적재
+- 컬럼 길이를 넘는 ERPia 코드가 전체 COPY 를 실패시키지 않는지 확인
+"""
+
+import pytest
+
+TEST_COMPANY_ID = 9999  # 실제 회사와 겹치지 않는 테스트 전용 ID
+
+
+@pytest.fixture
+def stock_sync(app):
+    from sqlalchemy import text
+    from app.common.models import db
+    from app.services.erpia_stock_sync import ErpiaStockSync
+
+    with app.app_context():
+        yield ErpiaStockSync(db.session, TEST_COMPANY_ID)
+        for table in ('erpia_stock', 'erpia_stock_history'):
+            db.session.execute(text(f"DELETE FROM {table} WHERE company_id = :company_id"),
+                               {'company_id': TEST_COMPANY_ID})
+        db.session.commit()
+
+
+def test_overlong_codes_do_not_fail_snapshot(stock_sync):
+    from sqlalchemy import text
+
+    result = stock_sync.sync([
+        {'goods_code': 'G' * 51, 'online_code': 'X', 'stock_qty': '1'},
+        {'goods_code': 'TEST-OK', 'online_code': 'O' * 60, 'goods_name': '테스트', 'stock_qty': '3.00'},
+    ])
+
+    assert result['data_count'] == 1
+    assert result['skipped_count'] == 1
+    row = stock_sync.session.execute(text("""
+        SELECT online_code, stock_qty FROM erpia_stock
+        WHERE company_id = :company_id AND goods_code = 'TEST-OK'
+    """), {'company_id': TEST_COMPANY_ID}).one()
+    assert row.online_code == 'O' * 50
+    assert row.stock_qty == 3
@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+주요 화면 API 쿼리 예산
+- 예산은 현재 쿼리 수 + 여유분, 초과 시 N+1 회귀로 간주
+"""
+
+import pytest
+
+
+@pytest.mark.parametrize('path, max_queries', [
+    ('/product/api/list', 8),
+    ('/product/api/list?search_name=test&per_page=100', 8),
+    ('/api/shops', 6),
+    ('/api/classifications', 6),
+    ('/admin/api/permissions/matrix', 10),
+    ('/admin/api/permissions/matrix?type=department', 10),
+])
+def test_endpoint_query_budget(client, query_budget, path, max_queries):
+    with query_budget(max_queries):
+        response = client.get(path)
+    assert response.status_code == 200
+
+
+def test_server_timing_header(app, client, monkeypatch):
+    """X-SQL-Profile 헤더로 프로파일링 시 Server-Timing 응답"""
+    monkeypatch.setitem(app.config, 'SQL_PROFILER_HEADER_ENABLED', True)
+    response = client.get('/product/api/list', headers={'X-SQL-Profile': '1'})
+    assert 'db;dur=' in response.headers.get('Server-Timing', '')
+
+
+def test_normalize_statement():
+    from app.common.sql_profiler import normalize_statement
+
+    assert normalize_statement(
+        "SELECT * FROM codes WHERE seq = 12 AND name = 'a''b'"
+    ) == "SELECT * FROM codes WHERE seq = ? AND name = ?"
+    assert normalize_statement(
+        "SELECT * FROM codes WHERE seq IN (%(seq_1_1)s, %(seq_1_2)s,\n %(seq_1_3)s)"
+    ) == "SELECT * FROM codes WHERE seq IN (?)"
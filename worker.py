@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+MIS v2 배치 워커 실행 파일
+- 웹 서버와 분리된 프로세스에서 ERPia 수집 / 사은품 분류 / 리포트 작업 실행
+- 웹 서버는 BATCH_WORKER_MODE=external 로 실행하면 작업 등록/조회만 수행
+- 여러 대 실행해도 리더(advisory lock) 하나만 스케줄러 실행, 나머지는 대기
+
+사용법:
+    BATCH_WORKER_MODE=external python run.py   # 웹
+    python worker.py                           # 워커
+"""
+
+import os
+import signal
+import threading
+
+from app import create_worker_app
+from app.services.batch_scheduler import batch_scheduler
+from app.services.batch_job_runner import batch_job_runner
+
+app = create_worker_app(os.environ.get('FLASK_ENV', 'production'))
+
+stop_event = threading.Event()
+
+
+def handle_signal(signum, frame):
+    print(f"⏹️ 종료 신호 수신 ({signum}) - 배치 워커 종료 중...")
+    stop_event.set()
+
+
+if __name__ == '__main__':
+    signal.signal(signal.SIGTERM, handle_signal)
+    signal.signal(signal.SIGINT, handle_signal)
+
+    print("🚀 배치 워커 실행 중 (종료: Ctrl+C)")
+    while not stop_event.is_set():
+        stop_event.wait(1)
+
+    # 실행 중인 작업 완료 대기 후 리더 락 해제 → 다른 워커가 승계
+    batch_job_runner.shutdown()
+    batch_scheduler.shutdown(wait=True)
+    print("✅ 배치 워커 종료 완료")
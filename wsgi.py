@@ -0,0 +1,14 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+MIS v2 운영 WSGI 진입점 (gunicorn)
+개발 서버는 run.py 사용
+
+사용법:
+    FLASK_ENV=production gunicorn -c gunicorn.conf.py wsgi:app
+"""
+
+import os
+from app import create_app
+
+app = create_app(os.environ.get('FLASK_ENV', 'production'))